@@ -30,10 +30,17 @@
  * 4. Community - Share and discover community-created skills (Supabase)
  * 5. Job Search Tools - Tracker, Interview prep, Networking, etc.
  * 6. Utilities - Batch processing, Export, Settings
+ *
+ * CODE SPLITTING:
+ * ===============
+ * Core pages are bundled with the app shell. Every other page is loaded
+ * with React.lazy when its route is first visited, so the skill library,
+ * role templates and workflow engine stay out of the startup bundle.
  */
 
-import React from 'react';
+import React, { lazy, Suspense } from 'react';
 import { HashRouter as Router, Routes, Route } from 'react-router-dom';
+import { Loader2 } from 'lucide-react';
 
 // ─────────────────────────────────────────────────────────────────────────────
 // CONTEXT PROVIDERS
@@ -57,6 +64,7 @@ import { PageErrorBoundary, RouteErrorBoundary } from './components/ErrorBoundar
 import Header from './components/Header';               // Navigation bar with menus
 import Footer from './components/Footer';               // Footer with links
 import CommandPalette from './components/CommandPalette'; // Cmd+K quick navigation
+import { AuthGate } from './components/AuthGate';           // Login gate with onboarding
 
 // ─────────────────────────────────────────────────────────────────────────────
 // CORE PAGES
@@ -71,80 +79,90 @@ import UserProfilePage from './pages/UserProfilePage';  // Resume and background
 // AI SKILLS PAGES
 // The 16 built-in AI skills for job seekers
 // ─────────────────────────────────────────────────────────────────────────────
-import BrowseSkillsPage from './pages/BrowseSkillsPage';  // Grid view of all skills
-import SkillRunnerPage from './pages/SkillRunnerPage';    // Execute a specific skill
-import RoleTemplatesPage from './pages/RoleTemplatesPage'; // Pre-configured role templates
-import MySkillsPage from './pages/MySkillsPage';          // User's saved/favorite skills
-import SkillLibraryPage from './pages/SkillLibraryPage';  // Unified skill library with filtering
-import LibrarySkillRunnerPage from './pages/LibrarySkillRunnerPage'; // Run skills from library
-import SkillQuizPage from './pages/SkillQuizPage';        // Skill discovery survey
+const BrowseSkillsPage = lazy(() => import('./pages/BrowseSkillsPage')); // Grid view of all skills
+const SkillRunnerPage = lazy(() => import('./pages/SkillRunnerPage')); // Execute a specific skill
+const RoleTemplatesPage = lazy(() => import('./pages/RoleTemplatesPage')); // Pre-configured role templates
+const MySkillsPage = lazy(() => import('./pages/MySkillsPage')); // User's saved/favorite skills
+const SkillLibraryPage = lazy(() => import('./pages/SkillLibraryPage')); // Unified skill library with filtering
+const LibrarySkillRunnerPage = lazy(() => import('./pages/LibrarySkillRunnerPage')); // Run skills from library
+const SkillQuizPage = lazy(() => import('./pages/SkillQuizPage')); // Skill discovery survey
 
 // ─────────────────────────────────────────────────────────────────────────────
 // CUSTOM SKILL GENERATION
 // Dynamic skill creation based on job description analysis
 // ─────────────────────────────────────────────────────────────────────────────
-import AnalyzeRolePage from './pages/AnalyzeRolePage';           // Analyze a job description
-import WorkspacePage from './pages/WorkspacePage';               // View workspace with recommendations
-import BuildSkillsPage from './pages/BuildSkillsPage';           // Build custom skills from recommendations
-import DynamicSkillRunnerPage from './pages/DynamicSkillRunnerPage'; // Run user-created skills
+const AnalyzeRolePage = lazy(() => import('./pages/AnalyzeRolePage')); // Analyze a job description
+const WorkspacePage = lazy(() => import('./pages/WorkspacePage')); // View workspace with recommendations
+const BuildSkillsPage = lazy(() => import('./pages/BuildSkillsPage')); // Build custom skills from recommendations
+const DynamicSkillRunnerPage = lazy(() => import('./pages/DynamicSkillRunnerPage')); // Run user-created skills
 
 // ─────────────────────────────────────────────────────────────────────────────
 // COMMUNITY FEATURES
 // Supabase-powered skill sharing and discovery
 // ─────────────────────────────────────────────────────────────────────────────
-import CommunitySkillsPage from './pages/CommunitySkillsPage';       // Browse community skills
-import CommunitySkillRunnerPage from './pages/CommunitySkillRunnerPage'; // Run a community skill
-import ImportSkillPage from './pages/ImportSkillPage';               // Import skill from JSON
+const CommunitySkillsPage = lazy(() => import('./pages/CommunitySkillsPage')); // Browse community skills
+const CommunitySkillRunnerPage = lazy(() => import('./pages/CommunitySkillRunnerPage')); // Run a community skill
+const ImportSkillPage = lazy(() => import('./pages/ImportSkillPage')); // Import skill from JSON
 
 // ─────────────────────────────────────────────────────────────────────────────
 // BATCH PROCESSING & EXPORT
 // Tools for bulk operations and data export
 // ─────────────────────────────────────────────────────────────────────────────
-import BatchProcessingPage from './pages/BatchProcessingPage';   // Run skills on CSV data
-import SkillExportPage from './pages/SkillExportPage';           // Export skill prompts to CSV/TXT
+const BatchProcessingPage = lazy(() => import('./pages/BatchProcessingPage')); // Run skills on CSV data
+const SkillExportPage = lazy(() => import('./pages/SkillExportPage')); // Export skill prompts to CSV/TXT
 
 // ─────────────────────────────────────────────────────────────────────────────
 // WORKFLOWS
 // Multi-step automated sequences that chain skills together
 // ─────────────────────────────────────────────────────────────────────────────
-import WorkflowsPage from './pages/WorkflowsPage';               // Browse all workflows by category
-import WorkflowRunnerPage from './pages/WorkflowRunnerPage';     // Execute multi-step workflows
-import BatchRunnerPage from './pages/BatchRunnerPage';           // Batch workflow execution
+const WorkflowsPage = lazy(() => import('./pages/WorkflowsPage')); // Browse all workflows by category
+const WorkflowRunnerPage = lazy(() => import('./pages/WorkflowRunnerPage')); // Execute multi-step workflows
+const BatchRunnerPage = lazy(() => import('./pages/BatchRunnerPage')); // Batch workflow execution
 
 // ─────────────────────────────────────────────────────────────────────────────
 // JOB SEARCH TOOLS
 // Utilities to support the job search process
 // ─────────────────────────────────────────────────────────────────────────────
-import JobTrackerPage from './pages/JobTrackerPage';             // Track job applications
-import InterviewBankPage from './pages/InterviewBankPage';       // Store interview Q&A
-import SalaryCalculatorPage from './pages/SalaryCalculatorPage'; // Calculate compensation
-import NetworkingTemplatesPage from './pages/NetworkingTemplatesPage'; // Outreach templates
-import CompanyNotesPage from './pages/CompanyNotesPage';         // Company research notes
-import AchievementsPage from './pages/AchievementsPage';         // Gamification & badges
-import SkillsGapPage from './pages/SkillsGapPage';               // Skills gap analysis
-import ProgressReportPage from './pages/ProgressReportPage';     // Job search progress
-import MockInterviewPage from './pages/MockInterviewPage';       // Practice interviews
-import FollowUpRemindersPage from './pages/FollowUpRemindersPage'; // Follow-up scheduling
-import AutoFillVaultPage from './pages/AutoFillVaultPage';       // Store common form answers
-import ReferralNetworkPage from './pages/ReferralNetworkPage';   // Track referral contacts
-import MarketInsightsPage from './pages/MarketInsightsPage';     // Job market data
-import DailyPlannerPage from './pages/DailyPlannerPage';         // Daily task planning
+const JobTrackerPage = lazy(() => import('./pages/JobTrackerPage')); // Track job applications
+const InterviewBankPage = lazy(() => import('./pages/InterviewBankPage')); // Store interview Q&A
+const SalaryCalculatorPage = lazy(() => import('./pages/SalaryCalculatorPage')); // Calculate compensation
+const NetworkingTemplatesPage = lazy(() => import('./pages/NetworkingTemplatesPage')); // Outreach templates
+const CompanyNotesPage = lazy(() => import('./pages/CompanyNotesPage')); // Company research notes
+const AchievementsPage = lazy(() => import('./pages/AchievementsPage')); // Gamification & badges
+const SkillsGapPage = lazy(() => import('./pages/SkillsGapPage')); // Skills gap analysis
+const ProgressReportPage = lazy(() => import('./pages/ProgressReportPage')); // Job search progress
+const MockInterviewPage = lazy(() => import('./pages/MockInterviewPage')); // Practice interviews
+const FollowUpRemindersPage = lazy(() => import('./pages/FollowUpRemindersPage')); // Follow-up scheduling
+const AutoFillVaultPage = lazy(() => import('./pages/AutoFillVaultPage')); // Store common form answers
+const ReferralNetworkPage = lazy(() => import('./pages/ReferralNetworkPage')); // Track referral contacts
+const MarketInsightsPage = lazy(() => import('./pages/MarketInsightsPage')); // Job market data
+const DailyPlannerPage = lazy(() => import('./pages/DailyPlannerPage')); // Daily task planning
 
 // ─────────────────────────────────────────────────────────────────────────────
 // UTILITY PAGES
 // Settings, configuration, and help
 // ─────────────────────────────────────────────────────────────────────────────
-import ApiKeyInstructionsPage from './pages/ApiKeyInstructionsPage'; // API key setup guide
-import PlatformKeysSetupPage from './pages/PlatformKeysSetupPage';   // Platform keys admin setup
-import SettingsPage from './pages/SettingsPage';                     // App settings
-import PricingPage from './pages/PricingPage';                       // Pricing information
-import AdminPage from './pages/AdminPage';                           // Admin control panel
-import DevPlaygroundPage from './pages/DevPlaygroundPage';           // Developer test playground
-import AccountPage from './pages/AccountPage';                       // User account & credits
-import AdminImprovementsPage from './pages/AdminImprovementsPage'; // Skill improvement review
-import AuthCallbackPage from './pages/AuthCallbackPage';           // OAuth callback handler
-import ClientPortalPage from './pages/ClientPortalPage';           // B2B client marketing portal
-import { AuthGate } from './components/AuthGate';                  // Login gate with onboarding
+const ApiKeyInstructionsPage = lazy(() => import('./pages/ApiKeyInstructionsPage')); // API key setup guide
+const PlatformKeysSetupPage = lazy(() => import('./pages/PlatformKeysSetupPage')); // Platform keys admin setup
+const SettingsPage = lazy(() => import('./pages/SettingsPage'));     // App settings
+const PricingPage = lazy(() => import('./pages/PricingPage'));       // Pricing information
+const AdminPage = lazy(() => import('./pages/AdminPage'));           // Admin control panel
+const DevPlaygroundPage = lazy(() => import('./pages/DevPlaygroundPage')); // Developer test playground
+const AccountPage = lazy(() => import('./pages/AccountPage'));       // User account & credits
+const AdminImprovementsPage = lazy(() => import('./pages/AdminImprovementsPage')); // Skill improvement review
+const AuthCallbackPage = lazy(() => import('./pages/AuthCallbackPage')); // OAuth callback handler
+const ClientPortalPage = lazy(() => import('./pages/ClientPortalPage')); // B2B client marketing portal
+
+/**
+ * Shown while a lazily loaded page chunk downloads
+ */
+function RouteLoading() {
+  return (
+    <div className="min-h-[50vh] flex items-center justify-center">
+      <Loader2 className="h-8 w-8 animate-spin text-primary" />
+    </div>
+  );
+}
 
 /**
  * Main App Component
@@ -176,6 +194,7 @@ function App() {
 
                 {/* Main content area - grows to fill available space */}
                 <main className="flex-1">
+                  <Suspense fallback={<RouteLoading />}>
                   <Routes>
                     {/* ═══════════════════════════════════════════════════════
                         HOME & CORE PAGES
@@ -292,6 +311,7 @@ function App() {
                     ═══════════════════════════════════════════════════════ */}
                     <Route path="/portal/:slug" element={<RouteErrorBoundary pageName="Client Portal"><ClientPortalPage /></RouteErrorBoundary>} />
                   </Routes>
+                  </Suspense>
                 </main>
 
                 {/* Footer with links and copyright */}
@@ -3,9 +3,17 @@
  *
  * Provides cost estimation, budget management, and provider routing
  * for skills and workflows.
+ *
+ * Recorded costs go into an append-only ledger that keeps running rollups
+ * by hour, day and month for every user, team, skill, workflow and
+ * provider, and every pair of them, so summaries and budget checks never
+ * scan individual records.
+ * Older records are compacted from memory to IndexedDB.
  */
 
 import { logger } from '../logger';
+import { db } from '../storage/indexeddb';
+import type { Page, PageOptions } from '../storage/query';
 import type {
   CostEstimate,
   BudgetConfig,
@@ -275,6 +283,8 @@ export function checkBudget(params: {
     return { allowed: true }; // No budget configured
   }
 
+  refreshBudgetUsage(budget);
+
   // Check per-run limit
   if (budget.perRunLimit > 0 && params.estimatedCost > budget.perRunLimit) {
     return {
@@ -322,13 +332,13 @@ export function checkBudget(params: {
 }
 
 /**
- * Record cost usage against budget
+ * Refresh a budget's usage from the cost ledger after a cost was recorded,
+ * and send threshold notifications
  */
 export function recordCostUsage(params: {
   budgetId?: string;
   userId?: string;
   teamId?: string;
-  actualCost: number;
 }): void {
   let budget: BudgetConfig | null = null;
 
@@ -343,9 +353,7 @@ export function recordCostUsage(params: {
 
   if (!budget) return;
 
-  budget.currentDailyUsage += params.actualCost;
-  budget.currentWeeklyUsage += params.actualCost;
-  budget.currentMonthlyUsage += params.actualCost;
+  refreshBudgetUsage(budget);
 
   // Check notification thresholds
   checkBudgetNotifications(budget);
@@ -367,9 +375,11 @@ function checkBudgetNotifications(budget: BudgetConfig): void {
 
 /**
  * Reset daily budget counters
+ * Usage counts from zero again until the day ends.
  */
 export function resetDailyBudgets(): void {
   for (const budget of budgets.values()) {
+    setUsageBaseline(budget, 'daily');
     budget.currentDailyUsage = 0;
   }
 }
@@ -379,6 +389,7 @@ export function resetDailyBudgets(): void {
  */
 export function resetWeeklyBudgets(): void {
   for (const budget of budgets.values()) {
+    setUsageBaseline(budget, 'weekly');
     budget.currentWeeklyUsage = 0;
   }
 }
@@ -388,11 +399,95 @@ export function resetWeeklyBudgets(): void {
  */
 export function resetMonthlyBudgets(): void {
   for (const budget of budgets.values()) {
+    setUsageBaseline(budget, 'monthly');
     budget.currentMonthlyUsage = 0;
     budget.lastResetAt = new Date().toISOString();
   }
 }
 
+// ─────────────────────────────────────────────────────────────────────────────
+// Budget usage from the cost ledger
+// ─────────────────────────────────────────────────────────────────────────────
+
+type BudgetPeriod = 'daily' | 'weekly' | 'monthly';
+
+/** Ledger usage at the last reset, subtracted until the period ends */
+const usageBaselines: Map<string, Partial<Record<BudgetPeriod, { periodStart: number; amount: number }>>> =
+  new Map();
+
+/**
+ * Rollup scopes a budget's usage is read from
+ *
+ * The narrowest part of the scope wins: a budget for a user within a team
+ * counts that user's spend.
+ */
+function getBudgetScopes(budget: BudgetConfig): string[] {
+  if (budget.scope.userId) return [`user:${budget.scope.userId}`];
+  if (budget.scope.teamId) return [`team:${budget.scope.teamId}`];
+  if (budget.scope.skills?.length) return budget.scope.skills.map(id => `skill:${id}`);
+  if (budget.scope.workflows?.length) return budget.scope.workflows.map(id => `workflow:${id}`);
+  return ['all'];
+}
+
+/**
+ * Start of the calendar period (UTC) containing time; weeks start on Monday
+ */
+function getPeriodStart(period: BudgetPeriod, time: number): number {
+  if (period === 'daily') return getBucketStart('day', time);
+  if (period === 'monthly') return getBucketStart('month', time);
+  const day = getBucketStart('day', time);
+  return day - ((new Date(day).getUTCDay() + 6) % 7) * DAY_MS;
+}
+
+/**
+ * Ledger spend in the period containing time: one day or month rollup per
+ * scope, or up to seven day rollups for a week
+ */
+function getLedgerUsage(scopes: string[], period: BudgetPeriod, time: number): number {
+  const start = getPeriodStart(period, time);
+  let total = 0;
+
+  for (const scope of scopes) {
+    if (period === 'weekly') {
+      for (let day = start; day <= time; day += DAY_MS) {
+        total += costRollups.get(getRollupKey('day', day, scope))?.cost ?? 0;
+      }
+    } else {
+      total += costRollups.get(getRollupKey(period === 'daily' ? 'day' : 'month', start, scope))?.cost ?? 0;
+    }
+  }
+  return total;
+}
+
+function setUsageBaseline(budget: BudgetConfig, period: BudgetPeriod): void {
+  const now = Date.now();
+  const baselines = usageBaselines.get(budget.id) ?? {};
+  baselines[period] = {
+    periodStart: getPeriodStart(period, now),
+    amount: getLedgerUsage(getBudgetScopes(budget), period, now),
+  };
+  usageBaselines.set(budget.id, baselines);
+}
+
+/**
+ * Set a budget's current usage from the ledger rollups
+ */
+function refreshBudgetUsage(budget: BudgetConfig): void {
+  const now = Date.now();
+  const scopes = getBudgetScopes(budget);
+  const baselines = usageBaselines.get(budget.id);
+
+  const usage = (period: BudgetPeriod) => {
+    const baseline = baselines?.[period];
+    const offset = baseline && baseline.periodStart === getPeriodStart(period, now) ? baseline.amount : 0;
+    return Math.max(0, getLedgerUsage(scopes, period, now) - offset);
+  };
+
+  budget.currentDailyUsage = usage('daily');
+  budget.currentWeeklyUsage = usage('weekly');
+  budget.currentMonthlyUsage = usage('monthly');
+}
+
 // ═══════════════════════════════════════════════════════════════════════════
 // PROVIDER ROUTING
 // ═══════════════════════════════════════════════════════════════════════════
@@ -536,8 +631,255 @@ function evaluateRoutingCondition(
 // COST TRACKING
 // ═══════════════════════════════════════════════════════════════════════════
 
-const costRecords: CostRecord[] = [];
+const HOUR_MS = 60 * 60 * 1000;
+const DAY_MS = 24 * HOUR_MS;
+
+/** Records kept in memory; older ones are compacted to the archive */
 const MAX_COST_RECORDS = 10000;
+/** Records moved to the archive per compaction */
+const COST_COMPACTION_BATCH = 1000;
+
+export interface CostBreakdown {
+  cost: number;
+  tokens: number;
+  count: number;
+}
+
+interface CostRollup extends CostBreakdown {
+  byProvider: Record<string, CostBreakdown>;
+  byModel: Record<string, CostBreakdown>;
+}
+
+type RollupGranularity = 'hour' | 'day' | 'month' | 'total';
+
+const ROLLUP_GRANULARITIES: RollupGranularity[] = ['hour', 'day', 'month', 'total'];
+
+/**
+ * Filters for cost record queries
+ */
+export interface CostRecordFilter {
+  userId?: string;
+  teamId?: string;
+  skillId?: string;
+  workflowId?: string;
+  provider?: string;
+}
+
+/**
+ * Where records compacted out of memory are kept
+ */
+export interface CostRecordArchive {
+  save(records: CostRecord[]): Promise<void>;
+  getPage(options: PageOptions & CostRecordFilter): Promise<Page<CostRecord>>;
+}
+
+/**
+ * Archive compacted records in the costRecords store of SkillEngineDB
+ */
+export const indexedDBCostRecordArchive: CostRecordArchive = {
+  save: (records) => db.saveCostRecords(records),
+  getPage: (options) => db.getCostRecordsPage(options),
+};
+
+/** Most recent records, oldest first; only ever appended to */
+const costRecords: CostRecord[] = [];
+/** Running totals keyed by getRollupKey */
+const costRollups: Map<string, CostRollup> = new Map();
+/** Whether any records have been compacted out of memory */
+let hasCompactedRecords = false;
+/** First and last hour with recorded costs, bounding range queries */
+let firstCostHour: number | null = null;
+let lastCostHour: number | null = null;
+
+let costRecordArchive: CostRecordArchive | null =
+  typeof indexedDB !== 'undefined' ? indexedDBCostRecordArchive : null;
+
+/**
+ * Replace the archive for compacted records; null drops them after
+ * they leave memory (their rollups are kept)
+ */
+export function setCostRecordArchive(archive: CostRecordArchive | null): void {
+  costRecordArchive = archive;
+}
+
+/**
+ * Start of the UTC hour, day or month containing time
+ */
+function getBucketStart(granularity: RollupGranularity, time: number): number {
+  switch (granularity) {
+    case 'hour':
+      return Math.floor(time / HOUR_MS) * HOUR_MS;
+    case 'day':
+      return Math.floor(time / DAY_MS) * DAY_MS;
+    case 'month': {
+      const date = new Date(time);
+      return Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), 1);
+    }
+    case 'total':
+      return 0;
+  }
+}
+
+function getNextMonthStart(monthStart: number): number {
+  const date = new Date(monthStart);
+  return Date.UTC(date.getUTCFullYear(), date.getUTCMonth() + 1, 1);
+}
+
+/**
+ * Key of one rollup, e.g. "day:1717200000000|user:u1"
+ */
+function getRollupKey(granularity: RollupGranularity, bucketStart: number, scope: string): string {
+  return `${granularity}:${bucketStart}|${scope}`;
+}
+
+/**
+ * Scopes for the filters that are set, in a fixed order (user, team,
+ * skill, workflow, provider) so records and queries build the same keys
+ */
+function getFilterScopes(filter: CostRecordFilter): string[] {
+  return [
+    filter.userId && `user:${filter.userId}`,
+    filter.teamId && `team:${filter.teamId}`,
+    filter.skillId && `skill:${filter.skillId}`,
+    filter.workflowId && `workflow:${filter.workflowId}`,
+    filter.provider && `provider:${filter.provider}`,
+  ].filter((scope): scope is string => !!scope);
+}
+
+/**
+ * Scopes a record is counted in: everything, its user, team, skill,
+ * workflow and provider, and every pair of those, e.g. "user:u1+team:t1"
+ */
+function getRecordScopes(record: CostRecord): string[] {
+  const filterScopes = getFilterScopes(record);
+  const scopes = ['all', ...filterScopes];
+  for (let i = 0; i < filterScopes.length; i++) {
+    for (let j = i + 1; j < filterScopes.length; j++) {
+      scopes.push(`${filterScopes[i]}+${filterScopes[j]}`);
+    }
+  }
+  return scopes;
+}
+
+function createRollup(): CostRollup {
+  return { cost: 0, tokens: 0, count: 0, byProvider: {}, byModel: {} };
+}
+
+function addToBreakdown(
+  breakdowns: Record<string, CostBreakdown>,
+  key: string,
+  cost: number,
+  tokens: number,
+  count: number
+): void {
+  const breakdown = breakdowns[key] || (breakdowns[key] = { cost: 0, tokens: 0, count: 0 });
+  breakdown.cost += cost;
+  breakdown.tokens += tokens;
+  breakdown.count += count;
+}
+
+function addRecordToRollup(rollup: CostRollup, record: CostRecord): void {
+  rollup.cost += record.cost;
+  rollup.tokens += record.totalTokens;
+  rollup.count++;
+  addToBreakdown(rollup.byProvider, record.provider, record.cost, record.totalTokens, 1);
+  addToBreakdown(rollup.byModel, record.model, record.cost, record.totalTokens, 1);
+}
+
+function mergeRollup(target: CostRollup, source: CostRollup): void {
+  target.cost += source.cost;
+  target.tokens += source.tokens;
+  target.count += source.count;
+  for (const [provider, b] of Object.entries(source.byProvider)) {
+    addToBreakdown(target.byProvider, provider, b.cost, b.tokens, b.count);
+  }
+  for (const [model, b] of Object.entries(source.byModel)) {
+    addToBreakdown(target.byModel, model, b.cost, b.tokens, b.count);
+  }
+}
+
+/**
+ * Count a record in every rollup it belongs to: one per granularity and scope
+ */
+function addToRollups(record: CostRecord): void {
+  const time = Date.parse(record.timestamp);
+  const scopes = getRecordScopes(record);
+
+  for (const granularity of ROLLUP_GRANULARITIES) {
+    const bucketStart = getBucketStart(granularity, time);
+    for (const scope of scopes) {
+      const key = getRollupKey(granularity, bucketStart, scope);
+      let rollup = costRollups.get(key);
+      if (!rollup) {
+        rollup = createRollup();
+        costRollups.set(key, rollup);
+      }
+      addRecordToRollup(rollup, record);
+    }
+  }
+
+  const hour = getBucketStart('hour', time);
+  if (firstCostHour === null || hour < firstCostHour) firstCostHour = hour;
+  if (lastCostHour === null || hour > lastCostHour) lastCostHour = hour;
+}
+
+/**
+ * Keys of the fewest rollups covering [startDate, endDate]
+ *
+ * The range is widened to whole hours, then covered greedily by whole
+ * months, whole days and the remaining hours, so the number of rollups read
+ * depends on the length of the range, not on how many records it holds.
+ */
+function getRangeRollupKeys(scope: string, startDate?: string, endDate?: string): string[] {
+  if (!startDate && !endDate) return [getRollupKey('total', 0, scope)];
+  if (firstCostHour === null || lastCostHour === null) return [];
+
+  const start = Math.max(
+    startDate ? getBucketStart('hour', Date.parse(startDate)) : firstCostHour,
+    firstCostHour
+  );
+  const end = Math.min(
+    endDate ? getBucketStart('hour', Date.parse(endDate)) + HOUR_MS : lastCostHour + HOUR_MS,
+    lastCostHour + HOUR_MS
+  );
+
+  const keys: string[] = [];
+  let time = start;
+  while (time < end) {
+    if (time === getBucketStart('month', time)) {
+      const nextMonth = getNextMonthStart(time);
+      if (nextMonth <= end) {
+        keys.push(getRollupKey('month', time, scope));
+        time = nextMonth;
+        continue;
+      }
+    }
+    if (time % DAY_MS === 0 && time + DAY_MS <= end) {
+      keys.push(getRollupKey('day', time, scope));
+      time += DAY_MS;
+      continue;
+    }
+    keys.push(getRollupKey('hour', time, scope));
+    time += HOUR_MS;
+  }
+  return keys;
+}
+
+/**
+ * Move the oldest in-memory records to the archive
+ */
+function compactCostRecords(): void {
+  const compacted = costRecords.splice(0, COST_COMPACTION_BATCH);
+  hasCompactedRecords = true;
+  if (!costRecordArchive) return;
+
+  costRecordArchive.save(compacted).catch(error => {
+    logger.warn('Failed to archive cost records', {
+      count: compacted.length,
+      error: error instanceof Error ? error.message : String(error),
+    });
+  });
+}
 
 /**
  * Record actual cost after execution
@@ -549,69 +891,72 @@ export function recordCost(record: Omit<CostRecord, 'id' | 'timestamp'>): CostRe
     timestamp: new Date().toISOString(),
   };
 
-  costRecords.unshift(fullRecord);
+  costRecords.push(fullRecord);
+  addToRollups(fullRecord);
 
-  // Trim old records
   if (costRecords.length > MAX_COST_RECORDS) {
-    costRecords.pop();
+    compactCostRecords();
   }
 
   // Update budget usage
   recordCostUsage({
     userId: record.userId,
     teamId: record.teamId,
-    actualCost: record.cost,
   });
 
   return fullRecord;
 }
 
 /**
- * Get cost records with filtering
+ * Get in-memory cost records with filtering, most recent first
+ * Use getArchivedCostRecords for records compacted out of memory.
  */
-export function getCostRecords(params?: {
-  userId?: string;
-  teamId?: string;
-  skillId?: string;
-  workflowId?: string;
-  provider?: string;
+export function getCostRecords(params?: CostRecordFilter & {
   startDate?: string;
   endDate?: string;
   limit?: number;
 }): CostRecord[] {
-  let records = [...costRecords];
-
-  if (params?.userId) {
-    records = records.filter(r => r.userId === params.userId);
-  }
-  if (params?.teamId) {
-    records = records.filter(r => r.teamId === params.teamId);
-  }
-  if (params?.skillId) {
-    records = records.filter(r => r.skillId === params.skillId);
-  }
-  if (params?.workflowId) {
-    records = records.filter(r => r.workflowId === params.workflowId);
-  }
-  if (params?.provider) {
-    records = records.filter(r => r.provider === params.provider);
-  }
-  if (params?.startDate) {
-    records = records.filter(r => r.timestamp >= params.startDate!);
-  }
-  if (params?.endDate) {
-    records = records.filter(r => r.timestamp <= params.endDate!);
+  const limit = params?.limit || 100;
+  const records: CostRecord[] = [];
+
+  for (let i = costRecords.length - 1; i >= 0 && records.length < limit; i--) {
+    const r = costRecords[i];
+    if (params?.userId && r.userId !== params.userId) continue;
+    if (params?.teamId && r.teamId !== params.teamId) continue;
+    if (params?.skillId && r.skillId !== params.skillId) continue;
+    if (params?.workflowId && r.workflowId !== params.workflowId) continue;
+    if (params?.provider && r.provider !== params.provider) continue;
+    if (params?.startDate && r.timestamp < params.startDate) continue;
+    if (params?.endDate && r.timestamp > params.endDate) continue;
+    records.push(r);
   }
 
-  return records.slice(0, params?.limit || 100);
+  return records;
+}
+
+/**
+ * Page through cost records compacted to the archive, newest first
+ */
+export async function getArchivedCostRecords(
+  options: PageOptions & CostRecordFilter = {}
+): Promise<Page<CostRecord>> {
+  if (!costRecordArchive) return { items: [], nextCursor: null };
+  return costRecordArchive.getPage(options);
 }
 
 /**
  * Get cost summary
+ *
+ * Answered from the ledger rollups, including records already compacted out
+ * of memory, for any one or two of user, team, skill, workflow and
+ * provider. Dates are widened to whole hours.
+ *
+ * There are no rollups for three or more filters, so those summaries scan
+ * the in-memory records instead. Once older records have been compacted,
+ * such a summary only covers records from coveredFrom onwards; coveredFrom
+ * is left unset whenever the summary is complete.
  */
-export function getCostSummary(params?: {
-  userId?: string;
-  teamId?: string;
+export function getCostSummary(params?: CostRecordFilter & {
   startDate?: string;
   endDate?: string;
 }): {
@@ -619,50 +964,36 @@ export function getCostSummary(params?: {
   totalTokens: number;
   executionCount: number;
   avgCostPerExecution: number;
-  byProvider: Record<string, { cost: number; tokens: number; count: number }>;
-  byModel: Record<string, { cost: number; tokens: number; count: number }>;
+  byProvider: Record<string, CostBreakdown>;
+  byModel: Record<string, CostBreakdown>;
+  coveredFrom?: string;
 } {
-  const records = getCostRecords({
-    userId: params?.userId,
-    teamId: params?.teamId,
-    startDate: params?.startDate,
-    endDate: params?.endDate,
-    limit: MAX_COST_RECORDS,
-  });
-
-  const summary = {
-    totalCost: 0,
-    totalTokens: 0,
-    executionCount: records.length,
-    avgCostPerExecution: 0,
-    byProvider: {} as Record<string, { cost: number; tokens: number; count: number }>,
-    byModel: {} as Record<string, { cost: number; tokens: number; count: number }>,
-  };
-
-  for (const record of records) {
-    summary.totalCost += record.cost;
-    summary.totalTokens += record.totalTokens;
-
-    // By provider
-    if (!summary.byProvider[record.provider]) {
-      summary.byProvider[record.provider] = { cost: 0, tokens: 0, count: 0 };
+  const scopes = getFilterScopes(params ?? {});
+
+  const rollup = createRollup();
+  let coveredFrom: string | undefined;
+  if (scopes.length > 2) {
+    getCostRecords({ ...params, limit: MAX_COST_RECORDS }).forEach(record => addRecordToRollup(rollup, record));
+    const oldestInMemory = costRecords[0]?.timestamp;
+    if (hasCompactedRecords && oldestInMemory && (!params?.startDate || params.startDate < oldestInMemory)) {
+      coveredFrom = oldestInMemory;
     }
-    summary.byProvider[record.provider].cost += record.cost;
-    summary.byProvider[record.provider].tokens += record.totalTokens;
-    summary.byProvider[record.provider].count++;
-
-    // By model
-    if (!summary.byModel[record.model]) {
-      summary.byModel[record.model] = { cost: 0, tokens: 0, count: 0 };
+  } else {
+    for (const key of getRangeRollupKeys(scopes.join('+') || 'all', params?.startDate, params?.endDate)) {
+      const bucket = costRollups.get(key);
+      if (bucket) mergeRollup(rollup, bucket);
     }
-    summary.byModel[record.model].cost += record.cost;
-    summary.byModel[record.model].tokens += record.totalTokens;
-    summary.byModel[record.model].count++;
   }
 
-  summary.avgCostPerExecution = records.length > 0 ? summary.totalCost / records.length : 0;
-
-  return summary;
+  return {
+    totalCost: rollup.cost,
+    totalTokens: rollup.tokens,
+    executionCount: rollup.count,
+    avgCostPerExecution: rollup.count > 0 ? rollup.cost / rollup.count : 0,
+    byProvider: rollup.byProvider,
+    byModel: rollup.byModel,
+    ...(coveredFrom && { coveredFrom }),
+  };
 }
 
 // ═══════════════════════════════════════════════════════════════════════════
@@ -31,6 +31,9 @@ export {
   getLatencyBudget,
   getAllLatencyBudgets,
   calculateLatencyPercentiles,
+  LatencySketch,
+  LATENCY_WINDOW_MINUTES,
+  type LatencySketchSnapshot,
 
   // Error budgets
   setErrorBudget,
@@ -47,7 +50,10 @@ export {
   // Metrics
   getMetricsSummary,
   getGlobalMetricsSummary,
+  getMetricsSnapshot,
+  exportMetricsSnapshot,
   type MetricsSummary,
+  type MetricsSnapshot,
 } from './observability';
 
 // Export compliance
@@ -102,7 +108,13 @@ export {
   // Cost tracking
   recordCost,
   getCostRecords,
+  getArchivedCostRecords,
   getCostSummary,
+  setCostRecordArchive,
+  indexedDBCostRecordArchive,
+  type CostBreakdown,
+  type CostRecordFilter,
+  type CostRecordArchive,
 } from './costControls';
 
 // Export collaboration
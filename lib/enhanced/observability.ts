@@ -3,6 +3,12 @@
  *
  * Provides tracing, latency budgets, error budgets, and alerting
  * for skills and workflows.
+ *
+ * Telemetry cost stays flat as execution volume grows:
+ * - Completed traces live in a fixed-size ring buffer indexed by trace ID
+ *   and entity ID
+ * - Latency percentiles come from fixed-size log-bucketed sketches, kept per
+ *   entity for the lifetime of the session and for a sliding time window
  */
 
 import { logger } from '../logger';
@@ -20,10 +26,86 @@ import type {
 // TRACE MANAGEMENT
 // ═══════════════════════════════════════════════════════════════════════════
 
-const activeTraces: Map<string, ExecutionTrace> = new Map();
-const completedTraces: ExecutionTrace[] = [];
 const MAX_COMPLETED_TRACES = 1000;
 
+/**
+ * Ring buffer of completed traces
+ *
+ * Each trace gets an increasing sequence number; its slot is the sequence
+ * number modulo the capacity, so adding a trace overwrites the oldest one.
+ * The ID and entity indexes store sequence numbers, and the entity lists are
+ * in insertion order, so the evicted trace is always at the head of its
+ * entity's list.
+ */
+class TraceRing {
+  private slots: (ExecutionTrace | undefined)[];
+  private nextSeq = 0;
+  private byId = new Map<string, number>();
+  private byEntity = new Map<string, { seqs: number[]; head: number }>();
+
+  constructor(private readonly capacity: number) {
+    this.slots = new Array(capacity);
+  }
+
+  add(trace: ExecutionTrace): void {
+    const seq = this.nextSeq++;
+    const slot = seq % this.capacity;
+
+    const evicted = this.slots[slot];
+    if (evicted) {
+      if (this.byId.get(evicted.id) === seq - this.capacity) {
+        this.byId.delete(evicted.id);
+      }
+      const list = this.byEntity.get(evicted.entityId);
+      if (list) {
+        list.head++;
+        if (list.head === list.seqs.length) {
+          this.byEntity.delete(evicted.entityId);
+        } else if (list.head > 64 && list.head * 2 > list.seqs.length) {
+          list.seqs = list.seqs.slice(list.head);
+          list.head = 0;
+        }
+      }
+    }
+
+    this.slots[slot] = trace;
+    this.byId.set(trace.id, seq);
+    const list = this.byEntity.get(trace.entityId);
+    if (list) {
+      list.seqs.push(seq);
+    } else {
+      this.byEntity.set(trace.entityId, { seqs: [seq], head: 0 });
+    }
+  }
+
+  get(traceId: string): ExecutionTrace | undefined {
+    const seq = this.byId.get(traceId);
+    return seq === undefined ? undefined : this.slots[seq % this.capacity];
+  }
+
+  /**
+   * Iterate traces newest first, optionally for one entity only
+   */
+  *newest(entityId?: string): Generator<ExecutionTrace> {
+    if (entityId !== undefined) {
+      const list = this.byEntity.get(entityId);
+      if (!list) return;
+      for (let i = list.seqs.length - 1; i >= list.head; i--) {
+        yield this.slots[list.seqs[i] % this.capacity]!;
+      }
+      return;
+    }
+
+    const oldest = Math.max(0, this.nextSeq - this.capacity);
+    for (let seq = this.nextSeq - 1; seq >= oldest; seq--) {
+      yield this.slots[seq % this.capacity]!;
+    }
+  }
+}
+
+const activeTraces: Map<string, ExecutionTrace> = new Map();
+const completedTraces = new TraceRing(MAX_COMPLETED_TRACES);
+
 /**
  * Generate unique trace ID
  */
@@ -123,12 +205,8 @@ export function completeTrace(
 
   // Move to completed
   activeTraces.delete(traceId);
-  completedTraces.unshift(trace);
-
-  // Trim old traces
-  if (completedTraces.length > MAX_COMPLETED_TRACES) {
-    completedTraces.pop();
-  }
+  completedTraces.add(trace);
+  recordExecutionMetrics(trace);
 
   // Check budgets and alerts
   checkLatencyBudgets(trace);
@@ -165,7 +243,8 @@ export function failTrace(
 
   // Move to completed
   activeTraces.delete(traceId);
-  completedTraces.unshift(trace);
+  completedTraces.add(trace);
+  recordExecutionMetrics(trace);
 
   // Check error budgets
   checkErrorBudgets(trace);
@@ -180,11 +259,11 @@ export function failTrace(
  * Get trace by ID
  */
 export function getTrace(traceId: string): ExecutionTrace | null {
-  return activeTraces.get(traceId) || completedTraces.find(t => t.id === traceId) || null;
+  return activeTraces.get(traceId) || completedTraces.get(traceId) || null;
 }
 
 /**
- * Get recent traces
+ * Get recent traces, completed (newest first) before running ones
  */
 export function getRecentTraces(params: {
   type?: 'skill' | 'workflow' | 'step';
@@ -192,19 +271,279 @@ export function getRecentTraces(params: {
   status?: ExecutionTrace['status'];
   limit?: number;
 }): ExecutionTrace[] {
-  let traces = [...completedTraces, ...Array.from(activeTraces.values())];
+  const limit = params.limit || 100;
+  const traces: ExecutionTrace[] = [];
+  const matches = (t: ExecutionTrace) =>
+    (!params.type || t.type === params.type) &&
+    (!params.entityId || t.entityId === params.entityId) &&
+    (!params.status || t.status === params.status);
+
+  for (const trace of completedTraces.newest(params.entityId || undefined)) {
+    if (traces.length >= limit) return traces;
+    if (matches(trace)) traces.push(trace);
+  }
+  for (const trace of activeTraces.values()) {
+    if (traces.length >= limit) break;
+    if (matches(trace)) traces.push(trace);
+  }
+
+  return traces;
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// LATENCY SKETCHES
+// ═══════════════════════════════════════════════════════════════════════════
+
+/** Quantile estimates are within 1% of a recorded value */
+const SKETCH_RELATIVE_ACCURACY = 0.01;
+const SKETCH_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY);
+const SKETCH_LOG_GAMMA = Math.log(SKETCH_GAMMA);
+/** Values at or below 1 ms share the first bucket */
+const SKETCH_MIN_MS = 1;
+/** Values above 24 hours share the last bucket */
+const SKETCH_MAX_MS = 24 * 60 * 60 * 1000;
+const SKETCH_BUCKETS = Math.ceil(Math.log(SKETCH_MAX_MS / SKETCH_MIN_MS) / SKETCH_LOG_GAMMA) + 1;
 
-  if (params.type) {
-    traces = traces.filter(t => t.type === params.type);
+/**
+ * Serialized LatencySketch; buckets maps bucket index to count
+ */
+export interface LatencySketchSnapshot {
+  relativeAccuracy: number;
+  count: number;
+  sum: number;
+  min: number;
+  max: number;
+  buckets: Record<number, number>;
+}
+
+/**
+ * Fixed-size latency histogram with logarithmic buckets
+ *
+ * Bucket i holds values in (gamma^(i-1), gamma^i], so every quantile estimate
+ * is within SKETCH_RELATIVE_ACCURACY of a recorded value. Adding a value is
+ * O(1) and a quantile query scans a fixed number of buckets, however many
+ * values were recorded. Sketches with the same bucketing merge by adding
+ * counts, which is how time windows are combined.
+ */
+export class LatencySketch {
+  count = 0;
+  sum = 0;
+  min = Infinity;
+  max = -Infinity;
+  /** Allocated on the first value */
+  private buckets: Uint32Array | null = null;
+
+  add(valueMs: number): void {
+    if (!Number.isFinite(valueMs)) return;
+    if (!this.buckets) this.buckets = new Uint32Array(SKETCH_BUCKETS);
+    this.buckets[bucketIndex(valueMs)]++;
+    this.count++;
+    this.sum += valueMs;
+    if (valueMs < this.min) this.min = valueMs;
+    if (valueMs > this.max) this.max = valueMs;
+  }
+
+  merge(other: LatencySketch): void {
+    if (!other.buckets || other.count === 0) return;
+    if (!this.buckets) this.buckets = new Uint32Array(SKETCH_BUCKETS);
+    for (let i = 0; i < SKETCH_BUCKETS; i++) {
+      this.buckets[i] += other.buckets[i];
+    }
+    this.count += other.count;
+    this.sum += other.sum;
+    this.min = Math.min(this.min, other.min);
+    this.max = Math.max(this.max, other.max);
+  }
+
+  /**
+   * Estimate the value at quantile q (0-1); 0 when empty
+   */
+  quantile(q: number): number {
+    if (!this.buckets || this.count === 0) return 0;
+    const rank = Math.min(this.count - 1, Math.floor(q * this.count));
+
+    let seen = 0;
+    for (let i = 0; i < SKETCH_BUCKETS; i++) {
+      seen += this.buckets[i];
+      if (seen > rank) {
+        return Math.min(this.max, Math.max(this.min, bucketValue(i)));
+      }
+    }
+    return this.max;
+  }
+
+  mean(): number {
+    return this.count > 0 ? this.sum / this.count : 0;
+  }
+
+  clear(): void {
+    this.buckets?.fill(0);
+    this.count = 0;
+    this.sum = 0;
+    this.min = Infinity;
+    this.max = -Infinity;
   }
-  if (params.entityId) {
-    traces = traces.filter(t => t.entityId === params.entityId);
+
+  toSnapshot(): LatencySketchSnapshot {
+    const buckets: Record<number, number> = {};
+    this.buckets?.forEach((count, i) => {
+      if (count > 0) buckets[i] = count;
+    });
+    return {
+      relativeAccuracy: SKETCH_RELATIVE_ACCURACY,
+      count: this.count,
+      sum: this.sum,
+      min: this.count > 0 ? this.min : 0,
+      max: this.count > 0 ? this.max : 0,
+      buckets,
+    };
   }
-  if (params.status) {
-    traces = traces.filter(t => t.status === params.status);
+
+  static fromSnapshot(snapshot: LatencySketchSnapshot): LatencySketch {
+    if (snapshot.relativeAccuracy !== SKETCH_RELATIVE_ACCURACY) {
+      throw new Error(`Unsupported sketch accuracy: ${snapshot.relativeAccuracy}`);
+    }
+    const sketch = new LatencySketch();
+    if (snapshot.count === 0) return sketch;
+
+    sketch.buckets = new Uint32Array(SKETCH_BUCKETS);
+    for (const [index, count] of Object.entries(snapshot.buckets)) {
+      sketch.buckets[Number(index)] = count;
+    }
+    sketch.count = snapshot.count;
+    sketch.sum = snapshot.sum;
+    sketch.min = snapshot.min;
+    sketch.max = snapshot.max;
+    return sketch;
   }
+}
 
-  return traces.slice(0, params.limit || 100);
+function bucketIndex(valueMs: number): number {
+  if (valueMs <= SKETCH_MIN_MS) return 0;
+  const index = Math.ceil(Math.log(valueMs / SKETCH_MIN_MS) / SKETCH_LOG_GAMMA);
+  return Math.min(SKETCH_BUCKETS - 1, index);
+}
+
+/**
+ * Representative value of a bucket, within the relative accuracy of both bounds
+ */
+function bucketValue(index: number): number {
+  if (index === 0) return SKETCH_MIN_MS;
+  return (SKETCH_MIN_MS * 2 * Math.pow(SKETCH_GAMMA, index)) / (SKETCH_GAMMA + 1);
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// EXECUTION METRICS
+// ═══════════════════════════════════════════════════════════════════════════
+
+/** Width of one time slice of the sliding latency window */
+const WINDOW_SLICE_MINUTES = 10;
+/** Slices kept per entity; latency windows cover at most 60 minutes */
+const WINDOW_SLICES = 6;
+const WINDOW_SLICE_MS = WINDOW_SLICE_MINUTES * 60 * 1000;
+export const LATENCY_WINDOW_MINUTES = WINDOW_SLICE_MINUTES * WINDOW_SLICES;
+
+/** Percentiles need at least this many samples */
+const MIN_LATENCY_SAMPLES = 10;
+
+interface WindowSlice {
+  /** Slice number: Math.floor(time / WINDOW_SLICE_MS) */
+  index: number;
+  latency: LatencySketch;
+}
+
+/**
+ * Running totals for one entity (or every entity)
+ */
+interface ExecutionMetrics {
+  total: number;
+  success: number;
+  error: number;
+  /** Every finished execution with a duration, since the session started */
+  latency: LatencySketch;
+  totalCost: number;
+  costCount: number;
+  /** Successful executions by time slice, used by latency budgets */
+  window: (WindowSlice | undefined)[];
+}
+
+const entityMetrics: Map<string, ExecutionMetrics> = new Map();
+const globalMetrics = createExecutionMetrics();
+
+function createExecutionMetrics(): ExecutionMetrics {
+  return {
+    total: 0,
+    success: 0,
+    error: 0,
+    latency: new LatencySketch(),
+    totalCost: 0,
+    costCount: 0,
+    window: new Array(WINDOW_SLICES),
+  };
+}
+
+function getEntityMetrics(entityId: string): ExecutionMetrics {
+  let metrics = entityMetrics.get(entityId);
+  if (!metrics) {
+    metrics = createExecutionMetrics();
+    entityMetrics.set(entityId, metrics);
+  }
+  return metrics;
+}
+
+/**
+ * Add a finished trace to its entity's and the global totals
+ */
+function recordExecutionMetrics(trace: ExecutionTrace): void {
+  for (const metrics of [getEntityMetrics(trace.entityId), globalMetrics]) {
+    metrics.total++;
+    if (trace.status === 'success') {
+      metrics.success++;
+    } else {
+      metrics.error++;
+    }
+    if (trace.durationMs !== undefined) metrics.latency.add(trace.durationMs);
+    if (trace.actualCost !== undefined) {
+      metrics.totalCost += trace.actualCost;
+      metrics.costCount++;
+    }
+  }
+}
+
+/**
+ * Record a successful execution's latency in the current time slice
+ */
+function recordWindowLatency(metrics: ExecutionMetrics, durationMs: number, at: number): void {
+  const index = Math.floor(at / WINDOW_SLICE_MS);
+  const position = index % WINDOW_SLICES;
+  let slice = metrics.window[position];
+
+  if (!slice) {
+    slice = { index, latency: new LatencySketch() };
+    metrics.window[position] = slice;
+  } else if (slice.index !== index) {
+    // Reuse the slot of a slice that has left the window
+    slice.index = index;
+    slice.latency.clear();
+  }
+  slice.latency.add(durationMs);
+}
+
+/**
+ * Merge the slices covering the last windowMinutes (rounded up to whole
+ * slices, at most LATENCY_WINDOW_MINUTES)
+ */
+function getWindowLatency(metrics: ExecutionMetrics, windowMinutes: number, at: number): LatencySketch {
+  const sliceCount = Math.min(WINDOW_SLICES, Math.max(1, Math.ceil(windowMinutes / WINDOW_SLICE_MINUTES)));
+  const current = Math.floor(at / WINDOW_SLICE_MS);
+  const merged = new LatencySketch();
+
+  for (const slice of metrics.window) {
+    if (slice && slice.index > current - sliceCount && slice.index <= current) {
+      merged.merge(slice.latency);
+    }
+  }
+  return merged;
 }
 
 // ═══════════════════════════════════════════════════════════════════════════
@@ -212,7 +551,6 @@ export function getRecentTraces(params: {
 // ═══════════════════════════════════════════════════════════════════════════
 
 const latencyBudgets: Map<string, LatencyBudget> = new Map();
-const latencyMetrics: Map<string, number[]> = new Map(); // entityId -> latencies
 
 /**
  * Create or update a latency budget
@@ -237,29 +575,31 @@ export function getAllLatencyBudgets(): LatencyBudget[] {
 
 /**
  * Check if trace meets latency budget
+ *
+ * Each budget is evaluated over its own windowMinutes (up to
+ * LATENCY_WINDOW_MINUTES) of this entity's successful executions.
  */
 function checkLatencyBudgets(trace: ExecutionTrace): void {
   if (!trace.durationMs) return;
 
-  // Get latencies for this entity
-  const entityId = trace.entityId;
-  const latencies = latencyMetrics.get(entityId) || [];
-  latencies.push(trace.durationMs);
+  const metrics = getEntityMetrics(trace.entityId);
+  const now = Date.now();
+  recordWindowLatency(metrics, trace.durationMs, now);
 
-  // Keep only recent samples (last 1000)
-  if (latencies.length > 1000) {
-    latencies.shift();
-  }
-  latencyMetrics.set(entityId, latencies);
+  // Budgets with the same window share one merged sketch
+  const windows = new Map<number, LatencySketch>();
 
-  // Check against budgets
   latencyBudgets.forEach(budget => {
-    if (latencies.length < 10) return; // Need minimum samples
+    let latency = windows.get(budget.windowMinutes);
+    if (!latency) {
+      latency = getWindowLatency(metrics, budget.windowMinutes, now);
+      windows.set(budget.windowMinutes, latency);
+    }
+    if (latency.count < MIN_LATENCY_SAMPLES) return; // Need minimum samples
 
-    const sorted = [...latencies].sort((a, b) => a - b);
-    const p50 = sorted[Math.floor(sorted.length * 0.5)];
-    const p95 = sorted[Math.floor(sorted.length * 0.95)];
-    const p99 = sorted[Math.floor(sorted.length * 0.99)];
+    const p50 = latency.quantile(0.5);
+    const p95 = latency.quantile(0.95);
+    const p99 = latency.quantile(0.99);
 
     budget.currentP50Ms = p50;
     budget.currentP95Ms = p95;
@@ -275,23 +615,31 @@ function checkLatencyBudgets(trace: ExecutionTrace): void {
 }
 
 /**
- * Calculate latency percentiles
+ * Calculate latency percentiles of an entity's successful executions
+ *
+ * @param entityId - Skill, workflow or step ID
+ * @param windowMinutes - How far back to look (default and maximum: LATENCY_WINDOW_MINUTES)
  */
-export function calculateLatencyPercentiles(entityId: string): {
+export function calculateLatencyPercentiles(
+  entityId: string,
+  windowMinutes = LATENCY_WINDOW_MINUTES
+): {
   p50: number;
   p95: number;
   p99: number;
   sampleCount: number;
 } | null {
-  const latencies = latencyMetrics.get(entityId);
-  if (!latencies || latencies.length < 10) return null;
+  const metrics = entityMetrics.get(entityId);
+  if (!metrics) return null;
+
+  const latency = getWindowLatency(metrics, windowMinutes, Date.now());
+  if (latency.count < MIN_LATENCY_SAMPLES) return null;
 
-  const sorted = [...latencies].sort((a, b) => a - b);
   return {
-    p50: sorted[Math.floor(sorted.length * 0.5)],
-    p95: sorted[Math.floor(sorted.length * 0.95)],
-    p99: sorted[Math.floor(sorted.length * 0.99)],
-    sampleCount: sorted.length,
+    p50: latency.quantile(0.5),
+    p95: latency.quantile(0.95),
+    p99: latency.quantile(0.99),
+    sampleCount: latency.count,
   };
 }
 
@@ -533,63 +881,87 @@ export interface MetricsSummary {
 }
 
 /**
- * Get metrics summary for an entity
+ * Point-in-time export of every metric, with the raw sketches so snapshots
+ * from several sessions can be merged with LatencySketch.fromSnapshot
  */
-export function getMetricsSummary(entityId: string): MetricsSummary | null {
-  const traces = completedTraces.filter(t => t.entityId === entityId);
-  if (traces.length === 0) return null;
-
-  const successTraces = traces.filter(t => t.status === 'success');
-  const latencies = traces
-    .filter(t => t.durationMs !== undefined)
-    .map(t => t.durationMs!)
-    .sort((a, b) => a - b);
-  const costs = traces
-    .filter(t => t.actualCost !== undefined)
-    .map(t => t.actualCost!);
+export interface MetricsSnapshot {
+  generatedAt: string;
+  windowMinutes: number;
+  global: MetricsSummary;
+  entities: Record<
+    string,
+    {
+      summary: MetricsSummary;
+      /** Successful executions in the last windowMinutes */
+      window: ReturnType<typeof calculateLatencyPercentiles>;
+      latency: LatencySketchSnapshot;
+    }
+  >;
+  latencyBudgets: LatencyBudget[];
+  errorBudgets: ErrorBudget[];
+}
 
+function summarize(metrics: ExecutionMetrics, emptySuccessRate: number): MetricsSummary {
   return {
-    totalExecutions: traces.length,
-    successCount: successTraces.length,
-    errorCount: traces.length - successTraces.length,
-    successRate: successTraces.length / traces.length,
-    avgLatencyMs: latencies.reduce((a, b) => a + b, 0) / latencies.length || 0,
-    p50LatencyMs: latencies[Math.floor(latencies.length * 0.5)] || 0,
-    p95LatencyMs: latencies[Math.floor(latencies.length * 0.95)] || 0,
-    p99LatencyMs: latencies[Math.floor(latencies.length * 0.99)] || 0,
-    totalCost: costs.reduce((a, b) => a + b, 0),
-    avgCost: costs.reduce((a, b) => a + b, 0) / costs.length || 0,
+    totalExecutions: metrics.total,
+    successCount: metrics.success,
+    errorCount: metrics.error,
+    successRate: metrics.total > 0 ? metrics.success / metrics.total : emptySuccessRate,
+    avgLatencyMs: metrics.latency.mean(),
+    p50LatencyMs: metrics.latency.quantile(0.5),
+    p95LatencyMs: metrics.latency.quantile(0.95),
+    p99LatencyMs: metrics.latency.quantile(0.99),
+    totalCost: metrics.totalCost,
+    avgCost: metrics.costCount > 0 ? metrics.totalCost / metrics.costCount : 0,
   };
 }
 
+/**
+ * Get metrics summary for an entity, over every execution this session
+ */
+export function getMetricsSummary(entityId: string): MetricsSummary | null {
+  const metrics = entityMetrics.get(entityId);
+  if (!metrics || metrics.total === 0) return null;
+  return summarize(metrics, 0);
+}
+
 /**
  * Get global metrics summary
  */
 export function getGlobalMetricsSummary(): MetricsSummary {
-  const traces = completedTraces;
-  const successTraces = traces.filter(t => t.status === 'success');
-  const latencies = traces
-    .filter(t => t.durationMs !== undefined)
-    .map(t => t.durationMs!)
-    .sort((a, b) => a - b);
-  const costs = traces
-    .filter(t => t.actualCost !== undefined)
-    .map(t => t.actualCost!);
+  return summarize(globalMetrics, 1);
+}
+
+/**
+ * Capture every summary, latency window and budget
+ */
+export function getMetricsSnapshot(): MetricsSnapshot {
+  const entities: MetricsSnapshot['entities'] = {};
+  entityMetrics.forEach((metrics, entityId) => {
+    entities[entityId] = {
+      summary: summarize(metrics, 0),
+      window: calculateLatencyPercentiles(entityId),
+      latency: metrics.latency.toSnapshot(),
+    };
+  });
 
   return {
-    totalExecutions: traces.length,
-    successCount: successTraces.length,
-    errorCount: traces.length - successTraces.length,
-    successRate: traces.length > 0 ? successTraces.length / traces.length : 1,
-    avgLatencyMs: latencies.length > 0 ? latencies.reduce((a, b) => a + b, 0) / latencies.length : 0,
-    p50LatencyMs: latencies[Math.floor(latencies.length * 0.5)] || 0,
-    p95LatencyMs: latencies[Math.floor(latencies.length * 0.95)] || 0,
-    p99LatencyMs: latencies[Math.floor(latencies.length * 0.99)] || 0,
-    totalCost: costs.reduce((a, b) => a + b, 0),
-    avgCost: costs.length > 0 ? costs.reduce((a, b) => a + b, 0) / costs.length : 0,
+    generatedAt: new Date().toISOString(),
+    windowMinutes: LATENCY_WINDOW_MINUTES,
+    global: getGlobalMetricsSummary(),
+    entities,
+    latencyBudgets: getAllLatencyBudgets(),
+    errorBudgets: getAllErrorBudgets(),
   };
 }
 
+/**
+ * Export a metrics snapshot to JSON
+ */
+export function exportMetricsSnapshot(): string {
+  return JSON.stringify(getMetricsSnapshot(), null, 2);
+}
+
 // ═══════════════════════════════════════════════════════════════════════════
 // DEFAULT CONFIGURATIONS
 // ═══════════════════════════════════════════════════════════════════════════
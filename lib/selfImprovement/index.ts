@@ -26,6 +26,7 @@ export {
   submitGrade,
   getSkillScores,
   getSkillPrompt,
+  getSkillPrompts,
   getSkillVersion,
   skillExistsInRegistry,
   registerSkill,
@@ -47,9 +48,21 @@ export {
   getPromptVersion,
   interpolateTemplate,
   createRegistryAwarePromptGenerator,
+  prefetchPrompts,
+  getPromptCacheStats,
   type ResolvedPrompt,
 } from './promptResolver';
 
+// Registry prompt cache (used by the resolver)
+export {
+  PromptCache,
+  promptCache,
+  type PromptCacheEntry,
+  type PromptCacheOptions,
+  type PromptCacheStats,
+  type PromptCacheStorage,
+} from './promptCache';
+
 /**
  * Quick-start guide (Supabase-backed):
  *
@@ -82,6 +95,8 @@ export {
  *    import { getEffectivePrompt } from './selfImprovement';
  *    const prompt = await getEffectivePrompt(skillId, fallbackPrompt);
  *    // Uses registry version if available, falls back to code-defined
+ *    // Lookups are cached; warm the cache for a workflow with
+ *    // prefetchPrompts(workflow.steps.map((s) => s.skillId))
  *
  * 4. CHECKING PENDING IMPROVEMENTS (Admin):
  *    import { getPendingImprovementRequests } from './selfImprovement';
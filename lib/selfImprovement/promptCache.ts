@@ -0,0 +1,313 @@
+/**
+ * Prompt Cache
+ *
+ * Caches skill prompts from the Supabase skill_registry so resolving a prompt
+ * does not cost a network round trip on every skill run or workflow step.
+ *
+ * - In-memory LRU of registry prompts (including "not in registry" results),
+ *   persisted to IndexedDB so a reload starts warm
+ * - Fresh entries (younger than ttlMs) are served without a request
+ * - Stale entries are served immediately while a background revalidation
+ *   runs (stale-while-revalidate); entries older than ttlMs + maxStaleMs
+ *   are fetched before returning
+ * - Revalidation first asks for the registry's current version only, and
+ *   downloads the prompt again only when the version changed
+ * - prefetch() loads many skills in one query, e.g. every step of a
+ *   workflow before it starts
+ */
+
+import {
+  getSkillPrompt,
+  getSkillPrompts,
+  getSkillVersion,
+  type SkillPrompt,
+} from './supabaseGrading';
+import { db } from '../storage/indexeddb';
+import { logger } from '../logger';
+
+// ═══════════════════════════════════════════════════════════════════════════
+// TYPES
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * A cached registry lookup; prompt is null when the skill is not registered
+ */
+export interface PromptCacheEntry {
+  skillId: string;
+  prompt: SkillPrompt | null;
+  /** When the entry was last confirmed against the registry (ms since epoch) */
+  fetchedAt: number;
+}
+
+export interface PromptCacheStats {
+  /** Fresh entries served from memory */
+  hits: number;
+  /** Stale entries served while revalidating */
+  staleHits: number;
+  /** Lookups that waited for the registry */
+  misses: number;
+  /** Background revalidations started */
+  revalidations: number;
+  /** Entries currently in memory */
+  size: number;
+}
+
+/**
+ * Where cache entries are persisted between sessions
+ */
+export interface PromptCacheStorage {
+  load(): Promise<PromptCacheEntry[]>;
+  save(entries: PromptCacheEntry[]): Promise<void>;
+  remove(skillIds: string[]): Promise<void>;
+}
+
+export interface PromptCacheOptions {
+  /** Maximum entries kept in memory (default: 500) */
+  maxEntries?: number;
+  /** How long an entry is served without checking the registry (default: 5 minutes) */
+  ttlMs?: number;
+  /** How long past ttlMs a stale entry may still be served while revalidating (default: 24 hours) */
+  maxStaleMs?: number;
+  /** Registry lookups, defaulting to the Supabase queries in supabaseGrading */
+  fetchPrompt?: (skillId: string) => Promise<SkillPrompt | null>;
+  fetchPrompts?: (skillIds?: string[]) => Promise<Map<string, SkillPrompt> | null>;
+  fetchVersion?: (skillId: string) => Promise<number>;
+  /** Persistence (default: IndexedDB when available); null keeps the cache in memory only */
+  storage?: PromptCacheStorage | null;
+  /** Clock, for tests */
+  now?: () => number;
+}
+
+const DEFAULT_MAX_ENTRIES = 500;
+const DEFAULT_TTL_MS = 5 * 60 * 1000;
+const DEFAULT_MAX_STALE_MS = 24 * 60 * 60 * 1000;
+
+/**
+ * Persist entries in the promptCache store of SkillEngineDB
+ */
+export const indexedDBPromptCacheStorage: PromptCacheStorage = {
+  load: () => db.getPromptCacheEntries(),
+  save: (entries) => db.savePromptCacheEntries(entries),
+  remove: (skillIds) => db.deletePromptCacheEntries(skillIds),
+};
+
+// ═══════════════════════════════════════════════════════════════════════════
+// CACHE
+// ═══════════════════════════════════════════════════════════════════════════
+
+export class PromptCache {
+  /** Map iteration order is the LRU order: least recently used first */
+  private entries = new Map<string, PromptCacheEntry>();
+  private inflight = new Map<string, Promise<SkillPrompt | null>>();
+  private hydrated: Promise<void> | null = null;
+  private stats = { hits: 0, staleHits: 0, misses: 0, revalidations: 0 };
+
+  private readonly maxEntries: number;
+  private readonly ttlMs: number;
+  private readonly maxStaleMs: number;
+  private readonly fetchPrompt: (skillId: string) => Promise<SkillPrompt | null>;
+  private readonly fetchPrompts: (skillIds?: string[]) => Promise<Map<string, SkillPrompt> | null>;
+  private readonly fetchVersion: (skillId: string) => Promise<number>;
+  private readonly storage: PromptCacheStorage | null;
+  private readonly now: () => number;
+
+  constructor(options: PromptCacheOptions = {}) {
+    this.maxEntries = Math.max(1, options.maxEntries ?? DEFAULT_MAX_ENTRIES);
+    this.ttlMs = options.ttlMs ?? DEFAULT_TTL_MS;
+    this.maxStaleMs = options.maxStaleMs ?? DEFAULT_MAX_STALE_MS;
+    this.fetchPrompt = options.fetchPrompt ?? getSkillPrompt;
+    this.fetchPrompts = options.fetchPrompts ?? getSkillPrompts;
+    this.fetchVersion = options.fetchVersion ?? getSkillVersion;
+    this.storage =
+      options.storage !== undefined
+        ? options.storage
+        : typeof indexedDB !== 'undefined'
+          ? indexedDBPromptCacheStorage
+          : null;
+    this.now = options.now ?? Date.now;
+  }
+
+  /**
+   * Get a skill's registry prompt, or null if the skill is not registered
+   */
+  async get(skillId: string): Promise<SkillPrompt | null> {
+    await this.hydrate();
+    const entry = this.entries.get(skillId);
+
+    if (entry) {
+      // Mark as most recently used
+      this.entries.delete(skillId);
+      this.entries.set(skillId, entry);
+
+      const age = this.now() - entry.fetchedAt;
+      if (age <= this.ttlMs) {
+        this.stats.hits++;
+        return entry.prompt;
+      }
+      if (age <= this.ttlMs + this.maxStaleMs) {
+        this.stats.staleHits++;
+        if (!this.inflight.has(skillId)) {
+          this.stats.revalidations++;
+          void this.refresh(skillId, entry).catch(() => undefined);
+        }
+        return entry.prompt;
+      }
+    }
+
+    this.stats.misses++;
+    return this.refresh(skillId, entry);
+  }
+
+  /**
+   * Load many skills with one registry query
+   *
+   * @param skillIds - Skills to load; omit to load every registered skill
+   * @returns Number of registry prompts loaded
+   */
+  async prefetch(skillIds?: string[]): Promise<number> {
+    await this.hydrate();
+    const ids = skillIds ? [...new Set(skillIds)] : undefined;
+    if (ids && ids.length === 0) return 0;
+
+    const prompts = await this.fetchPrompts(ids);
+    if (!prompts) return 0;
+
+    const fetchedAt = this.now();
+    const loaded: PromptCacheEntry[] = [...prompts].map(([skillId, prompt]) => ({ skillId, prompt, fetchedAt }));
+    // Requested skills the registry does not have
+    for (const skillId of ids ?? []) {
+      if (!prompts.has(skillId)) loaded.push({ skillId, prompt: null, fetchedAt });
+    }
+    this.store(loaded);
+    return prompts.size;
+  }
+
+  /**
+   * Drop one skill, or every skill, from the cache
+   */
+  async invalidate(skillId?: string): Promise<void> {
+    await this.hydrate();
+    const removed = skillId ? [skillId] : [...this.entries.keys()];
+    removed.forEach((id) => this.entries.delete(id));
+    await this.persist(() => this.storage!.remove(removed));
+  }
+
+  getStats(): PromptCacheStats {
+    return { ...this.stats, size: this.entries.size };
+  }
+
+  resetStats(): void {
+    this.stats = { hits: 0, staleHits: 0, misses: 0, revalidations: 0 };
+  }
+
+  // ─────────────────────────────────────────────────────────────────────────
+  // Internals
+  // ─────────────────────────────────────────────────────────────────────────
+
+  /**
+   * Load persisted entries once; entries set in the meantime win
+   */
+  private hydrate(): Promise<void> {
+    if (!this.hydrated) {
+      this.hydrated = (async () => {
+        if (!this.storage) return;
+        try {
+          const persisted = await this.storage.load();
+          persisted
+            .sort((a, b) => a.fetchedAt - b.fetchedAt)
+            .slice(-this.maxEntries)
+            .forEach((entry) => {
+              if (!this.entries.has(entry.skillId)) this.entries.set(entry.skillId, entry);
+            });
+          this.evict();
+        } catch (err) {
+          logger.warn('Failed to load prompt cache', { error: err instanceof Error ? err.message : String(err) });
+        }
+      })();
+    }
+    return this.hydrated;
+  }
+
+  /**
+   * Confirm or reload an entry from the registry; concurrent calls share one request
+   */
+  private refresh(skillId: string, entry?: PromptCacheEntry): Promise<SkillPrompt | null> {
+    const pending = this.inflight.get(skillId);
+    if (pending) return pending;
+
+    const request = (async () => {
+      try {
+        if (entry?.prompt) {
+          // Cheap version check before downloading the prompt again
+          let version: number;
+          try {
+            version = await this.fetchVersion(skillId);
+          } catch (err) {
+            logger.warn(`Failed to check prompt version for ${skillId}`, {
+              error: err instanceof Error ? err.message : String(err),
+            });
+            return entry.prompt;
+          }
+          if (version === entry.prompt.version) {
+            this.store([{ ...entry, fetchedAt: this.now() }]);
+            return entry.prompt;
+          }
+        }
+
+        const prompt = await this.fetchPrompt(skillId);
+        if (!prompt && entry?.prompt) {
+          // getSkillPrompt also returns null when the query fails; keep serving
+          // the known prompt and try again on the next lookup
+          return entry.prompt;
+        }
+        this.store([{ skillId, prompt, fetchedAt: this.now() }]);
+        return prompt;
+      } finally {
+        this.inflight.delete(skillId);
+      }
+    })();
+
+    this.inflight.set(skillId, request);
+    return request;
+  }
+
+  private store(entries: PromptCacheEntry[]): void {
+    for (const entry of entries) {
+      this.entries.delete(entry.skillId);
+      this.entries.set(entry.skillId, entry);
+    }
+    const evicted = this.evict();
+    void this.persist(async () => {
+      await this.storage!.save(entries.filter((entry) => this.entries.has(entry.skillId)));
+      if (evicted.length > 0) await this.storage!.remove(evicted);
+    });
+  }
+
+  /**
+   * Drop least recently used entries over the limit
+   * @returns The evicted skill IDs
+   */
+  private evict(): string[] {
+    const evicted: string[] = [];
+    for (const skillId of this.entries.keys()) {
+      if (this.entries.size <= this.maxEntries) break;
+      this.entries.delete(skillId);
+      evicted.push(skillId);
+    }
+    return evicted;
+  }
+
+  private async persist(write: () => Promise<void>): Promise<void> {
+    if (!this.storage) return;
+    try {
+      await write();
+    } catch (err) {
+      logger.warn('Failed to persist prompt cache', { error: err instanceof Error ? err.message : String(err) });
+    }
+  }
+}
+
+/**
+ * Shared cache used by the prompt resolver
+ */
+export const promptCache = new PromptCache();
@@ -6,9 +6,12 @@
  *
  * This enables the self-improvement system: when prompts are improved via AI,
  * the improved versions are stored in the registry and served to users.
+ *
+ * Registry lookups go through the shared prompt cache (promptCache.ts), so
+ * repeated resolutions of the same skill do not each query Supabase.
  */
 
-import { getSkillPrompt, skillExistsInRegistry } from './supabaseGrading';
+import { promptCache, type PromptCacheStats } from './promptCache';
 import { logger } from '../logger';
 
 export interface ResolvedPrompt {
@@ -35,7 +38,7 @@ export async function getEffectivePrompt(
 ): Promise<ResolvedPrompt> {
   try {
     // Try to get improved prompt from Supabase registry
-    const registryPrompt = await getSkillPrompt(skillId);
+    const registryPrompt = await promptCache.get(skillId);
 
     if (registryPrompt) {
       return {
@@ -65,7 +68,7 @@ export async function getEffectivePrompt(
  */
 export async function hasImprovedPrompt(skillId: string): Promise<boolean> {
   try {
-    const prompt = await getSkillPrompt(skillId);
+    const prompt = await promptCache.get(skillId);
     return prompt !== null && prompt.version > 1;
   } catch {
     return false;
@@ -77,13 +80,34 @@ export async function hasImprovedPrompt(skillId: string): Promise<boolean> {
  */
 export async function getPromptVersion(skillId: string): Promise<number> {
   try {
-    const prompt = await getSkillPrompt(skillId);
+    const prompt = await promptCache.get(skillId);
     return prompt?.version ?? 1;
   } catch {
     return 1;
   }
 }
 
+/**
+ * Load registry prompts for many skills with one query, e.g. all steps of a
+ * workflow before it starts, so each step resolves its prompt from the cache
+ *
+ * @param skillIds - Skills to load; omit to load every registered skill
+ */
+export async function prefetchPrompts(skillIds?: string[]): Promise<void> {
+  try {
+    await promptCache.prefetch(skillIds);
+  } catch (err) {
+    logger.warn('Failed to prefetch prompts from registry', { error: err instanceof Error ? err.message : String(err) });
+  }
+}
+
+/**
+ * Hit/miss counters of the prompt cache
+ */
+export function getPromptCacheStats(): PromptCacheStats {
+  return promptCache.getStats();
+}
+
 /**
  * Interpolate a template with values
  * Replaces {{key}} placeholders with corresponding values
@@ -303,6 +303,43 @@ export async function getSkillPrompt(skillId: string): Promise<SkillPrompt | nul
   }
 }
 
+/**
+ * Get the current prompts for many skills in one registry query
+ * Skills missing from the registry are left out of the map.
+ *
+ * @param skillIds - Skills to fetch; omit to fetch every registered skill
+ * @returns Prompts keyed by skill ID, or null if the query failed
+ */
+export async function getSkillPrompts(skillIds?: string[]): Promise<Map<string, SkillPrompt> | null> {
+  try {
+    let query = supabase
+      .from('skill_registry')
+      .select('id, current_system_instruction, current_user_prompt_template, current_version');
+    if (skillIds) {
+      query = query.in('id', skillIds);
+    }
+    const { data, error } = await query;
+
+    if (error || !data) {
+      return null;
+    }
+
+    return new Map(
+      data.map((row): [string, SkillPrompt] => [
+        row.id,
+        {
+          systemInstruction: row.current_system_instruction,
+          userPromptTemplate: row.current_user_prompt_template,
+          version: row.current_version,
+        },
+      ])
+    );
+  } catch (err) {
+    logger.error('Failed to get skill prompts', { error: err instanceof Error ? err.message : String(err) });
+    return null;
+  }
+}
+
 /**
  * Get the current version number for a skill
  * Falls back to 1 if skill is not in registry
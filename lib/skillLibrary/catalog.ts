@@ -0,0 +1,186 @@
+/**
+ * Lazy Skill Catalog
+ *
+ * Serves the skill library from the prebuilt files emitted by
+ * scripts/buildSkillLibraryIndex.ts:
+ * - generated/role-list.json    role names and icons (bundled, a few KB)
+ * - generated/index.json        compact metadata for every skill
+ * - generated/roles/<id>.json   full skill definitions, one chunk per role
+ *
+ * Vite turns the index and every role file into their own lazily loaded
+ * chunks, so importing this module only costs the role list; skill metadata
+ * is fetched on first use and prompt bodies only when a skill is opened.
+ * When the generated files are missing (fresh checkout, unit tests) every
+ * call falls back to the eager catalog in ./index via a dynamic import.
+ */
+
+import type {
+  CatalogIndexEntry,
+  CatalogRoleList,
+  LibrarySkill,
+  LibrarySkillSummary,
+  RoleDefinition,
+  SkillCatalogIndex,
+} from './types';
+
+// ═══════════════════════════════════════════════════════════════════════════
+// PREBUILT INDEX
+// ═══════════════════════════════════════════════════════════════════════════
+
+/** Bump together with SKILL_CATALOG_INDEX_VERSION in ./index */
+const EXPECTED_INDEX_VERSION = 1;
+
+const ROLE_LIST_PATH = './generated/role-list.json';
+const INDEX_PATH = './generated/index.json';
+const CHUNK_PATH_PREFIX = './generated/roles/';
+
+const roleListModules = import.meta.glob<CatalogRoleList>('./generated/role-list.json', {
+  eager: true,
+  import: 'default',
+});
+
+const indexLoaders = import.meta.glob<SkillCatalogIndex>('./generated/index.json', {
+  import: 'default',
+});
+
+const chunkLoaders = import.meta.glob<LibrarySkill[]>('./generated/roles/*.json', {
+  import: 'default',
+});
+
+const prebuiltRoles: RoleDefinition[] | null =
+  roleListModules[ROLE_LIST_PATH]?.version === EXPECTED_INDEX_VERSION
+    ? roleListModules[ROLE_LIST_PATH].roles
+    : null;
+
+let _prebuiltIndex: Promise<SkillCatalogIndex | null> | null = null;
+let _entriesById: Map<string, CatalogIndexEntry> | null = null;
+const _chunkCache = new Map<string, Promise<LibrarySkill[]>>();
+
+/**
+ * Load the prebuilt index once; null when it is missing or out of date
+ */
+function loadPrebuiltIndex(): Promise<SkillCatalogIndex | null> {
+  if (!_prebuiltIndex) {
+    const loader = indexLoaders[INDEX_PATH];
+    _prebuiltIndex = loader
+      ? loader().then((index) => (index.version === EXPECTED_INDEX_VERSION ? index : null))
+      : Promise.resolve(null);
+    // Allow a retry after a failed network fetch
+    _prebuiltIndex.catch(() => {
+      _prebuiltIndex = null;
+    });
+  }
+  return _prebuiltIndex;
+}
+
+function getEntriesById(index: SkillCatalogIndex): Map<string, CatalogIndexEntry> {
+  if (!_entriesById) {
+    _entriesById = new Map(index.skills.map((entry) => [entry.id, entry]));
+  }
+  return _entriesById;
+}
+
+function loadEagerCatalog() {
+  return import('./index');
+}
+
+/**
+ * Whether the prebuilt role list, index and role chunks are available
+ */
+export function hasPrebuiltCatalog(): boolean {
+  return prebuiltRoles !== null && INDEX_PATH in indexLoaders;
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// METADATA
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Get metadata for every skill, without prompt bodies
+ */
+export async function getSkillIndex(): Promise<LibrarySkillSummary[]> {
+  const index = await loadPrebuiltIndex();
+  if (index) {
+    return index.skills;
+  }
+
+  const { getAllLibrarySkills, toLibrarySkillSummary } = await loadEagerCatalog();
+  return getAllLibrarySkills().map(toLibrarySkillSummary);
+}
+
+/**
+ * Get the role list for filter sidebars and role names
+ *
+ * Answered from the bundled role list without fetching the skill index.
+ */
+export async function getCatalogRoles(): Promise<RoleDefinition[]> {
+  if (prebuiltRoles) {
+    return prebuiltRoles;
+  }
+
+  const { ROLE_DEFINITIONS } = await loadEagerCatalog();
+  return ROLE_DEFINITIONS;
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// FULL DEFINITIONS (ON DEMAND)
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Load every full skill definition in a catalog chunk
+ */
+export function loadSkillChunk(chunk: string): Promise<LibrarySkill[]> {
+  let pending = _chunkCache.get(chunk);
+  if (!pending) {
+    const loader = chunkLoaders[`${CHUNK_PATH_PREFIX}${chunk}.json`];
+    pending = loader ? loader() : Promise.resolve([]);
+    // Allow a retry after a failed network fetch
+    pending.catch(() => _chunkCache.delete(chunk));
+    _chunkCache.set(chunk, pending);
+  }
+  return pending;
+}
+
+/**
+ * Load a single skill with its inputs and prompts
+ */
+export async function loadLibrarySkill(id: string): Promise<LibrarySkill | undefined> {
+  const index = await loadPrebuiltIndex();
+  if (!index) {
+    const { getLibrarySkill } = await loadEagerCatalog();
+    return getLibrarySkill(id);
+  }
+
+  const entry = getEntriesById(index).get(id);
+  if (!entry) return undefined;
+
+  const skills = await loadSkillChunk(entry.chunk);
+  return skills.find((s) => s.id === id);
+}
+
+/**
+ * Load the full definitions of all skills available to a role
+ * (the role's own skills plus universal ones)
+ */
+export async function loadSkillsByRole(roleId: string): Promise<LibrarySkill[]> {
+  const index = await loadPrebuiltIndex();
+  if (!index) {
+    const { getSkillsByRole } = await loadEagerCatalog();
+    return getSkillsByRole(roleId);
+  }
+
+  const entries = index.skills.filter(
+    (entry) => entry.tags.roles.length === 0 || entry.tags.roles.includes(roleId)
+  );
+  const chunks = [...new Set(entries.map((entry) => entry.chunk))];
+  const loaded = await Promise.all(chunks.map(loadSkillChunk));
+
+  const byId = new Map<string, LibrarySkill>();
+  for (const skill of loaded.flat()) {
+    byId.set(skill.id, skill);
+  }
+
+  return entries
+    .map((entry) => byId.get(entry.id))
+    .filter((s): s is LibrarySkill => s !== undefined);
+}
@@ -0,0 +1,81 @@
+/**
+ * Curated Skill Collections
+ *
+ * Kept apart from ./index so pages can list collections without pulling
+ * in the full skill catalog.
+ */
+
+import type { SkillCollection } from './types';
+
+export const SKILL_COLLECTIONS: SkillCollection[] = [
+  {
+    id: 'job-search-starter',
+    name: 'Job Search Starter Kit',
+    description: 'Essential skills to kickstart your job search',
+    icon: 'Briefcase',
+    color: 'text-blue-500',
+    skillIds: [
+      'job-readiness-score',
+      'resume-customizer',
+      'cover-letter-generator',
+      'ats-optimization-checker',
+    ],
+    priority: 1,
+    featured: true,
+  },
+  {
+    id: 'interview-prep',
+    name: 'Interview Preparation',
+    description: 'Get ready to ace your interviews',
+    icon: 'Users',
+    color: 'text-violet-500',
+    skillIds: [
+      'company-research',
+      'interview-prep',
+      'day-in-the-life-generator',
+      'thank-you-note-generator',
+    ],
+    priority: 2,
+    featured: true,
+  },
+  {
+    id: 'career-growth',
+    name: 'Career Growth',
+    description: 'Tools for long-term career development',
+    icon: 'TrendingUp',
+    color: 'text-emerald-500',
+    skillIds: [
+      'skills-gap-analyzer',
+      'linkedin-optimizer-pro',
+      'role-ai-automation-analyzer',
+      'networking-script-generator',
+    ],
+    priority: 3,
+    featured: true,
+  },
+  {
+    id: 'negotiation-offers',
+    name: 'Negotiation & Offers',
+    description: 'Maximize your compensation package',
+    icon: 'DollarSign',
+    color: 'text-yellow-500',
+    skillIds: [
+      'offer-evaluation-pro',
+      'salary-negotiation-master',
+    ],
+    priority: 4,
+    featured: false,
+  },
+  {
+    id: 'first-90-days',
+    name: 'First 90 Days',
+    description: 'Hit the ground running in your new role',
+    icon: 'Rocket',
+    color: 'text-orange-500',
+    skillIds: [
+      'onboarding-accelerator-pro',
+    ],
+    priority: 5,
+    featured: false,
+  },
+];
@@ -11,18 +11,23 @@
 
 import type {
   LibrarySkill,
-  SkillCollection,
+  LibrarySkillSummary,
   RoleDefinition,
   LibraryFilters,
-  LibrarySortOption,
   SkillCategory,
   SkillUseCase,
   SkillLevel,
 } from './types';
-import { ROLE_TEMPLATES } from '../roleTemplates';
+import { SkillSearchIndex, sortSkills } from './search';
+import { SKILL_COLLECTIONS } from './collections';
+import { ROLE_TEMPLATES, getRoleTemplate } from '../roleTemplates';
 import type { DynamicFormInput } from '../storage/types';
 import { ALL_PROFESSIONAL_SKILLS } from '../skills/professional';
 
+// Collections and sorting also work on index summaries, so they live in
+// modules that don't pull in the catalog
+export { SKILL_COLLECTIONS, sortSkills };
+
 // ═══════════════════════════════════════════════════════════════════════════
 // STATIC SKILL MAPPINGS
 // Map builtin skill IDs to their tags
@@ -242,22 +247,32 @@ function determineUseCases(name: string, description: string): SkillUseCase[] {
   return useCases;
 }
 
+// Converted skills per role template, filled on demand
+const _roleSkillCache = new Map<string, LibrarySkill[]>();
+
 /**
- * Extract all dynamic skills from all role templates
+ * Get the converted dynamic skills of a single role template.
+ * Only that role's templates are converted; results are cached per role.
  */
-function extractAllDynamicSkills(): LibrarySkill[] {
-  const skills: LibrarySkill[] = [];
-
-  for (const role of ROLE_TEMPLATES) {
-    for (let i = 0; i < role.dynamicSkills.length; i++) {
-      const skill = convertDynamicSkill(role.dynamicSkills[i], role.id, role.name, i);
-      skills.push(skill);
-    }
+export function getRoleTemplateSkills(roleId: string): LibrarySkill[] {
+  let skills = _roleSkillCache.get(roleId);
+  if (!skills) {
+    const role = getRoleTemplate(roleId);
+    skills = role
+      ? role.dynamicSkills.map((skill, i) => convertDynamicSkill(skill, role.id, role.name, i))
+      : [];
+    _roleSkillCache.set(roleId, skills);
   }
-
   return skills;
 }
 
+/**
+ * Extract all dynamic skills from all role templates
+ */
+function extractAllDynamicSkills(): LibrarySkill[] {
+  return ROLE_TEMPLATES.flatMap((role) => getRoleTemplateSkills(role.id));
+}
+
 // ═══════════════════════════════════════════════════════════════════════════
 // BUILTIN SKILLS CONVERSION
 // ═══════════════════════════════════════════════════════════════════════════
@@ -529,88 +544,28 @@ function createBuiltinSkillEntries(): LibrarySkill[] {
   return builtinSkills;
 }
 
-// ═══════════════════════════════════════════════════════════════════════════
-// CURATED COLLECTIONS
-// ═══════════════════════════════════════════════════════════════════════════
-
-export const SKILL_COLLECTIONS: SkillCollection[] = [
-  {
-    id: 'job-search-starter',
-    name: 'Job Search Starter Kit',
-    description: 'Essential skills to kickstart your job search',
-    icon: 'Briefcase',
-    color: 'text-blue-500',
-    skillIds: [
-      'job-readiness-score',
-      'resume-customizer',
-      'cover-letter-generator',
-      'ats-optimization-checker',
-    ],
-    priority: 1,
-    featured: true,
-  },
-  {
-    id: 'interview-prep',
-    name: 'Interview Preparation',
-    description: 'Get ready to ace your interviews',
-    icon: 'Users',
-    color: 'text-violet-500',
-    skillIds: [
-      'company-research',
-      'interview-prep',
-      'day-in-the-life-generator',
-      'thank-you-note-generator',
-    ],
-    priority: 2,
-    featured: true,
-  },
-  {
-    id: 'career-growth',
-    name: 'Career Growth',
-    description: 'Tools for long-term career development',
-    icon: 'TrendingUp',
-    color: 'text-emerald-500',
-    skillIds: [
-      'skills-gap-analyzer',
-      'linkedin-optimizer-pro',
-      'role-ai-automation-analyzer',
-      'networking-script-generator',
-    ],
-    priority: 3,
-    featured: true,
-  },
-  {
-    id: 'negotiation-offers',
-    name: 'Negotiation & Offers',
-    description: 'Maximize your compensation package',
-    icon: 'DollarSign',
-    color: 'text-yellow-500',
-    skillIds: [
-      'offer-evaluation-pro',
-      'salary-negotiation-master',
-    ],
-    priority: 4,
-    featured: false,
-  },
-  {
-    id: 'first-90-days',
-    name: 'First 90 Days',
-    description: 'Hit the ground running in your new role',
-    icon: 'Rocket',
-    color: 'text-orange-500',
-    skillIds: [
-      'onboarding-accelerator-pro',
-    ],
-    priority: 5,
-    featured: false,
-  },
-];
-
 // ═══════════════════════════════════════════════════════════════════════════
 // SKILL LIBRARY SINGLETON
 // ═══════════════════════════════════════════════════════════════════════════
 
 let _allSkills: LibrarySkill[] | null = null;
+let _searchIndex: SkillSearchIndex | null = null;
+let _builtinSkills: LibrarySkill[] | null = null;
+let _professionalSkills: LibrarySkill[] | null = null;
+
+function getBuiltinSkills(): LibrarySkill[] {
+  if (!_builtinSkills) {
+    _builtinSkills = createBuiltinSkillEntries();
+  }
+  return _builtinSkills;
+}
+
+function getProfessionalSkills(): LibrarySkill[] {
+  if (!_professionalSkills) {
+    _professionalSkills = extractProfessionalSkills();
+  }
+  return _professionalSkills;
+}
 
 /**
  * Convert professional skills to LibrarySkill format
@@ -689,31 +644,65 @@ function extractProfessionalSkills(): LibrarySkill[] {
  */
 export function getAllLibrarySkills(): LibrarySkill[] {
   if (!_allSkills) {
-    const builtinSkills = createBuiltinSkillEntries();
+    const builtinSkills = getBuiltinSkills();
     const templateSkills = extractAllDynamicSkills();
-    const professionalSkills = extractProfessionalSkills();
+    const professionalSkills = getProfessionalSkills();
     _allSkills = [...builtinSkills, ...templateSkills, ...professionalSkills];
+    _searchIndex = null;
   }
   return _allSkills;
 }
 
+/**
+ * Get the search index over all library skills (built on first use)
+ */
+export function getLibrarySearchIndex(): SkillSearchIndex {
+  if (!_searchIndex) {
+    _searchIndex = new SkillSearchIndex(getAllLibrarySkills());
+  }
+  return _searchIndex;
+}
+
 /**
  * Get a single skill by ID
+ *
+ * Until the full catalog has been built, only the role template whose ID
+ * prefixes the skill ID is converted.
  */
 export function getLibrarySkill(id: string): LibrarySkill | undefined {
-  return getAllLibrarySkills().find((s) => s.id === id);
+  if (_searchIndex) {
+    return _searchIndex.get(id);
+  }
+
+  const builtin = getBuiltinSkills().find((s) => s.id === id);
+  if (builtin) return builtin;
+
+  for (const role of ROLE_TEMPLATES) {
+    if (id.startsWith(`${role.id}-`)) {
+      const match = getRoleTemplateSkills(role.id).find((s) => s.id === id);
+      if (match) return match;
+    }
+  }
+
+  return getProfessionalSkills().find((s) => s.id === id);
 }
 
 /**
  * Get skills for a specific role
+ *
+ * Role template skills are only tagged with their own role, so just that
+ * template is converted.
  */
 export function getSkillsByRole(roleId: string): LibrarySkill[] {
-  const allSkills = getAllLibrarySkills();
-  return allSkills.filter(
-    (skill) =>
-      skill.tags.roles.length === 0 || // Universal skills
-      skill.tags.roles.includes(roleId)
-  );
+  const matchesRole = (skill: LibrarySkill) =>
+    skill.tags.roles.length === 0 || // Universal skills
+    skill.tags.roles.includes(roleId);
+
+  return [
+    ...getBuiltinSkills().filter(matchesRole),
+    ...getRoleTemplateSkills(roleId),
+    ...getProfessionalSkills().filter(matchesRole),
+  ];
 }
 
 /**
@@ -723,9 +712,9 @@ export function getCollectionSkills(collectionId: string): LibrarySkill[] {
   const collection = SKILL_COLLECTIONS.find((c) => c.id === collectionId);
   if (!collection) return [];
 
-  const allSkills = getAllLibrarySkills();
+  const index = getLibrarySearchIndex();
   return collection.skillIds
-    .map((id) => allSkills.find((s) => s.id === id))
+    .map((id) => index.get(id))
     .filter((s): s is LibrarySkill => s !== undefined);
 }
 
@@ -733,111 +722,102 @@ export function getCollectionSkills(collectionId: string): LibrarySkill[] {
 // FILTERING & SORTING
 // ═══════════════════════════════════════════════════════════════════════════
 
+// Lowercased search fields per skill, so repeated searches don't lowercase again
+const _searchTextCache = new WeakMap<LibrarySkill, string[]>();
+
+function getSearchText(skill: LibrarySkill): string[] {
+  let fields = _searchTextCache.get(skill);
+  if (!fields) {
+    fields = [
+      skill.name.toLowerCase(),
+      skill.description.toLowerCase(),
+      skill.longDescription?.toLowerCase() ?? '',
+    ];
+    _searchTextCache.set(skill, fields);
+  }
+  return fields;
+}
+
 /**
  * Filter skills by multiple criteria
+ *
+ * The full library list is answered from the prebuilt search index; any other
+ * list (e.g. community skills) falls back to a single linear pass.
  */
 export function filterSkills(
   skills: LibrarySkill[],
   filters: LibraryFilters
 ): LibrarySkill[] {
+  if (_allSkills && skills === _allSkills) {
+    return getLibrarySearchIndex().filter(filters);
+  }
+
+  const skillIds = filters.skillIds?.length ? new Set(filters.skillIds) : null;
+  const searchLower = filters.search ? filters.search.toLowerCase() : '';
+  const categories = new Set<string>(filters.categories);
+  const roles = filters.roles;
+  const useCases = filters.useCases;
+  const levels = new Set<string>(filters.levels);
+  const sources = new Set<string>(filters.sources);
+
   return skills.filter((skill) => {
     // Skill IDs filter (for collections) - takes precedence
-    if (filters.skillIds && filters.skillIds.length > 0) {
-      if (!filters.skillIds.includes(skill.id)) return false;
-    }
+    if (skillIds && !skillIds.has(skill.id)) return false;
 
     // Search filter
-    if (filters.search) {
-      const searchLower = filters.search.toLowerCase();
-      const matchesSearch =
-        skill.name.toLowerCase().includes(searchLower) ||
-        skill.description.toLowerCase().includes(searchLower) ||
-        (skill.longDescription?.toLowerCase().includes(searchLower) ?? false);
+    if (searchLower) {
+      const matchesSearch = getSearchText(skill).some((field) => field.includes(searchLower));
       if (!matchesSearch) return false;
     }
 
     // Category filter
-    if (filters.categories.length > 0) {
-      if (!filters.categories.includes(skill.tags.category)) return false;
-    }
+    if (categories.size > 0 && !categories.has(skill.tags.category)) return false;
 
     // Role filter
-    if (filters.roles.length > 0) {
+    if (roles.length > 0) {
       // Skill matches if it's universal (no roles) or has any matching role
       const isUniversal = skill.tags.roles.length === 0;
-      const hasMatchingRole = filters.roles.some((r) => skill.tags.roles.includes(r));
+      const hasMatchingRole = skill.tags.roles.some((r) => roles.includes(r));
       if (!isUniversal && !hasMatchingRole) return false;
     }
 
     // Use case filter
-    if (filters.useCases.length > 0) {
-      const hasMatchingUseCase = filters.useCases.some((uc) =>
-        skill.tags.useCases.includes(uc)
-      );
+    if (useCases.length > 0) {
+      const hasMatchingUseCase = skill.tags.useCases.some((uc) => useCases.includes(uc));
       if (!hasMatchingUseCase) return false;
     }
 
     // Level filter
-    if (filters.levels.length > 0) {
-      if (!filters.levels.includes(skill.tags.level)) return false;
-    }
+    if (levels.size > 0 && !levels.has(skill.tags.level)) return false;
 
     // Source filter
-    if (filters.sources.length > 0) {
-      if (!filters.sources.includes(skill.source)) return false;
-    }
+    if (sources.size > 0 && !sources.has(skill.source)) return false;
 
     return true;
   });
 }
 
 /**
- * Sort skills by various criteria
+ * Relevance-ranked search over the full library
+ *
+ * Unlike filterSkills' substring match, the query is tokenized and each token
+ * must match the start of a word; name matches rank above description matches.
  */
-export function sortSkills(
-  skills: LibrarySkill[],
-  sortBy: LibrarySortOption
-): LibrarySkill[] {
-  const sorted = [...skills];
-
-  switch (sortBy) {
-    case 'popular':
-      sorted.sort((a, b) => b.useCount - a.useCount);
-      break;
-    case 'rating':
-      sorted.sort((a, b) => {
-        const ratingA = a.rating.count > 0 ? a.rating.sum / a.rating.count : 0;
-        const ratingB = b.rating.count > 0 ? b.rating.sum / b.rating.count : 0;
-        return ratingB - ratingA;
-      });
-      break;
-    case 'newest':
-      sorted.sort((a, b) => {
-        const dateA = a.createdAt ? new Date(a.createdAt).getTime() : 0;
-        const dateB = b.createdAt ? new Date(b.createdAt).getTime() : 0;
-        return dateB - dateA;
-      });
-      break;
-    case 'name':
-      sorted.sort((a, b) => a.name.localeCompare(b.name));
-      break;
-  }
-
-  return sorted;
+export function searchLibrarySkills(filters: LibraryFilters): LibrarySkill[] {
+  return getLibrarySearchIndex()
+    .search(filters)
+    .map((result) => result.skill);
 }
 
 /**
  * Get count of skills per role
  */
 export function getSkillCountByRole(): Record<string, number> {
-  const allSkills = getAllLibrarySkills();
+  const index = getLibrarySearchIndex();
   const counts: Record<string, number> = {};
 
   for (const role of ROLE_DEFINITIONS) {
-    counts[role.id] = allSkills.filter(
-      (skill) =>
-        skill.tags.roles.length === 0 || skill.tags.roles.includes(role.id)
-    ).length;
+    counts[role.id] = index.countByRole(role.id);
   }
 
   return counts;
@@ -847,7 +827,7 @@ export function getSkillCountByRole(): Record<string, number> {
  * Get count of skills per category
  */
 export function getSkillCountByCategory(): Record<SkillCategory, number> {
-  const allSkills = getAllLibrarySkills();
+  const index = getLibrarySearchIndex();
   const counts: Record<SkillCategory, number> = {
     analysis: 0,
     generation: 0,
@@ -857,9 +837,37 @@ export function getSkillCountByCategory(): Record<SkillCategory, number> {
     research: 0,
   };
 
-  for (const skill of allSkills) {
-    counts[skill.tags.category]++;
+  for (const category of Object.keys(counts) as SkillCategory[]) {
+    counts[category] = index.countByCategory(category);
   }
 
   return counts;
 }
+
+// ═══════════════════════════════════════════════════════════════════════════
+// CATALOG INDEX HELPERS
+// Used by scripts/buildSkillLibraryIndex.ts and the lazy catalog loader
+// ═══════════════════════════════════════════════════════════════════════════
+
+/** Format version of the prebuilt index (checked by ./catalog) */
+export const SKILL_CATALOG_INDEX_VERSION = 1;
+
+/** Chunk holding skills that don't belong to a role template */
+export const SHARED_SKILL_CHUNK = '_shared';
+
+/**
+ * Name of the catalog chunk a skill's full definition lives in
+ */
+export function getSkillChunkId(skill: LibrarySkill): string {
+  return skill.source === 'role-template' && skill.sourceRoleId
+    ? skill.sourceRoleId
+    : SHARED_SKILL_CHUNK;
+}
+
+/**
+ * Strip form inputs, prompts and execution config from a skill
+ */
+export function toLibrarySkillSummary(skill: LibrarySkill): LibrarySkillSummary {
+  const { inputs: _inputs, prompts: _prompts, config: _config, ...summary } = skill;
+  return summary;
+}
@@ -0,0 +1,462 @@
+/**
+ * Skill Library Search Index
+ *
+ * Precomputed lookup structures over a fixed list of skills:
+ * - id → skill map
+ * - lowercased name/description/longDescription (never recomputed per query)
+ * - inverted token index with prefix lookup over a sorted term list
+ * - facet bitsets for category, role, use case, level and source
+ *
+ * Built once per skill list (see getLibrarySearchIndex in ./index) so that
+ * filtering, ranked search and facet counts don't rescan the catalog.
+ * Only summary fields are indexed, so the same index also works over the
+ * prebuilt catalog metadata from getSkillIndex() in ./catalog.
+ */
+
+import type {
+  LibraryFilters,
+  LibrarySkill,
+  LibrarySkillSummary,
+  LibrarySortOption,
+  SkillCategory,
+} from './types';
+
+// ═══════════════════════════════════════════════════════════════════════════
+// BITSETS
+// ═══════════════════════════════════════════════════════════════════════════
+
+type Bitset = Uint32Array;
+
+function createBitset(size: number): Bitset {
+  return new Uint32Array((size + 31) >>> 5);
+}
+
+function setBit(bits: Bitset, index: number): void {
+  bits[index >>> 5] |= 1 << (index & 31);
+}
+
+function hasBit(bits: Bitset, index: number): boolean {
+  return (bits[index >>> 5] & (1 << (index & 31))) !== 0;
+}
+
+function orInto(target: Bitset, source: Bitset): void {
+  for (let i = 0; i < target.length; i++) {
+    target[i] |= source[i];
+  }
+}
+
+function andInto(target: Bitset, source: Bitset): void {
+  for (let i = 0; i < target.length; i++) {
+    target[i] &= source[i];
+  }
+}
+
+function popcount(bits: Bitset): number {
+  let count = 0;
+  for (let i = 0; i < bits.length; i++) {
+    let word = bits[i];
+    word = word - ((word >>> 1) & 0x55555555);
+    word = (word & 0x33333333) + ((word >>> 2) & 0x33333333);
+    count += (((word + (word >>> 4)) & 0x0f0f0f0f) * 0x01010101) >>> 24;
+  }
+  return count;
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// TOKENIZATION
+// ═══════════════════════════════════════════════════════════════════════════
+
+/** Relevance weight per field a term appears in */
+const FIELD_WEIGHTS = {
+  name: 3,
+  description: 2,
+  longDescription: 1,
+} as const;
+
+/** Score multiplier when a query token only prefixes the indexed term */
+const PREFIX_MATCH_FACTOR = 0.6;
+
+/**
+ * Split text into lowercase words of Unicode letters and digits
+ */
+export function tokenize(text: string): string[] {
+  return text.toLowerCase().split(/[^\p{L}\p{N}]+/u).filter(Boolean);
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// SEARCH INDEX
+// ═══════════════════════════════════════════════════════════════════════════
+
+type FacetFilters = Pick<
+  LibraryFilters,
+  'categories' | 'roles' | 'useCases' | 'levels' | 'sources' | 'skillIds'
+>;
+
+interface NarrowingCache {
+  mode: 'filter' | 'search';
+  facetKey: string;
+  query: string;
+  matches: number[];
+}
+
+export interface SkillSearchResult<T extends LibrarySkillSummary = LibrarySkill> {
+  skill: T;
+  score: number;
+}
+
+export class SkillSearchIndex<T extends LibrarySkillSummary = LibrarySkill> {
+  private readonly skills: T[];
+  private readonly byId = new Map<string, number>();
+  private readonly lowerFields: [string, string, string][] = [];
+
+  /** term → (doc index → summed field weight) */
+  private readonly postings = new Map<string, Map<number, number>>();
+  private readonly sortedTerms: string[];
+
+  private readonly facets = new Map<string, Bitset>();
+  private readonly universal: Bitset;
+
+  private lastQuery: NarrowingCache | null = null;
+  private readonly roleCounts = new Map<string, number>();
+
+  constructor(skills: T[]) {
+    this.skills = skills;
+    this.universal = createBitset(skills.length);
+
+    skills.forEach((skill, doc) => {
+      this.byId.set(skill.id, doc);
+
+      const name = skill.name.toLowerCase();
+      const description = skill.description.toLowerCase();
+      const longDescription = skill.longDescription?.toLowerCase() ?? '';
+      this.lowerFields.push([name, description, longDescription]);
+
+      this.indexField(doc, name, FIELD_WEIGHTS.name);
+      this.indexField(doc, description, FIELD_WEIGHTS.description);
+      this.indexField(doc, longDescription, FIELD_WEIGHTS.longDescription);
+
+      this.addFacet(`category:${skill.tags.category}`, doc);
+      this.addFacet(`level:${skill.tags.level}`, doc);
+      this.addFacet(`source:${skill.source}`, doc);
+      for (const useCase of skill.tags.useCases) {
+        this.addFacet(`useCase:${useCase}`, doc);
+      }
+      for (const role of skill.tags.roles) {
+        this.addFacet(`role:${role}`, doc);
+      }
+      if (skill.tags.roles.length === 0) {
+        setBit(this.universal, doc);
+      }
+    });
+
+    this.sortedTerms = [...this.postings.keys()].sort();
+  }
+
+  get size(): number {
+    return this.skills.length;
+  }
+
+  /**
+   * Look up a skill by ID
+   */
+  get(id: string): T | undefined {
+    const doc = this.byId.get(id);
+    return doc === undefined ? undefined : this.skills[doc];
+  }
+
+  // ─────────────────────────────────────────────────────────────────────────
+  // FILTERING
+  // ─────────────────────────────────────────────────────────────────────────
+
+  /**
+   * Same semantics as a linear filterSkills pass (case-insensitive substring
+   * search, AND across facets, OR within a facet) in catalog order.
+   * A query that extends the previous one only rechecks the previous matches.
+   */
+  filter(filters: Partial<LibraryFilters>): T[] {
+    const query = (filters.search ?? '').toLowerCase();
+    const facetKey = this.getFacetKey(filters);
+
+    let candidates: Iterable<number>;
+    const previous = this.lastQuery;
+    if (
+      previous &&
+      previous.mode === 'filter' &&
+      previous.facetKey === facetKey &&
+      query.startsWith(previous.query)
+    ) {
+      candidates = previous.matches;
+    } else {
+      candidates = this.iterateBits(this.buildFacetMask(filters));
+    }
+
+    const matches: number[] = [];
+    for (const doc of candidates) {
+      if (!query || this.lowerFields[doc].some((field) => field.includes(query))) {
+        matches.push(doc);
+      }
+    }
+
+    this.lastQuery = { mode: 'filter', facetKey, query, matches };
+    return matches.map((doc) => this.skills[doc]);
+  }
+
+  /**
+   * Relevance-ranked token search. Every query token must match an indexed
+   * term exactly or as a prefix; results are ordered by score, then name.
+   * Facet filters are applied the same way as in filter(). A query with no
+   * tokens, e.g. "&", is matched as a substring instead, unranked.
+   */
+  search(filters: Partial<LibraryFilters>): SkillSearchResult<T>[] {
+    const query = filters.search ?? '';
+    const tokens = tokenize(query);
+    const mask = this.buildFacetMask(filters);
+
+    if (tokens.length === 0) {
+      const substring = query.trim().toLowerCase();
+      return [...this.iterateBits(mask)]
+        .filter((doc) => !substring || this.lowerFields[doc].some((field) => field.includes(substring)))
+        .map((doc) => ({ skill: this.skills[doc], score: 0 }));
+    }
+
+    const normalizedQuery = tokens.join(' ');
+    const facetKey = this.getFacetKey(filters);
+    const previous = this.lastQuery;
+    const narrowFrom =
+      previous &&
+      previous.mode === 'search' &&
+      previous.facetKey === facetKey &&
+      normalizedQuery.startsWith(previous.query)
+        ? new Set(previous.matches)
+        : null;
+
+    let scores: Map<number, number> | null = null;
+    for (const token of tokens) {
+      const tokenScores = this.scoreToken(token, scores ?? narrowFrom, mask);
+      if (scores) {
+        for (const [doc, score] of scores) {
+          const add = tokenScores.get(doc);
+          if (add === undefined) {
+            scores.delete(doc);
+          } else {
+            scores.set(doc, score + add);
+          }
+        }
+      } else {
+        scores = tokenScores;
+      }
+      if (scores.size === 0) break;
+    }
+
+    const ranked = [...(scores ?? new Map<number, number>())].sort(
+      ([docA, scoreA], [docB, scoreB]) =>
+        scoreB - scoreA || this.skills[docA].name.localeCompare(this.skills[docB].name)
+    );
+
+    this.lastQuery = {
+      mode: 'search',
+      facetKey,
+      query: normalizedQuery,
+      matches: ranked.map(([doc]) => doc),
+    };
+
+    return ranked.map(([doc, score]) => ({ skill: this.skills[doc], score }));
+  }
+
+  // ─────────────────────────────────────────────────────────────────────────
+  // FACET COUNTS
+  // ─────────────────────────────────────────────────────────────────────────
+
+  /**
+   * Number of skills available to a role (its own plus universal skills)
+   */
+  countByRole(roleId: string): number {
+    let count = this.roleCounts.get(roleId);
+    if (count === undefined) {
+      const bits = this.universal.slice();
+      const roleBits = this.facets.get(`role:${roleId}`);
+      if (roleBits) orInto(bits, roleBits);
+      count = popcount(bits);
+      this.roleCounts.set(roleId, count);
+    }
+    return count;
+  }
+
+  /**
+   * Number of skills in a category
+   */
+  countByCategory(category: SkillCategory): number {
+    const bits = this.facets.get(`category:${category}`);
+    return bits ? popcount(bits) : 0;
+  }
+
+  // ─────────────────────────────────────────────────────────────────────────
+  // INTERNALS
+  // ─────────────────────────────────────────────────────────────────────────
+
+  private indexField(doc: number, text: string, weight: number): void {
+    for (const term of new Set(tokenize(text))) {
+      let docs = this.postings.get(term);
+      if (!docs) {
+        docs = new Map();
+        this.postings.set(term, docs);
+      }
+      docs.set(doc, (docs.get(doc) ?? 0) + weight);
+    }
+  }
+
+  private addFacet(key: string, doc: number): void {
+    let bits = this.facets.get(key);
+    if (!bits) {
+      bits = createBitset(this.skills.length);
+      this.facets.set(key, bits);
+    }
+    setBit(bits, doc);
+  }
+
+  /**
+   * Best score per document for one query token, over every term it prefixes
+   */
+  private scoreToken(
+    token: string,
+    candidates: Set<number> | Map<number, number> | null,
+    mask: Bitset
+  ): Map<number, number> {
+    const result = new Map<number, number>();
+
+    for (let i = this.lowerBound(token); i < this.sortedTerms.length; i++) {
+      const term = this.sortedTerms[i];
+      if (!term.startsWith(token)) break;
+
+      const factor = term === token ? 1 : PREFIX_MATCH_FACTOR;
+      for (const [doc, weight] of this.postings.get(term)!) {
+        if (candidates && !candidates.has(doc)) continue;
+        if (!hasBit(mask, doc)) continue;
+        const score = weight * factor;
+        if (score > (result.get(doc) ?? 0)) {
+          result.set(doc, score);
+        }
+      }
+    }
+
+    return result;
+  }
+
+  private lowerBound(prefix: string): number {
+    let lo = 0;
+    let hi = this.sortedTerms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (this.sortedTerms[mid] < prefix) {
+        lo = mid + 1;
+      } else {
+        hi = mid;
+      }
+    }
+    return lo;
+  }
+
+  private buildFacetMask(filters: Partial<FacetFilters>): Bitset {
+    const mask = createBitset(this.skills.length);
+    for (let doc = 0; doc < this.skills.length; doc++) {
+      setBit(mask, doc);
+    }
+
+    if (filters.skillIds && filters.skillIds.length > 0) {
+      const ids = createBitset(this.skills.length);
+      for (const id of filters.skillIds) {
+        const doc = this.byId.get(id);
+        if (doc !== undefined) setBit(ids, doc);
+      }
+      andInto(mask, ids);
+    }
+
+    this.applyFacet(mask, 'category', filters.categories);
+    this.applyFacet(mask, 'role', filters.roles, this.universal);
+    this.applyFacet(mask, 'useCase', filters.useCases);
+    this.applyFacet(mask, 'level', filters.levels);
+    this.applyFacet(mask, 'source', filters.sources);
+
+    return mask;
+  }
+
+  private applyFacet(
+    mask: Bitset,
+    facet: string,
+    values: readonly string[] | undefined,
+    alwaysInclude?: Bitset
+  ): void {
+    if (!values || values.length === 0) return;
+
+    const allowed = alwaysInclude ? alwaysInclude.slice() : createBitset(this.skills.length);
+    for (const value of values) {
+      const bits = this.facets.get(`${facet}:${value}`);
+      if (bits) orInto(allowed, bits);
+    }
+    andInto(mask, allowed);
+  }
+
+  private *iterateBits(bits: Bitset): Generator<number> {
+    for (let word = 0; word < bits.length; word++) {
+      let value = bits[word];
+      while (value !== 0) {
+        const lowest = value & -value;
+        yield (word << 5) + (31 - Math.clz32(lowest));
+        value ^= lowest;
+      }
+    }
+  }
+
+  private getFacetKey(filters: Partial<FacetFilters>): string {
+    return JSON.stringify([
+      filters.skillIds ?? [],
+      filters.categories ?? [],
+      filters.roles ?? [],
+      filters.useCases ?? [],
+      filters.levels ?? [],
+      filters.sources ?? [],
+    ]);
+  }
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// SORTING
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Sort skills by various criteria
+ */
+export function sortSkills<T extends LibrarySkillSummary>(
+  skills: T[],
+  sortBy: LibrarySortOption
+): T[] {
+  const sorted = [...skills];
+
+  switch (sortBy) {
+    case 'popular':
+      sorted.sort((a, b) => b.useCount - a.useCount);
+      break;
+    case 'rating':
+      sorted.sort((a, b) => {
+        const ratingA = a.rating.count > 0 ? a.rating.sum / a.rating.count : 0;
+        const ratingB = b.rating.count > 0 ? b.rating.sum / b.rating.count : 0;
+        return ratingB - ratingA;
+      });
+      break;
+    case 'newest':
+      sorted.sort((a, b) => {
+        const dateA = a.createdAt ? new Date(a.createdAt).getTime() : 0;
+        const dateB = b.createdAt ? new Date(b.createdAt).getTime() : 0;
+        return dateB - dateA;
+      });
+      break;
+    case 'name':
+      sorted.sort((a, b) => a.name.localeCompare(b.name));
+      break;
+    case 'relevance':
+      // Already ranked by SkillSearchIndex.search
+      break;
+  }
+
+  return sorted;
+}
@@ -169,6 +169,20 @@ export interface LibrarySkill {
   createdAt?: string;
 }
 
+/**
+ * Skill metadata without form inputs, prompts or execution config.
+ * This is what the prebuilt catalog index ships for first paint.
+ */
+export type LibrarySkillSummary = Omit<LibrarySkill, 'inputs' | 'prompts' | 'config'>;
+
+/**
+ * Entry in the prebuilt catalog index
+ */
+export interface CatalogIndexEntry extends LibrarySkillSummary {
+  /** Chunk holding the full definition (role ID or the shared chunk) */
+  chunk: string;
+}
+
 // ═══════════════════════════════════════════════════════════════════════════
 // CURATED COLLECTIONS
 // ═══════════════════════════════════════════════════════════════════════════
@@ -206,6 +220,24 @@ export interface RoleDefinition {
   skillCount?: number;  // Computed at runtime
 }
 
+/**
+ * Prebuilt catalog index emitted by scripts/buildSkillLibraryIndex.ts
+ */
+export interface SkillCatalogIndex {
+  version: number;
+  generatedAt: string;
+  roles: RoleDefinition[];
+  skills: CatalogIndexEntry[];
+}
+
+/**
+ * Role list emitted next to the index, small enough to bundle eagerly
+ */
+export interface CatalogRoleList {
+  version: number;
+  roles: RoleDefinition[];
+}
+
 // ═══════════════════════════════════════════════════════════════════════════
 // FILTER STATE
 // ═══════════════════════════════════════════════════════════════════════════
@@ -231,7 +263,8 @@ export type LibrarySortOption =
   | 'popular'     // By use count
   | 'rating'      // By average rating
   | 'newest'      // By creation date
-  | 'name';       // Alphabetical
+  | 'name'        // Alphabetical
+  | 'relevance';  // Search ranking (see searchLibrarySkills)
 
 // ═══════════════════════════════════════════════════════════════════════════
 // CONSTANTS
@@ -2,3 +2,4 @@
 
 export * from './types';
 export { db, STORES } from './indexeddb';
+export { DEFAULT_PAGE_SIZE, type Page, type PageOptions } from './query';
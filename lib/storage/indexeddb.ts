@@ -16,7 +16,7 @@
  * DATABASE SCHEMA:
  * ================
  * Database Name: 'skillengine'
- * Version: 2
+ * Version: 8
  *
  * Object Stores (Tables):
  * ┌─────────────────────┬─────────────┬────────────────────────────────────────┐
@@ -28,6 +28,14 @@
  * │ userPreferences     │ id          │ (none)                                 │
  * │ savedOutputs        │ id          │ skillId, createdAt, isFavorite         │
  * │ favoriteSkills      │ id          │ skillId, createdAt                     │
+ * │ workflowExecutions  │ id          │ workflowId, startedAt, status, isFav., │
+ * │                     │             │ workflowStartedAt                      │
+ * │ customWorkflows     │ id          │ createdAt, updatedAt, sourceWorkflowId │
+ * │ batchExecutions     │ id          │ workflowId, status                     │
+ * │ batchItems          │ batchId,pos │ (none)                                 │
+ * │ workflowSearch      │ id          │ terms (multiEntry)                     │
+ * │ promptCache         │ skillId     │ (none)                                 │
+ * │ costRecords         │ id          │ timestamp                              │
  * └─────────────────────┴─────────────┴────────────────────────────────────────┘
  *
  * ARCHITECTURE PATTERN:
@@ -50,6 +58,9 @@
  *
  * // Query workspaces
  * const workspaces = await db.getAllWorkspaces();
+ *
+ * // Page through large histories (see query.ts)
+ * const page = await db.getWorkflowExecutionsPage({ limit: 20 });
  */
 
 import type {
@@ -62,7 +73,20 @@ import type {
   WorkflowExecution,
   CustomWorkflow
 } from './types';
+import type { BatchExecution, BatchExecutionSummary, BatchItem } from '../workflows/batch';
+import type { PromptCacheEntry } from '../selfImprovement/promptCache';
+import type { CostRecord } from '../enhanced/types';
 import { logger } from '../logger';
+import {
+  DEFAULT_PAGE_SIZE,
+  decodePageCursor,
+  encodePageCursor,
+  getWorkflowExecutionSearchTerms,
+  tokenizeSearchText,
+  type CursorPosition,
+  type Page,
+  type PageOptions,
+} from './query';
 
 // ─────────────────────────────────────────────────────────────────────────────
 // DATABASE CONFIGURATION
@@ -75,7 +99,7 @@ const DB_NAME = 'skillengine';
  * Database version - increment this when schema changes
  * IndexedDB will trigger onupgradeneeded when version increases
  */
-const DB_VERSION = 4;
+const DB_VERSION = 8;
 
 /**
  * Object store names - constants to prevent typos and enable refactoring
@@ -89,9 +113,31 @@ export const STORES = {
   SAVED_OUTPUTS: 'savedOutputs',       // Saved AI responses
   FAVORITE_SKILLS: 'favoriteSkills',   // Bookmarked skills
   WORKFLOW_EXECUTIONS: 'workflowExecutions', // Workflow run history
-  CUSTOM_WORKFLOWS: 'customWorkflows'  // User-created custom workflows
+  CUSTOM_WORKFLOWS: 'customWorkflows', // User-created custom workflows
+  BATCH_EXECUTIONS: 'batchExecutions', // Batch run checkpoints (without items)
+  BATCH_ITEMS: 'batchItems',           // Batch run items, keyed by [batchId, position]
+  WORKFLOW_SEARCH: 'workflowSearch',   // Full-text terms of workflow executions
+  PROMPT_CACHE: 'promptCache',         // Cached skill_registry prompts
+  COST_RECORDS: 'costRecords'          // Cost ledger records compacted out of memory
 } as const;
 
+/**
+ * Stored form of a batch item - position keeps the original item order
+ */
+type BatchItemRecord = BatchItem & { batchId: string; position: number };
+
+/**
+ * Full-text index entry for a workflow execution, keyed by execution ID
+ */
+interface WorkflowSearchRecord {
+  id: string;
+  terms: string[];
+}
+
+function toSearchRecord(execution: WorkflowExecution): WorkflowSearchRecord {
+  return { id: execution.id, terms: getWorkflowExecutionSearchTerms(execution) };
+}
+
 // ─────────────────────────────────────────────────────────────────────────────
 // DATABASE CLASS
 // ─────────────────────────────────────────────────────────────────────────────
@@ -243,6 +289,66 @@ class SkillEngineDB {
           cwStore.createIndex('updatedAt', 'updatedAt');         // Sort by update time
           cwStore.createIndex('sourceWorkflowId', 'sourceWorkflowId'); // Find duplicates
         }
+
+        // ─────────────────────────────────────────────────────────────────────
+        // BATCH EXECUTION STORES (Added in v5)
+        // Checkpoints for resuming batch workflow runs after a reload.
+        // Items live in their own store so a checkpoint only rewrites the
+        // items that changed instead of the whole batch.
+        // ─────────────────────────────────────────────────────────────────────
+        if (!db.objectStoreNames.contains(STORES.BATCH_EXECUTIONS)) {
+          const batchStore = db.createObjectStore(STORES.BATCH_EXECUTIONS, { keyPath: 'id' });
+          batchStore.createIndex('workflowId', 'workflowId');   // Find batches for a workflow
+          batchStore.createIndex('status', 'status');           // Find unfinished batches
+        }
+
+        if (!db.objectStoreNames.contains(STORES.BATCH_ITEMS)) {
+          db.createObjectStore(STORES.BATCH_ITEMS, { keyPath: ['batchId', 'position'] });
+        }
+
+        // ─────────────────────────────────────────────────────────────────────
+        // WORKFLOW HISTORY INDEXES (Added in v6)
+        // workflowStartedAt pages one workflow's runs newest first without
+        // sorting. workflowSearch holds each execution's title, workflow
+        // name and tag terms in a multiEntry index for full-text search.
+        // ─────────────────────────────────────────────────────────────────────
+        const upgradeTx = (event.target as IDBOpenDBRequest).transaction!;
+        const historyStore = upgradeTx.objectStore(STORES.WORKFLOW_EXECUTIONS);
+        if (!historyStore.indexNames.contains('workflowStartedAt')) {
+          historyStore.createIndex('workflowStartedAt', ['workflowId', 'startedAt']);
+        }
+
+        if (!db.objectStoreNames.contains(STORES.WORKFLOW_SEARCH)) {
+          const searchStore = db.createObjectStore(STORES.WORKFLOW_SEARCH, { keyPath: 'id' });
+          searchStore.createIndex('terms', 'terms', { multiEntry: true });
+
+          // Index executions saved before v6
+          const backfill = historyStore.openCursor();
+          backfill.onsuccess = () => {
+            const cursor = backfill.result;
+            if (!cursor) return;
+            searchStore.put(toSearchRecord(cursor.value as WorkflowExecution));
+            cursor.continue();
+          };
+        }
+
+        // ─────────────────────────────────────────────────────────────────────
+        // PROMPT CACHE STORE (Added in v7)
+        // Registry prompts cached by the prompt resolver, so a reload does
+        // not refetch every skill's prompt from Supabase
+        // ─────────────────────────────────────────────────────────────────────
+        if (!db.objectStoreNames.contains(STORES.PROMPT_CACHE)) {
+          db.createObjectStore(STORES.PROMPT_CACHE, { keyPath: 'skillId' });
+        }
+
+        // ─────────────────────────────────────────────────────────────────────
+        // COST RECORDS STORE (Added in v8)
+        // Older cost ledger records, moved out of memory by costControls
+        // ─────────────────────────────────────────────────────────────────────
+        if (!db.objectStoreNames.contains(STORES.COST_RECORDS)) {
+          const costStore = db.createObjectStore(STORES.COST_RECORDS, { keyPath: 'id' });
+          costStore.createIndex('timestamp', 'timestamp', { unique: false });
+        }
       };
     });
 
@@ -410,6 +516,14 @@ class SkillEngineDB {
     return this.put(STORES.SKILL_EXECUTIONS, execution);
   }
 
+  /**
+   * Save many skill execution records in a single transaction
+   * @param executions - The executions to save
+   */
+  async saveExecutions(executions: SkillExecution[]): Promise<void> {
+    return this.putMany(STORES.SKILL_EXECUTIONS, executions);
+  }
+
   /**
    * Get a single execution by ID
    * @param id - The execution ID
@@ -443,10 +557,16 @@ class SkillEngineDB {
    * @returns Array of recent executions, sorted newest first
    */
   async getRecentExecutions(limit: number = 50): Promise<SkillExecution[]> {
-    const all = await this.getAll<SkillExecution>(STORES.SKILL_EXECUTIONS);
-    return all
-      .sort((a, b) => new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime())
-      .slice(0, limit);
+    const page = await this.getExecutionsPage({ limit });
+    return page.items;
+  }
+
+  /**
+   * Get one page of executions across all skills, newest first
+   * @param options - Page size and the previous page's cursor
+   */
+  async getExecutionsPage(options: PageOptions = {}): Promise<Page<SkillExecution>> {
+    return this.getPageByIndex(STORES.SKILL_EXECUTIONS, 'createdAt', options);
   }
 
   /**
@@ -493,6 +613,14 @@ class SkillEngineDB {
     return this.put(STORES.SAVED_OUTPUTS, output);
   }
 
+  /**
+   * Save many AI outputs in a single transaction
+   * @param outputs - The outputs to save
+   */
+  async saveOutputs(outputs: SavedOutput[]): Promise<void> {
+    return this.putMany(STORES.SAVED_OUTPUTS, outputs);
+  }
+
   /**
    * Get a saved output by ID
    * @param id - The output ID
@@ -513,6 +641,20 @@ class SkillEngineDB {
     );
   }
 
+  /**
+   * Get one page of saved outputs, newest first
+   * @param options - Page size, the previous page's cursor and whether to
+   *   return favorites only
+   */
+  async getSavedOutputsPage(
+    options: PageOptions & { favoritesOnly?: boolean } = {}
+  ): Promise<Page<SavedOutput>> {
+    return this.getPageByIndex<SavedOutput>(STORES.SAVED_OUTPUTS, 'createdAt', {
+      ...options,
+      filter: options.favoritesOnly ? (output) => !!output.isFavorite : undefined,
+    });
+  }
+
   /**
    * Get all saved outputs for a specific skill
    * @param skillId - The skill ID
@@ -527,10 +669,8 @@ class SkillEngineDB {
    * @returns Array of outputs marked as favorites
    */
   async getFavoriteSavedOutputs(): Promise<SavedOutput[]> {
-    const all = await this.getAll<SavedOutput>(STORES.SAVED_OUTPUTS);
-    return all
-      .filter(o => o.isFavorite)
-      .sort((a, b) => new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime());
+    const page = await this.getSavedOutputsPage({ favoritesOnly: true, limit: Infinity });
+    return page.items;
   }
 
   /**
@@ -649,7 +789,28 @@ class SkillEngineDB {
    * @param execution - The workflow execution to save
    */
   async saveWorkflowExecution(execution: WorkflowExecution): Promise<void> {
-    return this.put(STORES.WORKFLOW_EXECUTIONS, execution);
+    return this.saveWorkflowExecutions([execution]);
+  }
+
+  /**
+   * Save many workflow executions, and their search terms, in a single transaction
+   * @param executions - The workflow executions to save
+   */
+  async saveWorkflowExecutions(executions: WorkflowExecution[]): Promise<void> {
+    if (executions.length === 0) return;
+    await this.init();
+    return new Promise((resolve, reject) => {
+      const tx = this.ensureDb().transaction([STORES.WORKFLOW_EXECUTIONS, STORES.WORKFLOW_SEARCH], 'readwrite');
+      const executionStore = tx.objectStore(STORES.WORKFLOW_EXECUTIONS);
+      const searchStore = tx.objectStore(STORES.WORKFLOW_SEARCH);
+      for (const execution of executions) {
+        executionStore.put(execution);
+        searchStore.put(toSearchRecord(execution));
+      }
+      tx.oncomplete = () => resolve();
+      tx.onerror = () => reject(tx.error);
+      tx.onabort = () => reject(tx.error);
+    });
   }
 
   /**
@@ -667,11 +828,35 @@ class SkillEngineDB {
    * @returns Array of workflow executions
    */
   async getAllWorkflowExecutions(limit?: number): Promise<WorkflowExecution[]> {
-    const executions = await this.getAll<WorkflowExecution>(STORES.WORKFLOW_EXECUTIONS);
-    const sorted = executions.sort((a, b) =>
-      new Date(b.startedAt).getTime() - new Date(a.startedAt).getTime()
-    );
-    return limit ? sorted.slice(0, limit) : sorted;
+    const page = await this.getWorkflowExecutionsPage({ limit: limit || Infinity });
+    return page.items;
+  }
+
+  /**
+   * Get one page of workflow executions, newest first
+   * @param options - Page size, the previous page's cursor, and optionally a
+   *   workflow ID or favorites-only filter
+   */
+  async getWorkflowExecutionsPage(
+    options: PageOptions & { workflowId?: string; favoritesOnly?: boolean } = {}
+  ): Promise<Page<WorkflowExecution>> {
+    const { workflowId, favoritesOnly, ...page } = options;
+    // Booleans are not valid IndexedDB keys, so the isFavorite index stays
+    // empty; favorites are filtered while walking the date index instead
+    const filter = favoritesOnly ? (execution: WorkflowExecution) => !!execution.isFavorite : undefined;
+
+    if (workflowId) {
+      // [workflowId] sorts before and [workflowId, []] after every [workflowId, startedAt]
+      return this.getPageByIndex<WorkflowExecution>(STORES.WORKFLOW_EXECUTIONS, 'workflowStartedAt', {
+        ...page,
+        range: IDBKeyRange.bound([workflowId], [workflowId, []]),
+        filter,
+      });
+    }
+    return this.getPageByIndex<WorkflowExecution>(STORES.WORKFLOW_EXECUTIONS, 'startedAt', {
+      ...page,
+      filter,
+    });
   }
 
   /**
@@ -680,14 +865,8 @@ class SkillEngineDB {
    * @returns Array of executions for that workflow
    */
   async getWorkflowExecutionsByWorkflow(workflowId: string): Promise<WorkflowExecution[]> {
-    const executions = await this.getAllByIndex<WorkflowExecution>(
-      STORES.WORKFLOW_EXECUTIONS,
-      'workflowId',
-      workflowId
-    );
-    return executions.sort((a, b) =>
-      new Date(b.startedAt).getTime() - new Date(a.startedAt).getTime()
-    );
+    const page = await this.getWorkflowExecutionsPage({ workflowId, limit: Infinity });
+    return page.items;
   }
 
   /**
@@ -695,10 +874,8 @@ class SkillEngineDB {
    * @returns Array of favorited executions
    */
   async getFavoriteWorkflowExecutions(): Promise<WorkflowExecution[]> {
-    const all = await this.getAll<WorkflowExecution>(STORES.WORKFLOW_EXECUTIONS);
-    return all
-      .filter(e => e.isFavorite)
-      .sort((a, b) => new Date(b.startedAt).getTime() - new Date(a.startedAt).getTime());
+    const page = await this.getWorkflowExecutionsPage({ favoritesOnly: true, limit: Infinity });
+    return page.items;
   }
 
   /**
@@ -709,7 +886,7 @@ class SkillEngineDB {
   async updateWorkflowExecution(id: string, updates: Partial<WorkflowExecution>): Promise<void> {
     const execution = await this.getWorkflowExecution(id);
     if (execution) {
-      await this.put(STORES.WORKFLOW_EXECUTIONS, { ...execution, ...updates });
+      await this.saveWorkflowExecution({ ...execution, ...updates });
     }
   }
 
@@ -718,24 +895,67 @@ class SkillEngineDB {
    * @param id - The execution ID to delete
    */
   async deleteWorkflowExecution(id: string): Promise<void> {
-    return this.delete(STORES.WORKFLOW_EXECUTIONS, id);
+    await this.init();
+    return new Promise((resolve, reject) => {
+      const tx = this.ensureDb().transaction([STORES.WORKFLOW_EXECUTIONS, STORES.WORKFLOW_SEARCH], 'readwrite');
+      tx.objectStore(STORES.WORKFLOW_EXECUTIONS).delete(id);
+      tx.objectStore(STORES.WORKFLOW_SEARCH).delete(id);
+      tx.oncomplete = () => resolve();
+      tx.onerror = () => reject(tx.error);
+    });
   }
 
   /**
-   * Search workflow executions by title or tags
+   * Search workflow executions by title, workflow name or tags
+   *
+   * Uses the workflowSearch term index: every word of the query must be the
+   * start of a word in the execution's title, workflow name or tags, so
+   * "sales rep" matches "Sales Report". Only matching records are loaded.
+   *
    * @param query - Search query
-   * @returns Array of matching executions
+   * @param limit - Maximum number of executions to return
+   * @returns Array of matching executions, newest first
    */
-  async searchWorkflowExecutions(query: string): Promise<WorkflowExecution[]> {
-    const all = await this.getAll<WorkflowExecution>(STORES.WORKFLOW_EXECUTIONS);
-    const lowerQuery = query.toLowerCase();
-    return all
-      .filter(e =>
-        e.title?.toLowerCase().includes(lowerQuery) ||
-        e.workflowName.toLowerCase().includes(lowerQuery) ||
-        e.tags?.some(tag => tag.toLowerCase().includes(lowerQuery))
-      )
-      .sort((a, b) => new Date(b.startedAt).getTime() - new Date(a.startedAt).getTime());
+  async searchWorkflowExecutions(query: string, limit?: number): Promise<WorkflowExecution[]> {
+    const terms = [...new Set(tokenizeSearchText(query))];
+    if (terms.length === 0) return this.getAllWorkflowExecutions(limit);
+
+    await this.init();
+    return new Promise((resolve, reject) => {
+      const tx = this.ensureDb().transaction([STORES.WORKFLOW_SEARCH, STORES.WORKFLOW_EXECUTIONS], 'readonly');
+      const termIndex = tx.objectStore(STORES.WORKFLOW_SEARCH).index('terms');
+      const executionStore = tx.objectStore(STORES.WORKFLOW_EXECUTIONS);
+      const matchesPerTerm: Set<string>[] = [];
+      const results: WorkflowExecution[] = [];
+
+      const loadMatches = () => {
+        // Intersect starting from the rarest term
+        matchesPerTerm.sort((a, b) => a.size - b.size);
+        const [rarest, ...rest] = matchesPerTerm;
+        for (const id of rarest) {
+          if (!rest.every((matches) => matches.has(id))) continue;
+          const request = executionStore.get(id);
+          request.onsuccess = () => {
+            if (request.result) results.push(request.result as WorkflowExecution);
+          };
+        }
+      };
+
+      for (const term of terms) {
+        // Prefix match: every indexed term from `term` up to `term` + highest code unit
+        const request = termIndex.getAllKeys(IDBKeyRange.bound(term, `${term}\uffff`));
+        request.onsuccess = () => {
+          matchesPerTerm.push(new Set(request.result as string[]));
+          if (matchesPerTerm.length === terms.length) loadMatches();
+        };
+      }
+
+      tx.oncomplete = () => {
+        const sorted = results.sort((a, b) => b.startedAt.localeCompare(a.startedAt));
+        resolve(limit ? sorted.slice(0, limit) : sorted);
+      };
+      tx.onerror = () => reject(tx.error);
+    });
   }
 
   // ═══════════════════════════════════════════════════════════════════════════
@@ -823,6 +1043,169 @@ class SkillEngineDB {
     return newWorkflow;
   }
 
+  // ═══════════════════════════════════════════════════════════════════════════
+  // BATCH EXECUTION OPERATIONS
+  // Checkpoints written while a batch runs, used to resume it after a reload
+  // ═══════════════════════════════════════════════════════════════════════════
+
+  /**
+   * Save a batch checkpoint in a single transaction
+   * @param batch - The current batch state
+   * @param itemIndexes - Positions of the items that changed since the last checkpoint
+   */
+  async saveBatchCheckpoint(batch: BatchExecution, itemIndexes: number[]): Promise<void> {
+    await this.init();
+    return new Promise((resolve, reject) => {
+      const tx = this.ensureDb().transaction([STORES.BATCH_EXECUTIONS, STORES.BATCH_ITEMS], 'readwrite');
+      const { items, ...summary } = batch;
+
+      tx.objectStore(STORES.BATCH_EXECUTIONS).put(summary);
+      const itemStore = tx.objectStore(STORES.BATCH_ITEMS);
+      for (const position of itemIndexes) {
+        const record: BatchItemRecord = { ...items[position], batchId: batch.id, position };
+        itemStore.put(record);
+      }
+
+      tx.oncomplete = () => resolve();
+      tx.onerror = () => reject(tx.error);
+      tx.onabort = () => reject(tx.error);
+    });
+  }
+
+  /**
+   * Get a batch with all of its items in their original order
+   * @param id - The batch ID
+   */
+  async getBatchExecution(id: string): Promise<BatchExecution | undefined> {
+    await this.init();
+    return new Promise((resolve, reject) => {
+      const tx = this.ensureDb().transaction([STORES.BATCH_EXECUTIONS, STORES.BATCH_ITEMS], 'readonly');
+      const summaryRequest = tx.objectStore(STORES.BATCH_EXECUTIONS).get(id);
+      const itemsRequest = tx
+        .objectStore(STORES.BATCH_ITEMS)
+        .getAll(IDBKeyRange.bound([id, 0], [id, Infinity]));
+
+      tx.oncomplete = () => {
+        const summary = summaryRequest.result as BatchExecutionSummary | undefined;
+        if (!summary) {
+          resolve(undefined);
+          return;
+        }
+        const items = (itemsRequest.result as BatchItemRecord[]).map(
+          ({ batchId: _batchId, position: _position, ...item }) => item
+        );
+        resolve({ ...summary, items });
+      };
+      tx.onerror = () => reject(tx.error);
+    });
+  }
+
+  /**
+   * Get stored batches for a workflow (without items), newest first
+   * @param workflowId - The workflow ID
+   */
+  async getBatchExecutionsByWorkflow(workflowId: string): Promise<BatchExecutionSummary[]> {
+    const batches = await this.getAllByIndex<BatchExecutionSummary>(
+      STORES.BATCH_EXECUTIONS,
+      'workflowId',
+      workflowId
+    );
+    return batches.sort((a, b) => (b.startedAt ?? '').localeCompare(a.startedAt ?? ''));
+  }
+
+  /**
+   * Delete a batch and all of its items
+   * @param id - The batch ID
+   */
+  async deleteBatchExecution(id: string): Promise<void> {
+    await this.init();
+    return new Promise((resolve, reject) => {
+      const tx = this.ensureDb().transaction([STORES.BATCH_EXECUTIONS, STORES.BATCH_ITEMS], 'readwrite');
+      tx.objectStore(STORES.BATCH_EXECUTIONS).delete(id);
+      tx.objectStore(STORES.BATCH_ITEMS).delete(IDBKeyRange.bound([id, 0], [id, Infinity]));
+      tx.oncomplete = () => resolve();
+      tx.onerror = () => reject(tx.error);
+    });
+  }
+
+  // ═══════════════════════════════════════════════════════════════════════════
+  // PROMPT CACHE
+  // Persisted entries of the registry prompt cache (see selfImprovement/promptCache)
+  // ═══════════════════════════════════════════════════════════════════════════
+
+  /**
+   * Get every persisted prompt cache entry
+   */
+  async getPromptCacheEntries(): Promise<PromptCacheEntry[]> {
+    return this.getAll(STORES.PROMPT_CACHE);
+  }
+
+  /**
+   * Save prompt cache entries in a single transaction
+   * @param entries - The entries to save
+   */
+  async savePromptCacheEntries(entries: PromptCacheEntry[]): Promise<void> {
+    return this.putMany(STORES.PROMPT_CACHE, entries);
+  }
+
+  /**
+   * Delete prompt cache entries in a single transaction
+   * @param skillIds - Skills whose entries to delete
+   */
+  async deletePromptCacheEntries(skillIds: string[]): Promise<void> {
+    if (skillIds.length === 0) return;
+    await this.init();
+    return new Promise((resolve, reject) => {
+      const tx = this.ensureDb().transaction(STORES.PROMPT_CACHE, 'readwrite');
+      const store = tx.objectStore(STORES.PROMPT_CACHE);
+      skillIds.forEach((skillId) => store.delete(skillId));
+      tx.oncomplete = () => resolve();
+      tx.onerror = () => reject(tx.error);
+    });
+  }
+
+  // ═══════════════════════════════════════════════════════════════════════════
+  // COST RECORDS
+  // Cost ledger records compacted out of memory (see enhanced/costControls)
+  // ═══════════════════════════════════════════════════════════════════════════
+
+  /**
+   * Save cost records in a single transaction
+   * @param records - The records to save
+   */
+  async saveCostRecords(records: CostRecord[]): Promise<void> {
+    return this.putMany(STORES.COST_RECORDS, records);
+  }
+
+  /**
+   * Get one page of archived cost records, newest first
+   * @param options - Page size, the previous page's cursor and optional
+   *   filters, applied while walking the timestamp index
+   */
+  async getCostRecordsPage(
+    options: PageOptions & {
+      userId?: string;
+      teamId?: string;
+      skillId?: string;
+      workflowId?: string;
+      provider?: string;
+    } = {}
+  ): Promise<Page<CostRecord>> {
+    const { userId, teamId, skillId, workflowId, provider } = options;
+    const filtered = userId || teamId || skillId || workflowId || provider;
+    return this.getPageByIndex<CostRecord>(STORES.COST_RECORDS, 'timestamp', {
+      ...options,
+      filter: filtered
+        ? (record) =>
+            (!userId || record.userId === userId) &&
+            (!teamId || record.teamId === teamId) &&
+            (!skillId || record.skillId === skillId) &&
+            (!workflowId || record.workflowId === workflowId) &&
+            (!provider || record.provider === provider)
+        : undefined,
+    });
+  }
+
   // ═══════════════════════════════════════════════════════════════════════════
   // EXPORT / IMPORT
   // Allows users to export workspaces and reimport them
@@ -913,6 +1296,37 @@ class SkillEngineDB {
     });
   }
 
+  /**
+   * Put many items in a store in a single transaction
+   *
+   * One transaction commits once for the whole batch instead of once per
+   * record, and either every item is written or none is.
+   *
+   * @param storeName - The object store name
+   * @param items - The items to store
+   */
+  private async putMany<T>(storeName: string, items: T[]): Promise<void> {
+    if (items.length === 0) return;
+    await this.init();
+    return new Promise((resolve, reject) => {
+      const tx = this.ensureDb().transaction(storeName, 'readwrite');
+      const store = tx.objectStore(storeName);
+      tx.oncomplete = () => resolve();
+      tx.onerror = () => reject(tx.error);
+      tx.onabort = () => reject(tx.error);
+      try {
+        for (const item of items) {
+          store.put(item);
+        }
+      } catch (error) {
+        // put throws synchronously on an invalid key; abort so the
+        // items queued before it are not committed
+        tx.abort();
+        reject(error);
+      }
+    });
+  }
+
   /**
    * Get a single item by key
    *
@@ -974,6 +1388,79 @@ class SkillEngineDB {
     });
   }
 
+  /**
+   * Get one page of items from an index, walking it newest (highest key) first
+   *
+   * Uses keyset pagination: the cursor token holds the index key and primary
+   * key of the previous page's last item, and the walk resumes right after
+   * it. Only the records on the page (plus one to detect a next page) are
+   * read, whatever the size of the store. With a filter, records that do not
+   * match are skipped until the page is full.
+   *
+   * @param storeName - The object store name
+   * @param indexName - The index to walk
+   * @param options - Page size, cursor token, key range and record filter
+   * @returns The page and the token for the next one
+   */
+  private async getPageByIndex<T>(
+    storeName: string,
+    indexName: string,
+    options: PageOptions & { range?: IDBKeyRange; filter?: (item: T) => boolean }
+  ): Promise<Page<T>> {
+    const limit = Math.max(1, options.limit ?? DEFAULT_PAGE_SIZE);
+    const after = options.cursor ? decodePageCursor(options.cursor) : null;
+    const { filter } = options;
+
+    let range: IDBKeyRange | null = options.range ?? null;
+    if (after) {
+      range = range
+        ? IDBKeyRange.bound(range.lower, after.key, range.lowerOpen, false)
+        : IDBKeyRange.upperBound(after.key);
+    }
+
+    await this.init();
+    return new Promise((resolve, reject) => {
+      const tx = this.ensureDb().transaction(storeName, 'readonly');
+      const request = tx.objectStore(storeName).index(indexName).openCursor(range, 'prev');
+      const items: T[] = [];
+      let last: CursorPosition | null = null;
+
+      request.onerror = () => reject(request.error);
+      request.onsuccess = () => {
+        const cursor = request.result;
+        if (!cursor) {
+          resolve({ items, nextCursor: null });
+          return;
+        }
+
+        // Records sharing the previous page's last key: skip up to and including it
+        if (after && indexedDB.cmp(cursor.key, after.key) === 0) {
+          const order = indexedDB.cmp(cursor.primaryKey, after.primaryKey);
+          if (order > 0) {
+            cursor.continuePrimaryKey(after.key, after.primaryKey);
+            return;
+          }
+          if (order === 0) {
+            cursor.continue();
+            return;
+          }
+        }
+
+        const item = cursor.value as T;
+        if (!filter || filter(item)) {
+          if (items.length === limit) {
+            // Another match exists, so there is a next page
+            resolve({ items, nextCursor: encodePageCursor(last!) });
+            return;
+          }
+          items.push(item);
+          last = { key: cursor.key, primaryKey: cursor.primaryKey };
+        }
+        cursor.continue();
+      };
+    });
+  }
+
   /**
    * Delete an item by key
    *
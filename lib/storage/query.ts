@@ -0,0 +1,100 @@
+/**
+ * query.ts - Pagination and Search Helpers for the IndexedDB Layer
+ *
+ * Pure helpers used by SkillEngineDB for keyset pagination and the
+ * workflow execution full-text index. Kept free of IndexedDB calls so
+ * they can be unit tested without a browser.
+ *
+ * PAGINATION:
+ * ===========
+ * History queries walk an index with a cursor, newest first, and stop once
+ * a page is full. The returned `nextCursor` is an opaque token holding the
+ * index key and primary key of the last record, so the next page resumes
+ * right after it even when records were added or deleted in between.
+ *
+ * const first = await db.getWorkflowExecutionsPage({ limit: 20 });
+ * const second = await db.getWorkflowExecutionsPage({ limit: 20, cursor: first.nextCursor });
+ */
+
+import type { WorkflowExecution } from './types';
+
+/** Page size used when a query does not pass a limit */
+export const DEFAULT_PAGE_SIZE = 50;
+
+/**
+ * Options for a paginated query
+ */
+export interface PageOptions {
+  /** Maximum number of records to return (default: DEFAULT_PAGE_SIZE) */
+  limit?: number;
+  /** `nextCursor` of the previous page; omit for the first page */
+  cursor?: string | null;
+}
+
+/**
+ * One page of query results
+ */
+export interface Page<T> {
+  items: T[];
+  /** Token for the next page, or null when there are no more records */
+  nextCursor: string | null;
+}
+
+/**
+ * Position of a record in an index: its index key and primary key
+ */
+export interface CursorPosition {
+  key: IDBValidKey;
+  primaryKey: IDBValidKey;
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// CURSOR TOKENS
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Encode the position of the last record on a page as a continuation token
+ */
+export function encodePageCursor(position: CursorPosition): string {
+  return JSON.stringify([position.key, position.primaryKey]);
+}
+
+/**
+ * Decode a continuation token created by encodePageCursor
+ * @throws Error if the token is malformed
+ */
+export function decodePageCursor(cursor: string): CursorPosition {
+  let parsed: unknown;
+  try {
+    parsed = JSON.parse(cursor);
+  } catch {
+    throw new Error('Invalid page cursor');
+  }
+  if (!Array.isArray(parsed) || parsed.length !== 2 || parsed.some((part) => part === null)) {
+    throw new Error('Invalid page cursor');
+  }
+  return { key: parsed[0], primaryKey: parsed[1] };
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// FULL-TEXT TERMS
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Split text into lowercase search terms (letters and digits)
+ */
+export function tokenizeSearchText(text: string): string[] {
+  return text
+    .toLowerCase()
+    .split(/[^\p{L}\p{N}]+/u)
+    .filter(Boolean);
+}
+
+/**
+ * Unique search terms for a workflow execution's title, workflow name and tags
+ */
+export function getWorkflowExecutionSearchTerms(execution: WorkflowExecution): string[] {
+  const text = [execution.title ?? '', execution.workflowName, ...(execution.tags ?? [])].join(' ');
+  return [...new Set(tokenizeSearchText(text))];
+}
+
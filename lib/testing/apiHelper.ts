@@ -12,25 +12,44 @@ export interface ApiCallResult {
   tokenCount?: number;
 }
 
+/**
+ * Error from a failed API call, carrying the HTTP status when known
+ * (429 means the provider rate-limited the request)
+ */
+export class ApiCallError extends Error {
+  readonly status?: number;
+
+  constructor(message: string, status?: number) {
+    super(message);
+    this.name = 'ApiCallError';
+    this.status = status;
+  }
+}
+
 /**
  * Call Gemini API with system instruction and user prompt
- * Returns the full response (non-streaming)
+ * Returns the full response (non-streaming). `baseUrl` points the SDK at a
+ * different endpoint, e.g. a local mock server for benchmarks.
  */
 export async function callGeminiAPI(
   systemInstruction: string,
   userPrompt: string,
   apiKey: string,
-  modelId: string = 'gemini-1.5-flash-latest'
+  modelId: string = 'gemini-1.5-flash-latest',
+  baseUrl?: string
 ): Promise<ApiCallResult> {
   if (!apiKey) {
     throw new Error('API key is required');
   }
 
   const genAI = new GoogleGenerativeAI(apiKey);
-  const model = genAI.getGenerativeModel({
-    model: modelId,
-    systemInstruction,
-  });
+  const model = genAI.getGenerativeModel(
+    {
+      model: modelId,
+      systemInstruction,
+    },
+    baseUrl ? { baseUrl } : undefined
+  );
 
   try {
     const result = await model.generateContent({
@@ -45,10 +64,15 @@ export async function callGeminiAPI(
       tokenCount: response.usageMetadata?.totalTokenCount,
     };
   } catch (error) {
-    logger.error('Error calling Gemini API', { error: error instanceof Error ? error.message : String(error) });
-    if (error instanceof Error && error.message.includes('API key not valid')) {
-      throw new Error('The provided API key is not valid. Please check your key and try again.');
+    const message = error instanceof Error ? error.message : String(error);
+    const status = (error as { status?: number }).status;
+    logger.error('Error calling Gemini API', { error: message });
+    if (status === 429 || /\b429\b|RESOURCE_EXHAUSTED/.test(message)) {
+      throw new ApiCallError('Rate limit exceeded. Please wait and try again.', 429);
+    }
+    if (message.includes('API key not valid')) {
+      throw new ApiCallError('The provided API key is not valid. Please check your key and try again.', status);
     }
-    throw new Error('Failed to get response from AI. Please check your API key and network connection.');
+    throw new ApiCallError('Failed to get response from AI. Please check your API key and network connection.', status);
   }
 }
@@ -95,6 +95,26 @@ export async function saveEvalRecord(record: EvalRecord): Promise<void> {
   });
 }
 
+/**
+ * Save several eval records in a single transaction
+ */
+export async function saveEvalRecords(records: EvalRecord[]): Promise<void> {
+  if (records.length === 0) return;
+
+  const db = await openDatabase();
+  return new Promise((resolve, reject) => {
+    const tx = db.transaction(STORES.EVAL_RECORDS, 'readwrite');
+    const store = tx.objectStore(STORES.EVAL_RECORDS);
+    for (const record of records) {
+      store.put(record);
+    }
+
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+    tx.oncomplete = () => resolve();
+  });
+}
+
 /**
  * Get all eval records for a skill
  */
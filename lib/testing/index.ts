@@ -50,6 +50,7 @@ export {
 // Storage
 export {
   saveEvalRecord,
+  saveEvalRecords,
   getEvalRecordsForSkill,
   getEvalRecordsForWorkflow,
   getRecentEvalRecords,
@@ -84,6 +85,18 @@ export {
   type TestRunOptions,
 } from './testRunner';
 
+// Request scheduling
+export {
+  RequestScheduler,
+  TokenBucket,
+  isRateLimitError,
+  type RateLimitConfig,
+  type SchedulerOptions,
+  type ScheduleOptions,
+  type SchedulerStats,
+} from './scheduler';
+export { callGeminiAPI, ApiCallError, type ApiCallResult } from './apiHelper';
+
 // Prompt Optimizer
 export {
   analyzeSkillForOptimization,
@@ -0,0 +1,244 @@
+/**
+ * scheduler.ts - Shared Rate-Limited Request Scheduler
+ *
+ * Runs API calls for test runs through a bounded worker pool with a
+ * token bucket per provider. Calls rejected with HTTP 429 are retried with
+ * exponential backoff, and the provider's bucket is paused so other workers
+ * back off too instead of piling onto the limit.
+ */
+
+import { ApiCallError } from './apiHelper';
+
+// ═══════════════════════════════════════════════════════════════════════════
+// TYPES
+// ═══════════════════════════════════════════════════════════════════════════
+
+export interface RateLimitConfig {
+  /** Sustained request rate */
+  requestsPerMinute: number;
+  /** Requests that may be sent back-to-back before throttling (default 1) */
+  burst?: number;
+}
+
+export interface SchedulerOptions {
+  /** Max tasks in flight across all providers (default 4) */
+  concurrency?: number;
+  /** Per-provider rate limits, keyed by provider name */
+  rateLimits?: Record<string, RateLimitConfig>;
+  /** Rate limit for providers without an entry in rateLimits (default 60 rpm, burst 4) */
+  defaultRateLimit?: RateLimitConfig;
+  /** Retries after a 429 before giving up (default 4) */
+  maxRetries?: number;
+  /** Base delay for exponential backoff in ms (default 1000) */
+  retryBaseDelayMs?: number;
+  /** Upper bound for a single backoff in ms (default 30000) */
+  maxRetryDelayMs?: number;
+}
+
+export interface ScheduleOptions {
+  /**
+   * High-priority tasks jump ahead of queued normal ones. Used for grading
+   * calls so finished generations are graded before new ones start.
+   */
+  priority?: 'normal' | 'high';
+}
+
+export interface SchedulerStats {
+  active: number;
+  queued: number;
+  completed: number;
+  failed: number;
+  retries: number;
+  rateLimited: number;
+}
+
+interface QueuedTask {
+  provider: string;
+  run: () => Promise<unknown>;
+  resolve: (value: unknown) => void;
+  reject: (error: unknown) => void;
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// HELPERS
+// ═══════════════════════════════════════════════════════════════════════════
+
+function sleep(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+/**
+ * Whether an error means the provider rejected the call for rate limiting
+ */
+export function isRateLimitError(error: unknown): boolean {
+  if (error instanceof ApiCallError) {
+    return error.status === 429;
+  }
+  const message = error instanceof Error ? error.message : String(error);
+  return /\b429\b|rate limit|resource[_ ]exhausted|quota/i.test(message);
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// TOKEN BUCKET
+// ═══════════════════════════════════════════════════════════════════════════
+
+export class TokenBucket {
+  private tokens: number;
+  private lastRefill: number;
+  private pausedUntil = 0;
+  private readonly capacity: number;
+  private readonly refillPerMs: number;
+
+  constructor(config: RateLimitConfig) {
+    this.capacity = Math.max(1, config.burst ?? 1);
+    this.refillPerMs = config.requestsPerMinute / 60000;
+    this.tokens = this.capacity;
+    this.lastRefill = Date.now();
+  }
+
+  /**
+   * Wait until a request may be sent, then consume a token
+   */
+  async take(): Promise<void> {
+    for (;;) {
+      this.refill();
+      const now = Date.now();
+
+      if (now >= this.pausedUntil && this.tokens >= 1) {
+        this.tokens -= 1;
+        return;
+      }
+
+      const tokenWait = this.tokens >= 1 ? 0 : (1 - this.tokens) / this.refillPerMs;
+      await sleep(Math.max(this.pausedUntil - now, tokenWait, 1));
+    }
+  }
+
+  /**
+   * Stop handing out tokens for a while (after the provider returned 429)
+   */
+  pause(ms: number): void {
+    this.pausedUntil = Math.max(this.pausedUntil, Date.now() + ms);
+    this.tokens = Math.min(this.tokens, 0);
+  }
+
+  private refill(): void {
+    const now = Date.now();
+    this.tokens = Math.min(this.capacity, this.tokens + (now - this.lastRefill) * this.refillPerMs);
+    this.lastRefill = now;
+  }
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// REQUEST SCHEDULER
+// ═══════════════════════════════════════════════════════════════════════════
+
+const DEFAULT_RATE_LIMIT: RateLimitConfig = { requestsPerMinute: 60, burst: 4 };
+
+export class RequestScheduler {
+  private readonly concurrency: number;
+  private readonly rateLimits: Record<string, RateLimitConfig>;
+  private readonly defaultRateLimit: RateLimitConfig;
+  private readonly maxRetries: number;
+  private readonly retryBaseDelayMs: number;
+  private readonly maxRetryDelayMs: number;
+
+  private readonly buckets = new Map<string, TokenBucket>();
+  private readonly highQueue: QueuedTask[] = [];
+  private readonly normalQueue: QueuedTask[] = [];
+  private active = 0;
+  private completed = 0;
+  private failed = 0;
+  private retries = 0;
+  private rateLimited = 0;
+
+  constructor(options: SchedulerOptions = {}) {
+    this.concurrency = Math.max(1, options.concurrency ?? 4);
+    this.rateLimits = options.rateLimits ?? {};
+    this.defaultRateLimit = options.defaultRateLimit ?? DEFAULT_RATE_LIMIT;
+    this.maxRetries = options.maxRetries ?? 4;
+    this.retryBaseDelayMs = options.retryBaseDelayMs ?? 1000;
+    this.maxRetryDelayMs = options.maxRetryDelayMs ?? 30000;
+  }
+
+  /**
+   * Queue a call against a provider. Resolves with the task's result once a
+   * worker and a rate-limit token were available and any 429 retries ran out.
+   */
+  schedule<T>(provider: string, task: () => Promise<T>, options: ScheduleOptions = {}): Promise<T> {
+    return new Promise<T>((resolve, reject) => {
+      const queued: QueuedTask = {
+        provider,
+        run: task,
+        resolve: resolve as (value: unknown) => void,
+        reject,
+      };
+      if (options.priority === 'high') {
+        this.highQueue.push(queued);
+      } else {
+        this.normalQueue.push(queued);
+      }
+      this.pump();
+    });
+  }
+
+  get stats(): SchedulerStats {
+    return {
+      active: this.active,
+      queued: this.highQueue.length + this.normalQueue.length,
+      completed: this.completed,
+      failed: this.failed,
+      retries: this.retries,
+      rateLimited: this.rateLimited,
+    };
+  }
+
+  private getBucket(provider: string): TokenBucket {
+    let bucket = this.buckets.get(provider);
+    if (!bucket) {
+      bucket = new TokenBucket(this.rateLimits[provider] ?? this.defaultRateLimit);
+      this.buckets.set(provider, bucket);
+    }
+    return bucket;
+  }
+
+  private pump(): void {
+    while (this.active < this.concurrency) {
+      const next = this.highQueue.shift() ?? this.normalQueue.shift();
+      if (!next) return;
+
+      this.active++;
+      this.execute(next).finally(() => {
+        this.active--;
+        this.pump();
+      });
+    }
+  }
+
+  private async execute(task: QueuedTask): Promise<void> {
+    const bucket = this.getBucket(task.provider);
+
+    for (let attempt = 0; ; attempt++) {
+      await bucket.take();
+      try {
+        const result = await task.run();
+        this.completed++;
+        task.resolve(result);
+        return;
+      } catch (error) {
+        if (!isRateLimitError(error) || attempt >= this.maxRetries) {
+          this.failed++;
+          task.reject(error);
+          return;
+        }
+
+        this.rateLimited++;
+        this.retries++;
+        const backoff = Math.min(this.maxRetryDelayMs, this.retryBaseDelayMs * 2 ** attempt);
+        // Jitter so workers released together don't retry in lockstep
+        const delay = backoff / 2 + Math.random() * (backoff / 2);
+        bucket.pause(delay);
+      }
+    }
+  }
+}
@@ -27,7 +27,7 @@ import {
   type EvalRecord,
 } from './grader';
 import {
-  saveEvalRecord,
+  saveEvalRecords,
   saveSkillTestSuite,
   getSkillTestSuite,
   getWorkflowTestSuite,
@@ -35,6 +35,8 @@ import {
 } from './evalStorage';
 import { SKILLS } from '../skills/static';
 import { callGeminiAPI } from './apiHelper';
+import { RequestScheduler, type RateLimitConfig } from './scheduler';
+import { logger } from '../logger';
 
 // ═══════════════════════════════════════════════════════════════════════════
 // TYPES
@@ -93,29 +95,95 @@ export interface TestRunOptions {
   testTypes?: ('happy-path' | 'edge-case' | 'variant')[]; // Filter test types
   runGrading?: boolean; // Whether to run AI grading (slower)
   onProgress?: (progress: { completed: number; total: number; current: string }) => void;
-  onTestComplete?: (result: TestRunResult) => void;
-  concurrency?: number; // Max parallel tests (default 1 for rate limiting)
-  delayBetweenTests?: number; // Delay in ms between tests (default 1000)
+  onTestComplete?: (result: TestRunResult) => void; // Called as each test finishes, in completion order
+  concurrency?: number; // Max API calls in flight (default 4)
+  delayBetweenTests?: number; // Legacy pacing: used as 60000 / delay rpm when rateLimits has no gemini entry
+  rateLimits?: Record<string, RateLimitConfig>; // Per-provider token buckets (default gemini: 60 rpm, burst 4)
+  maxRetries?: number; // Retries per call after a 429 (default 4)
+  scheduler?: RequestScheduler; // Share one scheduler (and its quota) across concurrent runs
+  persist?: boolean; // Read/write test suites and eval records in IndexedDB (default true)
+  baseUrl?: string; // Override the Gemini endpoint (mock servers, proxies)
 }
 
 // ═══════════════════════════════════════════════════════════════════════════
-// HELPERS
+// RUN CONTEXT
 // ═══════════════════════════════════════════════════════════════════════════
 
+const DEFAULT_MODEL = 'gemini-1.5-flash-latest';
+const PROVIDER = 'gemini';
+const EVAL_WRITE_BATCH_SIZE = 25;
+
 /**
- * Sleep for specified milliseconds
+ * Buffers eval records and writes them in batched transactions
  */
-function sleep(ms: number): Promise<void> {
-  return new Promise((resolve) => setTimeout(resolve, ms));
+class EvalRecordWriter {
+  private buffer: EvalRecord[] = [];
+  private pending: Promise<void> = Promise.resolve();
+
+  add(record: EvalRecord): void {
+    this.buffer.push(record);
+    if (this.buffer.length >= EVAL_WRITE_BATCH_SIZE) {
+      this.write();
+    }
+  }
+
+  flush(): Promise<void> {
+    this.write();
+    return this.pending;
+  }
+
+  private write(): void {
+    if (this.buffer.length === 0) return;
+    const batch = this.buffer;
+    this.buffer = [];
+    this.pending = this.pending
+      .then(() => saveEvalRecords(batch))
+      .catch((error) => {
+        logger.error('Failed to save eval records', {
+          count: batch.length,
+          error: error instanceof Error ? error.message : String(error),
+        });
+      });
+  }
+}
+
+interface RunContext {
+  scheduler: RequestScheduler;
+  evalWriter: EvalRecordWriter | null;
+  modelId: string;
+}
+
+function createRunContext(options: TestRunOptions): RunContext {
+  const rateLimits = { ...options.rateLimits };
+  if (!rateLimits[PROVIDER] && options.delayBetweenTests && options.delayBetweenTests > 0) {
+    rateLimits[PROVIDER] = { requestsPerMinute: 60000 / options.delayBetweenTests, burst: 1 };
+  }
+
+  return {
+    scheduler:
+      options.scheduler ??
+      new RequestScheduler({
+        concurrency: options.concurrency,
+        rateLimits,
+        maxRetries: options.maxRetries,
+      }),
+    evalWriter: options.persist === false ? null : new EvalRecordWriter(),
+    modelId: options.modelId || DEFAULT_MODEL,
+  };
 }
 
 /**
  * Run a single skill test case
+ *
+ * Generation and grading are separate scheduler tasks: grading is queued at
+ * high priority as soon as its output arrives, while other workers keep
+ * generating.
  */
 async function runSkillTest(
   skill: SkillSchema,
   testCase: TestCase,
-  options: TestRunOptions
+  options: TestRunOptions,
+  ctx: RunContext
 ): Promise<TestRunResult> {
   const startTime = Date.now();
 
@@ -141,11 +209,8 @@ async function runSkillTest(
     const { systemInstruction, userPrompt } = skillDef.generatePrompt(testCase.inputPayload);
 
     // Call API
-    const result = await callGeminiAPI(
-      systemInstruction,
-      userPrompt,
-      options.apiKey,
-      options.modelId || 'gemini-1.5-flash-latest'
+    const result = await ctx.scheduler.schedule(PROVIDER, () =>
+      callGeminiAPI(systemInstruction, userPrompt, options.apiKey, ctx.modelId, options.baseUrl)
     );
 
     const output = result.response;
@@ -155,7 +220,7 @@ async function runSkillTest(
     const structuralValidation = validateOutputStructure(output);
 
     // Determine pass/fail based on structural validation
-    const status = structuralValidation.passed ? 'passed' : 'failed';
+    const status = structuralValidation.isValid ? 'passed' : 'failed';
 
     const testResult: TestRunResult = {
       skillId: skill.id,
@@ -178,11 +243,10 @@ async function runSkillTest(
         skill.name
       );
 
-      const gradingResult = await callGeminiAPI(
-        systemPrompt,
-        gradingPrompt,
-        options.apiKey,
-        options.modelId || 'gemini-1.5-flash-latest'
+      const gradingResult = await ctx.scheduler.schedule(
+        PROVIDER,
+        () => callGeminiAPI(systemPrompt, gradingPrompt, options.apiKey, ctx.modelId, options.baseUrl),
+        { priority: 'high' }
       );
 
       const parsedGrading = parseGradingResponse(gradingResult.response, testCase, skill.id);
@@ -193,10 +257,10 @@ async function runSkillTest(
         testCase,
         output,
         parsedGrading,
-        { executionTimeMs, modelUsed: options.modelId || 'gemini-1.5-flash-latest' }
+        { executionTimeMs, modelUsed: ctx.modelId }
       );
 
-      await saveEvalRecord(evalRecord);
+      ctx.evalWriter?.add(evalRecord);
       testResult.evalRecord = evalRecord;
     }
 
@@ -214,16 +278,13 @@ async function runSkillTest(
   }
 }
 
-// ═══════════════════════════════════════════════════════════════════════════
-// MAIN TEST RUNNER
-// ═══════════════════════════════════════════════════════════════════════════
-
 /**
- * Run tests for a single skill
+ * Run every test case of one skill through the shared scheduler
  */
-export async function runSkillTests(
+async function runSkillSuite(
   skillId: string,
-  options: TestRunOptions
+  options: TestRunOptions,
+  ctx: RunContext
 ): Promise<TestSuiteResult> {
   const skill = getSkillSchema(skillId);
   if (!skill) {
@@ -242,10 +303,12 @@ export async function runSkillTests(
   }
 
   // Get or generate test suite
-  let testSuite = await getSkillTestSuite(skillId);
+  let testSuite = options.persist === false ? undefined : await getSkillTestSuite(skillId);
   if (!testSuite) {
     testSuite = generateSkillTestSuite(skill);
-    await saveSkillTestSuite(testSuite);
+    if (options.persist !== false) {
+      await saveSkillTestSuite(testSuite);
+    }
   }
 
   // Filter test cases by type if specified
@@ -254,7 +317,6 @@ export async function runSkillTests(
     testCases = testCases.filter((tc) => options.testTypes!.includes(tc.type));
   }
 
-  const testResults: TestRunResult[] = [];
   let passed = 0;
   let failed = 0;
   let errors = 0;
@@ -262,37 +324,36 @@ export async function runSkillTests(
   let totalScore = 0;
   let scoredCount = 0;
 
-  for (const testCase of testCases) {
-    const result = await runSkillTest(skill, testCase, options);
-    testResults.push(result);
-
-    switch (result.status) {
-      case 'passed':
-        passed++;
-        break;
-      case 'failed':
-        failed++;
-        break;
-      case 'error':
-        errors++;
-        break;
-      case 'skipped':
-        skipped++;
-        break;
-    }
-
-    if (result.evalRecord) {
-      totalScore += result.evalRecord.gradingResult.overallScore;
-      scoredCount++;
-    }
+  // All cases are queued at once; the scheduler bounds how many run.
+  // Results keep test case order, callbacks fire in completion order.
+  const testResults = await Promise.all(
+    testCases.map(async (testCase) => {
+      const result = await runSkillTest(skill, testCase, options, ctx);
+
+      switch (result.status) {
+        case 'passed':
+          passed++;
+          break;
+        case 'failed':
+          failed++;
+          break;
+        case 'error':
+          errors++;
+          break;
+        case 'skipped':
+          skipped++;
+          break;
+      }
 
-    options.onTestComplete?.(result);
+      if (result.evalRecord) {
+        totalScore += result.evalRecord.gradingResult.overallScore;
+        scoredCount++;
+      }
 
-    // Delay between tests to avoid rate limiting
-    if (options.delayBetweenTests) {
-      await sleep(options.delayBetweenTests);
-    }
-  }
+      options.onTestComplete?.(result);
+      return result;
+    })
+  );
 
   return {
     itemId: skillId,
@@ -309,8 +370,28 @@ export async function runSkillTests(
   };
 }
 
+// ═══════════════════════════════════════════════════════════════════════════
+// MAIN TEST RUNNER
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Run tests for a single skill
+ */
+export async function runSkillTests(
+  skillId: string,
+  options: TestRunOptions
+): Promise<TestSuiteResult> {
+  const ctx = createRunContext(options);
+  const result = await runSkillSuite(skillId, options, ctx);
+  await ctx.evalWriter?.flush();
+  return result;
+}
+
 /**
  * Run all skill tests
+ *
+ * Every suite is queued on one scheduler, so the worker pool and rate limits
+ * apply across skills rather than per skill.
  */
 export async function runAllSkillTests(options: TestRunOptions): Promise<FullTestRunResult> {
   const startTime = new Date();
@@ -320,29 +401,34 @@ export async function runAllSkillTests(options: TestRunOptions): Promise<FullTes
   const staticSkills = allSkills.filter((s) => s.source === 'static');
 
   // Filter by specific IDs if provided
-  const skillsToTest = options.skillIds
-    ? staticSkills.filter((s) => options.skillIds!.includes(s.id))
-    : staticSkills;
+  const skillIds = options.skillIds ? new Set(options.skillIds) : null;
+  const skillsToTest = skillIds ? staticSkills.filter((s) => skillIds.has(s.id)) : staticSkills;
+
+  const ctx = createRunContext(options);
+  let completedSuites = 0;
+
+  const suiteResults = await Promise.all(
+    skillsToTest.map(async (skill) => {
+      const result = await runSkillSuite(skill.id, options, ctx);
+      completedSuites++;
+      options.onProgress?.({
+        completed: completedSuites,
+        total: skillsToTest.length,
+        current: skill.name,
+      });
+      return result;
+    })
+  );
+
+  await ctx.evalWriter?.flush();
 
-  const suiteResults: TestSuiteResult[] = [];
   let totalTests = 0;
   let totalPassed = 0;
   let totalFailed = 0;
   let totalErrors = 0;
   let totalSkipped = 0;
 
-  for (let i = 0; i < skillsToTest.length; i++) {
-    const skill = skillsToTest[i];
-
-    options.onProgress?.({
-      completed: i,
-      total: skillsToTest.length,
-      current: skill.name,
-    });
-
-    const result = await runSkillTests(skill.id, options);
-    suiteResults.push(result);
-
+  for (const result of suiteResults) {
     totalTests += result.totalTests;
     totalPassed += result.passed;
     totalFailed += result.failed;
@@ -2,8 +2,15 @@
  * batch.ts - Batch Workflow Execution
  *
  * Executes workflows with multiple input sets in parallel with rate limiting.
+ * Every step of an item starts as soon as its own dependencies finish; steps
+ * from all items share one pool of `concurrency` slots, so a batch never has more
+ * provider calls in flight than configured. Progress can be checkpointed and
+ * a paused or interrupted batch resumed from its last checkpoint.
  */
 
+import { logger } from '../logger';
+import { evaluateCondition } from './conditions';
+import { buildStepGraph } from './parallelExecutor';
 import type { Workflow, WorkflowExecution, WorkflowStep } from '../storage/types';
 
 /**
@@ -38,6 +45,11 @@ export interface BatchExecution {
   };
 }
 
+/**
+ * Batch execution without its items (stored checkpoint header)
+ */
+export type BatchExecutionSummary = Omit<BatchExecution, 'items'>;
+
 /**
  * Options for batch execution
  */
@@ -50,6 +62,34 @@ export interface BatchOptions {
   onProgress?: (progress: BatchExecution['progress']) => void;
 }
 
+/**
+ * Runs one workflow step for a batch item and resolves with its output
+ */
+export type BatchStepExecutor = (
+  step: WorkflowStep,
+  context: {
+    globalInputs: Record<string, string>;
+    outputs: Record<string, string>;
+    signal: AbortSignal;
+  }
+) => Promise<string>;
+
+/**
+ * Options for runBatchExecution
+ */
+export interface BatchRunOptions extends BatchOptions {
+  /** Aborting pauses the batch: no new steps start and in-flight steps are cancelled */
+  signal?: AbortSignal;
+  /** Persist the batch header plus the items changed since the previous call */
+  checkpoint?: (batch: BatchExecution, changedItemIndexes: number[]) => Promise<void>;
+  /** Minimum time between checkpoint writes in ms (default: 1000) */
+  checkpointIntervalMs?: number;
+  /** Receives a new batch snapshot as items progress */
+  onUpdate?: (batch: BatchExecution) => void;
+  /** Minimum time between onUpdate calls in ms (default: 200) */
+  updateIntervalMs?: number;
+}
+
 /**
  * Create a new batch execution
  */
@@ -150,6 +190,18 @@ export function exportBatchResultsToCSV(
   batch: BatchExecution,
   workflow: Workflow
 ): string {
+  return Array.from(streamBatchResultsCSV(batch, workflow)).join('\n');
+}
+
+/**
+ * Yield the batch results CSV one line at a time (header first, no line
+ * terminators), so large batches can be written out as Blob parts without
+ * building the whole file as a single string.
+ */
+export function* streamBatchResultsCSV(
+  batch: BatchExecution,
+  workflow: Workflow
+): Generator<string> {
   const headers = [
     'Item ID',
     'Status',
@@ -158,8 +210,9 @@ export function exportBatchResultsToCSV(
     ...workflow.globalInputs.map((i) => `Input: ${i.label}`),
     ...workflow.steps.map((s) => `Output: ${s.name}`),
   ];
+  yield headers.join(',');
 
-  const rows = batch.items.map((item) => {
+  for (const item of batch.items) {
     const inputValues = workflow.globalInputs.map((i) =>
       escapeCSVValue(item.inputs[i.id] || '')
     );
@@ -168,7 +221,7 @@ export function exportBatchResultsToCSV(
       escapeCSVValue(item.result?.stepOutputs[s.outputKey] || '')
     );
 
-    return [
+    yield [
       item.id,
       item.status,
       item.startedAt || '',
@@ -176,9 +229,7 @@ export function exportBatchResultsToCSV(
       ...inputValues,
       ...outputValues,
     ].join(',');
-  });
-
-  return [headers.join(','), ...rows].join('\n');
+  }
 }
 
 /**
@@ -240,3 +291,378 @@ export function getBatchSummary(batch: BatchExecution): {
     avgDurationMs: durationsCount > 0 ? totalDurationMs / durationsCount : 0,
   };
 }
+
+/**
+ * Count finished items for a batch's progress
+ */
+function countProgress(items: BatchItem[]): BatchExecution['progress'] {
+  let completed = 0;
+  let failed = 0;
+  for (const item of items) {
+    if (item.status === 'completed') completed++;
+    else if (item.status === 'error') failed++;
+  }
+  return { total: items.length, completed, failed };
+}
+
+/**
+ * Prepare a stored batch for another run: items that were mid-flight when
+ * the page closed go back to pending (keeping their finished step outputs),
+ * and failed items are retried if requested.
+ */
+export function prepareBatchForResume(
+  batch: BatchExecution,
+  options: { retryFailed?: boolean } = {}
+): BatchExecution {
+  const items = batch.items.map((item): BatchItem => {
+    if (item.status === 'running' || (options.retryFailed && item.status === 'error')) {
+      return { ...item, status: 'pending', error: undefined };
+    }
+    return item;
+  });
+  return { ...batch, items, status: 'paused', progress: countProgress(items) };
+}
+
+/**
+ * Per-item scheduling state while a batch runs
+ */
+interface ItemRun {
+  index: number;
+  execution: WorkflowExecution;
+  /** Step ID → dependencies that have not finished yet */
+  waiting: Map<string, number>;
+  ready: WorkflowStep[];
+  running: number;
+  failed: boolean;
+  closed: boolean;
+}
+
+/**
+ * Run every pending item of a batch through the workflow.
+ *
+ * Each step of an item is queued the moment its dependencies have completed
+ * or been skipped, so independent branches run in parallel without waiting
+ * for each other. Steps from all items share `concurrency`
+ * slots; a freed slot goes to the oldest open item with a ready step, and a
+ * new item is only opened when no open item can use it. Steps that already
+ * completed in an earlier run are not executed again.
+ *
+ * Aborting `options.signal` pauses the batch: in-flight steps are cancelled,
+ * their items go back to pending, and the returned batch has status 'paused'.
+ * Resolves once every item has finished or the pause has settled.
+ */
+export function runBatchExecution(
+  batch: BatchExecution,
+  workflow: Workflow,
+  executeStep: BatchStepExecutor,
+  options: BatchRunOptions = {}
+): Promise<BatchExecution> {
+  const concurrency = Math.max(1, options.concurrency ?? batch.concurrency);
+  const signal = options.signal ?? new AbortController().signal;
+  const graph = buildStepGraph(workflow.steps);
+  const stepMap = new Map<string, WorkflowStep>(workflow.steps.map((step) => [step.id, step]));
+  const stepIndex = new Map<string, number>(workflow.steps.map((step, index) => [step.id, index]));
+
+  const prepared = prepareBatchForResume(batch);
+  const items = prepared.items.slice();
+  let current: BatchExecution = {
+    ...prepared,
+    items,
+    status: 'running',
+    concurrency,
+    startedAt: batch.startedAt ?? new Date().toISOString(),
+    completedAt: undefined,
+  };
+
+  const open: ItemRun[] = [];
+  let cursor = 0;
+  let active = 0;
+  let done = false;
+
+  // ─────────────────────────────────────────────────────────────────────────
+  // Snapshots: throttled onUpdate and write-behind checkpoints
+  // ─────────────────────────────────────────────────────────────────────────
+
+  const dirty = new Set<number>(items.map((_, index) => index));
+  let updateTimer: ReturnType<typeof setTimeout> | null = null;
+  let checkpointTimer: ReturnType<typeof setTimeout> | null = null;
+  let checkpointing: Promise<void> | null = null;
+
+  const snapshot = (): BatchExecution => ({ ...current, items: items.slice() });
+
+  const emitUpdate = () => {
+    if (updateTimer) clearTimeout(updateTimer);
+    updateTimer = null;
+    options.onUpdate?.(snapshot());
+  };
+
+  const writeCheckpoint = () => {
+    checkpointTimer = null;
+    if (!options.checkpoint || checkpointing) return;
+    const changed = [...dirty];
+    dirty.clear();
+    checkpointing = options
+      .checkpoint(snapshot(), changed)
+      .catch((error) => {
+        // Retry these items with the next write
+        changed.forEach((index) => dirty.add(index));
+        logger.warn('Batch checkpoint failed', {
+          batchId: current.id,
+          error: error instanceof Error ? error.message : String(error),
+        });
+      })
+      .finally(() => {
+        checkpointing = null;
+        if (dirty.size > 0 && !done) scheduleCheckpoint();
+      });
+  };
+
+  const scheduleCheckpoint = () => {
+    if (!options.checkpoint || checkpointTimer || checkpointing) return;
+    checkpointTimer = setTimeout(writeCheckpoint, options.checkpointIntervalMs ?? 1000);
+  };
+
+  const touch = (index: number) => {
+    dirty.add(index);
+    if (options.onUpdate && !updateTimer) {
+      updateTimer = setTimeout(emitUpdate, options.updateIntervalMs ?? 200);
+    }
+    scheduleCheckpoint();
+  };
+
+  const updateItem = (run: ItemRun, patch: Partial<BatchItem>) => {
+    items[run.index] = {
+      ...items[run.index],
+      ...patch,
+      result: {
+        ...run.execution,
+        stepOutputs: { ...run.execution.stepOutputs },
+        stepStatuses: { ...run.execution.stepStatuses },
+      },
+    };
+    touch(run.index);
+  };
+
+  const setProgress = (progress: BatchExecution['progress']) => {
+    current = { ...current, progress };
+    options.onProgress?.(progress);
+  };
+
+  // ─────────────────────────────────────────────────────────────────────────
+  // Item lifecycle
+  // ─────────────────────────────────────────────────────────────────────────
+
+  const isDone = (run: ItemRun, stepId: string) => {
+    const status = run.execution.stepStatuses[stepId];
+    return status === 'completed' || status === 'skipped';
+  };
+
+  /**
+   * Queue a step whose dependencies have finished, or skip it when its
+   * condition is not met
+   */
+  const enqueue = (run: ItemRun, step: WorkflowStep) => {
+    const { stepOutputs, stepStatuses } = run.execution;
+    if (step.condition && !evaluateCondition(step.condition, stepOutputs, workflow.steps)) {
+      stepStatuses[step.id] = 'skipped';
+      release(run, step.id);
+      return;
+    }
+    stepStatuses[step.id] = 'pending';
+    run.ready.push(step);
+  };
+
+  /**
+   * A step finished; queue the dependents that were only waiting on it
+   */
+  const release = (run: ItemRun, stepId: string) => {
+    for (const dependent of graph.dependents.get(stepId)!) {
+      const left = run.waiting.get(dependent)! - 1;
+      run.waiting.set(dependent, left);
+      if (left === 0) enqueue(run, stepMap.get(dependent)!);
+    }
+  };
+
+  /**
+   * Count unfinished dependencies and queue the steps that can start now,
+   * skipping steps that completed in an earlier run
+   */
+  const queueInitialSteps = (run: ItemRun) => {
+    for (const step of workflow.steps) {
+      if (isDone(run, step.id)) continue;
+      const deps = graph.dependencies.get(step.id)!;
+      run.waiting.set(step.id, deps.filter((dep) => !isDone(run, dep)).length);
+    }
+    for (const step of workflow.steps) {
+      if (!isDone(run, step.id) && run.waiting.get(step.id) === 0) enqueue(run, step);
+    }
+  };
+
+  const close = (run: ItemRun, patch: Partial<BatchItem>) => {
+    run.closed = true;
+    open.splice(open.indexOf(run), 1);
+    updateItem(run, patch);
+  };
+
+  const openItem = (index: number): ItemRun | null => {
+    const item = items[index];
+    if (item.status !== 'pending') return null;
+
+    const startedAt = item.startedAt ?? new Date().toISOString();
+    const previous = item.result;
+    const run: ItemRun = {
+      index,
+      execution: previous
+        ? {
+            ...previous,
+            stepOutputs: { ...previous.stepOutputs },
+            stepStatuses: { ...previous.stepStatuses },
+            status: 'running',
+          }
+        : {
+            id: `${item.id}-execution`,
+            workflowId: workflow.id,
+            workflowName: workflow.name,
+            status: 'running',
+            currentStepIndex: 0,
+            globalInputs: item.inputs,
+            stepOutputs: {},
+            stepStatuses: {},
+            startedAt,
+          },
+      waiting: new Map(),
+      ready: [],
+      running: 0,
+      failed: false,
+      closed: false,
+    };
+
+    open.push(run);
+    updateItem(run, { status: 'running', startedAt, error: undefined });
+    options.onItemStart?.(items[index]);
+    queueInitialSteps(run);
+    settle(run);
+    return run.closed ? null : run;
+  };
+
+  /**
+   * Close an item once nothing of it is running any more
+   */
+  const settle = (run: ItemRun) => {
+    if (run.closed || run.running > 0) return;
+    const completedAt = new Date().toISOString();
+
+    if (run.failed) {
+      const error = run.execution.error ?? 'Unknown error';
+      run.execution = { ...run.execution, status: 'error', completedAt };
+      close(run, { status: 'error', error, completedAt });
+      setProgress({ ...current.progress, failed: current.progress.failed + 1 });
+      options.onItemError?.(items[run.index], error);
+    } else if (signal.aborted) {
+      for (const [stepId, status] of Object.entries(run.execution.stepStatuses)) {
+        if (status === 'running') run.execution.stepStatuses[stepId] = 'pending';
+      }
+      run.execution = { ...run.execution, status: 'paused' };
+      close(run, { status: 'pending' });
+    } else if (run.ready.length === 0) {
+      run.execution = { ...run.execution, status: 'completed', completedAt };
+      close(run, { status: 'completed', completedAt });
+      setProgress({ ...current.progress, completed: current.progress.completed + 1 });
+      options.onItemComplete?.(items[run.index]);
+    }
+  };
+
+  const runStep = async (run: ItemRun, step: WorkflowStep) => {
+    const { execution } = run;
+    execution.stepStatuses[step.id] = 'running';
+    execution.currentStepIndex = stepIndex.get(step.id) ?? execution.currentStepIndex;
+    updateItem(run, {});
+
+    try {
+      const output = await executeStep(step, {
+        globalInputs: execution.globalInputs,
+        outputs: { ...execution.stepOutputs },
+        signal,
+      });
+      execution.stepOutputs[step.outputKey] = output;
+      execution.stepStatuses[step.id] = 'completed';
+      if (!run.failed && !signal.aborted) release(run, step.id);
+    } catch (error) {
+      if (signal.aborted) {
+        execution.stepStatuses[step.id] = 'pending';
+      } else {
+        execution.stepStatuses[step.id] = 'error';
+        execution.error = `${step.name}: ${error instanceof Error ? error.message : 'Unknown error'}`;
+        run.failed = true;
+        run.ready = [];
+      }
+    }
+    updateItem(run, {});
+  };
+
+  // ─────────────────────────────────────────────────────────────────────────
+  // Scheduling
+  // ─────────────────────────────────────────────────────────────────────────
+
+  const takeReady = (): { run: ItemRun; step: WorkflowStep } | null => {
+    for (const run of open) {
+      if (run.ready.length > 0) return { run, step: run.ready.shift()! };
+    }
+    while (cursor < items.length) {
+      const run = openItem(cursor++);
+      if (run && run.ready.length > 0) return { run, step: run.ready.shift()! };
+    }
+    return null;
+  };
+
+  return new Promise<BatchExecution>((resolve) => {
+    const finish = async () => {
+      done = true;
+      // Items that were opened but never got a slot before the pause
+      for (const run of [...open]) settle(run);
+
+      current = {
+        ...current,
+        status: signal.aborted ? 'paused' : 'completed',
+        completedAt: signal.aborted ? undefined : new Date().toISOString(),
+      };
+
+      if (checkpointTimer) clearTimeout(checkpointTimer);
+      checkpointTimer = null;
+      await checkpointing;
+      writeCheckpoint();
+      await checkpointing;
+
+      const result = snapshot();
+      if (updateTimer) clearTimeout(updateTimer);
+      options.onUpdate?.(result);
+      resolve(result);
+    };
+
+    const pump = () => {
+      if (done) return;
+      while (active < concurrency && !signal.aborted) {
+        const next = takeReady();
+        if (!next) break;
+
+        active++;
+        next.run.running++;
+        runStep(next.run, next.step).finally(() => {
+          active--;
+          next.run.running--;
+          settle(next.run);
+          pump();
+        });
+      }
+
+      if (active === 0 && (signal.aborted || (open.length === 0 && cursor >= items.length))) {
+        void finish();
+      }
+    };
+
+    signal.addEventListener('abort', pump, { once: true });
+    options.onProgress?.(current.progress);
+    writeCheckpoint();
+    pump();
+  });
+}
@@ -2251,6 +2251,7 @@ export const AI_IMPLEMENTATION_WORKFLOW: Workflow = {
         additionalContext: { type: 'global', inputId: 'additionalContext' },
       },
       outputKey: 'dataReadinessAudit',
+      dependsOn: ['step-use-case-prioritization'],
     },
     {
       id: 'step-risk-assessment',
@@ -2276,6 +2277,7 @@ export const AI_IMPLEMENTATION_WORKFLOW: Workflow = {
         additionalContext: { type: 'global', inputId: 'additionalContext' },
       },
       outputKey: 'riskAssessment',
+      dependsOn: ['step-use-case-prioritization'],
     },
     {
       id: 'step-cost-benefit',
@@ -2303,6 +2305,7 @@ export const AI_IMPLEMENTATION_WORKFLOW: Workflow = {
         additionalContext: { type: 'global', inputId: 'additionalContext' },
       },
       outputKey: 'costBenefitAnalysis',
+      dependsOn: ['step-use-case-prioritization', 'step-risk-assessment'],
     },
     {
       id: 'step-pilot-design',
@@ -2330,6 +2333,7 @@ export const AI_IMPLEMENTATION_WORKFLOW: Workflow = {
         additionalContext: { type: 'global', inputId: 'additionalContext' },
       },
       outputKey: 'pilotDesign',
+      dependsOn: ['step-use-case-prioritization', 'step-data-readiness', 'step-risk-assessment'],
     },
     {
       id: 'step-architecture',
@@ -2356,6 +2360,7 @@ export const AI_IMPLEMENTATION_WORKFLOW: Workflow = {
         additionalRequirements: { type: 'previous', stepId: 'step-data-readiness', outputKey: 'dataReadinessAudit' },
       },
       outputKey: 'architectureBlueprint',
+      dependsOn: ['step-use-case-prioritization', 'step-data-readiness'],
     },
     {
       id: 'step-change-management',
@@ -2384,6 +2389,7 @@ export const AI_IMPLEMENTATION_WORKFLOW: Workflow = {
         additionalContext: { type: 'global', inputId: 'additionalContext' },
       },
       outputKey: 'changeManagementPlaybook',
+      dependsOn: ['step-use-case-prioritization', 'step-risk-assessment'],
     },
     {
       id: 'step-security-compliance',
@@ -2411,6 +2417,7 @@ export const AI_IMPLEMENTATION_WORKFLOW: Workflow = {
         additionalContext: { type: 'global', inputId: 'additionalContext' },
       },
       outputKey: 'securityComplianceAssessment',
+      dependsOn: ['step-use-case-prioritization', 'step-architecture'],
     },
     {
       id: 'step-monitoring',
@@ -2441,6 +2448,7 @@ export const AI_IMPLEMENTATION_WORKFLOW: Workflow = {
         additionalContext: { type: 'global', inputId: 'additionalContext' },
       },
       outputKey: 'monitoringSpec',
+      dependsOn: ['step-use-case-prioritization', 'step-architecture', 'step-data-readiness', 'step-pilot-design'],
     },
     {
       id: 'step-communications',
@@ -2468,6 +2476,7 @@ export const AI_IMPLEMENTATION_WORKFLOW: Workflow = {
         additionalContext: { type: 'global', inputId: 'additionalContext' },
       },
       outputKey: 'communicationPackage',
+      dependsOn: ['step-use-case-prioritization', 'step-cost-benefit', 'step-change-management', 'step-pilot-design'],
     },
   ],
 };
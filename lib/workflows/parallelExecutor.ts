@@ -3,7 +3,9 @@
  *
  * This module provides utilities for executing workflow steps in parallel
  * when they don't have dependencies on each other. It analyzes the step
- * dependencies and groups independent steps together.
+ * dependencies, groups independent steps together for display, and runs
+ * steps from a ready queue: each step starts as soon as its own
+ * dependencies finish instead of waiting for a whole group.
  */
 
 import { logger } from '../logger';
@@ -18,73 +20,120 @@ export interface ExecutionGroup {
 }
 
 /**
- * Build execution groups from workflow steps based on dependencies
+ * Resolved dependency graph for a workflow's steps
+ */
+export interface StepGraph {
+  /** Steps in workflow order */
+  steps: WorkflowStep[];
+  /** Step ID → IDs of the steps it waits for */
+  dependencies: Map<string, string[]>;
+  /** Step ID → IDs of the steps waiting for it */
+  dependents: Map<string, string[]>;
+  /** Step ID → execution group index (longest dependency chain before it) */
+  levels: Map<string, number>;
+}
+
+/**
+ * Build the dependency graph for workflow steps
  *
- * Steps are grouped such that:
- * 1. All steps in a group have their dependencies satisfied by previous groups
- * 2. Steps within a group can run in parallel
+ * Dependencies come from `dependsOn`, or default to the previous step.
+ * Levels are assigned with Kahn's algorithm in O(steps + dependencies).
+ * Steps caught in a cycle or waiting on an unknown step can never become
+ * ready; they are chained to run one by one after every other step.
  *
  * @param steps - The workflow steps to analyze
- * @returns Array of execution groups in order
+ * @returns The resolved graph
  */
-export function buildExecutionGroups(steps: WorkflowStep[]): ExecutionGroup[] {
-  if (steps.length === 0) return [];
-
-  // Build dependency map
-  const stepMap = new Map<string, WorkflowStep>();
-  steps.forEach((step) => stepMap.set(step.id, step));
+export function buildStepGraph(steps: WorkflowStep[]): StepGraph {
+  const ids = new Set(steps.map((step) => step.id));
+  const dependencies = new Map<string, string[]>();
+  const dependents = new Map<string, string[]>();
+  const levels = new Map<string, number>();
+  const waiting = new Map<string, number>();
 
-  // Resolve dependencies for each step
-  const dependencies = new Map<string, Set<string>>();
   steps.forEach((step, index) => {
+    let deps: string[];
     if (step.dependsOn && step.dependsOn.length > 0) {
       // Use explicit dependencies
-      dependencies.set(step.id, new Set(step.dependsOn));
+      deps = [...new Set(step.dependsOn)];
     } else if (index > 0) {
       // Default: depend on the previous step
-      dependencies.set(step.id, new Set([steps[index - 1].id]));
+      deps = [steps[index - 1].id];
     } else {
       // First step has no dependencies
-      dependencies.set(step.id, new Set());
+      deps = [];
     }
+
+    dependencies.set(step.id, deps);
+    dependents.set(step.id, []);
+    waiting.set(step.id, deps.length);
   });
 
-  // Build execution groups using topological sort
-  const groups: ExecutionGroup[] = [];
-  const completed = new Set<string>();
-  const remaining = new Set(steps.map((s) => s.id));
-
-  let groupIndex = 0;
-  while (remaining.size > 0) {
-    // Find all steps whose dependencies are satisfied
-    const readySteps: string[] = [];
-    for (const stepId of remaining) {
-      const deps = dependencies.get(stepId) || new Set();
-      const depsArray = Array.from(deps);
-      if (depsArray.every((dep) => completed.has(dep))) {
-        readySteps.push(stepId);
-      }
+  for (const [stepId, deps] of dependencies) {
+    for (const dep of deps) {
+      // Unknown dependencies are never released, so the step stays waiting
+      if (ids.has(dep)) dependents.get(dep)!.push(stepId);
     }
+  }
+
+  // Topological sort, one pass over every edge
+  const queue = steps.filter((step) => waiting.get(step.id) === 0).map((step) => step.id);
+  queue.forEach((stepId) => levels.set(stepId, 0));
+  for (let head = 0; head < queue.length; head++) {
+    const stepId = queue[head];
+    const level = levels.get(stepId)!;
+    for (const dependent of dependents.get(stepId)!) {
+      levels.set(dependent, Math.max(levels.get(dependent) ?? 0, level + 1));
+      const left = waiting.get(dependent)! - 1;
+      waiting.set(dependent, left);
+      if (left === 0) queue.push(dependent);
+    }
+  }
 
-    if (readySteps.length === 0) {
-      // Circular dependency or missing dependency
-      logger.error('Circular or missing dependency detected');
-      // Add remaining steps as a sequential fallback
-      for (const stepId of remaining) {
-        groups.push({ groupIndex: groupIndex++, stepIds: [stepId] });
-        completed.add(stepId);
+  if (queue.length < steps.length) {
+    // Circular or missing dependency - run the rest sequentially at the end
+    logger.error('Circular or missing dependency detected');
+    const unresolved = steps.filter((step) => waiting.get(step.id)! > 0);
+    let previous: string[] = queue.slice();
+    let level = Math.max(-1, ...queue.map((stepId) => levels.get(stepId)!));
+
+    for (const step of unresolved) {
+      for (const dep of dependencies.get(step.id)!) {
+        const list = dependents.get(dep);
+        const position = list ? list.indexOf(step.id) : -1;
+        if (position !== -1) list!.splice(position, 1);
       }
-      break;
+      dependencies.set(step.id, previous);
+      previous.forEach((dep) => dependents.get(dep)!.push(step.id));
+      levels.set(step.id, ++level);
+      previous = [step.id];
     }
+  }
 
-    // Create a group with all ready steps
-    groups.push({ groupIndex: groupIndex++, stepIds: readySteps });
+  return { steps, dependencies, dependents, levels };
+}
 
-    // Mark these steps as completed
-    readySteps.forEach((stepId) => {
-      completed.add(stepId);
-      remaining.delete(stepId);
-    });
+/**
+ * Build execution groups from workflow steps based on dependencies
+ *
+ * Steps are grouped such that:
+ * 1. All steps in a group have their dependencies satisfied by previous groups
+ * 2. Steps within a group can run in parallel
+ *
+ * @param steps - The workflow steps to analyze
+ * @returns Array of execution groups in order
+ */
+export function buildExecutionGroups(steps: WorkflowStep[]): ExecutionGroup[] {
+  if (steps.length === 0) return [];
+
+  const { levels } = buildStepGraph(steps);
+  const groups: ExecutionGroup[] = [];
+  for (const step of steps) {
+    const groupIndex = levels.get(step.id)!;
+    while (groups.length <= groupIndex) {
+      groups.push({ groupIndex: groups.length, stepIds: [] });
+    }
+    groups[groupIndex].stepIds.push(step.id);
   }
 
   return groups;
@@ -112,23 +161,317 @@ export function getMaxParallelism(steps: WorkflowStep[]): number {
   return Math.max(...groups.map((g) => g.stepIds.length), 1);
 }
 
+// ═══════════════════════════════════════════════════════════════════════════
+// READY-QUEUE EXECUTION
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Default per-provider limit on steps running at once in a single workflow
+ * run, kept under the providers' per-key concurrent request limits
+ */
+export const DEFAULT_PROVIDER_CONCURRENCY: Record<string, number> = {
+  gemini: 4,
+  claude: 3,
+  chatgpt: 4,
+};
+
+export type StepRunStatus = 'pending' | 'running' | 'completed' | 'skipped' | 'error';
+
+/**
+ * Wall-clock timing of one executed step (ms since epoch)
+ */
+export interface StepTiming {
+  /** When all dependencies had finished */
+  readyAt: number;
+  startedAt: number;
+  completedAt: number;
+}
+
+/**
+ * Options for executeStepGraph
+ */
+export interface StepGraphOptions {
+  /** Max steps running at once (default: unlimited) */
+  concurrency?: number;
+  /** Max steps running at once per provider, keyed by getProvider's result */
+  providerConcurrency?: Record<string, number>;
+  /** Provider a step calls (default: 'default') */
+  getProvider?: (step: WorkflowStep) => string;
+  /** Outputs and statuses from an earlier run; completed/skipped steps are not re-run */
+  initialOutputs?: Record<string, string>;
+  initialStatuses?: Record<string, StepRunStatus>;
+  /** Return a reason to skip a ready step (e.g. condition not met) */
+  shouldSkip?: (step: WorkflowStep, outputs: Record<string, string>) => string | null;
+  /** Stop starting new steps; running steps receive the signal */
+  signal?: AbortSignal;
+  onStepStart?: (step: WorkflowStep) => void;
+  onStepComplete?: (step: WorkflowStep, output: string, timing: StepTiming) => void;
+  onStepSkipped?: (step: WorkflowStep, reason: string) => void;
+  onStepError?: (step: WorkflowStep, error: string) => void;
+}
+
+/**
+ * Result of executeStepGraph
+ */
+export interface StepGraphResult {
+  outputs: Record<string, string>;
+  statuses: Record<string, StepRunStatus>;
+  errors: Record<string, string>;
+  timings: Record<string, StepTiming>;
+  hasError: boolean;
+  startedAt: number;
+  completedAt: number;
+}
+
+/**
+ * Execute workflow steps from a ready queue
+ *
+ * A step is queued the moment its last dependency completes or is skipped,
+ * and starts as soon as both the overall and its provider's concurrency
+ * allow. Queued steps start in workflow order. After a step fails no new
+ * steps start; steps already running finish, and steps downstream of the
+ * failure stay pending.
+ *
+ * @param steps - The workflow steps
+ * @param runStep - Executes one step given the outputs available so far
+ * @param options - Concurrency limits, resume state and callbacks
+ */
+export function executeStepGraph(
+  steps: WorkflowStep[],
+  runStep: (step: WorkflowStep, outputs: Record<string, string>, signal?: AbortSignal) => Promise<string>,
+  options: StepGraphOptions = {}
+): Promise<StepGraphResult> {
+  const graph = buildStepGraph(steps);
+  const stepMap = new Map<string, WorkflowStep>(steps.map((step) => [step.id, step]));
+  const order = new Map<string, number>(steps.map((step, index) => [step.id, index]));
+  const concurrency = Math.max(1, options.concurrency ?? Infinity);
+  const getProvider = options.getProvider ?? (() => 'default');
+  const signal = options.signal;
+
+  const outputs: Record<string, string> = { ...options.initialOutputs };
+  const statuses: Record<string, StepRunStatus> = {};
+  const errors: Record<string, string> = {};
+  const timings: Record<string, StepTiming> = {};
+  const readyAt = new Map<string, number>();
+  const waiting = new Map<string, number>();
+  const providerActive = new Map<string, number>();
+  const ready: string[] = [];
+  const startedAt = Date.now();
+  let active = 0;
+  let hasError = false;
+
+  const isDone = (stepId: string) =>
+    statuses[stepId] === 'completed' || statuses[stepId] === 'skipped';
+
+  /** Insert keeping workflow order so earlier steps win free slots */
+  const enqueue = (stepId: string) => {
+    const index = order.get(stepId)!;
+    let position = ready.length;
+    while (position > 0 && order.get(ready[position - 1])! > index) position--;
+    ready.splice(position, 0, stepId);
+  };
+
+  /** Mark a step done (completed or skipped) and queue dependents that became ready */
+  const release = (stepId: string) => {
+    for (const dependent of graph.dependents.get(stepId)!) {
+      const left = waiting.get(dependent)! - 1;
+      waiting.set(dependent, left);
+      if (left === 0) makeReady(dependent);
+    }
+  };
+
+  const makeReady = (stepId: string) => {
+    const step = stepMap.get(stepId)!;
+    const reason = options.shouldSkip?.(step, outputs);
+    if (reason) {
+      statuses[stepId] = 'skipped';
+      options.onStepSkipped?.(step, reason);
+      release(stepId);
+      return;
+    }
+    readyAt.set(stepId, Date.now());
+    enqueue(stepId);
+  };
+
+  for (const step of steps) {
+    const initial = options.initialStatuses?.[step.id];
+    statuses[step.id] = initial === 'completed' || initial === 'skipped' ? initial : 'pending';
+  }
+  for (const step of steps) {
+    const deps = graph.dependencies.get(step.id)!;
+    waiting.set(step.id, deps.filter((dep) => !isDone(dep)).length);
+  }
+  for (const step of steps) {
+    if (!isDone(step.id) && waiting.get(step.id) === 0) makeReady(step.id);
+  }
+
+  return new Promise<StepGraphResult>((resolve) => {
+    const finish = () =>
+      resolve({ outputs, statuses, errors, timings, hasError, startedAt, completedAt: Date.now() });
+
+    const start = (stepId: string) => {
+      const step = stepMap.get(stepId)!;
+      const provider = getProvider(step);
+      active++;
+      providerActive.set(provider, (providerActive.get(provider) ?? 0) + 1);
+      statuses[stepId] = 'running';
+      options.onStepStart?.(step);
+      const stepStartedAt = Date.now();
+
+      runStep(step, { ...outputs }, signal)
+        .then((output) => {
+          const timing = { readyAt: readyAt.get(stepId) ?? stepStartedAt, startedAt: stepStartedAt, completedAt: Date.now() };
+          outputs[step.outputKey] = output;
+          statuses[stepId] = 'completed';
+          timings[stepId] = timing;
+          options.onStepComplete?.(step, output, timing);
+          if (!hasError) release(stepId);
+        })
+        .catch((error) => {
+          const message = error instanceof Error ? error.message : 'Unknown error';
+          statuses[stepId] = 'error';
+          errors[stepId] = message;
+          hasError = true;
+          options.onStepError?.(step, message);
+        })
+        .finally(() => {
+          active--;
+          providerActive.set(provider, providerActive.get(provider)! - 1);
+          pump();
+        });
+    };
+
+    const pump = () => {
+      if (!hasError && !signal?.aborted) {
+        for (let i = 0; i < ready.length && active < concurrency; ) {
+          const stepId = ready[i];
+          const provider = getProvider(stepMap.get(stepId)!);
+          const limit = Math.max(1, options.providerConcurrency?.[provider] ?? Infinity);
+          if ((providerActive.get(provider) ?? 0) >= limit) {
+            i++;
+            continue;
+          }
+          ready.splice(i, 1);
+          start(stepId);
+        }
+      }
+      if (active === 0) finish();
+    };
+
+    pump();
+  });
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// CRITICAL PATH
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Critical path of a finished run
+ */
+export interface CriticalPathReport {
+  /** Step IDs from first to last along the chain that set the total time */
+  stepIds: string[];
+  /** Time spent running the steps on the path */
+  durationMs: number;
+  /** Time steps on the path were ready but waited for a free slot */
+  queuedMs: number;
+  /** First step start to last step end */
+  totalMs: number;
+}
+
+/**
+ * Find the chain of steps that determined a run's total time
+ *
+ * Starts from the step that finished last and repeatedly follows the
+ * dependency that finished last before it. Any speed-up of a step on this
+ * path shortens the run; speeding up other steps does not.
+ *
+ * @param steps - The workflow steps
+ * @param timings - Timings of executed steps, keyed by step ID
+ */
+export function getCriticalPath(
+  steps: WorkflowStep[],
+  timings: Record<string, StepTiming>
+): CriticalPathReport {
+  const { dependencies } = buildStepGraph(steps);
+  const timed = steps.filter((step) => timings[step.id]);
+  if (timed.length === 0) {
+    return { stepIds: [], durationMs: 0, queuedMs: 0, totalMs: 0 };
+  }
+
+  let last = timed[0].id;
+  let firstStart = timings[last].startedAt;
+  for (const step of timed) {
+    if (timings[step.id].completedAt > timings[last].completedAt) last = step.id;
+    firstStart = Math.min(firstStart, timings[step.id].startedAt);
+  }
+
+  const path: string[] = [];
+  let durationMs = 0;
+  let queuedMs = 0;
+  for (let current: string | undefined = last; current; ) {
+    const timing: StepTiming = timings[current];
+    path.unshift(current);
+    durationMs += timing.completedAt - timing.startedAt;
+    queuedMs += timing.startedAt - timing.readyAt;
+
+    let next: string | undefined;
+    for (const dep of dependencies.get(current) ?? []) {
+      if (timings[dep] && (!next || timings[dep].completedAt > timings[next].completedAt)) {
+        next = dep;
+      }
+    }
+    current = next;
+  }
+
+  return {
+    stepIds: path,
+    durationMs,
+    queuedMs,
+    totalMs: timings[last].completedAt - firstStart,
+  };
+}
+
+function formatSeconds(ms: number): string {
+  return `${(ms / 1000).toFixed(1)}s`;
+}
+
 /**
  * Visualize the execution plan as a text diagram
  *
+ * With timings from a finished run, each step shows how long it took,
+ * steps on the critical path are marked with `*`, and a summary of the
+ * critical path is appended.
+ *
  * @param steps - The workflow steps
+ * @param timings - Optional timings of executed steps, keyed by step ID
  * @returns A text representation of the execution plan
  */
-export function visualizeExecutionPlan(steps: WorkflowStep[]): string {
+export function visualizeExecutionPlan(
+  steps: WorkflowStep[],
+  timings?: Record<string, StepTiming>
+): string {
   const groups = buildExecutionGroups(steps);
   const stepMap = new Map<string, WorkflowStep>();
   steps.forEach((step) => stepMap.set(step.id, step));
 
+  const critical = timings ? getCriticalPath(steps, timings) : null;
+  const onPath = new Set(critical?.stepIds);
+  const label = (id: string) => {
+    const name = stepMap.get(id)?.name || id;
+    const timing = timings?.[id];
+    if (!timing) return name;
+    const mark = onPath.has(id) ? ' *' : '';
+    return `${name} (${formatSeconds(timing.completedAt - timing.startedAt)})${mark}`;
+  };
+
   const lines: string[] = [];
   lines.push('Execution Plan:');
   lines.push('===============');
 
   groups.forEach((group, index) => {
-    const stepNames = group.stepIds.map((id) => stepMap.get(id)?.name || id);
+    const stepNames = group.stepIds.map(label);
     if (stepNames.length === 1) {
       lines.push(`${index + 1}. ${stepNames[0]}`);
     } else {
@@ -139,5 +482,20 @@ export function visualizeExecutionPlan(steps: WorkflowStep[]): string {
     }
   });
 
+  if (critical && critical.stepIds.length > 0) {
+    const sequentialMs = Object.values(timings!).reduce(
+      (sum, timing) => sum + (timing.completedAt - timing.startedAt),
+      0
+    );
+    lines.push('');
+    lines.push(`Critical path (*): ${critical.stepIds.map((id) => stepMap.get(id)?.name || id).join(' → ')}`);
+    lines.push(
+      `Critical path: ${formatSeconds(critical.durationMs)} running, ${formatSeconds(critical.queuedMs)} queued`
+    );
+    lines.push(
+      `Total: ${formatSeconds(critical.totalMs)} (${formatSeconds(sequentialMs)} if run one step at a time)`
+    );
+  }
+
   return lines.join('\n');
 }
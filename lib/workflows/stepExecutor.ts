@@ -0,0 +1,362 @@
+/**
+ * stepExecutor.ts - Single Workflow Step Execution
+ *
+ * Resolves a step's input mappings, builds the prompt for the referenced
+ * skill (static skill or role-template library skill) and streams the
+ * response from the selected provider. Shared by the single-run workflow
+ * page and the batch runner so both call providers the same way.
+ *
+ * Prompts are resolved through the skill registry (improved prompts win
+ * over the code-defined ones), served from the prompt cache that the
+ * runners warm with prefetchPrompts() before the first step.
+ */
+
+import { SKILLS, interpolateTemplate } from '../skills';
+import { getLibrarySkill } from '../skillLibrary';
+import { getEffectivePrompt } from '../selfImprovement/promptResolver';
+import { isSupabaseConfigured } from '../supabase';
+import { runSkillStream as runGeminiSkillStream } from '../gemini';
+import { runSkillStream as runClaudeSkillStream } from '../claude';
+import { runSkillStream as runChatGPTSkillStream, type ChatGPTModelType } from '../chatgpt';
+import { streamAIProxy, type ApiProvider, type KeyMode } from '../platformKeys';
+import type { WorkflowInputSource, WorkflowStep } from '../storage/types';
+
+// ═══════════════════════════════════════════════════════════════════════════
+// TYPES
+// ═══════════════════════════════════════════════════════════════════════════
+
+export interface StepProviderConfig {
+  provider: ApiProvider;
+  model: string;
+  keyMode: KeyMode;
+  apiKey: string;
+}
+
+export interface StepExecutionContext {
+  /** Global inputs for this run */
+  globalInputs: Record<string, string>;
+  /** Outputs of steps that already finished, keyed by outputKey */
+  outputs: Record<string, string>;
+  /** Provider, model and key to run with */
+  providerConfig: StepProviderConfig;
+  /** Stops reading the response stream when aborted */
+  signal?: AbortSignal;
+}
+
+const CLAUDE_API_MODELS = {
+  haiku: 'claude-3-5-haiku-latest',
+  sonnet: 'claude-3-5-sonnet-latest',
+  opus: 'claude-3-opus-latest',
+};
+
+// ═══════════════════════════════════════════════════════════════════════════
+// INPUT MAPPING
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Resolve one input mapping to its actual value
+ */
+export function resolveInputMapping(
+  mapping: WorkflowInputSource | undefined,
+  globalInputs: Record<string, string>,
+  outputs: Record<string, string>
+): string {
+  if (!mapping) return '';
+
+  switch (mapping.type) {
+    case 'global':
+      return globalInputs[mapping.inputId] || '';
+    case 'previous':
+      return outputs[mapping.outputKey] || '';
+    case 'static':
+      return mapping.value;
+    case 'computed': {
+      // Replace {{placeholders}} with global inputs, then previous outputs
+      let template = mapping.template;
+      Object.entries(globalInputs).forEach(([key, value]) => {
+        template = template.replace(new RegExp(`\\{\\{${key}\\}\\}`, 'g'), value);
+      });
+      Object.entries(outputs).forEach(([key, value]) => {
+        template = template.replace(new RegExp(`\\{\\{${key}\\}\\}`, 'g'), value);
+      });
+      return template;
+    }
+    default:
+      return '';
+  }
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// STREAM READERS
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Read a server-sent events body, passing each parsed `data:` payload to onData.
+ * Returns false from onData to stop reading.
+ */
+async function readEventStream(
+  response: Response,
+  onData: (data: string) => boolean | void,
+  signal?: AbortSignal
+): Promise<void> {
+  if (!response.body) throw new Error('Response body is null');
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+
+  while (true) {
+    signal?.throwIfAborted();
+    const { done, value } = await reader.read();
+    if (done) break;
+    const chunk = decoder.decode(value);
+    for (const line of chunk.split('\n')) {
+      if (line.startsWith('data: ') && onData(line.substring(6)) === false) {
+        return;
+      }
+    }
+  }
+}
+
+async function readClaudeStream(response: Response, signal?: AbortSignal): Promise<string> {
+  let fullResponse = '';
+  await readEventStream(
+    response,
+    (jsonStr) => {
+      if (jsonStr.trim() === '[DONE]') return false;
+      try {
+        const parsed = JSON.parse(jsonStr);
+        if (parsed.type === 'content_block_delta' && parsed.delta?.type === 'text_delta') {
+          fullResponse += parsed.delta.text;
+        }
+      } catch {
+        // Ignore parsing errors
+      }
+    },
+    signal
+  );
+  return fullResponse;
+}
+
+async function readChatGPTStream(response: Response, signal?: AbortSignal): Promise<string> {
+  let fullResponse = '';
+  await readEventStream(
+    response,
+    (jsonStr) => {
+      if (jsonStr.trim() === '[DONE]') return;
+      try {
+        const parsed = JSON.parse(jsonStr);
+        const content = parsed.choices?.[0]?.delta?.content;
+        if (content) {
+          fullResponse += content;
+        }
+      } catch {
+        // Ignore parsing errors
+      }
+    },
+    signal
+  );
+  return fullResponse;
+}
+
+async function runPlatformProxy(
+  config: StepProviderConfig,
+  systemPrompt: string,
+  userPrompt: string,
+  signal?: AbortSignal
+): Promise<string> {
+  const proxyModel = config.provider === 'gemini' ? 'gemini-2.0-flash' : config.model;
+  const stream = streamAIProxy({
+    model: proxyModel,
+    prompt: userPrompt,
+    systemPrompt,
+    maxTokens: 4096,
+    temperature: 0.7,
+  });
+
+  let fullResponse = '';
+  for await (const chunk of stream) {
+    signal?.throwIfAborted();
+    fullResponse += chunk;
+  }
+  return fullResponse;
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// STEP EXECUTION
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Resolve a step's prompt through the registry, or use the code-defined
+ * prompt when Supabase is not configured
+ */
+async function resolveStepPrompt(
+  skillId: string,
+  codePrompt: { systemInstruction: string; userPrompt: string },
+  interpolatedUserPrompt?: string
+): Promise<{ systemInstruction: string; userPrompt: string }> {
+  if (!isSupabaseConfigured()) {
+    return {
+      systemInstruction: codePrompt.systemInstruction,
+      userPrompt: interpolatedUserPrompt || codePrompt.userPrompt,
+    };
+  }
+  const { systemInstruction, userPrompt } = await getEffectivePrompt(skillId, codePrompt, interpolatedUserPrompt);
+  return { systemInstruction, userPrompt };
+}
+
+/**
+ * Execute a single workflow step and return the full response text.
+ * Supports both static skills and role-template library skills.
+ */
+export async function executeWorkflowStep(
+  step: WorkflowStep,
+  context: StepExecutionContext
+): Promise<string> {
+  const { globalInputs, outputs, providerConfig, signal } = context;
+  const { provider, model, keyMode, apiKey } = providerConfig;
+  signal?.throwIfAborted();
+
+  // First try static skills
+  const staticSkill = SKILLS[step.skillId];
+
+  if (staticSkill) {
+    const inputValues: Record<string, string> = {};
+    staticSkill.inputs.forEach((input) => {
+      inputValues[input.id] = resolveInputMapping(step.inputMappings[input.id], globalInputs, outputs);
+    });
+
+    // Registry may improve the system instruction; the user prompt is built in code
+    const codePrompt = staticSkill.generatePrompt(inputValues);
+    const promptData = await resolveStepPrompt(step.skillId, codePrompt, codePrompt.userPrompt);
+
+    if (keyMode === 'platform') {
+      return runPlatformProxy(providerConfig, promptData.systemInstruction, promptData.userPrompt, signal);
+    }
+
+    if (provider === 'gemini') {
+      const result = await runGeminiSkillStream(apiKey, promptData, staticSkill.useGoogleSearch);
+      const stream = result && result.stream ? result.stream : result;
+      if (!stream || typeof stream[Symbol.asyncIterator] !== 'function') {
+        throw new Error('Invalid response from Gemini service');
+      }
+      let fullResponse = '';
+      for await (const chunk of stream) {
+        signal?.throwIfAborted();
+        const text = typeof chunk.text === 'function' ? chunk.text() : chunk.text;
+        if (text) {
+          fullResponse += text;
+        }
+      }
+      return fullResponse;
+    }
+
+    if (provider === 'claude') {
+      const response = await runClaudeSkillStream(apiKey, promptData, model as 'haiku' | 'sonnet' | 'opus');
+      return readClaudeStream(response, signal);
+    }
+
+    if (provider === 'chatgpt') {
+      const response = await runChatGPTSkillStream(apiKey, promptData, model as ChatGPTModelType);
+      return readChatGPTStream(response, signal);
+    }
+
+    return '';
+  }
+
+  // Try library skill (role template skills)
+  const librarySkill = getLibrarySkill(step.skillId);
+
+  if (librarySkill && librarySkill.source === 'role-template') {
+    // Map workflow inputs to skill inputs
+    const inputValues: Record<string, string> = {};
+    Object.keys(step.inputMappings).forEach((inputId) => {
+      inputValues[inputId] = resolveInputMapping(step.inputMappings[inputId], globalInputs, outputs);
+    });
+
+    // Also include any skill inputs that might have defaults
+    librarySkill.inputs?.forEach((input) => {
+      if (!inputValues[input.id]) {
+        inputValues[input.id] = resolveInputMapping(step.inputMappings[input.id], globalInputs, outputs);
+      }
+    });
+
+    // Registry may improve both the system instruction and the user template
+    const resolved = await resolveStepPrompt(step.skillId, {
+      systemInstruction: librarySkill.prompts.systemInstruction,
+      userPrompt: librarySkill.prompts.userPromptTemplate,
+    });
+    const systemPrompt = resolved.systemInstruction;
+    const userPrompt = interpolateTemplate(resolved.userPrompt, inputValues);
+
+    if (keyMode === 'platform') {
+      return runPlatformProxy(providerConfig, systemPrompt, userPrompt, signal);
+    }
+
+    if (provider === 'gemini') {
+      const { GoogleGenerativeAI } = await import('@google/generative-ai');
+      const genAI = new GoogleGenerativeAI(apiKey);
+      const geminiModel = genAI.getGenerativeModel({
+        model: 'gemini-2.0-flash',
+        systemInstruction: systemPrompt,
+      });
+
+      const result = await geminiModel.generateContentStream({
+        contents: [{ role: 'user', parts: [{ text: userPrompt }] }],
+        generationConfig: {
+          temperature: librarySkill.config.temperature,
+          maxOutputTokens: Math.max(librarySkill.config.maxTokens, 16384),
+        },
+      });
+
+      let fullResponse = '';
+      for await (const chunk of result.stream) {
+        signal?.throwIfAborted();
+        const text = chunk.text();
+        if (text) {
+          fullResponse += text;
+        }
+      }
+      return fullResponse;
+    }
+
+    if (provider === 'claude') {
+      const claudeModel = model as keyof typeof CLAUDE_API_MODELS;
+      const response = await fetch('https://api.anthropic.com/v1/messages', {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'x-api-key': apiKey,
+          'anthropic-version': '2023-06-01',
+          'anthropic-dangerous-direct-browser-access': 'true',
+        },
+        body: JSON.stringify({
+          model: CLAUDE_API_MODELS[claudeModel],
+          max_tokens: librarySkill.config.maxTokens,
+          system: systemPrompt,
+          messages: [{ role: 'user', content: userPrompt }],
+          stream: true,
+        }),
+        signal,
+      });
+
+      if (!response.ok) {
+        const error = await response.text();
+        throw new Error(`Claude API error: ${error}`);
+      }
+
+      return readClaudeStream(response, signal);
+    }
+
+    if (provider === 'chatgpt') {
+      const response = await runChatGPTSkillStream(
+        apiKey,
+        { systemInstruction: systemPrompt, userPrompt },
+        model as ChatGPTModelType
+      );
+      return readChatGPTStream(response, signal);
+    }
+
+    return '';
+  }
+
+  throw new Error(`Skill not found: ${step.skillId}`);
+}
@@ -8,7 +8,9 @@ import { Button } from '../components/ui/Button';
 import { useToast } from '../hooks/useToast';
 import { SKILLS } from '../lib/skills';
 import { getApiKey } from '../lib/apiKeyStorage';
-import { runSkillStream } from '../lib/gemini';
+import { runBatchExecution, type BatchExecution } from '../lib/workflows/batch';
+import { executeWorkflowStep } from '../lib/workflows/stepExecutor';
+import type { Workflow } from '../lib/storage/types';
 import {
   Upload,
   FileSpreadsheet,
@@ -38,6 +40,9 @@ interface BatchItem {
 
 type BatchStatus = 'idle' | 'running' | 'paused' | 'completed';
 
+/** Rows processed at the same time */
+const BATCH_CONCURRENCY = 4;
+
 const BatchProcessingPage: React.FC = () => {
   const navigate = useNavigate();
   const { addToast } = useToast();
@@ -145,8 +150,41 @@ const BatchProcessingPage: React.FC = () => {
     return mapped;
   };
 
+  // Single-step workflow so CSV rows run through the shared batch engine
+  const skillWorkflow = useMemo<Workflow | null>(() => {
+    if (!selectedSkill) return null;
+    return {
+      id: `batch-${selectedSkill.id}`,
+      name: selectedSkill.name,
+      description: selectedSkill.description,
+      longDescription: '',
+      icon: 'FileSpreadsheet',
+      color: '',
+      estimatedTime: '',
+      outputs: [selectedSkill.name],
+      globalInputs: selectedSkill.inputs.map((input) => ({
+        id: input.id,
+        label: input.label,
+        type: 'text' as const,
+        required: false,
+      })),
+      steps: [
+        {
+          id: 'run',
+          skillId: selectedSkill.id,
+          name: selectedSkill.name,
+          description: selectedSkill.description,
+          inputMappings: Object.fromEntries(
+            selectedSkill.inputs.map((input) => [input.id, { type: 'global' as const, inputId: input.id }])
+          ),
+          outputKey: 'output',
+        },
+      ],
+    };
+  }, [selectedSkill]);
+
   const runBatch = async () => {
-    if (!selectedSkill) {
+    if (!selectedSkill || !skillWorkflow) {
       addToast('Please select a skill first', 'error');
       return;
     }
@@ -159,77 +197,52 @@ const BatchProcessingPage: React.FC = () => {
     }
 
     setBatchStatus('running');
-    abortControllerRef.current = new AbortController();
-
-    const pendingItems = items.filter((item) => item.status === 'pending' || item.status === 'error');
-
-    for (let i = 0; i < pendingItems.length; i++) {
-      if (abortControllerRef.current?.signal.aborted) {
-        setBatchStatus('paused');
-        return;
-      }
-
-      const item = pendingItems[i];
-
-      // Update status to running
-      setItems((prev) =>
-        prev.map((it) => (it.id === item.id ? { ...it, status: 'running' } : it))
-      );
+    const controller = new AbortController();
+    abortControllerRef.current = controller;
+
+    // Failed items are retried; completed ones are kept
+    const batch: BatchExecution = {
+      id: `batch-${selectedSkill.id}-${Date.now()}`,
+      workflowId: skillWorkflow.id,
+      workflowName: skillWorkflow.name,
+      items: items.map((item) => ({
+        id: item.id,
+        inputs: mapDataToInputs(item.data),
+        status: item.status === 'completed' ? 'completed' : 'pending',
+      })),
+      status: 'pending',
+      concurrency: BATCH_CONCURRENCY,
+      progress: { total: items.length, completed: 0, failed: 0 },
+    };
 
-      try {
-        const formData = mapDataToInputs(item.data);
-        const { systemInstruction, userPrompt } = selectedSkill.generatePrompt(formData);
-
-        const response = await runSkillStream(apiKey, {
-          systemInstruction,
-          userPrompt,
-        });
-
-        let output = '';
-        const reader = response.body?.getReader();
-        if (reader) {
-          const decoder = new TextDecoder();
-          while (true) {
-            const { done, value } = await reader.read();
-            if (done) break;
-
-            const chunk = decoder.decode(value, { stream: true });
-            const lines = chunk.split('\n');
-
-            for (const line of lines) {
-              if (line.startsWith('data: ')) {
-                const data = line.slice(6);
-                if (data === '[DONE]') continue;
-                try {
-                  const parsed = JSON.parse(data);
-                  const text = parsed.candidates?.[0]?.content?.parts?.[0]?.text || '';
-                  output += text;
-                } catch {
-                  // Ignore parse errors
-                }
-              }
-            }
-          }
-        }
+    const updateItem = (id: string, update: Partial<BatchItem>) => {
+      setItems((prev) => prev.map((it) => (it.id === id ? { ...it, ...update } : it)));
+    };
 
-        setItems((prev) =>
-          prev.map((it) =>
-            it.id === item.id ? { ...it, status: 'completed', output } : it
-          )
-        );
-        setProgress((prev) => ({ ...prev, completed: prev.completed + 1 }));
-      } catch (error) {
-        setItems((prev) =>
-          prev.map((it) =>
-            it.id === item.id
-              ? { ...it, status: 'error', error: error instanceof Error ? error.message : 'Unknown error' }
-              : it
-          )
-        );
+    const finished = await runBatchExecution(
+      batch,
+      skillWorkflow,
+      (step, context) =>
+        executeWorkflowStep(step, {
+          ...context,
+          providerConfig: { provider: 'gemini', model: 'gemini-2.0-flash', keyMode: 'personal', apiKey },
+        }),
+      {
+        signal: controller.signal,
+        onItemStart: (item) => updateItem(item.id, { status: 'running', error: undefined }),
+        onItemComplete: (item) =>
+          updateItem(item.id, { status: 'completed', output: item.result?.stepOutputs.output ?? '' }),
+        onItemError: (item, error) => updateItem(item.id, { status: 'error', error }),
+        onProgress: (batchProgress) =>
+          setProgress({ completed: batchProgress.completed, total: batchProgress.total }),
       }
+    );
 
-      // Small delay between items to avoid rate limiting
-      await new Promise((resolve) => setTimeout(resolve, 500));
+    if (finished.status === 'paused') {
+      // Items interrupted mid-run go back to pending
+      const interrupted = new Set(finished.items.filter((it) => it.status === 'pending').map((it) => it.id));
+      setItems((prev) => prev.map((it) => (interrupted.has(it.id) ? { ...it, status: 'pending' } : it)));
+      return;
     }
 
     setBatchStatus('completed');
@@ -5,7 +5,7 @@
  * Supports CSV upload and provides progress tracking with export.
  */
 
-import React, { useState, useMemo, useCallback } from 'react';
+import React, { useState, useMemo, useCallback, useEffect, useRef } from 'react';
 import { useParams, useNavigate, Link } from 'react-router-dom';
 import {
   ArrowLeft,
@@ -20,26 +20,38 @@ import {
   FileSpreadsheet,
   Trash2,
   Plus,
+  RotateCcw,
 } from 'lucide-react';
 import { WORKFLOWS } from '../lib/workflows';
+import { db } from '../lib/storage/indexeddb';
+import { executeWorkflowStep } from '../lib/workflows/stepExecutor';
+import { prefetchPrompts } from '../lib/selfImprovement/promptResolver';
+import { isSupabaseConfigured } from '../lib/supabase';
 import { Button } from '../components/ui/Button';
 import { Input } from '../components/ui/Input';
 import { Textarea } from '../components/ui/Textarea';
 import { Progress } from '../components/ui/Progress';
 import { useToast } from '../hooks/useToast';
+import { ProviderConfigStatus, useProviderConfig } from '../components/ProviderConfig';
+import { logger } from '../lib/logger';
 import {
   createBatchExecution,
   parseCSVToInputSets,
-  exportBatchResultsToCSV,
+  streamBatchResultsCSV,
   getBatchSummary,
+  prepareBatchForResume,
+  runBatchExecution,
   type BatchExecution,
-  type BatchItem,
+  type BatchExecutionSummary,
+  type BatchStepExecutor,
 } from '../lib/workflows/batch';
 
 const BatchRunnerPage: React.FC = () => {
   const { workflowId } = useParams<{ workflowId: string }>();
   const navigate = useNavigate();
   const { addToast } = useToast();
+  const { state: providerState, canRun, runStatus, availableModels } = useProviderConfig();
+  const abortControllerRef = useRef<AbortController | null>(null);
 
   // Get workflow
   const workflow = useMemo(() => {
@@ -54,6 +66,22 @@ const BatchRunnerPage: React.FC = () => {
   const [batch, setBatch] = useState<BatchExecution | null>(null);
   const [isRunning, setIsRunning] = useState(false);
   const [concurrency, setConcurrency] = useState(3);
+  const [resumableBatch, setResumableBatch] = useState<BatchExecutionSummary | null>(null);
+
+  // Look for a batch that was interrupted (page reload) or paused earlier
+  useEffect(() => {
+    if (!workflowId) return;
+    db.getBatchExecutionsByWorkflow(workflowId)
+      .then((batches) => {
+        setResumableBatch(batches.find((b) => b.status === 'running' || b.status === 'paused') ?? null);
+      })
+      .catch((error) => {
+        logger.error('Failed to load batch checkpoints', { error: error instanceof Error ? error.message : String(error) });
+      });
+  }, [workflowId]);
+
+  // Cancel in-flight steps when leaving the page; the checkpoint keeps progress
+  useEffect(() => () => abortControllerRef.current?.abort(), []);
 
   // Parse CSV preview
   const csvPreview = useMemo(() => {
@@ -118,10 +146,60 @@ const BatchRunnerPage: React.FC = () => {
     });
   };
 
+  // Run (or continue) a batch through the workflow engine
+  const executeBatch = useCallback(async (batchToRun: BatchExecution) => {
+    if (!workflow) return;
+
+    const executeStep: BatchStepExecutor = (step, context) =>
+      executeWorkflowStep(step, { ...context, providerConfig: providerState });
+
+    const controller = new AbortController();
+    abortControllerRef.current = controller;
+    setBatch(batchToRun);
+    setIsRunning(true);
+    setResumableBatch(null);
+
+    // Load registry prompts for every step with one query; each step then
+    // resolves its prompt from the cache
+    if (isSupabaseConfigured()) {
+      await prefetchPrompts(workflow.steps.map((step) => step.skillId));
+    }
+
+    try {
+      const finished = await runBatchExecution(batchToRun, workflow, executeStep, {
+        concurrency: batchToRun.concurrency,
+        signal: controller.signal,
+        checkpoint: (snapshot, changedItemIndexes) => db.saveBatchCheckpoint(snapshot, changedItemIndexes),
+        onUpdate: setBatch,
+      });
+      setBatch(finished);
+
+      if (finished.status === 'paused') {
+        addToast('Batch paused. Progress is saved and can be resumed.', 'info');
+      } else if (finished.progress.failed > 0) {
+        addToast(`Batch finished with ${finished.progress.failed} failed items`, 'info');
+      } else {
+        addToast('Batch completed!', 'success');
+      }
+    } catch (error) {
+      addToast(`Batch failed: ${error instanceof Error ? error.message : 'Unknown error'}`, 'error');
+    } finally {
+      if (abortControllerRef.current === controller) {
+        abortControllerRef.current = null;
+      }
+      setIsRunning(false);
+    }
+  }, [workflow, providerState, addToast]);
+
   // Start batch execution
   const startBatch = useCallback(async () => {
     if (!workflow) return;
 
+    if (!canRun) {
+      addToast(runStatus.reason || 'API Key is required.', 'error');
+      return;
+    }
+
     // Get input sets
     let inputSets: Record<string, string>[];
     if (inputMode === 'csv') {
@@ -135,45 +213,41 @@ const BatchRunnerPage: React.FC = () => {
       return;
     }
 
-    // Create batch
     const newBatch = createBatchExecution(workflow, inputSets, { concurrency });
-    newBatch.status = 'running';
-    newBatch.startedAt = new Date().toISOString();
-    setBatch(newBatch);
-    setIsRunning(true);
-
     addToast(`Starting batch of ${inputSets.length} items`, 'success');
+    await executeBatch(newBatch);
+  }, [workflow, canRun, runStatus, inputMode, csvText, columnMapping, manualItems, concurrency, addToast, executeBatch]);
+
+  // Resume a stored batch (after a reload) or continue a paused one
+  const resumeBatch = useCallback(async (batchId: string, retryFailed = false) => {
+    const stored = await db.getBatchExecution(batchId);
+    if (!stored) {
+      addToast('Saved batch not found', 'error');
+      setResumableBatch(null);
+      return;
+    }
+    await executeBatch(prepareBatchForResume(stored, { retryFailed }));
+  }, [executeBatch, addToast]);
 
-    // Note: Actual execution would happen here, but for now we just show the UI
-    // In a real implementation, you would call the workflow executor for each item
-    // with rate limiting based on concurrency
-
-    // Simulate completion for demo
-    setTimeout(() => {
-      setBatch((prev) => {
-        if (!prev) return prev;
-        return {
-          ...prev,
-          status: 'completed',
-          completedAt: new Date().toISOString(),
-          items: prev.items.map((item) => ({
-            ...item,
-            status: 'completed' as const,
-            completedAt: new Date().toISOString(),
-          })),
-          progress: { ...prev.progress, completed: prev.items.length },
-        };
-      });
-      setIsRunning(false);
-      addToast('Batch execution framework ready! Connect to workflow executor for full functionality.', 'info');
-    }, 2000);
-  }, [workflow, inputMode, csvText, columnMapping, manualItems, concurrency, addToast]);
+  // Pause: stop starting steps and cancel the running ones
+  const pauseBatch = () => {
+    abortControllerRef.current?.abort();
+  };
+
+  // Discard a stored batch
+  const discardBatch = async (batchId: string) => {
+    await db.deleteBatchExecution(batchId);
+    setResumableBatch(null);
+  };
 
-  // Export results
+  // Export results (available while running too)
   const exportResults = () => {
     if (!batch || !workflow) return;
-    const csv = exportBatchResultsToCSV(batch, workflow);
-    const blob = new Blob([csv], { type: 'text/csv' });
+    const lines: string[] = [];
+    for (const line of streamBatchResultsCSV(batch, workflow)) {
+      lines.push(line, '\n');
+    }
+    const blob = new Blob(lines, { type: 'text/csv' });
     const url = URL.createObjectURL(blob);
     const a = document.createElement('a');
     a.href = url;
@@ -218,6 +292,37 @@ const BatchRunnerPage: React.FC = () => {
 
       {!batch ? (
         <>
+          {/* Provider Status */}
+          <div className="mb-6">
+            <ProviderConfigStatus
+              providerState={providerState}
+              availableModels={availableModels}
+              canRun={canRun}
+            />
+          </div>
+
+          {/* Resume Interrupted Batch */}
+          {resumableBatch && (
+            <div className="rounded-xl border border-blue-500/30 bg-blue-500/5 p-4 mb-6 flex items-center justify-between gap-4">
+              <div>
+                <p className="font-medium">Unfinished batch found</p>
+                <p className="text-sm text-muted-foreground">
+                  {resumableBatch.progress.completed + resumableBatch.progress.failed} of {resumableBatch.progress.total} items processed
+                  {resumableBatch.startedAt && ` • started ${new Date(resumableBatch.startedAt).toLocaleString()}`}
+                </p>
+              </div>
+              <div className="flex gap-2">
+                <Button size="sm" onClick={() => resumeBatch(resumableBatch.id)}>
+                  <Play className="h-4 w-4 mr-1" />
+                  Resume
+                </Button>
+                <Button size="sm" variant="ghost" onClick={() => discardBatch(resumableBatch.id)}>
+                  Discard
+                </Button>
+              </div>
+            </div>
+          )}
+
           {/* Input Mode Toggle */}
           <div className="mb-6">
             <div className="flex gap-2">
@@ -386,7 +491,7 @@ const BatchRunnerPage: React.FC = () => {
                 />
               </div>
               <p className="text-sm text-muted-foreground">
-                Process up to {concurrency} items simultaneously
+                Run up to {concurrency} steps at once across all items
               </p>
             </div>
             <Button onClick={startBatch} disabled={isRunning} className="w-full">
@@ -469,14 +574,30 @@ const BatchRunnerPage: React.FC = () => {
           <div className="flex gap-4">
             <Button
               variant="outline"
-              onClick={() => {
-                setBatch(null);
-                setIsRunning(false);
-              }}
+              disabled={isRunning}
+              onClick={() => setBatch(null)}
             >
               New Batch
             </Button>
-            {batch.status === 'completed' && (
+            {isRunning && (
+              <Button variant="outline" onClick={pauseBatch}>
+                <Pause className="h-4 w-4 mr-2" />
+                Pause
+              </Button>
+            )}
+            {!isRunning && batch.status === 'paused' && (
+              <Button onClick={() => resumeBatch(batch.id)}>
+                <Play className="h-4 w-4 mr-2" />
+                Resume
+              </Button>
+            )}
+            {!isRunning && batch.status === 'completed' && batch.progress.failed > 0 && (
+              <Button variant="outline" onClick={() => resumeBatch(batch.id, true)}>
+                <RotateCcw className="h-4 w-4 mr-2" />
+                Retry Failed ({batch.progress.failed})
+              </Button>
+            )}
+            {batch.progress.completed > 0 && (
               <Button onClick={exportResults}>
                 <Download className="h-4 w-4 mr-2" />
                 Export Results
@@ -51,7 +51,7 @@ import {
   ChevronDown,
 } from 'lucide-react';
 import { getUserProfile } from './UserProfilePage';
-import { ROLE_DEFINITIONS } from '../lib/skillLibrary';
+import { getCatalogRoles } from '../lib/skillLibrary/catalog';
 import { hasStoredKey } from '../lib/apiKeyStorage';
 import { isAdmin } from '../lib/billing';
 import { useAuth } from '../hooks/useAuth';
@@ -102,6 +102,7 @@ const HomePage: React.FC = () => {
   const { user, appUser } = useAuth();
   const [hasProfile, setHasProfile] = useState(false);
   const [showLearnMore, setShowLearnMore] = useState(false);
+  const [roleCount, setRoleCount] = useState<number | null>(null);
   const [setupStatus, setSetupStatus] = useState({
     hasApiKey: false,
     hasProfile: false,
@@ -127,6 +128,12 @@ const HomePage: React.FC = () => {
     });
   }, [user, appUser]);
 
+  // Role count for the "more roles" link, only needed once Learn More is open
+  useEffect(() => {
+    if (!showLearnMore || roleCount !== null) return;
+    getCatalogRoles().then((roles) => setRoleCount(roles.length));
+  }, [showLearnMore, roleCount]);
+
   return (
     <div className="min-h-screen">
       {/* ═══════════════════════════════════════════════════════════════════════════
@@ -649,11 +656,13 @@ const HomePage: React.FC = () => {
                   })}
                 </div>
 
-                <div className="text-center">
-                  <Link to="/role-templates" className="text-sm text-muted-foreground hover:text-primary transition-colors">
-                    + {ROLE_DEFINITIONS.length - FEATURED_ROLES.length} more professional roles
-                  </Link>
-                </div>
+                {roleCount !== null && (
+                  <div className="text-center">
+                    <Link to="/role-templates" className="text-sm text-muted-foreground hover:text-primary transition-colors">
+                      + {roleCount - FEATURED_ROLES.length} more professional roles
+                    </Link>
+                  </div>
+                )}
               </div>
             </div>
           )}
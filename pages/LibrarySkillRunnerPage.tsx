@@ -20,8 +20,8 @@ import { executeDynamicSkill } from '../lib/skills/dynamic';
 import type { ChatGPTModelType } from '../lib/chatgpt';
 import { useToast } from '../hooks/useToast';
 import type { DynamicSkill, DynamicFormInput, SavedOutput, SkillExecution, FavoriteSkill } from '../lib/storage/types';
-import type { LibrarySkill } from '../lib/skillLibrary/types';
-import { ROLE_DEFINITIONS, getLibrarySkill } from '../lib/skillLibrary';
+import type { LibrarySkill, RoleDefinition } from '../lib/skillLibrary/types';
+import { getCatalogRoles, loadLibrarySkill } from '../lib/skillLibrary/catalog';
 import { db } from '../lib/storage/indexeddb';
 import { Button } from '../components/ui/Button';
 import { Input } from '../components/ui/Input';
@@ -72,6 +72,7 @@ const LibrarySkillRunnerPage: React.FC = () => {
   // Skill state
   const [librarySkill, setLibrarySkill] = useState<LibrarySkill | null>(null);
   const [loading, setLoading] = useState(true);
+  const [roles, setRoles] = useState<RoleDefinition[]>([]);
 
   // Form state
   const [formState, setFormState] = useState<Record<string, unknown>>({});
@@ -107,9 +108,14 @@ const LibrarySkillRunnerPage: React.FC = () => {
   const [showGrading, setShowGrading] = useState(false);
   const [executionIdForGrading, setExecutionIdForGrading] = useState<string>('');
 
+  // Role names for the header
+  useEffect(() => {
+    getCatalogRoles().then(setRoles);
+  }, []);
+
   // Load skill from sessionStorage or URL parameter
   useEffect(() => {
-    const loadSkill = () => {
+    const loadSkill = async () => {
       try {
         // First try sessionStorage
         const stored = sessionStorage.getItem('librarySkillToRun');
@@ -119,7 +125,7 @@ const LibrarySkillRunnerPage: React.FC = () => {
           skill = JSON.parse(stored) as LibrarySkill;
         } else if (skillId) {
           // If no sessionStorage, try to look up by URL param
-          skill = getLibrarySkill(skillId);
+          skill = await loadLibrarySkill(skillId);
         }
 
         if (skill) {
@@ -200,7 +206,7 @@ const LibrarySkillRunnerPage: React.FC = () => {
   // Get role name for display
   const getRoleName = (): string | null => {
     if (!librarySkill?.sourceRoleId) return null;
-    const role = ROLE_DEFINITIONS.find((r) => r.id === librarySkill.sourceRoleId);
+    const role = roles.find((r) => r.id === librarySkill.sourceRoleId);
     return role?.name || librarySkill.sourceRoleId.replace(/-/g, ' ');
   };
 
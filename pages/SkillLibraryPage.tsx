@@ -53,19 +53,14 @@ import {
   Copy,
   Check,
   Info,
+  Loader2,
 } from 'lucide-react';
 import { Button } from '../components/ui/Button';
 import { Input } from '../components/ui/Input';
-import {
-  getAllLibrarySkills,
-  filterSkills,
-  sortSkills,
-  getSkillCountByRole,
-  getSkillCountByCategory,
-  SKILL_COLLECTIONS,
-  ROLE_DEFINITIONS,
-  getCollectionSkills,
-} from '../lib/skillLibrary';
+import { getCatalogRoles, getSkillIndex, loadLibrarySkill } from '../lib/skillLibrary/catalog';
+import { SKILL_COLLECTIONS } from '../lib/skillLibrary/collections';
+import { SkillSearchIndex, sortSkills } from '../lib/skillLibrary/search';
+import { logger } from '../lib/logger';
 import {
   SKILL_CATEGORIES,
   SKILL_USE_CASES,
@@ -73,7 +68,8 @@ import {
   DEFAULT_FILTERS,
   type LibraryFilters,
   type LibrarySortOption,
-  type LibrarySkill,
+  type LibrarySkillSummary,
+  type RoleDefinition,
   type SkillCategory,
   type SkillUseCase,
   type SkillLevel,
@@ -132,6 +128,12 @@ const COLLECTION_ICONS: Record<string, React.ElementType> = {
   Rocket,
 };
 
+// Skill metadata and roles, loaded from the prebuilt catalog index
+interface LibraryCatalog {
+  index: SkillSearchIndex<LibrarySkillSummary>;
+  roles: RoleDefinition[];
+}
+
 const SkillLibraryPage: React.FC = () => {
   const navigate = useNavigate();
   const [searchParams, setSearchParams] = useSearchParams();
@@ -192,16 +194,55 @@ const SkillLibraryPage: React.FC = () => {
     search: debouncedSearch,
   }), [filters, debouncedSearch]);
 
-  // Get all skills and apply filters
-  const allSkills = useMemo(() => getAllLibrarySkills(), []);
-  const filteredSkills = useMemo(
-    () => sortSkills(filterSkills(allSkills, debouncedFilters), sortBy),
-    [allSkills, debouncedFilters, sortBy]
+  // Load skill summaries; prompts are only fetched when a skill is opened
+  const [catalog, setCatalog] = useState<LibraryCatalog | null>(null);
+  const [catalogError, setCatalogError] = useState(false);
+
+  useEffect(() => {
+    let cancelled = false;
+    Promise.all([getSkillIndex(), getCatalogRoles()])
+      .then(([skills, roles]) => {
+        if (!cancelled) {
+          setCatalog({ index: new SkillSearchIndex(skills), roles });
+        }
+      })
+      .catch((error) => {
+        logger.error('Failed to load skill library', { error: error instanceof Error ? error.message : String(error) });
+        if (!cancelled) setCatalogError(true);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, []);
+
+  const sortedRoles = useMemo(
+    () => [...(catalog?.roles ?? [])].sort((a, b) => a.name.localeCompare(b.name)),
+    [catalog]
   );
 
+  // Apply filters
+  const filteredSkills = useMemo(() => {
+    if (!catalog) return [];
+    return sortBy === 'relevance' && debouncedFilters.search
+      ? catalog.index.search(debouncedFilters).map((result) => result.skill)
+      : sortSkills(catalog.index.filter(debouncedFilters), sortBy);
+  }, [catalog, debouncedFilters, sortBy]);
+
   // Get counts for sidebar
-  const skillCountByRole = useMemo(() => getSkillCountByRole(), []);
-  const skillCountByCategory = useMemo(() => getSkillCountByCategory(), []);
+  const skillCountByRole = useMemo(() => {
+    const counts: Record<string, number> = {};
+    for (const role of catalog?.roles ?? []) {
+      counts[role.id] = catalog!.index.countByRole(role.id);
+    }
+    return counts;
+  }, [catalog]);
+  const skillCountByCategory = useMemo(() => {
+    const counts: Record<string, number> = {};
+    for (const category of SKILL_CATEGORIES) {
+      counts[category.value] = catalog?.index.countByCategory(category.value) ?? 0;
+    }
+    return counts;
+  }, [catalog]);
 
   // Update URL when role or useCase filter changes
   useEffect(() => {
@@ -257,13 +298,20 @@ const SkillLibraryPage: React.FC = () => {
     filters.skillIds.length > 0;
 
   // Handle skill launch
-  const handleLaunchSkill = (skill: LibrarySkill) => {
+  const handleLaunchSkill = async (skill: LibrarySkillSummary) => {
     if (skill.source === 'builtin') {
       navigate(`/skill/${skill.id}`);
-    } else {
-      // For template skills, store in session and navigate to runner
-      sessionStorage.setItem('librarySkillToRun', JSON.stringify(skill));
+      return;
+    }
+
+    // For template skills, load the full definition, store in session and navigate to runner
+    try {
+      const fullSkill = await loadLibrarySkill(skill.id);
+      if (!fullSkill) return;
+      sessionStorage.setItem('librarySkillToRun', JSON.stringify(fullSkill));
       navigate('/library-skill-runner');
+    } catch (error) {
+      logger.error('Failed to load library skill', { error: error instanceof Error ? error.message : String(error) });
     }
   };
 
@@ -340,7 +388,9 @@ const SkillLibraryPage: React.FC = () => {
                 Skill Library
               </h1>
               <p className="text-muted-foreground mt-1">
-                {allSkills.length} production-ready AI skills across {ROLE_DEFINITIONS.length} professional roles
+                {catalog
+                  ? `${catalog.index.size} production-ready AI skills across ${catalog.roles.length} professional roles`
+                  : 'Loading skills...'}
               </p>
             </div>
             <div className="flex items-center gap-3">
@@ -383,8 +433,7 @@ const SkillLibraryPage: React.FC = () => {
             >
               All Roles
             </button>
-            {[...ROLE_DEFINITIONS]
-              .sort((a, b) => a.name.localeCompare(b.name))
+            {sortedRoles
               .slice(0, 8)
               .map((role) => {
                 const Icon = ROLE_ICONS[role.id] || Briefcase;
@@ -404,12 +453,12 @@ const SkillLibraryPage: React.FC = () => {
                   </button>
                 );
               })}
-            {ROLE_DEFINITIONS.length > 8 && (
+            {sortedRoles.length > 8 && (
               <button
                 onClick={() => toggleSection('roles')}
                 className="px-3 py-1.5 rounded-full text-sm text-muted-foreground hover:text-foreground bg-muted/50"
               >
-                +{ROLE_DEFINITIONS.length - 8} more
+                +{sortedRoles.length - 8} more
               </button>
             )}
           </div>
@@ -495,9 +544,7 @@ const SkillLibraryPage: React.FC = () => {
                 {renderFilterSection(
                   'Professional Role',
                   'roles',
-                  [...ROLE_DEFINITIONS]
-                    .sort((a, b) => a.name.localeCompare(b.name))
-                    .map((r) => ({
+                  sortedRoles.map((r) => ({
                       value: r.id,
                       label: r.name,
                       count: skillCountByRole[r.id],
@@ -555,7 +602,9 @@ const SkillLibraryPage: React.FC = () => {
                 <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-4">
                   {SKILL_COLLECTIONS.filter((c) => c.featured).map((collection) => {
                     const Icon = COLLECTION_ICONS[collection.icon] || Sparkles;
-                    const skills = getCollectionSkills(collection.id);
+                    const skillCount = catalog
+                      ? collection.skillIds.filter((id) => catalog.index.get(id)).length
+                      : 0;
                     return (
                       <button
                         key={collection.id}
@@ -578,7 +627,7 @@ const SkillLibraryPage: React.FC = () => {
                           {collection.description}
                         </p>
                         <p className="text-xs text-muted-foreground mt-2">
-                          {skills.length} skills
+                          {skillCount} skills
                         </p>
                       </button>
                     );
@@ -609,7 +658,7 @@ const SkillLibraryPage: React.FC = () => {
                 )}
                 {filters.roles.length === 1 && (
                   <span className="px-2 py-0.5 rounded bg-primary/10 text-primary text-xs font-medium flex items-center gap-1">
-                    {ROLE_DEFINITIONS.find((r) => r.id === filters.roles[0])?.name}
+                    {sortedRoles.find((r) => r.id === filters.roles[0])?.name}
                     <button
                       onClick={() => setFilters((prev) => ({ ...prev, roles: [] }))}
                       className="hover:text-primary/80"
@@ -624,6 +673,7 @@ const SkillLibraryPage: React.FC = () => {
                 onChange={(e) => setSortBy(e.target.value as LibrarySortOption)}
                 className="text-sm border rounded-md px-2 py-1 bg-background"
               >
+                <option value="relevance">Sort: Best Match</option>
                 <option value="name">Sort: A-Z</option>
                 <option value="popular">Sort: Most Popular</option>
                 <option value="rating">Sort: Highest Rated</option>
@@ -632,7 +682,20 @@ const SkillLibraryPage: React.FC = () => {
             </div>
 
             {/* Skills Grid */}
-            {filteredSkills.length === 0 ? (
+            {!catalog ? (
+              <div className="text-center py-12 rounded-xl border border-dashed">
+                {catalogError ? (
+                  <>
+                    <h3 className="text-lg font-semibold">Couldn't Load Skills</h3>
+                    <p className="text-muted-foreground mt-1">
+                      Check your connection and reload the page
+                    </p>
+                  </>
+                ) : (
+                  <Loader2 className="mx-auto h-8 w-8 animate-spin text-primary" />
+                )}
+              </div>
+            ) : filteredSkills.length === 0 ? (
               <div className="text-center py-12 rounded-xl border border-dashed">
                 <Search className="mx-auto h-12 w-12 text-muted-foreground" />
                 <h3 className="mt-4 text-lg font-semibold">No Skills Found</h3>
@@ -649,6 +712,7 @@ const SkillLibraryPage: React.FC = () => {
                   <SkillCard
                     key={skill.id}
                     skill={skill}
+                    roles={sortedRoles}
                     onLaunch={() => handleLaunchSkill(skill)}
                   />
                 ))}
@@ -666,24 +730,26 @@ const SkillLibraryPage: React.FC = () => {
 // ═══════════════════════════════════════════════════════════════════════════
 
 interface SkillCardProps {
-  skill: LibrarySkill;
+  skill: LibrarySkillSummary;
+  roles: RoleDefinition[];
   onLaunch: () => void;
 }
 
-const SkillCard: React.FC<SkillCardProps> = ({ skill, onLaunch }) => {
+const SkillCard: React.FC<SkillCardProps> = ({ skill, roles, onLaunch }) => {
   const [copied, setCopied] = useState(false);
   const avgRating = skill.rating.count > 0 ? skill.rating.sum / skill.rating.count : 0;
   const CategoryIcon = CATEGORY_ICONS[skill.tags.category] || Sparkles;
 
   // Get role name for display
   const roleName = skill.tags.roles.length > 0
-    ? ROLE_DEFINITIONS.find((r) => r.id === skill.tags.roles[0])?.name
+    ? roles.find((r) => r.id === skill.tags.roles[0])?.name
     : null;
 
-  // Copy system prompt to clipboard
+  // Copy system prompt to clipboard (prompts are loaded on demand)
   const handleCopyPrompt = async (e: React.MouseEvent) => {
     e.stopPropagation();
-    const prompt = skill.prompts.systemInstruction;
+    const fullSkill = await loadLibrarySkill(skill.id);
+    const prompt = fullSkill?.prompts.systemInstruction;
     if (prompt) {
       await navigator.clipboard.writeText(prompt);
       setCopied(true);
@@ -707,7 +773,8 @@ const SkillCard: React.FC<SkillCardProps> = ({ skill, onLaunch }) => {
               <span>{avgRating.toFixed(1)}</span>
             </div>
           )}
-          {skill.prompts.systemInstruction && (
+          {/* Built-in skills run their own prompts and have none to copy */}
+          {skill.source !== 'builtin' && (
             <button
               onClick={handleCopyPrompt}
               className="p-1.5 rounded-md hover:bg-muted transition-colors"
@@ -9,7 +9,8 @@
  * ========================
  * 1. User selects a workflow from HomePage or navigation
  * 2. All global inputs are collected in a single form
- * 3. Steps execute sequentially, with progress visualization
+ * 3. Each step starts as soon as the steps it depends on finish, with
+ *    independent steps running in parallel and progress visualization
  * 4. Each step's output can feed into subsequent steps
  * 5. Final output package displays all results together
  */
@@ -49,11 +50,17 @@ import {
   Layers,
 } from 'lucide-react';
 import { WORKFLOWS } from '../lib/workflows';
-import { SKILLS, interpolateTemplate } from '../lib/skills';
-import { getAllLibrarySkills } from '../lib/skillLibrary';
 import { db } from '../lib/storage/indexeddb';
-import { buildExecutionGroups, hasParallelSteps } from '../lib/workflows/parallelExecutor';
+import {
+  DEFAULT_PROVIDER_CONCURRENCY,
+  executeStepGraph,
+  hasParallelSteps,
+  visualizeExecutionPlan,
+} from '../lib/workflows/parallelExecutor';
 import { evaluateCondition, describeCondition } from '../lib/workflows/conditions';
+import { executeWorkflowStep } from '../lib/workflows/stepExecutor';
+import { prefetchPrompts } from '../lib/selfImprovement/promptResolver';
+import { isSupabaseConfigured } from '../lib/supabase';
 import type { Workflow, WorkflowStep, WorkflowGlobalInput, DynamicSkill, WorkflowExecution } from '../lib/storage/types';
 import type { LibrarySkill } from '../lib/skillLibrary/types';
 import { Button } from '../components/ui/Button';
@@ -63,16 +70,12 @@ import { Select } from '../components/ui/Select';
 import { Progress } from '../components/ui/Progress';
 import { useToast } from '../hooks/useToast';
 import { useAppContext } from '../hooks/useAppContext';
-import { runSkillStream as runGeminiSkillStream } from '../lib/gemini';
-import { runSkillStream as runClaudeSkillStream } from '../lib/claude';
-import { runSkillStream as runChatGPTSkillStream, ChatGPTModelType } from '../lib/chatgpt';
 import type { ApiProviderType } from '../types';
 import { TestDataBanner } from '../components/TestOutputButton';
 import { ProviderConfigStatus, useProviderConfig } from '../components/ProviderConfig';
 import { ReadyToRunChecklist } from '../components/ReadyToRunChecklist';
 import { ExecutionSummary } from '../components/ExecutionSummary';
 import { checkPlatformStatus, type PlatformStatus } from '../lib/platformProxy';
-import { streamAIProxy } from '../lib/platformKeys';
 import { calculateCost } from '../lib/billing';
 import { recordUsage, createUsageRecordFromExecution } from '../lib/usageLedger';
 import { useAuth } from '../hooks/useAuth';
@@ -93,6 +96,9 @@ const WORKFLOW_ICONS: Record<string, React.FC<{ className?: string }>> = {
 // Step status type
 type StepStatus = 'pending' | 'running' | 'completed' | 'error' | 'skipped';
 
+/** Runs loaded into the history modal per page */
+const HISTORY_PAGE_SIZE = 20;
+
 const WorkflowRunnerPage: React.FC = () => {
   const { workflowId } = useParams<{ workflowId: string }>();
   const navigate = useNavigate();
@@ -135,6 +141,7 @@ const WorkflowRunnerPage: React.FC = () => {
   // History state
   const [showHistory, setShowHistory] = useState(false);
   const [executionHistory, setExecutionHistory] = useState<WorkflowExecution[]>([]);
+  const [historyCursor, setHistoryCursor] = useState<string | null>(null);
   const [currentExecutionId, setCurrentExecutionId] = useState<string | null>(null);
 
   // Platform status for ReadyToRunChecklist
@@ -149,13 +156,27 @@ const WorkflowRunnerPage: React.FC = () => {
   // Test data applied tracking
   const [testDataApplied, setTestDataApplied] = useState(false);
 
-  // Load execution history for this workflow
+  // Load the most recent page of execution history for this workflow
   useEffect(() => {
     if (workflowId) {
-      db.getWorkflowExecutionsByWorkflow(workflowId).then(setExecutionHistory);
+      db.getWorkflowExecutionsPage({ workflowId, limit: HISTORY_PAGE_SIZE }).then((page) => {
+        setExecutionHistory(page.items);
+        setHistoryCursor(page.nextCursor);
+      });
     }
   }, [workflowId]);
 
+  const loadMoreHistory = async () => {
+    if (!workflowId || !historyCursor) return;
+    const page = await db.getWorkflowExecutionsPage({
+      workflowId,
+      limit: HISTORY_PAGE_SIZE,
+      cursor: historyCursor,
+    });
+    setExecutionHistory((prev) => [...prev, ...page.items]);
+    setHistoryCursor(page.nextCursor);
+  };
+
   // Fetch platform status on mount
   useEffect(() => {
     checkPlatformStatus().then(setPlatformStatus).catch((error) => {
@@ -264,323 +285,16 @@ const WorkflowRunnerPage: React.FC = () => {
     return true;
   };
 
-  // Resolve input mapping to get actual value
-  const resolveInputMapping = (
-    step: WorkflowStep,
-    inputId: string,
-    currentOutputs: Record<string, string>
-  ): string => {
-    const mapping = step.inputMappings[inputId];
-    if (!mapping) return '';
-
-    switch (mapping.type) {
-      case 'global':
-        return globalInputs[mapping.inputId] || '';
-      case 'previous':
-        return currentOutputs[mapping.outputKey] || '';
-      case 'static':
-        return mapping.value;
-      case 'computed':
-        // Replace {{placeholders}} with actual values
-        let template = mapping.template;
-        // Replace global inputs
-        Object.entries(globalInputs).forEach(([key, value]) => {
-          template = template.replace(new RegExp(`\\{\\{${key}\\}\\}`, 'g'), value);
-        });
-        // Replace previous outputs
-        Object.entries(currentOutputs).forEach(([key, value]) => {
-          template = template.replace(new RegExp(`\\{\\{${key}\\}\\}`, 'g'), value);
-        });
-        return template;
-      default:
-        return '';
-    }
-  };
-
   // Execute a single step - supports both static skills and library skills
-  const executeStep = async (
+  const executeStep = (
     step: WorkflowStep,
     currentOutputs: Record<string, string>
-  ): Promise<string> => {
-    // First try static skills
-    const staticSkill = SKILLS[step.skillId];
-
-    if (staticSkill) {
-      // Execute static skill (original logic)
-      const inputValues: Record<string, string> = {};
-      staticSkill.inputs.forEach((input) => {
-        inputValues[input.id] = resolveInputMapping(step, input.id, currentOutputs);
-      });
-
-      const promptData = staticSkill.generatePrompt(inputValues);
-      let fullResponse = '';
-
-      const { provider, model, keyMode, apiKey } = providerState;
-      const currentApiKey = apiKey;
-
-      // Handle platform key mode with streaming
-      if (keyMode === 'platform') {
-        let proxyModel: string;
-        if (provider === 'gemini') {
-          proxyModel = 'gemini-2.0-flash';
-        } else if (provider === 'claude') {
-          proxyModel = model as string;
-        } else {
-          proxyModel = model as string;
-        }
-
-        const stream = streamAIProxy({
-          model: proxyModel,
-          prompt: promptData.userPrompt,
-          systemPrompt: promptData.systemInstruction,
-          maxTokens: 4096,
-          temperature: 0.7,
-        });
-
-        for await (const chunk of stream) {
-          fullResponse += chunk;
-        }
-        return fullResponse;
-      }
-
-      if (provider === 'gemini') {
-        const result = await runGeminiSkillStream(currentApiKey, promptData, staticSkill.useGoogleSearch);
-        const stream = result && result.stream ? result.stream : result;
-        if (!stream || typeof stream[Symbol.asyncIterator] !== 'function') {
-          throw new Error('Invalid response from Gemini service');
-        }
-        for await (const chunk of stream) {
-          const text = typeof chunk.text === 'function' ? chunk.text() : chunk.text;
-          if (text) {
-            fullResponse += text;
-          }
-        }
-      } else if (provider === 'claude') {
-        const claudeModel = model as 'haiku' | 'sonnet' | 'opus';
-        const response = await runClaudeSkillStream(currentApiKey, promptData, claudeModel);
-        if (!response.body) throw new Error('Response body is null');
-        const reader = response.body.getReader();
-        const decoder = new TextDecoder();
-        while (true) {
-          const { done, value } = await reader.read();
-          if (done) break;
-          const chunk = decoder.decode(value);
-          const lines = chunk.split('\n');
-          for (const line of lines) {
-            if (line.startsWith('data: ')) {
-              const jsonStr = line.substring(6);
-              if (jsonStr.trim() === '[DONE]') break;
-              try {
-                const parsed = JSON.parse(jsonStr);
-                if (parsed.type === 'content_block_delta' && parsed.delta.type === 'text_delta') {
-                  fullResponse += parsed.delta.text;
-                }
-              } catch {
-                // Ignore parsing errors
-              }
-            }
-          }
-        }
-      } else if (provider === 'chatgpt') {
-        const chatgptModel = model as ChatGPTModelType;
-        const response = await runChatGPTSkillStream(currentApiKey, promptData, chatgptModel);
-        if (!response.body) throw new Error('Response body is null');
-        const reader = response.body.getReader();
-        const decoder = new TextDecoder();
-        while (true) {
-          const { done, value } = await reader.read();
-          if (done) break;
-          const chunk = decoder.decode(value);
-          const lines = chunk.split('\n');
-          for (const line of lines) {
-            if (line.startsWith('data: ')) {
-              const jsonStr = line.substring(6);
-              if (jsonStr.trim() === '[DONE]') continue;
-              try {
-                const parsed = JSON.parse(jsonStr);
-                const content = parsed.choices?.[0]?.delta?.content;
-                if (content) {
-                  fullResponse += content;
-                }
-              } catch {
-                // Ignore parsing errors
-              }
-            }
-          }
-        }
-      }
-
-      return fullResponse;
-    }
-
-    // Try library skill (role template skills)
-    const allLibrarySkills = getAllLibrarySkills();
-    const librarySkill = allLibrarySkills.find(s => s.id === step.skillId);
-
-    if (librarySkill && librarySkill.source === 'role-template') {
-      // Build input values from workflow mappings
-      const inputValues: Record<string, string> = {};
-
-      // Map workflow inputs to skill inputs
-      Object.keys(step.inputMappings).forEach((inputId) => {
-        inputValues[inputId] = resolveInputMapping(step, inputId, currentOutputs);
-      });
-
-      // Also include any skill inputs that might have defaults
-      librarySkill.inputs?.forEach((input) => {
-        if (!inputValues[input.id]) {
-          inputValues[input.id] = resolveInputMapping(step, input.id, currentOutputs);
-        }
-      });
-
-      // Interpolate the user prompt template
-      const systemPrompt = librarySkill.prompts.systemInstruction;
-      const userPrompt = interpolateTemplate(librarySkill.prompts.userPromptTemplate, inputValues);
-
-      let fullResponse = '';
-
-      const { provider, model, keyMode, apiKey } = providerState;
-      const currentApiKey = apiKey;
-
-      // Handle platform key mode with streaming
-      if (keyMode === 'platform') {
-        let proxyModel: string;
-        if (provider === 'gemini') {
-          proxyModel = 'gemini-2.0-flash';
-        } else if (provider === 'claude') {
-          proxyModel = model as string;
-        } else {
-          proxyModel = model as string;
-        }
-
-        const stream = streamAIProxy({
-          model: proxyModel,
-          prompt: userPrompt,
-          systemPrompt: systemPrompt,
-          maxTokens: 4096,
-          temperature: 0.7,
-        });
-
-        for await (const chunk of stream) {
-          fullResponse += chunk;
-        }
-        return fullResponse;
-      }
-
-      if (provider === 'gemini') {
-        const { GoogleGenerativeAI } = await import('@google/generative-ai');
-        const genAI = new GoogleGenerativeAI(currentApiKey);
-        const geminiModel = genAI.getGenerativeModel({
-          model: 'gemini-2.0-flash',
-          systemInstruction: systemPrompt,
-        });
-
-        const result = await geminiModel.generateContentStream({
-          contents: [{ role: 'user', parts: [{ text: userPrompt }] }],
-          generationConfig: {
-            temperature: librarySkill.config.temperature,
-            maxOutputTokens: Math.max(librarySkill.config.maxTokens, 16384),
-          },
-        });
-
-        for await (const chunk of result.stream) {
-          const text = chunk.text();
-          if (text) {
-            fullResponse += text;
-          }
-        }
-      } else if (provider === 'claude') {
-        const CLAUDE_MODELS = {
-          haiku: 'claude-3-5-haiku-latest',
-          sonnet: 'claude-3-5-sonnet-latest',
-          opus: 'claude-3-opus-latest',
-        };
-        const claudeModel = model as 'haiku' | 'sonnet' | 'opus';
-
-        const response = await fetch('https://api.anthropic.com/v1/messages', {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-            'x-api-key': currentApiKey,
-            'anthropic-version': '2023-06-01',
-            'anthropic-dangerous-direct-browser-access': 'true',
-          },
-          body: JSON.stringify({
-            model: CLAUDE_MODELS[claudeModel],
-            max_tokens: librarySkill.config.maxTokens,
-            system: systemPrompt,
-            messages: [{ role: 'user', content: userPrompt }],
-            stream: true,
-          }),
-        });
-
-        if (!response.ok) {
-          const error = await response.text();
-          throw new Error(`Claude API error: ${error}`);
-        }
-
-        const reader = response.body?.getReader();
-        if (!reader) throw new Error('Response body is null');
-
-        const decoder = new TextDecoder();
-        while (true) {
-          const { done, value } = await reader.read();
-          if (done) break;
-          const chunk = decoder.decode(value);
-          const lines = chunk.split('\n');
-          for (const line of lines) {
-            if (line.startsWith('data: ')) {
-              const jsonStr = line.substring(6);
-              if (jsonStr.trim() === '[DONE]') break;
-              try {
-                const parsed = JSON.parse(jsonStr);
-                if (parsed.type === 'content_block_delta' && parsed.delta?.type === 'text_delta') {
-                  fullResponse += parsed.delta.text;
-                }
-              } catch {
-                // Ignore parsing errors
-              }
-            }
-          }
-        }
-      } else if (provider === 'chatgpt') {
-        const chatgptModel = model as ChatGPTModelType;
-        const response = await runChatGPTSkillStream(
-          currentApiKey,
-          { systemInstruction: systemPrompt, userPrompt },
-          chatgptModel
-        );
-        if (!response.body) throw new Error('Response body is null');
-        const reader = response.body.getReader();
-        const decoder = new TextDecoder();
-        while (true) {
-          const { done, value } = await reader.read();
-          if (done) break;
-          const chunk = decoder.decode(value);
-          const lines = chunk.split('\n');
-          for (const line of lines) {
-            if (line.startsWith('data: ')) {
-              const jsonStr = line.substring(6);
-              if (jsonStr.trim() === '[DONE]') continue;
-              try {
-                const parsed = JSON.parse(jsonStr);
-                const content = parsed.choices?.[0]?.delta?.content;
-                if (content) {
-                  fullResponse += content;
-                }
-              } catch {
-                // Ignore parsing errors
-              }
-            }
-          }
-        }
-      }
-
-      return fullResponse;
-    }
-
-    throw new Error(`Skill not found: ${step.skillId}`);
-  };
+  ): Promise<string> =>
+    executeWorkflowStep(step, {
+      globalInputs,
+      outputs: currentOutputs,
+      providerConfig: providerState,
+    });
 
   // Run the entire workflow
   const handleRunWorkflow = async () => {
@@ -603,103 +317,61 @@ const WorkflowRunnerPage: React.FC = () => {
     });
     setStepStatuses(newStatuses);
 
-    const outputs: Record<string, string> = {};
-    const finalStatuses: Record<string, 'pending' | 'running' | 'completed' | 'skipped' | 'error'> = { ...newStatuses };
+    // Load registry prompts for every step with one query; each step then
+    // resolves its prompt from the cache
+    if (isSupabaseConfigured()) {
+      await prefetchPrompts(workflow.steps.map((step) => step.skillId));
+    }
+
     const totalSteps = workflow.steps.length;
-    let hasError = false;
     let completedCount = 0;
-
-    // Build execution groups for parallel execution
-    const executionGroups = buildExecutionGroups(workflow.steps);
-    const stepMap = new Map<string, WorkflowStep>();
-    workflow.steps.forEach((step) => stepMap.set(step.id, step));
-
-    // Execute each group
-    for (const group of executionGroups) {
-      if (hasError) break;
-
-      const groupSteps = group.stepIds.map((id) => stepMap.get(id)!).filter(Boolean);
-
-      // Mark all steps in group as running
-      groupSteps.forEach((step) => {
-        setStepStatuses((prev) => ({ ...prev, [step.id]: 'running' }));
-      });
-
-      // Execute steps in parallel (with condition checking)
-      const results = await Promise.allSettled(
-        groupSteps.map(async (step) => {
-          // Check condition if present
-          if (step.condition) {
-            const conditionMet = evaluateCondition(step.condition, outputs, workflow.steps);
-            if (!conditionMet) {
-              return { step, skipped: true, reason: describeCondition(step.condition) };
-            }
-          }
-
-          try {
-            const output = await executeStep(step, outputs);
-            return { step, output, success: true };
-          } catch (error) {
-            const errorMessage = error instanceof Error ? error.message : 'Unknown error';
-            return { step, error: errorMessage, success: false };
-          }
-        })
-      );
-
-      // Process results
-      for (const result of results) {
-        if (result.status === 'fulfilled') {
-          const { step, output, success, error, skipped, reason } = result.value as {
-            step: WorkflowStep;
-            output?: string;
-            success?: boolean;
-            error?: string;
-            skipped?: boolean;
-            reason?: string;
-          };
-
-          if (skipped) {
-            // Step was skipped due to condition
-            setStepStatuses((prev) => ({ ...prev, [step.id]: 'skipped' }));
-            finalStatuses[step.id] = 'skipped';
-            completedCount++;
-            addToast(`Skipped "${step.name}": ${reason}`, 'info');
-          } else if (success && output) {
-            outputs[step.outputKey] = output;
-            setStepOutputs((prev) => ({ ...prev, [step.outputKey]: output }));
-            setStepStatuses((prev) => ({ ...prev, [step.id]: 'completed' }));
-            finalStatuses[step.id] = 'completed';
-            setExpandedSteps((prev) => new Set([...prev, step.id]));
-            completedCount++;
-          } else {
-            setStepErrors((prev) => ({ ...prev, [step.id]: error || 'Unknown error' }));
-            setStepStatuses((prev) => ({ ...prev, [step.id]: 'error' }));
-            finalStatuses[step.id] = 'error';
-            hasError = true;
-            addToast(`Step "${step.name}" failed: ${error}`, 'error');
-          }
-        } else {
-          // Rejected promise
-          const step = groupSteps.find((s) =>
-            results.indexOf(result) === groupSteps.indexOf(s)
-          );
-          if (step) {
-            setStepErrors((prev) => ({ ...prev, [step.id]: 'Execution failed' }));
-            setStepStatuses((prev) => ({ ...prev, [step.id]: 'error' }));
-            finalStatuses[step.id] = 'error';
-            hasError = true;
-          }
-        }
-      }
-
-      // Update progress after each group
+    const markDone = () => {
+      completedCount++;
       setOverallProgress((completedCount / totalSteps) * 100);
+    };
 
-      // Small delay between groups
-      if (!hasError && group.groupIndex < executionGroups.length - 1) {
-        await new Promise((resolve) => setTimeout(resolve, 300));
+    // Each step starts as soon as the steps it depends on have finished
+    const run = await executeStepGraph(
+      workflow.steps,
+      async (step, currentOutputs) => {
+        const output = await executeStep(step, currentOutputs);
+        if (!output) throw new Error('Step returned no output');
+        return output;
+      },
+      {
+        getProvider: () => providerState.provider,
+        providerConcurrency: DEFAULT_PROVIDER_CONCURRENCY,
+        shouldSkip: (step, currentOutputs) =>
+          step.condition && !evaluateCondition(step.condition, currentOutputs, workflow.steps)
+            ? describeCondition(step.condition)
+            : null,
+        onStepStart: (step) => {
+          setStepStatuses((prev) => ({ ...prev, [step.id]: 'running' }));
+        },
+        onStepSkipped: (step, reason) => {
+          setStepStatuses((prev) => ({ ...prev, [step.id]: 'skipped' }));
+          markDone();
+          addToast(`Skipped "${step.name}": ${reason}`, 'info');
+        },
+        onStepComplete: (step, output) => {
+          setStepOutputs((prev) => ({ ...prev, [step.outputKey]: output }));
+          setStepStatuses((prev) => ({ ...prev, [step.id]: 'completed' }));
+          setExpandedSteps((prev) => new Set([...prev, step.id]));
+          markDone();
+        },
+        onStepError: (step, error) => {
+          setStepErrors((prev) => ({ ...prev, [step.id]: error }));
+          setStepStatuses((prev) => ({ ...prev, [step.id]: 'error' }));
+          addToast(`Step "${step.name}" failed: ${error}`, 'error');
+        },
       }
-    }
+    );
+
+    const { outputs, statuses: finalStatuses, hasError } = run;
+    logger.info('Workflow run finished', {
+      workflowId: workflow.id,
+      plan: visualizeExecutionPlan(workflow.steps, run.timings),
+    });
 
     setOverallProgress(100);
     setIsRunning(false);
@@ -940,7 +612,7 @@ const WorkflowRunnerPage: React.FC = () => {
             {executionHistory.length > 0 && (
               <Button variant="outline" onClick={() => setShowHistory(true)}>
                 <History className="h-4 w-4 mr-2" />
-                History ({executionHistory.length})
+                History ({executionHistory.length}{historyCursor ? '+' : ''})
               </Button>
             )}
           </div>
@@ -1012,6 +684,11 @@ const WorkflowRunnerPage: React.FC = () => {
                   </Button>
                 </div>
               ))}
+              {historyCursor && (
+                <Button variant="ghost" size="sm" className="w-full" onClick={loadMoreHistory}>
+                  Load older runs
+                </Button>
+              )}
               {executionHistory.length === 0 && (
                 <p className="text-center text-muted-foreground py-8">
                   No previous runs yet
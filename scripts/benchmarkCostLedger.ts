@@ -0,0 +1,141 @@
+/**
+ * Benchmark Cost Ledger Queries
+ *
+ * Records executions through recordCost (no IndexedDB under Node, so
+ * compacted records are dropped; their rollups are kept) and times the
+ * dashboard and budget queries as the ledger grows:
+ *   1. recordCost:       append + rollup updates per execution
+ *   2. summary:          getCostSummary for everything, one user, one team
+ *                        over the last 30 days
+ *   3. checkBudget:      scoped budget check
+ *   4. records:          latest 50 records for one user
+ *   5. old summary:      copy and filter 10,000 records, as the old
+ *                        getCostSummary did on every call
+ *
+ *   node scripts/runScript.mjs scripts/benchmarkCostLedger.ts [executions]
+ */
+
+import { performance } from 'perf_hooks';
+import {
+  recordCost,
+  getCostSummary,
+  getCostRecords,
+  checkBudget,
+  getBudget,
+  setBudget,
+} from '../lib/enhanced/costControls';
+import type { CostRecord } from '../lib/enhanced/types';
+
+const EXECUTION_COUNT = Number(process.argv[2] ?? 1_000_000);
+const CHECKPOINTS = [10_000, 100_000].filter((n) => n < EXECUTION_COUNT).concat(EXECUTION_COUNT);
+
+const USERS = 200;
+const TEAMS = 10;
+const SKILLS = 60;
+const MODELS = [
+  { provider: 'claude', model: 'claude-3-5-haiku' },
+  { provider: 'gemini', model: 'gemini-2.0-flash' },
+  { provider: 'chatgpt', model: 'gpt-4o-mini' },
+];
+
+function recordOne(i: number): void {
+  const { provider, model } = MODELS[i % MODELS.length];
+  const inputTokens = 500 + (i % 2000);
+  const outputTokens = 300 + (i % 1500);
+  recordCost({
+    executionId: `exec-${i}`,
+    skillId: `skill-${i % SKILLS}`,
+    workflowId: i % 4 === 0 ? `workflow-${i % 5}` : undefined,
+    userId: `user-${i % USERS}`,
+    teamId: `team-${i % TEAMS}`,
+    inputTokens,
+    outputTokens,
+    totalTokens: inputTokens + outputTokens,
+    cost: (inputTokens * 0.8 + outputTokens * 4) / 1_000_000,
+    currency: 'USD',
+    provider,
+    model,
+  });
+}
+
+/**
+ * Average microseconds per call over iterations
+ */
+function timeUs(iterations: number, fn: () => void): number {
+  const start = performance.now();
+  for (let i = 0; i < iterations; i++) fn();
+  return ((performance.now() - start) * 1000) / iterations;
+}
+
+/**
+ * The old getCostSummary: copy the record array, filter it, then total it
+ */
+function legacySummaryUs(records: CostRecord[]): number {
+  return timeUs(100, () => {
+    let filtered = [...records];
+    filtered = filtered.filter((r) => r.teamId === 'team-3');
+    filtered = filtered.filter((r) => r.timestamp >= '1970-01-01T00:00:00.000Z');
+    let total = 0;
+    for (const r of filtered) total += r.cost;
+    void total;
+  });
+}
+
+function format(us: number): string {
+  return us >= 1000 ? `${(us / 1000).toFixed(2)} ms` : `${us.toFixed(1)} µs`;
+}
+
+function main() {
+  console.log('═══════════════════════════════════════════════════════════════');
+  console.log('COST LEDGER BENCHMARK');
+  console.log('═══════════════════════════════════════════════════════════════\n');
+  console.log(`Executions: ${EXECUTION_COUNT}, users: ${USERS}, teams: ${TEAMS}, skills: ${SKILLS}\n`);
+
+  // Keep threshold notifications out of the timings
+  setBudget({ ...getBudget('default-budget')!, notifyAt: [] });
+  setBudget({
+    id: 'bench-team-budget',
+    name: 'Bench Team Budget',
+    dailyLimit: 1000,
+    weeklyLimit: 5000,
+    monthlyLimit: 20000,
+    perRunLimit: 1,
+    scope: { teamId: 'team-3' },
+    onLimitReached: 'warn',
+    notifyAt: [],
+    currentDailyUsage: 0,
+    currentWeeklyUsage: 0,
+    currentMonthlyUsage: 0,
+    lastResetAt: new Date().toISOString(),
+  });
+
+  const rows: [string, ...string[]][] = [];
+  let recorded = 0;
+  for (const checkpoint of CHECKPOINTS) {
+    const start = performance.now();
+    for (let i = recorded; i < checkpoint; i++) recordOne(i);
+    const recordUs = ((performance.now() - start) * 1000) / (checkpoint - recorded);
+    recorded = checkpoint;
+
+    const last30Days = new Date(Date.now() - 30 * 24 * 60 * 60 * 1000).toISOString();
+    rows.push([
+      String(checkpoint),
+      format(recordUs),
+      format(timeUs(1000, () => getCostSummary())),
+      format(timeUs(1000, () => getCostSummary({ userId: 'user-7' }))),
+      format(timeUs(1000, () => getCostSummary({ teamId: 'team-3', startDate: last30Days }))),
+      format(timeUs(1000, () => checkBudget({ budgetId: 'bench-team-budget', estimatedCost: 0.01 }))),
+      format(timeUs(100, () => getCostRecords({ userId: 'user-7', limit: 50 }))),
+      format(legacySummaryUs(getCostRecords({ limit: 10_000 }))),
+    ]);
+  }
+
+  const headers = ['Executions', 'recordCost', 'summary', 'by user', 'team 30d', 'checkBudget', 'records', 'old summary'];
+  console.log(headers.map((h) => h.padStart(12)).join(''));
+  for (const row of rows) {
+    console.log(row.map((cell) => cell.padStart(12)).join(''));
+  }
+  console.log('\nold summary: 10,000 in-memory records copied and filtered per call');
+}
+
+main();
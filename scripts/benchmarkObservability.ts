@@ -0,0 +1,109 @@
+/**
+ * Benchmark Observability Overhead
+ *
+ * Completes traces for a set of skills (random latency, no API calls) and
+ * reports the telemetry cost per trace as volume grows:
+ *   1. completeTrace: ring buffer insert, sketch updates, budget checks
+ *   2. old budgets:   copy and sort the last 1000 latencies per budget, as
+ *                     the old checkLatencyBudgets did
+ *   3. lookups:       getTrace, getRecentTraces for one entity, snapshot export
+ *
+ *   node scripts/runScript.mjs scripts/benchmarkObservability.ts [traces] [entities]
+ */
+
+import { performance } from 'perf_hooks';
+import {
+  startTrace,
+  updateTrace,
+  completeTrace,
+  getTrace,
+  getRecentTraces,
+  getAllLatencyBudgets,
+  exportMetricsSnapshot,
+} from '../lib/enhanced/observability';
+
+const TRACE_COUNT = Number(process.argv[2] ?? 1_000_000);
+const ENTITY_COUNT = Number(process.argv[3] ?? 50);
+const CHECKPOINTS = [1_000, 10_000, 100_000].filter((n) => n < TRACE_COUNT).concat(TRACE_COUNT);
+
+function randomLatencyMs(): number {
+  // Long-tailed: mostly 1-5 s with occasional slow calls
+  return Math.round(1000 + Math.random() * 4000 + (Math.random() < 0.005 ? Math.random() * 60000 : 0));
+}
+
+function completeOne(i: number): string {
+  const entityId = `skill-${i % ENTITY_COUNT}`;
+  const trace = startTrace({
+    type: 'skill',
+    entityId,
+    entityName: entityId,
+    provider: 'gemini',
+    model: 'gemini-2.0-flash',
+  });
+  updateTrace(trace.id, { startedAt: new Date(Date.now() - randomLatencyMs()).toISOString() });
+  completeTrace(trace.id, { inputTokens: 1200, outputTokens: 800, actualCost: 0.002 });
+  return trace.id;
+}
+
+/**
+ * Per-trace cost of the old sort-based percentile check at the same volume
+ */
+function legacyBudgetCheckUs(traces: number): number {
+  const budgets = getAllLatencyBudgets().length;
+  const latencies: number[] = [];
+  const start = performance.now();
+  for (let i = 0; i < traces; i++) {
+    latencies.push(randomLatencyMs());
+    if (latencies.length > 1000) latencies.shift();
+    for (let b = 0; b < budgets; b++) {
+      const sorted = [...latencies].sort((x, y) => x - y);
+      void sorted[Math.floor(sorted.length * 0.99)];
+    }
+  }
+  return ((performance.now() - start) * 1000) / traces;
+}
+
+function main() {
+  console.log('═══════════════════════════════════════════════════════════════');
+  console.log('OBSERVABILITY OVERHEAD BENCHMARK');
+  console.log('═══════════════════════════════════════════════════════════════\n');
+  console.log(`Traces: ${TRACE_COUNT}, entities: ${ENTITY_COUNT}\n`);
+
+  console.log(
+    `${'Traces'.padStart(10)}  ${'completeTrace'.padStart(14)}  ${'old budgets'.padStart(12)}  ` +
+      `${'getTrace'.padStart(10)}  ${'recent(entity)'.padStart(14)}  ${'snapshot'.padStart(10)}`
+  );
+
+  let completed = 0;
+  let lastId = '';
+  for (const checkpoint of CHECKPOINTS) {
+    const batch = checkpoint - completed;
+    const start = performance.now();
+    for (let i = completed; i < checkpoint; i++) {
+      lastId = completeOne(i);
+    }
+    const perTraceUs = ((performance.now() - start) * 1000) / batch;
+    completed = checkpoint;
+
+    const lookupStart = performance.now();
+    for (let i = 0; i < 1000; i++) getTrace(lastId);
+    const getTraceUs = ((performance.now() - lookupStart) * 1000) / 1000;
+
+    const recentStart = performance.now();
+    for (let i = 0; i < 100; i++) getRecentTraces({ entityId: 'skill-0', limit: 20 });
+    const recentUs = ((performance.now() - recentStart) * 1000) / 100;
+
+    const snapshotStart = performance.now();
+    exportMetricsSnapshot();
+    const snapshotMs = performance.now() - snapshotStart;
+
+    console.log(
+      `${String(checkpoint).padStart(10)}  ${`${perTraceUs.toFixed(1)} µs`.padStart(14)}  ` +
+        `${`${legacyBudgetCheckUs(Math.min(batch, 20_000)).toFixed(1)} µs`.padStart(12)}  ` +
+        `${`${getTraceUs.toFixed(2)} µs`.padStart(10)}  ${`${recentUs.toFixed(1)} µs`.padStart(14)}  ` +
+        `${`${snapshotMs.toFixed(1)} ms`.padStart(10)}`
+    );
+  }
+}
+
+main();
@@ -0,0 +1,249 @@
+/**
+ * Benchmark Skill Catalog Cold Start
+ *
+ * Builds the app twice with `vite build`, once from a base git ref (checked
+ * out into a temporary worktree) and once from the working tree, and
+ * compares the real production output:
+ *   1. startup chunks: entry script plus its modulepreload imports, raw and gzip
+ *   2. script time:    CDP ScriptDuration for a cold load of the home page
+ *                      in headless Chromium (median of N runs)
+ *
+ * Pass the commit before the lazy catalog to reproduce the original numbers:
+ *   node scripts/runScript.mjs scripts/benchmarkSkillCatalog.ts [baseRef] [runs]
+ */
+
+import { execFileSync } from 'child_process';
+import { existsSync, mkdtempSync, readFileSync, rmSync, statSync, symlinkSync } from 'fs';
+import { createServer, type Server } from 'http';
+import type { AddressInfo } from 'net';
+import { tmpdir } from 'os';
+import { dirname, extname, join, normalize } from 'path';
+import { fileURLToPath } from 'url';
+import { gzipSync } from 'zlib';
+import { chromium, type Browser } from '@playwright/test';
+
+const ROOT_DIR = join(dirname(fileURLToPath(import.meta.url)), '..');
+const BASE_REF = process.argv[2] ?? 'main';
+const RUNS = Number(process.argv[3] ?? 7);
+
+const CONTENT_TYPES: Record<string, string> = {
+  '.html': 'text/html',
+  '.js': 'text/javascript',
+  '.css': 'text/css',
+  '.json': 'application/json',
+  '.svg': 'image/svg+xml',
+};
+
+interface StartupChunk {
+  file: string;
+  bytes: number;
+  gzipBytes: number;
+}
+
+interface BuildResult {
+  label: string;
+  chunks: StartupChunk[];
+  scriptMs: number;
+  taskMs: number;
+}
+
+function formatBytes(bytes: number): string {
+  return bytes >= 1024 * 1024
+    ? `${(bytes / (1024 * 1024)).toFixed(2)} MB`
+    : `${(bytes / 1024).toFixed(1)} KB`;
+}
+
+function median(values: number[]): number {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// BUILDS
+// ═══════════════════════════════════════════════════════════════════════════
+
+function run(command: string, args: string[], cwd: string): void {
+  execFileSync(command, args, { cwd, stdio: ['ignore', 'ignore', 'inherit'] });
+}
+
+/**
+ * Production build of a source tree, generating the skill index first
+ * when the tree has the build script (run with this tree's runScript.mjs,
+ * since older refs don't have it)
+ */
+function viteBuild(sourceDir: string, outDir: string): void {
+  if (existsSync(join(sourceDir, 'scripts', 'buildSkillLibraryIndex.ts'))) {
+    run('node', [join(ROOT_DIR, 'scripts', 'runScript.mjs'), 'scripts/buildSkillLibraryIndex.ts'], sourceDir);
+  }
+  run('npx', ['vite', 'build', '--outDir', outDir, '--emptyOutDir'], sourceDir);
+}
+
+/**
+ * Check out a ref into a temporary worktree that shares this node_modules
+ */
+function addWorktree(ref: string, dir: string): void {
+  run('git', ['worktree', 'add', '--detach', dir, ref], ROOT_DIR);
+  symlinkSync(join(ROOT_DIR, 'node_modules'), join(dir, 'node_modules'), 'dir');
+}
+
+function removeWorktree(dir: string): void {
+  try {
+    run('git', ['worktree', 'remove', '--force', dir], ROOT_DIR);
+  } catch {
+    rmSync(dir, { recursive: true, force: true });
+  }
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// STARTUP CHUNKS
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Scripts the browser fetches before the first render: the module entry
+ * from index.html and every chunk Vite marks as modulepreload
+ */
+function getStartupChunks(distDir: string): StartupChunk[] {
+  const html = readFileSync(join(distDir, 'index.html'), 'utf-8');
+  const files = new Set<string>();
+
+  for (const match of html.matchAll(/<script[^>]+type="module"[^>]+src="([^"]+)"/g)) {
+    files.add(match[1]);
+  }
+  for (const match of html.matchAll(/<link[^>]+rel="modulepreload"[^>]+href="([^"]+)"/g)) {
+    files.add(match[1]);
+  }
+
+  return [...files].map((file) => {
+    const contents = readFileSync(join(distDir, file.replace(/^\//, '')));
+    return { file, bytes: contents.length, gzipBytes: gzipSync(contents).length };
+  });
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// SCRIPT TIME
+// ═══════════════════════════════════════════════════════════════════════════
+
+function serveStatic(distDir: string): Promise<Server> {
+  const server = createServer((req, res) => {
+    const path = normalize(decodeURIComponent((req.url ?? '/').split('?')[0]));
+    let file = join(distDir, path);
+    if (!file.startsWith(distDir) || !existsSync(file) || statSync(file).isDirectory()) {
+      file = join(distDir, 'index.html');
+    }
+    res.writeHead(200, { 'Content-Type': CONTENT_TYPES[extname(file)] ?? 'application/octet-stream' });
+    res.end(readFileSync(file));
+  });
+  return new Promise((resolve) => server.listen(0, '127.0.0.1', () => resolve(server)));
+}
+
+/**
+ * Median script and task time for a cold load of the home page
+ */
+async function measureColdLoad(
+  browser: Browser,
+  distDir: string
+): Promise<{ scriptMs: number; taskMs: number }> {
+  const server = await serveStatic(distDir);
+  const { port } = server.address() as AddressInfo;
+  const scriptSamples: number[] = [];
+  const taskSamples: number[] = [];
+
+  try {
+    for (let i = 0; i < RUNS; i++) {
+      // Fresh context per run: empty HTTP cache and code cache
+      const context = await browser.newContext();
+      const page = await context.newPage();
+      const cdp = await context.newCDPSession(page);
+      await cdp.send('Performance.enable');
+
+      await page.goto(`http://127.0.0.1:${port}/`, { waitUntil: 'networkidle' });
+
+      const { metrics } = await cdp.send('Performance.getMetrics');
+      const metric = (name: string) => metrics.find((m) => m.name === name)?.value ?? 0;
+      scriptSamples.push(metric('ScriptDuration') * 1000);
+      taskSamples.push(metric('TaskDuration') * 1000);
+
+      await context.close();
+    }
+  } finally {
+    server.close();
+  }
+
+  return { scriptMs: median(scriptSamples), taskMs: median(taskSamples) };
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// REPORT
+// ═══════════════════════════════════════════════════════════════════════════
+
+function printResult(result: BuildResult): void {
+  const total = result.chunks.reduce((sum, c) => sum + c.bytes, 0);
+  const totalGzip = result.chunks.reduce((sum, c) => sum + c.gzipBytes, 0);
+
+  console.log(result.label);
+  console.log(`  Startup chunks:              ${result.chunks.length}`);
+  for (const chunk of [...result.chunks].sort((a, b) => b.bytes - a.bytes)) {
+    console.log(`    ${chunk.file.padEnd(40)} ${formatBytes(chunk.bytes).padStart(10)}  (${formatBytes(chunk.gzipBytes)} gzip)`);
+  }
+  console.log(`  Startup JS:                  ${formatBytes(total)} (${formatBytes(totalGzip)} gzip)`);
+  console.log(`  Script time (median):        ${result.scriptMs.toFixed(1)} ms`);
+  console.log(`  Main thread tasks (median):  ${result.taskMs.toFixed(1)} ms\n`);
+}
+
+function printChange(label: string, before: number, after: number, format: (value: number) => string): void {
+  const change = before > 0 ? ((after - before) / before) * 100 : 0;
+  console.log(`  ${label.padEnd(28)} ${format(before)} → ${format(after)} (${change >= 0 ? '+' : ''}${change.toFixed(1)}%)`);
+}
+
+async function main() {
+  console.log('═══════════════════════════════════════════════════════════════');
+  console.log('SKILL CATALOG COLD START BENCHMARK');
+  console.log('═══════════════════════════════════════════════════════════════\n');
+  console.log(`Base ref: ${BASE_REF}, runs: ${RUNS}\n`);
+
+  const workDir = mkdtempSync(join(tmpdir(), 'skill-catalog-bench-'));
+  const baseTree = join(workDir, 'base');
+  const builds = [
+    { label: `BEFORE (${BASE_REF})`, sourceDir: baseTree, outDir: join(workDir, 'dist-before') },
+    { label: 'AFTER (working tree)', sourceDir: ROOT_DIR, outDir: join(workDir, 'dist-after') },
+  ];
+
+  const browser = await chromium.launch();
+  const results: BuildResult[] = [];
+
+  try {
+    addWorktree(BASE_REF, baseTree);
+
+    for (const build of builds) {
+      console.log(`Building ${build.label}...`);
+      viteBuild(build.sourceDir, build.outDir);
+      const timing = await measureColdLoad(browser, build.outDir);
+      results.push({ label: build.label, chunks: getStartupChunks(build.outDir), ...timing });
+    }
+  } finally {
+    await browser.close();
+    removeWorktree(baseTree);
+  }
+
+  console.log('');
+  results.forEach(printResult);
+
+  const [before, after] = results;
+  const sum = (chunks: StartupChunk[], key: 'bytes' | 'gzipBytes') =>
+    chunks.reduce((total, c) => total + c[key], 0);
+
+  console.log('═══════════════════════════════════════════════════════════════');
+  console.log('CHANGE');
+  console.log('═══════════════════════════════════════════════════════════════\n');
+  printChange('Startup JS', sum(before.chunks, 'bytes'), sum(after.chunks, 'bytes'), formatBytes);
+  printChange('Startup JS (gzip)', sum(before.chunks, 'gzipBytes'), sum(after.chunks, 'gzipBytes'), formatBytes);
+  printChange('Script time', before.scriptMs, after.scriptMs, (ms) => `${ms.toFixed(1)} ms`);
+  printChange('Main thread tasks', before.taskMs, after.taskMs, (ms) => `${ms.toFixed(1)} ms`);
+
+  rmSync(workDir, { recursive: true, force: true });
+}
+
+main().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
@@ -0,0 +1,159 @@
+/**
+ * Benchmark IndexedDB History Queries
+ *
+ * Seeds a fresh browser profile with workflow executions through the real
+ * SkillEngineDB (served by the Vite dev server) and times:
+ *   1. bulk writes: one transaction per record vs saveWorkflowExecutions
+ *   2. history:     loading the whole store vs the first and second page
+ *   3. favorites:   first page of favorites
+ *   4. search:      full-text index vs scanning every record
+ *
+ * Start the dev server first (npm run dev), then:
+ *   node scripts/runScript.mjs scripts/benchmarkStorage.ts [records] [baseUrl]
+ */
+
+import { chromium } from '@playwright/test';
+import type { db as skillEngineDb } from '../lib/storage/indexeddb';
+
+type SkillEngineDB = typeof skillEngineDb;
+
+const RECORD_COUNT = Number(process.argv[2] ?? 50000);
+const BASE_URL = process.argv[3] ?? 'http://localhost:5173';
+const CHUNK_SIZE = 1000;
+
+interface BenchmarkResult {
+  label: string;
+  ms: number;
+  detail: string;
+}
+
+async function main() {
+  console.log('═══════════════════════════════════════════════════════════════');
+  console.log('INDEXEDDB HISTORY BENCHMARK');
+  console.log('═══════════════════════════════════════════════════════════════\n');
+  console.log(`Records: ${RECORD_COUNT}, server: ${BASE_URL}\n`);
+
+  const browser = await chromium.launch();
+  const page = await browser.newPage();
+  await page.goto(BASE_URL);
+
+  // Load the app's own database module through the dev server
+  await page.addScriptTag({
+    type: 'module',
+    content: "import { db } from '/lib/storage/indexeddb.ts'; window.__benchDb = db;",
+  });
+  await page.waitForFunction(() => '__benchDb' in window);
+
+  const results = await page.evaluate(
+    async ({ recordCount, chunkSize }) => {
+      const db = (window as unknown as { __benchDb: SkillEngineDB }).__benchDb;
+      const timed: BenchmarkResult[] = [];
+      const time = async <T>(label: string, fn: () => Promise<T>, detail: (result: T) => string) => {
+        const start = performance.now();
+        const result = await fn();
+        timed.push({ label, ms: performance.now() - start, detail: detail(result) });
+        return result;
+      };
+
+      const words = ['acme', 'globex', 'initech', 'umbrella', 'hooli', 'stark', 'wayne', 'wonka'];
+      const workflows = ['job-application', 'interview-prep', 'ai-implementation', 'post-interview'];
+      const output = 'Generated section text. '.repeat(80);
+      const base = Date.parse('2024-01-01T00:00:00.000Z');
+      const makeExecution = (i: number) => ({
+        id: `bench-${i}`,
+        workflowId: workflows[i % workflows.length],
+        workflowName: workflows[i % workflows.length].replace('-', ' '),
+        status: 'completed' as const,
+        currentStepIndex: 2,
+        globalInputs: { company: words[i % words.length] },
+        stepOutputs: { step1Output: output, step2Output: output, step3Output: output },
+        stepStatuses: { step1: 'completed' as const, step2: 'completed' as const, step3: 'completed' as const },
+        startedAt: new Date(base + i * 60_000).toISOString(),
+        title: `Run ${i} for ${words[i % words.length]} ${words[(i * 7) % words.length]}`,
+        tags: [words[(i * 3) % words.length]],
+        isFavorite: i % 500 === 0,
+      });
+
+      await time(
+        `Write ${chunkSize} records, one transaction each`,
+        async () => {
+          for (let i = 0; i < chunkSize; i++) {
+            await db.saveWorkflowExecution(makeExecution(i));
+          }
+        },
+        () => ''
+      );
+      await time(
+        `Write ${chunkSize} records, one transaction`,
+        () => db.saveWorkflowExecutions(Array.from({ length: chunkSize }, (_, i) => makeExecution(i))),
+        () => ''
+      );
+
+      await time(
+        `Seed ${recordCount} records`,
+        async () => {
+          for (let start = 0; start < recordCount; start += chunkSize) {
+            const size = Math.min(chunkSize, recordCount - start);
+            await db.saveWorkflowExecutions(Array.from({ length: size }, (_, i) => makeExecution(start + i)));
+          }
+        },
+        () => ''
+      );
+
+      await time('Load all executions (old history page)', () => db.getAllWorkflowExecutions(), (r) => `${r.length} records`);
+      const first = await time(
+        'First page of 50',
+        () => db.getWorkflowExecutionsPage({ limit: 50 }),
+        (r) => `${r.items.length} records`
+      );
+      await time(
+        'Second page of 50',
+        () => db.getWorkflowExecutionsPage({ limit: 50, cursor: first.nextCursor }),
+        (r) => `${r.items.length} records`
+      );
+      await time(
+        'First page of 20 for one workflow',
+        () => db.getWorkflowExecutionsPage({ workflowId: 'interview-prep', limit: 20 }),
+        (r) => `${r.items.length} records`
+      );
+      await time(
+        'First page of 20 favorites',
+        () => db.getWorkflowExecutionsPage({ favoritesOnly: true, limit: 20 }),
+        (r) => `${r.items.length} records`
+      );
+
+      await time(
+        'Search "acme hoo" (scan every record)',
+        async () => {
+          const all = await db.getAllWorkflowExecutions();
+          return all.filter((e) => {
+            const text = `${e.title} ${e.workflowName} ${(e.tags ?? []).join(' ')}`.toLowerCase();
+            return text.includes('acme') && text.includes('hoo');
+          });
+        },
+        (r) => `${r.length} matches`
+      );
+      await time(
+        'Search "acme hoo" (term index)',
+        () => db.searchWorkflowExecutions('acme hoo'),
+        (r) => `${r.length} matches`
+      );
+
+      await db.clearAll();
+      return timed;
+    },
+    { recordCount: RECORD_COUNT, chunkSize: CHUNK_SIZE }
+  );
+
+  await browser.close();
+
+  for (const result of results) {
+    const ms = result.ms >= 1000 ? `${(result.ms / 1000).toFixed(2)} s` : `${result.ms.toFixed(1)} ms`;
+    console.log(`${result.label.padEnd(46)} ${ms.padStart(10)}  ${result.detail}`);
+  }
+}
+
+main().catch((err) => {
+  console.error('Fatal error:', err);
+  process.exit(1);
+});
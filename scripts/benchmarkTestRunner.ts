@@ -0,0 +1,147 @@
+/**
+ * Benchmark Eval Test Runner
+ *
+ * Starts a local mock of the Gemini generateContent endpoint (fixed latency,
+ * server-side requests-per-second limit that answers 429) and runs the same
+ * skill test suites twice:
+ *   1. sequential: concurrency 1, paced with delayBetweenTests
+ *   2. scheduled:  worker pool + token bucket sized to the mock's quota
+ *
+ * No real API key or network access is needed:
+ *   node scripts/runScript.mjs scripts/benchmarkTestRunner.ts [skillCount] [latencyMs] [rps]
+ */
+
+import { createServer, type IncomingMessage, type ServerResponse } from 'http';
+import type { AddressInfo } from 'net';
+import { runAllSkillTests, type FullTestRunResult } from '../lib/testing/testRunner';
+import { getStaticSkills } from '../lib/testing/registrySnapshot';
+
+const SKILL_COUNT = Number(process.argv[2] ?? 8);
+const LATENCY_MS = Number(process.argv[3] ?? 400);
+const MOCK_RPS = Number(process.argv[4] ?? 10);
+
+const GENERATED_OUTPUT = `## Analysis\n\n${'This is a detailed mock skill output paragraph. '.repeat(20)}\n\n## Recommendations\n\n- Item one\n- Item two\n`;
+const GRADING_OUTPUT = JSON.stringify({
+  criterionScores: [],
+  summary: 'Mock grading',
+  strengths: ['Structured'],
+  improvements: [],
+});
+
+// ═══════════════════════════════════════════════════════════════════════════
+// MOCK SERVER
+// ═══════════════════════════════════════════════════════════════════════════
+
+interface MockStats {
+  requests: number;
+  rateLimited: number;
+}
+
+function startMockServer(stats: MockStats): Promise<{ url: string; close: () => void }> {
+  const recent: number[] = [];
+
+  const handler = (req: IncomingMessage, res: ServerResponse) => {
+    let body = '';
+    req.on('data', (chunk) => (body += chunk));
+    req.on('end', () => {
+      stats.requests++;
+
+      // Sliding one-second window
+      const now = Date.now();
+      while (recent.length > 0 && recent[0] <= now - 1000) recent.shift();
+      if (recent.length >= MOCK_RPS) {
+        stats.rateLimited++;
+        res.writeHead(429, { 'Content-Type': 'application/json' });
+        res.end(JSON.stringify({ error: { code: 429, message: 'Resource has been exhausted', status: 'RESOURCE_EXHAUSTED' } }));
+        return;
+      }
+      recent.push(now);
+
+      const isGrading = body.includes('expert evaluator');
+      setTimeout(() => {
+        res.writeHead(200, { 'Content-Type': 'application/json' });
+        res.end(
+          JSON.stringify({
+            candidates: [
+              {
+                content: { role: 'model', parts: [{ text: isGrading ? GRADING_OUTPUT : GENERATED_OUTPUT }] },
+                finishReason: 'STOP',
+              },
+            ],
+            usageMetadata: { totalTokenCount: 500 },
+          })
+        );
+      }, LATENCY_MS);
+    });
+  };
+
+  return new Promise((resolve) => {
+    const server = createServer(handler);
+    server.listen(0, '127.0.0.1', () => {
+      const { port } = server.address() as AddressInfo;
+      resolve({ url: `http://127.0.0.1:${port}`, close: () => server.close() });
+    });
+  });
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// BENCHMARK
+// ═══════════════════════════════════════════════════════════════════════════
+
+function report(label: string, result: FullTestRunResult, stats: MockStats) {
+  const { summary } = result;
+  console.log(label);
+  console.log(`  Duration:        ${(result.totalDurationMs / 1000).toFixed(1)} s`);
+  console.log(`  Tests:           ${summary.totalTests} (passed ${summary.passed}, failed ${summary.failed}, errors ${summary.errors})`);
+  console.log(`  Mock requests:   ${stats.requests}`);
+  console.log(`  Mock 429s:       ${stats.rateLimited}\n`);
+}
+
+async function main() {
+  const skillIds = getStaticSkills()
+    .slice(0, SKILL_COUNT)
+    .map((s) => s.id);
+
+  console.log('═══════════════════════════════════════════════════════════════');
+  console.log('EVAL TEST RUNNER BENCHMARK');
+  console.log('═══════════════════════════════════════════════════════════════\n');
+  console.log(`Skills: ${skillIds.length}, mock latency: ${LATENCY_MS} ms, mock quota: ${MOCK_RPS} req/s\n`);
+
+  const baseOptions = {
+    apiKey: 'mock-key',
+    skillIds,
+    runGrading: true,
+    persist: false,
+  };
+
+  const sequentialStats: MockStats = { requests: 0, rateLimited: 0 };
+  const sequentialServer = await startMockServer(sequentialStats);
+  const sequential = await runAllSkillTests({
+    ...baseOptions,
+    baseUrl: sequentialServer.url,
+    concurrency: 1,
+    delayBetweenTests: 1000 / MOCK_RPS,
+  });
+  sequentialServer.close();
+  report('SEQUENTIAL (concurrency 1)', sequential, sequentialStats);
+
+  const scheduledStats: MockStats = { requests: 0, rateLimited: 0 };
+  const scheduledServer = await startMockServer(scheduledStats);
+  const scheduled = await runAllSkillTests({
+    ...baseOptions,
+    baseUrl: scheduledServer.url,
+    concurrency: Math.ceil((MOCK_RPS * LATENCY_MS) / 1000) + 2,
+    rateLimits: { gemini: { requestsPerMinute: MOCK_RPS * 60, burst: MOCK_RPS } },
+    maxRetries: 6,
+  });
+  scheduledServer.close();
+  report('SCHEDULED (worker pool + token bucket)', scheduled, scheduledStats);
+
+  const speedup = sequential.totalDurationMs / Math.max(1, scheduled.totalDurationMs);
+  console.log(`Speedup: ${speedup.toFixed(1)}x`);
+}
+
+main().catch((err) => {
+  console.error('Fatal error:', err);
+  process.exit(1);
+});
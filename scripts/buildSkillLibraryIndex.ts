@@ -0,0 +1,99 @@
+/**
+ * Build Skill Library Index
+ *
+ * Emits the prebuilt catalog consumed by lib/skillLibrary/catalog.ts:
+ *   lib/skillLibrary/generated/role-list.json    role names and icons
+ *   lib/skillLibrary/generated/index.json        metadata for every skill
+ *   lib/skillLibrary/generated/roles/<id>.json   full definitions, one file per role
+ *
+ * Skills that don't come from a role template (built-in and professional)
+ * go into a single shared chunk. Run this before `vite build`:
+ *   node scripts/runScript.mjs scripts/buildSkillLibraryIndex.ts
+ */
+
+import { mkdirSync, rmSync, writeFileSync } from 'fs';
+import { dirname, join } from 'path';
+import { fileURLToPath } from 'url';
+import {
+  getAllLibrarySkills,
+  getSkillChunkId,
+  toLibrarySkillSummary,
+  ROLE_DEFINITIONS,
+  SKILL_CATALOG_INDEX_VERSION,
+} from '../lib/skillLibrary';
+import type {
+  CatalogIndexEntry,
+  CatalogRoleList,
+  LibrarySkill,
+  SkillCatalogIndex,
+} from '../lib/skillLibrary/types';
+
+const ROOT_DIR = join(dirname(fileURLToPath(import.meta.url)), '..');
+const OUTPUT_DIR = join(ROOT_DIR, 'lib', 'skillLibrary', 'generated');
+const ROLES_DIR = join(OUTPUT_DIR, 'roles');
+
+function formatBytes(bytes: number): string {
+  return bytes >= 1024 * 1024
+    ? `${(bytes / (1024 * 1024)).toFixed(2)} MB`
+    : `${(bytes / 1024).toFixed(1)} KB`;
+}
+
+function main() {
+  console.log('═══════════════════════════════════════════════════════════════');
+  console.log('SKILL LIBRARY INDEX BUILD');
+  console.log('═══════════════════════════════════════════════════════════════\n');
+
+  const skills = getAllLibrarySkills();
+  const chunks = new Map<string, LibrarySkill[]>();
+  const entries: CatalogIndexEntry[] = [];
+
+  for (const skill of skills) {
+    const chunk = getSkillChunkId(skill);
+    if (!chunks.has(chunk)) {
+      chunks.set(chunk, []);
+    }
+    chunks.get(chunk)!.push(skill);
+    entries.push({ ...toLibrarySkillSummary(skill), chunk });
+  }
+
+  const index: SkillCatalogIndex = {
+    version: SKILL_CATALOG_INDEX_VERSION,
+    generatedAt: new Date().toISOString(),
+    roles: ROLE_DEFINITIONS,
+    skills: entries,
+  };
+
+  // Start clean so renamed or removed roles don't leave stale chunks behind
+  rmSync(OUTPUT_DIR, { recursive: true, force: true });
+  mkdirSync(ROLES_DIR, { recursive: true });
+
+  const roleList: CatalogRoleList = {
+    version: SKILL_CATALOG_INDEX_VERSION,
+    roles: ROLE_DEFINITIONS,
+  };
+  const roleListJson = JSON.stringify(roleList);
+  writeFileSync(join(OUTPUT_DIR, 'role-list.json'), roleListJson);
+  console.log(`  ✓ role-list.json: ${ROLE_DEFINITIONS.length} roles, ${formatBytes(roleListJson.length)}`);
+
+  const indexJson = JSON.stringify(index);
+  writeFileSync(join(OUTPUT_DIR, 'index.json'), indexJson);
+  console.log(`  ✓ index.json: ${entries.length} skills, ${formatBytes(indexJson.length)}`);
+
+  let totalChunkBytes = 0;
+  for (const [chunk, chunkSkills] of chunks) {
+    const chunkJson = JSON.stringify(chunkSkills);
+    writeFileSync(join(ROLES_DIR, `${chunk}.json`), chunkJson);
+    totalChunkBytes += chunkJson.length;
+    console.log(`  ✓ roles/${chunk}.json: ${chunkSkills.length} skills, ${formatBytes(chunkJson.length)}`);
+  }
+
+  console.log('\n═══════════════════════════════════════════════════════════════');
+  console.log('SUMMARY');
+  console.log('═══════════════════════════════════════════════════════════════\n');
+  console.log(`Skills indexed:   ${entries.length}`);
+  console.log(`Role chunks:      ${chunks.size}`);
+  console.log(`Index size:       ${formatBytes(indexJson.length)}`);
+  console.log(`All chunks size:  ${formatBytes(totalChunkBytes)}`);
+}
+
+main();
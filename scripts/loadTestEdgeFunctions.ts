@@ -0,0 +1,333 @@
+/**
+ * Load Test Edge Functions Against Mock Providers
+ *
+ * Starts mock AI and email providers (no real API calls or costs), then
+ * drives the locally served Edge Functions and reports latency, rate
+ * limiting and upstream connection reuse per scenario:
+ *   1. platform-status:   public endpoint, rate limited per IP
+ *   2. ai-proxy:          non-streaming OpenAI, Claude and Gemini calls
+ *   3. ai-proxy stream:   OpenAI and Claude SSE, with usage split across chunks
+ *   4. email-send:        one campaign to LOAD_TEST_RECIPIENT_IDS in batches
+ *
+ * The mock providers count requests and new TCP connections, so
+ * "requests / connection" shows whether upstream keep-alive is working.
+ *
+ * 1. Point the functions at the mocks (printed by --mock-only), e.g. in
+ *    supabase/functions/.env:
+ *      OPENAI_BASE_URL=http://host.docker.internal:54400
+ *      CLAUDE_BASE_URL=http://host.docker.internal:54400
+ *      ...
+ * 2. supabase start && supabase functions serve --env-file supabase/functions/.env
+ * 3. LOAD_TEST_JWT=<user access token> \
+ *      node scripts/runScript.mjs scripts/loadTestEdgeFunctions.ts [requests] [concurrency] [functionsUrl]
+ *
+ * Set RATE_LIMIT_BACKEND=postgres for the functions to load test the shared
+ * rate limiter; expect 429s once a scenario exceeds its limit.
+ */
+
+import http from 'http';
+import { performance } from 'perf_hooks';
+
+const MOCK_ONLY = process.argv.includes('--mock-only');
+const args = process.argv.slice(2).filter((arg) => !arg.startsWith('--'));
+const REQUEST_COUNT = Number(args[0] ?? 200);
+const CONCURRENCY = Number(args[1] ?? 20);
+const FUNCTIONS_URL = args[2] ?? 'http://localhost:54321/functions/v1';
+const MOCK_PORT = Number(process.env.MOCK_PROVIDER_PORT ?? 54400);
+const MOCK_LATENCY_MS = Number(process.env.MOCK_PROVIDER_LATENCY_MS ?? 50);
+const JWT = process.env.LOAD_TEST_JWT;
+const RECIPIENT_IDS = (process.env.LOAD_TEST_RECIPIENT_IDS ?? '').split(',').filter(Boolean);
+
+// ═══════════════════════════════════════════════════════════════════════════
+// MOCK PROVIDERS
+// ═══════════════════════════════════════════════════════════════════════════
+
+interface MockStats {
+  requests: Record<string, number>;
+  connections: number;
+  emailsAccepted: number;
+}
+
+const mockStats: MockStats = { requests: {}, connections: 0, emailsAccepted: 0 };
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+function readBody(req: http.IncomingMessage): Promise<string> {
+  return new Promise((resolve, reject) => {
+    let body = '';
+    req.setEncoding('utf8');
+    req.on('data', (chunk) => (body += chunk));
+    req.on('end', () => resolve(body));
+    req.on('error', reject);
+  });
+}
+
+function sendJson(res: http.ServerResponse, status: number, body: unknown): void {
+  res.writeHead(status, { 'Content-Type': 'application/json' });
+  res.end(JSON.stringify(body));
+}
+
+/**
+ * Write SSE events, splitting the last one across two writes so the proxy
+ * has to reassemble it
+ */
+async function sendEvents(res: http.ServerResponse, events: unknown[]): Promise<void> {
+  res.writeHead(200, { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache' });
+  const lines = events.map((event) => `data: ${JSON.stringify(event)}\n\n`);
+  for (const line of lines.slice(0, -1)) {
+    res.write(line);
+    await sleep(5);
+  }
+  const last = lines[lines.length - 1];
+  const middle = Math.floor(last.length / 2);
+  res.write(last.slice(0, middle));
+  await sleep(5);
+  res.write(last.slice(middle));
+  res.end('data: [DONE]\n\n');
+}
+
+const words = (text: string) => text.split(/\s+/).filter(Boolean).length;
+
+async function handleMockRequest(req: http.IncomingMessage, res: http.ServerResponse): Promise<void> {
+  const url = req.url ?? '/';
+  const raw = await readBody(req);
+  await sleep(MOCK_LATENCY_MS);
+
+  if (url === '/v1/chat/completions') {
+    const body = JSON.parse(raw);
+    const usage = { prompt_tokens: words(JSON.stringify(body.messages)), completion_tokens: 42 };
+    if (!body.stream) {
+      return sendJson(res, 200, { choices: [{ message: { content: 'Mock OpenAI reply' } }], usage });
+    }
+    return sendEvents(res, [
+      { choices: [{ delta: { content: 'Mock ' } }] },
+      { choices: [{ delta: { content: 'OpenAI reply' } }] },
+      { choices: [], usage },
+    ]);
+  }
+
+  if (url === '/v1/messages') {
+    const body = JSON.parse(raw);
+    const inputTokens = words(JSON.stringify(body.messages));
+    if (!body.stream) {
+      return sendJson(res, 200, {
+        content: [{ type: 'text', text: 'Mock Claude reply' }],
+        usage: { input_tokens: inputTokens, output_tokens: 42 },
+      });
+    }
+    return sendEvents(res, [
+      { type: 'message_start', message: { usage: { input_tokens: inputTokens, output_tokens: 1 } } },
+      { type: 'content_block_delta', delta: { type: 'text_delta', text: 'Mock Claude reply' } },
+      { type: 'message_delta', usage: { output_tokens: 42 } },
+    ]);
+  }
+
+  if (url.startsWith('/v1beta/models/')) {
+    return sendJson(res, 200, {
+      candidates: [{ content: { parts: [{ text: 'Mock Gemini reply' }] } }],
+      usageMetadata: { promptTokenCount: words(raw), candidatesTokenCount: 42 },
+    });
+  }
+
+  if (url === '/v3/mail/send') {
+    mockStats.emailsAccepted += JSON.parse(raw).personalizations.length;
+    res.writeHead(202);
+    return void res.end();
+  }
+
+  if (url === '/emails/batch') {
+    const emails = JSON.parse(raw);
+    mockStats.emailsAccepted += emails.length;
+    return sendJson(res, 200, { data: emails.map((_: unknown, i: number) => ({ id: `mock-${i}` })) });
+  }
+
+  if (/^\/v3\/[^/]+\/messages$/.test(url)) {
+    // Multipart form: count the "to" fields
+    mockStats.emailsAccepted += (raw.match(/name="to"/g) ?? []).length;
+    return sendJson(res, 200, { id: '<mock@mailgun>', message: 'Queued. Thank you.' });
+  }
+
+  sendJson(res, 404, { error: `Mock provider has no route for ${url}` });
+}
+
+function startMockProviders(): Promise<http.Server> {
+  const server = http.createServer((req, res) => {
+    const route = (req.url ?? '/').replace(/\/models\/[^/:]+/, '/models/*').replace(/\/v3\/[^/]+\/messages/, '/v3/*/messages');
+    mockStats.requests[route] = (mockStats.requests[route] ?? 0) + 1;
+    handleMockRequest(req, res).catch((err) => sendJson(res, 500, { error: String(err) }));
+  });
+  server.keepAliveTimeout = 120_000;
+  server.on('connection', () => mockStats.connections++);
+  return new Promise((resolve) => server.listen(MOCK_PORT, () => resolve(server)));
+}
+
+// ═══════════════════════════════════════════════════════════════════════════
+// LOAD
+// ═══════════════════════════════════════════════════════════════════════════
+
+interface Scenario {
+  name: string;
+  requests: number;
+  request: (i: number) => { path: string; body?: unknown; stream?: boolean };
+}
+
+interface ScenarioResult {
+  name: string;
+  latencies: number[];
+  statuses: Record<number, number>;
+  errors: number;
+  durationMs: number;
+  upstreamRequests: number;
+  upstreamConnections: number;
+}
+
+async function callFunction(path: string, body: unknown, stream: boolean): Promise<number> {
+  const response = await fetch(`${FUNCTIONS_URL}/${path}`, {
+    method: body ? 'POST' : 'GET',
+    headers: {
+      'Content-Type': 'application/json',
+      ...(JWT ? { Authorization: `Bearer ${JWT}` } : {}),
+      'x-forwarded-for': '203.0.113.7',
+    },
+    body: body ? JSON.stringify(body) : undefined,
+  });
+  // Read the whole body (for streams, until the proxy closes it)
+  await (stream ? response.arrayBuffer() : response.text());
+  return response.status;
+}
+
+async function runScenario(scenario: Scenario): Promise<ScenarioResult> {
+  const result: ScenarioResult = {
+    name: scenario.name,
+    latencies: [],
+    statuses: {},
+    errors: 0,
+    durationMs: 0,
+    upstreamRequests: 0,
+    upstreamConnections: 0,
+  };
+  const requestsBefore = Object.values(mockStats.requests).reduce((a, b) => a + b, 0);
+  const connectionsBefore = mockStats.connections;
+
+  let next = 0;
+  const worker = async () => {
+    while (next < scenario.requests) {
+      const { path, body, stream = false } = scenario.request(next++);
+      const start = performance.now();
+      try {
+        const status = await callFunction(path, body, stream);
+        result.statuses[status] = (result.statuses[status] ?? 0) + 1;
+      } catch {
+        result.errors++;
+      }
+      result.latencies.push(performance.now() - start);
+    }
+  };
+
+  const start = performance.now();
+  await Promise.all(Array.from({ length: Math.min(CONCURRENCY, scenario.requests) }, worker));
+  result.durationMs = performance.now() - start;
+  result.upstreamRequests = Object.values(mockStats.requests).reduce((a, b) => a + b, 0) - requestsBefore;
+  result.upstreamConnections = mockStats.connections - connectionsBefore;
+  return result;
+}
+
+function percentile(sorted: number[], q: number): number {
+  return sorted.length > 0 ? sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * q))] : 0;
+}
+
+function printResult(result: ScenarioResult): void {
+  const sorted = [...result.latencies].sort((a, b) => a - b);
+  const statuses = Object.entries(result.statuses)
+    .map(([status, count]) => `${status}×${count}`)
+    .join(' ');
+  const reuse = result.upstreamConnections > 0
+    ? (result.upstreamRequests / result.upstreamConnections).toFixed(1)
+    : result.upstreamRequests > 0 ? 'pooled' : '-';
+
+  console.log(
+    `${result.name.padEnd(22)}${`${((sorted.length / result.durationMs) * 1000).toFixed(1)}/s`.padStart(10)}` +
+      `${`${percentile(sorted, 0.5).toFixed(0)} ms`.padStart(10)}${`${percentile(sorted, 0.95).toFixed(0)} ms`.padStart(10)}` +
+      `${`${percentile(sorted, 0.99).toFixed(0)} ms`.padStart(10)}${reuse.padStart(12)}   ${statuses}` +
+      (result.errors > 0 ? ` errors×${result.errors}` : '')
+  );
+}
+
+function printMockEnv(): void {
+  const base = `http://host.docker.internal:${MOCK_PORT}`;
+  console.log('Mock providers listening. Serve the functions with:');
+  for (const name of ['GEMINI', 'CLAUDE', 'OPENAI', 'SENDGRID', 'RESEND', 'MAILGUN']) {
+    console.log(`  ${name}_BASE_URL=${base}`);
+  }
+  console.log('  GEMINI_API_KEY=mock CLAUDE_API_KEY=mock OPENAI_API_KEY=mock');
+  console.log('  EMAIL_PROVIDER=resend RESEND_API_KEY=mock\n');
+}
+
+async function main() {
+  console.log('═══════════════════════════════════════════════════════════════');
+  console.log('EDGE FUNCTION LOAD TEST');
+  console.log('═══════════════════════════════════════════════════════════════\n');
+
+  const server = await startMockProviders();
+  printMockEnv();
+  if (MOCK_ONLY) return;
+
+  if (!JWT) {
+    console.log('LOAD_TEST_JWT not set: only platform-status (no auth) will succeed\n');
+  }
+  console.log(`Requests per scenario: ${REQUEST_COUNT}, concurrency: ${CONCURRENCY}, functions: ${FUNCTIONS_URL}\n`);
+
+  const models = ['gpt-4o-mini', 'haiku', 'gemini-2.0-flash'];
+  const scenarios: Scenario[] = [
+    { name: 'platform-status', requests: REQUEST_COUNT, request: () => ({ path: 'platform-status' }) },
+    {
+      name: 'ai-proxy',
+      requests: REQUEST_COUNT,
+      request: (i) => ({ path: 'ai-proxy', body: { model: models[i % models.length], prompt: `Load test ${i}` } }),
+    },
+    {
+      name: 'ai-proxy stream',
+      requests: REQUEST_COUNT,
+      request: (i) => ({
+        path: 'ai-proxy',
+        body: { model: models[i % 2], prompt: `Load test ${i}`, stream: true },
+        stream: true,
+      }),
+    },
+  ];
+  if (RECIPIENT_IDS.length > 0) {
+    scenarios.push({
+      name: `email-send (${RECIPIENT_IDS.length} rcpt)`,
+      requests: 1,
+      request: () => ({
+        path: 'email-send',
+        body: { subject: 'Load test', body: '# Load test\n\nMock delivery only.', recipientIds: RECIPIENT_IDS },
+      }),
+    });
+  }
+
+  console.log(
+    `${'Scenario'.padEnd(22)}${'rate'.padStart(10)}${'p50'.padStart(10)}${'p95'.padStart(10)}` +
+      `${'p99'.padStart(10)}${'req/conn'.padStart(12)}   statuses`
+  );
+  for (const scenario of scenarios) {
+    printResult(await runScenario(scenario));
+  }
+
+  console.log('\nUpstream requests by route:');
+  for (const [route, count] of Object.entries(mockStats.requests)) {
+    console.log(`  ${route.padEnd(28)}${String(count).padStart(8)}`);
+  }
+  console.log(`Upstream connections opened: ${mockStats.connections}`);
+  if (RECIPIENT_IDS.length > 0) console.log(`Emails accepted: ${mockStats.emailsAccepted}`);
+  if (Object.keys(mockStats.requests).length === 0) {
+    console.log('\nNo upstream calls reached the mocks: check the *_BASE_URL settings above');
+  }
+
+  server.close();
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
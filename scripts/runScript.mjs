@@ -0,0 +1,61 @@
+/**
+ * Run a TypeScript Script
+ *
+ * Bundles a script with Vite's SSR build, so scripts can import app modules
+ * exactly as the app bundles them: TypeScript, extensionless and directory
+ * imports, JSON and import.meta.glob (used by lib/skillLibrary/catalog.ts).
+ * Packages stay external and load from node_modules.
+ *
+ * The bundle is written next to the script, so import.meta.url resolves
+ * the same paths, and removed when the process exits. Plain JavaScript so
+ * Node runs it directly.
+ *
+ * Usage:
+ *   node scripts/runScript.mjs scripts/buildSkillLibraryIndex.ts [args...]
+ */
+
+/* global console, process */
+
+import { rmSync } from 'fs';
+import { basename, dirname, extname, join, resolve } from 'path';
+import { pathToFileURL } from 'url';
+import { build } from 'vite';
+
+const [script, ...args] = process.argv.slice(2);
+if (!script) {
+  console.error('Usage: node scripts/runScript.mjs <script.ts> [args...]');
+  process.exit(1);
+}
+
+const entry = resolve(script);
+const outDir = dirname(entry);
+const prefix = `.run-${basename(entry, extname(entry))}-${process.pid}`;
+
+const result = await build({
+  configFile: false,
+  logLevel: 'error',
+  build: {
+    ssr: entry,
+    outDir,
+    emptyOutDir: false,
+    copyPublicDir: false,
+    minify: false,
+    rollupOptions: {
+      output: {
+        format: 'es',
+        entryFileNames: `${prefix}.mjs`,
+        chunkFileNames: `${prefix}-[name]-[hash].mjs`,
+      },
+    },
+  },
+});
+
+const files = (Array.isArray(result) ? result : [result]).flatMap((bundle) =>
+  bundle.output.map((file) => join(outDir, file.fileName))
+);
+process.on('exit', () => files.forEach((file) => rmSync(file, { force: true })));
+process.on('SIGINT', () => process.exit(130));
+
+// Scripts read their own arguments from process.argv[2] onwards
+process.argv = [process.argv[0], entry, ...args];
+await import(pathToFileURL(join(outDir, `${prefix}.mjs`)).href);
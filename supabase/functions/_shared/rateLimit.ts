@@ -1,8 +1,9 @@
 /**
  * Rate Limiting Utility for Edge Functions
  *
- * Implements a sliding window rate limiter using Supabase's database
- * to track request counts per user/IP.
+ * Implements a sliding window rate limiter that tracks request counts per
+ * user/IP, either in a bounded per-instance store or in Supabase's database
+ * (RATE_LIMIT_BACKEND=postgres) so every instance enforces the same limit.
  *
  * SECURITY BENEFITS:
  * - Prevents API abuse and enumeration attacks
@@ -59,82 +60,198 @@ export interface RateLimitResult {
   retryAfter?: number; // seconds until next request allowed
 }
 
+// ═══════════════════════════════════════════════════════════════════════════
+// SLIDING WINDOW COUNTERS
+// ═══════════════════════════════════════════════════════════════════════════
+
 /**
- * In-memory rate limit store for Edge Functions
- * Uses a Map with automatic cleanup of expired entries
+ * Counts for one key: requests in the current fixed window and the one before
+ *
+ * The sliding window estimate weights the previous window by how much of it
+ * still overlaps the last windowSeconds, so a client cannot send a full
+ * quota at the end of one window and another at the start of the next.
  */
-const rateLimitStore = new Map<string, { count: number; windowStart: number }>();
+export interface WindowCounter {
+  windowStart: number;
+  currentCount: number;
+  previousCount: number;
+}
 
-// Clean up expired entries every 5 minutes
-const CLEANUP_INTERVAL = 5 * 60 * 1000;
-let lastCleanup = Date.now();
+/**
+ * Roll a counter forward to the window containing now
+ */
+function advanceWindow(counter: WindowCounter, now: number, windowMs: number): void {
+  const windowStart = Math.floor(now / windowMs) * windowMs;
+  if (windowStart === counter.windowStart) return;
 
-function cleanupExpiredEntries(windowSeconds: number): void {
-  const now = Date.now();
+  counter.previousCount = windowStart - counter.windowStart === windowMs ? counter.currentCount : 0;
+  counter.currentCount = 0;
+  counter.windowStart = windowStart;
+}
 
-  // Only cleanup periodically
-  if (now - lastCleanup < CLEANUP_INTERVAL) {
-    return;
-  }
+/**
+ * Apply one request to a counter and return the decision
+ */
+export function hitWindowCounter(
+  counter: WindowCounter,
+  config: RateLimitConfig,
+  now: number
+): RateLimitResult {
+  const windowMs = config.windowSeconds * 1000;
+  advanceWindow(counter, now, windowMs);
 
-  lastCleanup = now;
-  const expiredBefore = now - windowSeconds * 1000;
+  const elapsed = now - counter.windowStart;
+  const previousWeight = 1 - elapsed / windowMs;
+  const used = Math.floor(counter.previousCount * previousWeight) + counter.currentCount;
+  const windowEnd = counter.windowStart + windowMs;
 
-  for (const [key, value] of rateLimitStore.entries()) {
-    if (value.windowStart < expiredBefore) {
-      rateLimitStore.delete(key);
-    }
+  if (used >= config.maxRequests) {
+    // Wait until the weighted count drops below the limit
+    const waitMs = counter.currentCount >= config.maxRequests
+      ? windowEnd - now + windowMs * Math.max(0, 1 - config.maxRequests / counter.currentCount)
+      : windowMs * (1 - (config.maxRequests - counter.currentCount) / counter.previousCount) - elapsed;
+    const retryAfter = Math.max(1, Math.ceil(waitMs / 1000));
+    return {
+      allowed: false,
+      remaining: 0,
+      resetAt: new Date(now + retryAfter * 1000),
+      retryAfter,
+    };
   }
+
+  counter.currentCount++;
+  return {
+    allowed: true,
+    remaining: config.maxRequests - used - 1,
+    resetAt: new Date(windowEnd),
+  };
 }
 
+// ═══════════════════════════════════════════════════════════════════════════
+// STORES
+// ═══════════════════════════════════════════════════════════════════════════
+
 /**
- * Check rate limit for a given identifier
- * Uses in-memory storage (appropriate for Edge Functions)
+ * Where rate limit counters live
  */
-export function checkRateLimit(
-  identifier: string,
-  config: RateLimitConfig
-): RateLimitResult {
-  const now = Date.now();
-  const windowMs = config.windowSeconds * 1000;
-  const key = `${config.endpoint}:${identifier}`;
+export interface RateLimitStore {
+  hit(key: string, config: RateLimitConfig, now: number): Promise<RateLimitResult>;
+}
 
-  // Cleanup periodically
-  cleanupExpiredEntries(config.windowSeconds);
+/** Keys kept per instance by the in-memory store */
+const DEFAULT_MAX_KEYS = 10_000;
+
+/**
+ * Per-instance counters, bounded to maxKeys
+ *
+ * Keys are kept in least-recently-used order (Map insertion order, moved to
+ * the end on every hit), so the oldest idle keys are evicted first. An
+ * evicted key starts again from zero, which only ever errs towards allowing.
+ */
+export class MemoryRateLimitStore implements RateLimitStore {
+  private counters = new Map<string, WindowCounter>();
+
+  constructor(private maxKeys: number = DEFAULT_MAX_KEYS) {}
+
+  get size(): number {
+    return this.counters.size;
+  }
+
+  hit(key: string, config: RateLimitConfig, now: number): Promise<RateLimitResult> {
+    return Promise.resolve(this.hitSync(key, config, now));
+  }
 
-  // Get or create entry
-  let entry = rateLimitStore.get(key);
+  hitSync(key: string, config: RateLimitConfig, now: number): RateLimitResult {
+    let counter = this.counters.get(key);
+    if (counter) {
+      this.counters.delete(key);
+    } else {
+      counter = { windowStart: now, currentCount: 0, previousCount: 0 };
+      while (this.counters.size >= this.maxKeys) {
+        this.counters.delete(this.counters.keys().next().value!);
+      }
+    }
+    this.counters.set(key, counter);
 
-  // If no entry or window expired, create new window
-  if (!entry || now - entry.windowStart >= windowMs) {
-    entry = { count: 0, windowStart: now };
-    rateLimitStore.set(key, entry);
+    return hitWindowCounter(counter, config, now);
   }
+}
+
+/**
+ * Counters shared by every instance, kept in the rate_limit_counters table
+ *
+ * Each hit is a single rate_limit_hit RPC that updates the row under a lock.
+ * When the database cannot be reached the request is checked against the
+ * fallback store instead of being blocked.
+ */
+export class PostgresRateLimitStore implements RateLimitStore {
+  constructor(
+    private client: SupabaseClient,
+    private fallback: RateLimitStore = new MemoryRateLimitStore()
+  ) {}
+
+  async hit(key: string, config: RateLimitConfig, now: number): Promise<RateLimitResult> {
+    const { data, error } = await this.client.rpc('rate_limit_hit', {
+      p_key: key,
+      p_max_requests: config.maxRequests,
+      p_window_seconds: config.windowSeconds,
+    });
 
-  // Calculate remaining and reset time
-  const windowEnd = entry.windowStart + windowMs;
-  const resetAt = new Date(windowEnd);
+    const row = Array.isArray(data) ? data[0] : data;
+    if (error || !row) {
+      console.warn('Rate limit store unavailable, using fallback:', error?.message);
+      return this.fallback.hit(key, config, now);
+    }
 
-  // Check if rate limit exceeded
-  if (entry.count >= config.maxRequests) {
-    const retryAfter = Math.ceil((windowEnd - now) / 1000);
     return {
-      allowed: false,
-      remaining: 0,
-      resetAt,
-      retryAfter,
+      allowed: row.allowed,
+      remaining: row.remaining,
+      resetAt: new Date(row.reset_at),
+      retryAfter: row.allowed ? undefined : row.retry_after,
     };
   }
+}
 
-  // Increment count
-  entry.count++;
-  rateLimitStore.set(key, entry);
+const memoryStore = new MemoryRateLimitStore();
+let rateLimitStore: RateLimitStore | null = null;
 
-  return {
-    allowed: true,
-    remaining: config.maxRequests - entry.count,
-    resetAt,
-  };
+/**
+ * Store used by rateLimitMiddleware
+ *
+ * Set RATE_LIMIT_BACKEND=postgres to share counters across instances;
+ * the default keeps them in memory per instance.
+ */
+export function getRateLimitStore(): RateLimitStore {
+  if (rateLimitStore) return rateLimitStore;
+
+  const supabaseUrl = Deno.env.get('SUPABASE_URL');
+  const serviceRoleKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
+  if (Deno.env.get('RATE_LIMIT_BACKEND') === 'postgres' && supabaseUrl && serviceRoleKey) {
+    rateLimitStore = new PostgresRateLimitStore(
+      createClient(supabaseUrl, serviceRoleKey, { auth: { persistSession: false } }),
+      memoryStore
+    );
+  } else {
+    rateLimitStore = memoryStore;
+  }
+  return rateLimitStore;
+}
+
+/**
+ * Replace the rate limit store (e.g. for load tests)
+ */
+export function setRateLimitStore(store: RateLimitStore | null): void {
+  rateLimitStore = store;
+}
+
+/**
+ * Check rate limit for a given identifier in this instance's memory
+ */
+export function checkRateLimit(
+  identifier: string,
+  config: RateLimitConfig
+): RateLimitResult {
+  return memoryStore.hitSync(`${config.endpoint}:${identifier}`, config, Date.now());
 }
 
 /**
@@ -219,26 +336,47 @@ export function rateLimitExceededResponse(
 
 /**
  * Middleware function for rate limiting
- * Returns null if allowed, or a Response if rate limited
+ * Resolves to null if allowed, or a Response if rate limited
+ *
+ * Several endpoints (e.g. a per-minute and a burst limit) are checked in
+ * parallel, so shared counters cost one round trip rather than one per
+ * limit. The blocking limit with the longest wait is reported.
  */
-export function rateLimitMiddleware(
+export async function rateLimitMiddleware(
   req: Request,
   userId: string | undefined,
-  endpoint: string,
+  endpoints: string | string[],
   corsHeaders: Record<string, string>
-): Response | null {
-  const config = RATE_LIMITS[endpoint];
-  if (!config) {
-    console.warn(`No rate limit config for endpoint: ${endpoint}`);
-    return null;
+): Promise<Response | null> {
+  const configs: RateLimitConfig[] = [];
+  for (const endpoint of Array.isArray(endpoints) ? endpoints : [endpoints]) {
+    const config = RATE_LIMITS[endpoint];
+    if (config) {
+      configs.push(config);
+    } else {
+      console.warn(`No rate limit config for endpoint: ${endpoint}`);
+    }
   }
+  if (configs.length === 0) return null;
 
   const identifier = getIdentifier(req, userId);
-  const result = checkRateLimit(identifier, config);
+  const store = getRateLimitStore();
+  const now = Date.now();
+  const results = await Promise.all(
+    configs.map((config) => store.hit(`${config.endpoint}:${identifier}`, config, now))
+  );
+
+  let blocked = -1;
+  for (let i = 0; i < results.length; i++) {
+    if (results[i].allowed) continue;
+    if (blocked < 0 || (results[i].retryAfter ?? 0) > (results[blocked].retryAfter ?? 0)) {
+      blocked = i;
+    }
+  }
 
-  if (!result.allowed) {
-    console.warn(`Rate limit exceeded for ${identifier} on ${endpoint}`);
-    return rateLimitExceededResponse(result, corsHeaders);
+  if (blocked >= 0) {
+    console.warn(`Rate limit exceeded for ${identifier} on ${configs[blocked].endpoint}`);
+    return rateLimitExceededResponse(results[blocked], corsHeaders);
   }
 
   return null;
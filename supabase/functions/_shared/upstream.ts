@@ -0,0 +1,71 @@
+/**
+ * Upstream HTTP Utility for Edge Functions
+ *
+ * Calls to AI and email providers go through one pooled HTTP client per
+ * instance, so warm invocations reuse open TLS connections (and HTTP/2
+ * where the provider supports it) instead of connecting for every request.
+ *
+ * Provider base URLs can be overridden, e.g. to point at the mock providers
+ * in scripts/loadTestEdgeFunctions.ts:
+ * - GEMINI_BASE_URL, CLAUDE_BASE_URL, OPENAI_BASE_URL
+ * - SENDGRID_BASE_URL, RESEND_BASE_URL, MAILGUN_BASE_URL
+ */
+
+export type UpstreamProvider = 'gemini' | 'claude' | 'openai' | 'sendgrid' | 'resend' | 'mailgun';
+
+const DEFAULT_BASE_URLS: Record<UpstreamProvider, string> = {
+  gemini: 'https://generativelanguage.googleapis.com',
+  claude: 'https://api.anthropic.com',
+  openai: 'https://api.openai.com',
+  sendgrid: 'https://api.sendgrid.com',
+  resend: 'https://api.resend.com',
+  mailgun: 'https://api.mailgun.net',
+};
+
+// Idle connections kept open per provider host
+const POOL_MAX_IDLE_PER_HOST = 32;
+// Close idle connections after 90 seconds (providers drop them soon after)
+const POOL_IDLE_TIMEOUT_MS = 90_000;
+
+let upstreamClient: Deno.HttpClient | null | undefined;
+
+/**
+ * Pooled client shared by every upstream call in this instance, or null
+ * where the runtime has no Deno.createHttpClient (fetch's default pool
+ * is used instead)
+ */
+function getUpstreamClient(): Deno.HttpClient | null {
+  if (upstreamClient !== undefined) return upstreamClient;
+
+  try {
+    upstreamClient = typeof Deno.createHttpClient === 'function'
+      ? Deno.createHttpClient({
+          poolMaxIdlePerHost: POOL_MAX_IDLE_PER_HOST,
+          poolIdleTimeout: POOL_IDLE_TIMEOUT_MS,
+        })
+      : null;
+  } catch (err) {
+    console.warn('Pooled HTTP client unavailable, using default fetch:', err);
+    upstreamClient = null;
+  }
+  return upstreamClient;
+}
+
+/**
+ * Full URL for a provider API path
+ */
+export function getProviderUrl(provider: UpstreamProvider, path: string): string {
+  const baseUrl = Deno.env.get(`${provider.toUpperCase()}_BASE_URL`) || DEFAULT_BASE_URLS[provider];
+  return `${baseUrl.replace(/\/$/, '')}${path}`;
+}
+
+/**
+ * fetch through the shared connection pool
+ *
+ * Callers must read or cancel the response body, otherwise the connection
+ * cannot go back to the pool.
+ */
+export function upstreamFetch(url: string, init: RequestInit = {}): Promise<Response> {
+  const client = getUpstreamClient();
+  return fetch(url, client ? { ...init, client } as RequestInit : init);
+}
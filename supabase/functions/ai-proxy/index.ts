@@ -6,102 +6,29 @@
  *
  * Features:
  * - Validates user authentication
- * - Rate limiting to prevent abuse
+ * - Rate limiting to prevent abuse (shared across instances with
+ *   RATE_LIMIT_BACKEND=postgres)
  * - Checks user credits before making calls
  * - Routes requests to Gemini, Claude, or ChatGPT
  * - Deducts credits based on actual token usage
- * - Records usage for billing/analytics
+ * - Records usage for billing/analytics, including streamed responses
+ * - Reuses pooled connections to the providers
  *
  * Environment Variables Required:
  * - GEMINI_API_KEY: Google AI Studio API key
  * - CLAUDE_API_KEY: Anthropic API key
  * - OPENAI_API_KEY: OpenAI API key
+ *
+ * Optional:
+ * - RATE_LIMIT_BACKEND: 'postgres' to share rate limits across instances
+ * - GEMINI_BASE_URL, CLAUDE_BASE_URL, OPENAI_BASE_URL: provider overrides
+ *   (e.g. mock providers for load tests)
  */
 
 import { serve } from 'https://deno.land/std@0.168.0/http/server.ts';
 import { createClient } from 'https://esm.sh/@supabase/supabase-js@2';
-
-// ═══════════════════════════════════════════════════════════════════════════
-// RATE LIMITING (inlined to avoid _shared import issues)
-// ═══════════════════════════════════════════════════════════════════════════
-
-interface RateLimitConfig {
-  maxRequests: number;
-  windowSeconds: number;
-  endpoint: string;
-}
-
-const RATE_LIMITS: Record<string, RateLimitConfig> = {
-  'ai-proxy': { maxRequests: 30, windowSeconds: 60, endpoint: 'ai-proxy' },
-  'ai-proxy-burst': { maxRequests: 5, windowSeconds: 10, endpoint: 'ai-proxy-burst' },
-};
-
-interface RateLimitResult {
-  allowed: boolean;
-  remaining: number;
-  resetAt: Date;
-  retryAfter?: number;
-}
-
-const rateLimitStore = new Map<string, { count: number; windowStart: number }>();
-
-function checkRateLimit(identifier: string, config: RateLimitConfig): RateLimitResult {
-  const now = Date.now();
-  const windowMs = config.windowSeconds * 1000;
-  const key = `${config.endpoint}:${identifier}`;
-
-  let entry = rateLimitStore.get(key);
-  if (!entry || now - entry.windowStart >= windowMs) {
-    entry = { count: 0, windowStart: now };
-    rateLimitStore.set(key, entry);
-  }
-
-  const windowEnd = entry.windowStart + windowMs;
-  const resetAt = new Date(windowEnd);
-
-  if (entry.count >= config.maxRequests) {
-    return {
-      allowed: false,
-      remaining: 0,
-      resetAt,
-      retryAfter: Math.ceil((windowEnd - now) / 1000),
-    };
-  }
-
-  entry.count++;
-  rateLimitStore.set(key, entry);
-  return { allowed: true, remaining: config.maxRequests - entry.count, resetAt };
-}
-
-function getIdentifier(req: Request, userId?: string): string {
-  if (userId) return `user:${userId}`;
-  const forwardedFor = req.headers.get('x-forwarded-for');
-  if (forwardedFor) return `ip:${forwardedFor.split(',')[0].trim()}`;
-  const realIp = req.headers.get('x-real-ip');
-  if (realIp) return `ip:${realIp}`;
-  return `anon:unknown`;
-}
-
-function rateLimitMiddleware(
-  req: Request,
-  userId: string | undefined,
-  endpoint: string,
-  corsHeaders: Record<string, string>
-): Response | null {
-  const config = RATE_LIMITS[endpoint];
-  if (!config) return null;
-
-  const identifier = getIdentifier(req, userId);
-  const result = checkRateLimit(identifier, config);
-
-  if (!result.allowed) {
-    return new Response(
-      JSON.stringify({ error: 'Rate limit exceeded', retryAfter: result.retryAfter }),
-      { status: 429, headers: { ...corsHeaders, 'Content-Type': 'application/json' } }
-    );
-  }
-  return null;
-}
+import { rateLimitMiddleware } from '../_shared/rateLimit.ts';
+import { getProviderUrl, upstreamFetch } from '../_shared/upstream.ts';
 
 // CORS headers for browser requests
 const corsHeaders = {
@@ -189,18 +116,12 @@ serve(async (req) => {
       );
     }
 
-    // 1.5. Check rate limits
-    const rateLimitResponse = rateLimitMiddleware(req, user.id, 'ai-proxy', corsHeaders);
+    // 1.5. Check the per-minute and burst rate limits together
+    const rateLimitResponse = await rateLimitMiddleware(req, user.id, ['ai-proxy', 'ai-proxy-burst'], corsHeaders);
     if (rateLimitResponse) {
       return rateLimitResponse;
     }
 
-    // Also check burst rate limit
-    const burstLimitResponse = rateLimitMiddleware(req, user.id, 'ai-proxy-burst', corsHeaders);
-    if (burstLimitResponse) {
-      return burstLimitResponse;
-    }
-
     // 2. Parse request body
     const body: RequestBody = await req.json();
     const { model, prompt, systemPrompt, maxTokens = 4096, temperature = 0.7, stream = false } = body;
@@ -368,37 +289,15 @@ serve(async (req) => {
       );
     }
 
-    // 7. Calculate actual cost
-    const pricing = MODEL_PRICING[modelInfo.apiModel] || { input: 10, output: 30 };
-    const inputCost = (inputTokens / 1_000_000) * pricing.input;
-    const outputCost = (outputTokens / 1_000_000) * pricing.output;
-    const totalCostCents = Math.ceil((inputCost + outputCost) * 100);
-
-    // 8. Deduct credits from user (if credits table exists)
-    if (!skipCreditCheck) {
-      try {
-        await supabase.rpc('deduct_credits', {
-          p_user_id: user.id,
-          p_amount: totalCostCents,
-        });
-      } catch (err) {
-        console.warn('Failed to deduct credits (table may not exist):', err);
-      }
-    }
-
-    // 9. Record usage (if usage_logs table exists)
-    try {
-      await supabase.from('usage_logs').insert({
-        user_id: user.id,
-        model: model,
-        input_tokens: inputTokens,
-        output_tokens: outputTokens,
-        cost_cents: totalCostCents,
-        created_at: new Date().toISOString(),
-      });
-    } catch (err) {
-      console.warn('Failed to log usage (table may not exist):', err);
-    }
+    // 7-9. Calculate actual cost, deduct credits and record usage
+    const totalCostCents = await recordUsage(supabase, {
+      userId: user.id,
+      model,
+      apiModel: modelInfo.apiModel,
+      inputTokens,
+      outputTokens,
+      skipCreditCheck,
+    });
 
     // 10. Return the response
     return new Response(
@@ -440,7 +339,7 @@ async function callGemini(
 ): Promise<Response> {
   // Use header-based authentication instead of query parameter
   // to prevent API key exposure in logs and referrer headers
-  const url = `https://generativelanguage.googleapis.com/v1beta/models/${model}:generateContent`;
+  const url = getProviderUrl('gemini', `/v1beta/models/${model}:generateContent`);
 
   const contents = [];
   if (systemPrompt) {
@@ -449,7 +348,7 @@ async function callGemini(
   }
   contents.push({ role: 'user', parts: [{ text: prompt }] });
 
-  return fetch(url, {
+  return upstreamFetch(url, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
@@ -473,7 +372,7 @@ async function callClaude(
   maxTokens: number = 4096,
   temperature: number = 0.7
 ): Promise<Response> {
-  return fetch('https://api.anthropic.com/v1/messages', {
+  return upstreamFetch(getProviderUrl('claude', '/v1/messages'), {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
@@ -504,7 +403,7 @@ async function callOpenAI(
   }
   messages.push({ role: 'user', content: prompt });
 
-  return fetch('https://api.openai.com/v1/chat/completions', {
+  return upstreamFetch(getProviderUrl('openai', '/v1/chat/completions'), {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
@@ -519,6 +418,131 @@ async function callOpenAI(
   });
 }
 
+// ═══════════════════════════════════════════════════════════════════════════
+// USAGE ACCOUNTING
+// ═══════════════════════════════════════════════════════════════════════════
+
+/**
+ * Deduct credits (unless skipped) and log usage for one call
+ * Returns the cost in cents
+ */
+async function recordUsage(
+  supabase: ReturnType<typeof createClient>,
+  usage: {
+    userId: string;
+    model: string;
+    apiModel: string;
+    inputTokens: number;
+    outputTokens: number;
+    skipCreditCheck: boolean;
+  }
+): Promise<number> {
+  const pricing = MODEL_PRICING[usage.apiModel] || { input: 10, output: 30 };
+  const inputCost = (usage.inputTokens / 1_000_000) * pricing.input;
+  const outputCost = (usage.outputTokens / 1_000_000) * pricing.output;
+  const totalCostCents = Math.ceil((inputCost + outputCost) * 100);
+
+  // The two writes are independent; run them together
+  const deduct = async () => {
+    if (usage.skipCreditCheck) return;
+    try {
+      const { error } = await supabase.rpc('deduct_credits', {
+        p_user_id: usage.userId,
+        p_amount: totalCostCents,
+      });
+      if (error) console.warn('Failed to deduct credits:', error.message);
+    } catch (err) {
+      console.warn('Failed to deduct credits (table may not exist):', err);
+    }
+  };
+
+  const log = async () => {
+    try {
+      const { error } = await supabase.from('usage_logs').insert({
+        user_id: usage.userId,
+        model: usage.model,
+        input_tokens: usage.inputTokens,
+        output_tokens: usage.outputTokens,
+        cost_cents: totalCostCents,
+        created_at: new Date().toISOString(),
+      });
+      if (error) console.warn('Failed to log usage:', error.message);
+    } catch (err) {
+      console.warn('Failed to log usage (table may not exist):', err);
+    }
+  };
+
+  await Promise.all([deduct(), log()]);
+  return totalCostCents;
+}
+
+/**
+ * Forward an upstream SSE body to the client while reading its events
+ *
+ * Chunks are passed through as they arrive (pulled, so a slow client slows
+ * the upstream read rather than buffering). Event lines are reassembled
+ * across chunk boundaries before onEvent sees their JSON, so usage that
+ * straddles two chunks is not lost. onComplete runs once, whether the
+ * stream ends, fails or the client disconnects (the upstream request is
+ * cancelled then, and the tokens seen so far are billed).
+ */
+function meterEventStream(
+  upstream: ReadableStream<Uint8Array>,
+  onEvent: (data: any) => void,
+  onComplete: () => Promise<void>
+): ReadableStream<Uint8Array> {
+  const reader = upstream.getReader();
+  const decoder = new TextDecoder();
+  let pending = '';
+  let completed = false;
+
+  const scan = (text: string) => {
+    const lines = (pending + text).split('\n');
+    pending = lines.pop() ?? '';
+    for (const line of lines) {
+      const trimmed = line.trim();
+      if (!trimmed.startsWith('data: ') || trimmed.includes('[DONE]')) continue;
+      try {
+        onEvent(JSON.parse(trimmed.slice(6)));
+      } catch {
+        // Ignore parse errors
+      }
+    }
+  };
+
+  const complete = () => {
+    if (completed) return;
+    completed = true;
+    onComplete().catch((err) => console.warn('Failed to record streamed usage:', err));
+  };
+
+  return new ReadableStream<Uint8Array>({
+    async pull(controller) {
+      try {
+        const { done, value } = await reader.read();
+        if (done) {
+          scan(decoder.decode() + '\n');
+          controller.close();
+          complete();
+          return;
+        }
+        controller.enqueue(value);
+        scan(decoder.decode(value, { stream: true }));
+      } catch (err) {
+        controller.error(err);
+        complete();
+      }
+    },
+    async cancel(reason) {
+      try {
+        await reader.cancel(reason);
+      } finally {
+        complete();
+      }
+    },
+  });
+}
+
 // ═══════════════════════════════════════════════════════════════════════════
 // STREAMING HANDLERS
 // ═══════════════════════════════════════════════════════════════════════════
@@ -545,7 +569,7 @@ async function handleOpenAIStream(
   }
   messages.push({ role: 'user', content: prompt });
 
-  const response = await fetch('https://api.openai.com/v1/chat/completions', {
+  const response = await upstreamFetch(getProviderUrl('openai', '/v1/chat/completions'), {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
@@ -573,84 +597,30 @@ async function handleOpenAIStream(
   let inputTokens = 0;
   let outputTokens = 0;
 
-  // Create a transform stream that forwards chunks and tracks usage
-  const { readable, writable } = new TransformStream({
-    transform(chunk, controller) {
-      controller.enqueue(chunk);
-    },
-  });
-
-  // Process the stream in the background
-  (async () => {
-    const reader = response.body!.getReader();
-    const writer = writable.getWriter();
-    const decoder = new TextDecoder();
-
-    try {
-      while (true) {
-        const { done, value } = await reader.read();
-        if (done) break;
-
-        // Forward the chunk
-        await writer.write(value);
-
-        // Parse for usage info (comes in final chunk)
-        const text = decoder.decode(value, { stream: true });
-        const lines = text.split('\n');
-        for (const line of lines) {
-          if (line.startsWith('data: ') && !line.includes('[DONE]')) {
-            try {
-              const data = JSON.parse(line.slice(6));
-              if (data.usage) {
-                inputTokens = data.usage.prompt_tokens || 0;
-                outputTokens = data.usage.completion_tokens || 0;
-              }
-            } catch {
-              // Ignore parse errors
-            }
-          }
-        }
+  const body = meterEventStream(
+    response.body!,
+    (data) => {
+      // Usage comes in the final chunk
+      if (data.usage) {
+        inputTokens = data.usage.prompt_tokens || 0;
+        outputTokens = data.usage.completion_tokens || 0;
       }
-    } finally {
-      await writer.close();
-
-      // Record usage after stream completes
+    },
+    async () => {
       if (inputTokens > 0 || outputTokens > 0) {
-        const pricing = MODEL_PRICING[apiModel] || { input: 10, output: 30 };
-        const inputCost = (inputTokens / 1_000_000) * pricing.input;
-        const outputCost = (outputTokens / 1_000_000) * pricing.output;
-        const totalCostCents = Math.ceil((inputCost + outputCost) * 100);
-
-        // Deduct credits
-        if (!skipCreditCheck) {
-          try {
-            await supabase.rpc('deduct_credits', {
-              p_user_id: userId,
-              p_amount: totalCostCents,
-            });
-          } catch (err) {
-            console.warn('Failed to deduct credits:', err);
-          }
-        }
-
-        // Log usage
-        try {
-          await supabase.from('usage_logs').insert({
-            user_id: userId,
-            model: requestModel,
-            input_tokens: inputTokens,
-            output_tokens: outputTokens,
-            cost_cents: totalCostCents,
-            created_at: new Date().toISOString(),
-          });
-        } catch (err) {
-          console.warn('Failed to log usage:', err);
-        }
+        await recordUsage(supabase, {
+          userId,
+          model: requestModel,
+          apiModel,
+          inputTokens,
+          outputTokens,
+          skipCreditCheck,
+        });
       }
     }
-  })();
+  );
 
-  return new Response(readable, {
+  return new Response(body, {
     headers: streamHeaders,
   });
 }
@@ -671,7 +641,7 @@ async function handleClaudeStream(
   skipCreditCheck: boolean,
   supabase: ReturnType<typeof createClient>
 ): Promise<Response> {
-  const response = await fetch('https://api.anthropic.com/v1/messages', {
+  const response = await upstreamFetch(getProviderUrl('claude', '/v1/messages'), {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
@@ -700,87 +670,32 @@ async function handleClaudeStream(
   let inputTokens = 0;
   let outputTokens = 0;
 
-  // Create a transform stream that forwards chunks and tracks usage
-  const { readable, writable } = new TransformStream({
-    transform(chunk, controller) {
-      controller.enqueue(chunk);
-    },
-  });
-
-  // Process the stream in the background
-  (async () => {
-    const reader = response.body!.getReader();
-    const writer = writable.getWriter();
-    const decoder = new TextDecoder();
-
-    try {
-      while (true) {
-        const { done, value } = await reader.read();
-        if (done) break;
-
-        // Forward the chunk
-        await writer.write(value);
-
-        // Parse for usage info from Claude events
-        const text = decoder.decode(value, { stream: true });
-        const lines = text.split('\n');
-        for (const line of lines) {
-          if (line.startsWith('data: ')) {
-            try {
-              const data = JSON.parse(line.slice(6));
-              // Claude sends usage in message_start and message_delta events
-              if (data.type === 'message_start' && data.message?.usage) {
-                inputTokens = data.message.usage.input_tokens || 0;
-              }
-              if (data.type === 'message_delta' && data.usage) {
-                outputTokens = data.usage.output_tokens || 0;
-              }
-            } catch {
-              // Ignore parse errors
-            }
-          }
-        }
+  const body = meterEventStream(
+    response.body!,
+    (data) => {
+      // Claude sends usage in message_start and message_delta events
+      if (data.type === 'message_start' && data.message?.usage) {
+        inputTokens = data.message.usage.input_tokens || 0;
       }
-    } finally {
-      await writer.close();
-
-      // Record usage after stream completes
+      if (data.type === 'message_delta' && data.usage) {
+        outputTokens = data.usage.output_tokens || 0;
+      }
+    },
+    async () => {
       if (inputTokens > 0 || outputTokens > 0) {
-        const pricing = MODEL_PRICING[apiModel] || { input: 10, output: 30 };
-        const inputCost = (inputTokens / 1_000_000) * pricing.input;
-        const outputCost = (outputTokens / 1_000_000) * pricing.output;
-        const totalCostCents = Math.ceil((inputCost + outputCost) * 100);
-
-        // Deduct credits
-        if (!skipCreditCheck) {
-          try {
-            await supabase.rpc('deduct_credits', {
-              p_user_id: userId,
-              p_amount: totalCostCents,
-            });
-          } catch (err) {
-            console.warn('Failed to deduct credits:', err);
-          }
-        }
-
-        // Log usage
-        try {
-          await supabase.from('usage_logs').insert({
-            user_id: userId,
-            model: requestModel,
-            input_tokens: inputTokens,
-            output_tokens: outputTokens,
-            cost_cents: totalCostCents,
-            created_at: new Date().toISOString(),
-          });
-        } catch (err) {
-          console.warn('Failed to log usage:', err);
-        }
+        await recordUsage(supabase, {
+          userId,
+          model: requestModel,
+          apiModel,
+          inputTokens,
+          outputTokens,
+          skipCreditCheck,
+        });
       }
     }
-  })();
+  );
 
-  return new Response(readable, {
+  return new Response(body, {
     headers: streamHeaders,
   });
 }
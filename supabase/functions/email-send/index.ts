@@ -17,11 +17,18 @@
  * - SENDGRID_API_KEY (for SendGrid)
  * - RESEND_API_KEY (for Resend)
  * - MAILGUN_API_KEY, MAILGUN_DOMAIN (for Mailgun)
+ * - EMAIL_SEND_CONCURRENCY: provider requests in flight at once (default 4)
+ * - SENDGRID_BASE_URL, RESEND_BASE_URL, MAILGUN_BASE_URL: provider overrides
+ *   (e.g. mock providers for load tests)
+ *
+ * Recipients are sent in batches through each provider's bulk API, so every
+ * recipient gets their own copy and one failed batch does not fail the rest.
  */
 
 import { serve } from 'https://deno.land/std@0.168.0/http/server.ts';
 import { createClient } from 'https://esm.sh/@supabase/supabase-js@2';
 import { rateLimitMiddleware } from '../_shared/rateLimit.ts';
+import { getProviderUrl, upstreamFetch } from '../_shared/upstream.ts';
 
 // ═══════════════════════════════════════════════════════════════════════════
 // TYPES
@@ -49,6 +56,21 @@ interface RecipientEmail {
   email: string;
 }
 
+interface SendResult {
+  success: boolean;
+  error?: string;
+}
+
+type EmailSender = (
+  to: string[],
+  subject: string,
+  body: string,
+  bodyHtml: string,
+  fromName: string,
+  fromEmail: string,
+  replyTo?: string
+) => Promise<SendResult>;
+
 // ═══════════════════════════════════════════════════════════════════════════
 // CORS HEADERS
 // ═══════════════════════════════════════════════════════════════════════════
@@ -83,13 +105,13 @@ async function sendViaSendGrid(
   fromName: string,
   fromEmail: string,
   replyTo?: string
-): Promise<{ success: boolean; error?: string }> {
+): Promise<SendResult> {
   const apiKey = Deno.env.get('SENDGRID_API_KEY');
   if (!apiKey) {
     return { success: false, error: 'SendGrid API key not configured' };
   }
 
-  const response = await fetch('https://api.sendgrid.com/v3/mail/send', {
+  const response = await upstreamFetch(getProviderUrl('sendgrid', '/v3/mail/send'), {
     method: 'POST',
     headers: {
       'Authorization': `Bearer ${apiKey}`,
@@ -112,6 +134,9 @@ async function sendViaSendGrid(
     return { success: false, error: `SendGrid error: ${error}` };
   }
 
+  // Release the pooled connection (see upstreamFetch)
+  await response.body?.cancel();
+
   return { success: true };
 }
 
@@ -123,26 +148,27 @@ async function sendViaResend(
   fromName: string,
   fromEmail: string,
   replyTo?: string
-): Promise<{ success: boolean; error?: string }> {
+): Promise<SendResult> {
   const apiKey = Deno.env.get('RESEND_API_KEY');
   if (!apiKey) {
     return { success: false, error: 'Resend API key not configured' };
   }
 
-  const response = await fetch('https://api.resend.com/emails', {
+  // Batch API: one email per recipient, so recipients don't see each other
+  const response = await upstreamFetch(getProviderUrl('resend', '/emails/batch'), {
     method: 'POST',
     headers: {
       'Authorization': `Bearer ${apiKey}`,
       'Content-Type': 'application/json',
     },
-    body: JSON.stringify({
+    body: JSON.stringify(to.map(email => ({
       from: `${fromName} <${fromEmail}>`,
-      to,
+      to: [email],
       reply_to: replyTo,
       subject,
       text: body,
       html: bodyHtml,
-    }),
+    }))),
   });
 
   if (!response.ok) {
@@ -150,6 +176,9 @@ async function sendViaResend(
     return { success: false, error: `Resend error: ${error}` };
   }
 
+  // Release the pooled connection (see upstreamFetch)
+  await response.body?.cancel();
+
   return { success: true };
 }
 
@@ -161,7 +190,7 @@ async function sendViaMailgun(
   fromName: string,
   fromEmail: string,
   replyTo?: string
-): Promise<{ success: boolean; error?: string }> {
+): Promise<SendResult> {
   const apiKey = Deno.env.get('MAILGUN_API_KEY');
   const domain = Deno.env.get('MAILGUN_DOMAIN');
 
@@ -172,6 +201,8 @@ async function sendViaMailgun(
   const formData = new FormData();
   formData.append('from', `${fromName} <${fromEmail}>`);
   to.forEach(email => formData.append('to', email));
+  // Recipient variables make this a batch send: one message per recipient
+  formData.append('recipient-variables', JSON.stringify(Object.fromEntries(to.map(email => [email, {}]))));
   formData.append('subject', subject);
   formData.append('text', body);
   formData.append('html', bodyHtml);
@@ -179,8 +210,8 @@ async function sendViaMailgun(
     formData.append('h:Reply-To', replyTo);
   }
 
-  const response = await fetch(
-    `https://api.mailgun.net/v3/${domain}/messages`,
+  const response = await upstreamFetch(
+    getProviderUrl('mailgun', `/v3/${domain}/messages`),
     {
       method: 'POST',
       headers: {
@@ -195,6 +226,9 @@ async function sendViaMailgun(
     return { success: false, error: `Mailgun error: ${error}` };
   }
 
+  // Release the pooled connection (see upstreamFetch)
+  await response.body?.cancel();
+
   return { success: true };
 }
 
@@ -207,7 +241,7 @@ async function sendViaMock(
   _fromName: string,
   _fromEmail: string,
   _replyTo?: string
-): Promise<{ success: boolean; error?: string }> {
+): Promise<SendResult> {
   // Only log non-sensitive metadata in development
   // Never log actual email addresses, content, or PII
   console.log('[MOCK EMAIL] Sending email campaign');
@@ -219,6 +253,62 @@ async function sendViaMock(
   return { success: true };
 }
 
+// Largest batch each provider's bulk API accepts in one request
+const EMAIL_PROVIDERS: Record<string, { batchSize: number; send: EmailSender }> = {
+  sendgrid: { batchSize: 1000, send: sendViaSendGrid }, // personalizations per request
+  resend: { batchSize: 100, send: sendViaResend }, // emails per batch request
+  mailgun: { batchSize: 1000, send: sendViaMailgun }, // recipients per batch send
+  mock: { batchSize: 1000, send: sendViaMock },
+};
+
+const DEFAULT_SEND_CONCURRENCY = 4;
+
+/**
+ * Send to recipients in provider-sized batches, at most concurrency
+ * requests at a time
+ */
+async function sendInBatches(
+  recipients: RecipientEmail[],
+  batchSize: number,
+  concurrency: number,
+  sendBatch: (emails: string[]) => Promise<SendResult>
+): Promise<{ sentCount: number; failedRecipients: string[]; errors: string[] }> {
+  const batches: RecipientEmail[][] = [];
+  for (let i = 0; i < recipients.length; i += batchSize) {
+    batches.push(recipients.slice(i, i + batchSize));
+  }
+
+  let sentCount = 0;
+  const failedRecipients: string[] = [];
+  const errors: string[] = [];
+  let next = 0;
+
+  const worker = async () => {
+    while (next < batches.length) {
+      const batch = batches[next++];
+      let result: SendResult;
+      try {
+        result = await sendBatch(batch.map(r => r.email));
+      } catch (error) {
+        result = { success: false, error: error instanceof Error ? error.message : 'Unknown error' };
+      }
+
+      if (result.success) {
+        sentCount += batch.length;
+      } else {
+        failedRecipients.push(...batch.map(r => r.userId));
+        if (result.error) errors.push(result.error);
+      }
+    }
+  };
+
+  await Promise.all(
+    Array.from({ length: Math.min(concurrency, batches.length) }, worker)
+  );
+
+  return { sentCount, failedRecipients, errors };
+}
+
 // ═══════════════════════════════════════════════════════════════════════════
 // MARKDOWN TO HTML CONVERSION
 // ═══════════════════════════════════════════════════════════════════════════
@@ -308,7 +398,7 @@ serve(async (req: Request) => {
     }
 
     // Check rate limits
-    const rateLimitResponse = rateLimitMiddleware(req, user.id, 'email-send', corsHeaders);
+    const rateLimitResponse = await rateLimitMiddleware(req, user.id, 'email-send', corsHeaders);
     if (rateLimitResponse) {
       return rateLimitResponse;
     }
@@ -366,8 +456,9 @@ serve(async (req: Request) => {
       );
     }
 
-    // Get emails
-    const emails = recipients.map((r: RecipientEmail) => r.email);
+    const recipientEmails: RecipientEmail[] = recipients.map(
+      (r: { user_id: string; email: string }) => ({ userId: r.user_id, email: r.email })
+    );
 
     // Convert markdown to HTML if not provided
     const htmlContent = bodyHtml || markdownToHtml(body);
@@ -376,38 +467,24 @@ serve(async (req: Request) => {
     const provider = Deno.env.get('EMAIL_PROVIDER') || 'mock';
     const fromEmail = Deno.env.get('EMAIL_FROM') || 'noreply@skillengine.app';
     const senderName = fromName || 'SkillEngine';
+    const concurrency = Number(Deno.env.get('EMAIL_SEND_CONCURRENCY')) || DEFAULT_SEND_CONCURRENCY;
+
+    // Send in batches through the provider's bulk API
+    const { batchSize, send } = EMAIL_PROVIDERS[provider] || EMAIL_PROVIDERS.mock;
+    const { sentCount, failedRecipients, errors } = await sendInBatches(
+      recipientEmails,
+      batchSize,
+      concurrency,
+      (emails) => send(emails, subject, body, htmlContent, senderName, fromEmail, replyTo)
+    );
 
-    // Send based on provider
-    let sendResult: { success: boolean; error?: string };
-
-    switch (provider) {
-      case 'sendgrid':
-        sendResult = await sendViaSendGrid(
-          emails, subject, body, htmlContent, senderName, fromEmail, replyTo
-        );
-        break;
-      case 'resend':
-        sendResult = await sendViaResend(
-          emails, subject, body, htmlContent, senderName, fromEmail, replyTo
-        );
-        break;
-      case 'mailgun':
-        sendResult = await sendViaMailgun(
-          emails, subject, body, htmlContent, senderName, fromEmail, replyTo
-        );
-        break;
-      default:
-        sendResult = await sendViaMock(
-          emails, subject, body, htmlContent, senderName, fromEmail, replyTo
-        );
-    }
-
-    if (!sendResult.success) {
+    if (sentCount === 0) {
       return new Response(
         JSON.stringify({
           success: false,
-          error: sendResult.error,
-          recipientCount: emails.length,
+          error: errors[0],
+          recipientCount: recipientEmails.length,
+          failedRecipients,
         } as EmailSendResponse),
         {
           status: 500,
@@ -416,6 +493,10 @@ serve(async (req: Request) => {
       );
     }
 
+    if (failedRecipients.length > 0) {
+      console.error(`Email send: ${failedRecipients.length} recipients failed:`, errors);
+    }
+
     // Log campaign
     const campaignId = crypto.randomUUID();
     await supabase.from('email_campaigns').insert({
@@ -423,7 +504,7 @@ serve(async (req: Request) => {
       subject,
       body,
       body_html: htmlContent,
-      recipient_count: emails.length,
+      recipient_count: sentCount,
       status: 'sent',
       sent_at: new Date().toISOString(),
     });
@@ -433,16 +514,17 @@ serve(async (req: Request) => {
       admin_user_id: user.id,
       admin_email: user.email,
       action_type: 'email_send',
-      action_details: { subject, campaignId },
+      action_details: { subject, campaignId, failedCount: failedRecipients.length },
       target_user_ids: recipientIds,
-      recipient_count: emails.length,
+      recipient_count: sentCount,
     });
 
     return new Response(
       JSON.stringify({
         success: true,
         campaignId,
-        recipientCount: emails.length,
+        recipientCount: sentCount,
+        failedRecipients: failedRecipients.length > 0 ? failedRecipients : undefined,
       } as EmailSendResponse),
       {
         status: 200,
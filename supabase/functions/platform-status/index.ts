@@ -31,7 +31,7 @@ serve(async (req) => {
 
   try {
     // Check rate limits (no user ID for this public endpoint)
-    const rateLimitResponse = rateLimitMiddleware(req, undefined, 'platform-status', corsHeaders);
+    const rateLimitResponse = await rateLimitMiddleware(req, undefined, 'platform-status', corsHeaders);
     if (rateLimitResponse) {
       return rateLimitResponse;
     }
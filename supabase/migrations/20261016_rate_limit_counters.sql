@@ -0,0 +1,131 @@
+-- ═══════════════════════════════════════════════════════════════════════════
+-- RATE LIMIT COUNTERS
+-- Shared sliding window counters for Edge Function rate limiting
+-- (RATE_LIMIT_BACKEND=postgres in supabase/functions/_shared/rateLimit.ts)
+-- ═══════════════════════════════════════════════════════════════════════════
+
+-- ───────────────────────────────────────────────────────────────────────────
+-- 1. COUNTERS
+-- One row per endpoint and user/IP: requests in the current fixed window
+-- and the one before it
+-- ───────────────────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS rate_limit_counters (
+    key TEXT PRIMARY KEY,  -- e.g., 'ai-proxy:user:<uuid>'
+    window_start TIMESTAMPTZ NOT NULL,
+    current_count INTEGER NOT NULL DEFAULT 0,
+    previous_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Index for pruning idle keys
+CREATE INDEX IF NOT EXISTS idx_rate_limit_counters_updated ON rate_limit_counters(updated_at);
+
+-- No policies: only the service role (Edge Functions) reads or writes counters
+ALTER TABLE rate_limit_counters ENABLE ROW LEVEL SECURITY;
+
+-- ───────────────────────────────────────────────────────────────────────────
+-- 2. FUNCTIONS
+-- ───────────────────────────────────────────────────────────────────────────
+
+-- Count one request against a key and return the decision.
+-- The previous window is weighted by how much of it still overlaps the last
+-- p_window_seconds. The row lock serializes concurrent hits on one key, so
+-- every instance sees the same count.
+CREATE OR REPLACE FUNCTION rate_limit_hit(
+    p_key TEXT,
+    p_max_requests INTEGER,
+    p_window_seconds INTEGER
+)
+RETURNS TABLE (
+    allowed BOOLEAN,
+    remaining INTEGER,
+    retry_after INTEGER,
+    reset_at TIMESTAMPTZ
+) AS $$
+DECLARE
+    v_now TIMESTAMPTZ := clock_timestamp();
+    v_window_start TIMESTAMPTZ :=
+        to_timestamp(floor(extract(epoch FROM v_now) / p_window_seconds) * p_window_seconds);
+    v_counter rate_limit_counters%ROWTYPE;
+    v_elapsed DOUBLE PRECISION;
+    v_used INTEGER;
+    v_wait DOUBLE PRECISION;
+BEGIN
+    INSERT INTO rate_limit_counters (key, window_start)
+    VALUES (p_key, v_window_start)
+    ON CONFLICT (key) DO NOTHING;
+
+    SELECT * INTO v_counter
+    FROM rate_limit_counters
+    WHERE key = p_key
+    FOR UPDATE;
+
+    -- Roll forward to the current window
+    IF v_counter.window_start <> v_window_start THEN
+        v_counter.previous_count := CASE
+            WHEN v_counter.window_start = v_window_start - make_interval(secs => p_window_seconds)
+                THEN v_counter.current_count
+            ELSE 0
+        END;
+        v_counter.current_count := 0;
+        v_counter.window_start := v_window_start;
+    END IF;
+
+    v_elapsed := extract(epoch FROM v_now - v_window_start);
+    v_used := floor(v_counter.previous_count * (1 - v_elapsed / p_window_seconds))::INTEGER
+        + v_counter.current_count;
+
+    IF v_used >= p_max_requests THEN
+        -- Wait until the weighted count drops below the limit
+        IF v_counter.current_count >= p_max_requests THEN
+            v_wait := p_window_seconds - v_elapsed
+                + p_window_seconds * greatest(0, 1 - p_max_requests::DOUBLE PRECISION / v_counter.current_count);
+        ELSE
+            v_wait := p_window_seconds
+                * (1 - (p_max_requests - v_counter.current_count)::DOUBLE PRECISION / v_counter.previous_count)
+                - v_elapsed;
+        END IF;
+
+        allowed := false;
+        remaining := 0;
+        retry_after := greatest(1, ceil(v_wait))::INTEGER;
+        reset_at := v_now + make_interval(secs => retry_after);
+    ELSE
+        v_counter.current_count := v_counter.current_count + 1;
+
+        allowed := true;
+        remaining := p_max_requests - v_used - 1;
+        retry_after := NULL;
+        reset_at := v_window_start + make_interval(secs => p_window_seconds);
+    END IF;
+
+    UPDATE rate_limit_counters
+    SET window_start = v_counter.window_start,
+        current_count = v_counter.current_count,
+        previous_count = v_counter.previous_count,
+        updated_at = v_now
+    WHERE key = p_key;
+
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Delete counters idle for longer than any configured window (call daily)
+CREATE OR REPLACE FUNCTION prune_rate_limit_counters(p_idle INTERVAL DEFAULT INTERVAL '1 day')
+RETURNS INTEGER AS $$
+DECLARE
+    v_deleted INTEGER;
+BEGIN
+    DELETE FROM rate_limit_counters
+    WHERE updated_at < now() - p_idle;
+
+    GET DIAGNOSTICS v_deleted = ROW_COUNT;
+    RETURN v_deleted;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Clients must not be able to spend other users' allowance
+REVOKE EXECUTE ON FUNCTION rate_limit_hit(TEXT, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION prune_rate_limit_counters(INTERVAL) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION rate_limit_hit(TEXT, INTEGER, INTEGER) TO service_role;
+GRANT EXECUTE ON FUNCTION prune_rate_limit_counters(INTERVAL) TO service_role;
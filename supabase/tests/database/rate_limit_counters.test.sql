@@ -0,0 +1,58 @@
+-- ═══════════════════════════════════════════════════════════════════════════
+-- RATE LIMIT COUNTERS
+-- Tests rate_limit_hit and prune_rate_limit_counters against a local database
+--   supabase start && supabase test db
+-- ═══════════════════════════════════════════════════════════════════════════
+
+BEGIN;
+CREATE EXTENSION IF NOT EXISTS pgtap WITH SCHEMA extensions;
+SELECT plan(12);
+
+-- Allows up to the limit, then blocks
+SELECT is((SELECT allowed FROM rate_limit_hit('test:user:a', 3, 86400)), true, 'first request allowed');
+SELECT is((SELECT remaining FROM rate_limit_hit('test:user:a', 3, 86400)), 1, 'remaining counts down');
+SELECT is((SELECT allowed FROM rate_limit_hit('test:user:a', 3, 86400)), true, 'request at the limit allowed');
+
+SELECT is((SELECT allowed FROM rate_limit_hit('test:user:a', 3, 86400)), false, 'request over the limit blocked');
+SELECT ok((SELECT retry_after FROM rate_limit_hit('test:user:a', 3, 86400)) >= 1, 'blocked request gets a retry time');
+SELECT is(
+    (SELECT current_count FROM rate_limit_counters WHERE key = 'test:user:a'),
+    3,
+    'blocked requests are not counted'
+);
+
+-- Keys are independent
+SELECT is((SELECT allowed FROM rate_limit_hit('test:user:b', 3, 86400)), true, 'other keys have their own allowance');
+
+-- The previous window still counts while it overlaps the sliding window
+UPDATE rate_limit_counters
+SET window_start = to_timestamp(floor(extract(epoch FROM clock_timestamp()) / 86400) * 86400 - 86400),
+    current_count = 1000000,
+    previous_count = 0
+WHERE key = 'test:user:b';
+SELECT is((SELECT allowed FROM rate_limit_hit('test:user:b', 3, 86400)), false, 'previous window is weighted in');
+SELECT is(
+    (SELECT previous_count FROM rate_limit_counters WHERE key = 'test:user:b'),
+    1000000,
+    'counter rolled forward one window'
+);
+
+-- Counts older than one full window are dropped
+UPDATE rate_limit_counters
+SET window_start = to_timestamp(floor(extract(epoch FROM clock_timestamp()) / 86400) * 86400 - 2 * 86400),
+    current_count = 1000000,
+    previous_count = 1000000
+WHERE key = 'test:user:b';
+SELECT is((SELECT allowed FROM rate_limit_hit('test:user:b', 3, 86400)), true, 'stale windows are dropped');
+
+-- Idle counters are pruned
+UPDATE rate_limit_counters SET updated_at = now() - INTERVAL '2 days' WHERE key = 'test:user:a';
+SELECT is(prune_rate_limit_counters(), 1, 'one idle counter pruned');
+SELECT is(
+    (SELECT count(*)::INTEGER FROM rate_limit_counters WHERE key LIKE 'test:user:%'),
+    1,
+    'active counter kept'
+);
+
+SELECT * FROM finish();
+ROLLBACK;
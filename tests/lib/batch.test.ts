@@ -0,0 +1,257 @@
+/**
+ * Batch Execution Unit Tests
+ *
+ * Tests the batch engine in lib/workflows/batch.ts: shared step slots,
+ * dependency order, failures, pause/resume and CSV export.
+ */
+
+import { describe, it, expect } from 'vitest';
+import {
+  createBatchExecution,
+  exportBatchResultsToCSV,
+  prepareBatchForResume,
+  runBatchExecution,
+  streamBatchResultsCSV,
+  type BatchExecution,
+  type BatchStepExecutor,
+} from '../../lib/workflows/batch';
+import type { Workflow, WorkflowStep } from '../../lib/storage/types';
+
+function delay(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+function makeStep(id: string, dependsOn?: string[]): WorkflowStep {
+  return {
+    id,
+    skillId: 'test-skill',
+    name: id,
+    description: '',
+    inputMappings: {},
+    outputKey: `${id}Output`,
+    dependsOn,
+  };
+}
+
+// a → (b, c) → d
+const WORKFLOW: Workflow = {
+  id: 'test-workflow',
+  name: 'Test Workflow',
+  description: '',
+  longDescription: '',
+  icon: 'Briefcase',
+  color: '',
+  estimatedTime: '',
+  outputs: [],
+  globalInputs: [{ id: 'topic', label: 'Topic', type: 'text', required: true }],
+  steps: [
+    makeStep('a'),
+    makeStep('b', ['a']),
+    makeStep('c', ['a']),
+    makeStep('d', ['b', 'c']),
+  ],
+};
+
+function makeBatch(count: number, concurrency = 3): BatchExecution {
+  const inputSets = Array.from({ length: count }, (_, i) => ({ topic: `topic ${i}` }));
+  return createBatchExecution(WORKFLOW, inputSets, { concurrency });
+}
+
+const echoStep: BatchStepExecutor = async (step, { globalInputs }) => {
+  await delay(2);
+  return `${step.id}:${globalInputs.topic}`;
+};
+
+describe('runBatchExecution', () => {
+  it('runs every item through every step', async () => {
+    const result = await runBatchExecution(makeBatch(5), WORKFLOW, echoStep);
+
+    expect(result.status).toBe('completed');
+    expect(result.progress).toEqual({ total: 5, completed: 5, failed: 0 });
+    for (const item of result.items) {
+      expect(item.status).toBe('completed');
+      expect(item.result?.stepOutputs.dOutput).toBe(`d:${item.inputs.topic}`);
+    }
+  });
+
+  it('never has more steps in flight than the concurrency', async () => {
+    let inFlight = 0;
+    let maxInFlight = 0;
+
+    await runBatchExecution(makeBatch(10, 4), WORKFLOW, async (step) => {
+      inFlight++;
+      maxInFlight = Math.max(maxInFlight, inFlight);
+      await delay(3);
+      inFlight--;
+      return step.id;
+    });
+
+    expect(maxInFlight).toBe(4);
+  });
+
+  it('starts a step only after its dependencies finished', async () => {
+    const finished = new Map<string, Set<string>>();
+
+    await runBatchExecution(makeBatch(3), WORKFLOW, async (step, { globalInputs, outputs }) => {
+      for (const dep of step.dependsOn ?? []) {
+        expect(outputs[`${dep}Output`]).toBeDefined();
+      }
+      await delay(1);
+      const done = finished.get(globalInputs.topic) ?? new Set();
+      done.add(step.id);
+      finished.set(globalInputs.topic, done);
+      return step.id;
+    });
+
+    expect([...finished.values()].every((done) => done.size === 4)).toBe(true);
+  });
+
+  it('marks an item as failed without stopping the others', async () => {
+    const result = await runBatchExecution(makeBatch(3), WORKFLOW, async (step, { globalInputs }) => {
+      if (step.id === 'b' && globalInputs.topic === 'topic 1') {
+        throw new Error('Provider error');
+      }
+      return step.id;
+    });
+
+    expect(result.progress).toEqual({ total: 3, completed: 2, failed: 1 });
+    const failed = result.items[1];
+    expect(failed.status).toBe('error');
+    expect(failed.error).toContain('Provider error');
+    expect(failed.result?.stepStatuses.d).not.toBe('completed');
+  });
+
+  it('skips steps that already completed when resuming', async () => {
+    const calls: string[] = [];
+    const batch = makeBatch(1);
+    batch.items[0] = {
+      ...batch.items[0],
+      status: 'running',
+      result: {
+        id: 'exec-1',
+        workflowId: WORKFLOW.id,
+        workflowName: WORKFLOW.name,
+        status: 'running',
+        currentStepIndex: 1,
+        globalInputs: batch.items[0].inputs,
+        stepOutputs: { aOutput: 'cached a', bOutput: 'cached b' },
+        stepStatuses: { a: 'completed', b: 'completed', c: 'running' },
+        startedAt: new Date().toISOString(),
+      },
+    };
+
+    const result = await runBatchExecution(batch, WORKFLOW, async (step) => {
+      calls.push(step.id);
+      return step.id;
+    });
+
+    expect(calls).toEqual(['c', 'd']);
+    expect(result.items[0].result?.stepOutputs.aOutput).toBe('cached a');
+    expect(result.items[0].status).toBe('completed');
+  });
+
+  it('pauses on abort and finishes the rest on resume', async () => {
+    const controller = new AbortController();
+    let calls = 0;
+    const slowStep: BatchStepExecutor = async (step, { signal }) => {
+      calls++;
+      if (calls === 6) controller.abort();
+      await delay(2);
+      signal.throwIfAborted();
+      return step.id;
+    };
+
+    const paused = await runBatchExecution(makeBatch(6, 2), WORKFLOW, slowStep, {
+      signal: controller.signal,
+    });
+
+    expect(paused.status).toBe('paused');
+    expect(paused.items.some((item) => item.status === 'pending')).toBe(true);
+    expect(paused.items.every((item) => item.status !== 'running')).toBe(true);
+
+    const resumed = await runBatchExecution(prepareBatchForResume(paused), WORKFLOW, echoStep);
+    expect(resumed.status).toBe('completed');
+    expect(resumed.progress.completed).toBe(6);
+  });
+
+  it('checkpoints only the items that changed', async () => {
+    const writes: { items: BatchExecution['items']; changed: number[] }[] = [];
+    const result = await runBatchExecution(makeBatch(6, 2), WORKFLOW, echoStep, {
+      checkpointIntervalMs: 5,
+      checkpoint: async (batch, changed) => {
+        writes.push({ items: batch.items, changed });
+      },
+    });
+
+    // First write stores every item
+    expect(writes[0].changed).toEqual([0, 1, 2, 3, 4, 5]);
+    expect(writes.length).toBeGreaterThan(2);
+
+    // Each later write holds exactly the items replaced since the previous
+    // one, including every item that completed in between
+    for (let i = 1; i < writes.length; i++) {
+      const previous = writes[i - 1].items;
+      const { items, changed } = writes[i];
+      const modified = items.flatMap((item, index) => (item !== previous[index] ? [index] : []));
+      const completed = items.flatMap((item, index) =>
+        item.status === 'completed' && previous[index].status !== 'completed' ? [index] : []
+      );
+      expect([...changed].sort((a, b) => a - b)).toEqual(modified);
+      expect(changed).toEqual(expect.arrayContaining(completed));
+    }
+    expect(writes.slice(1).some(({ changed }) => changed.length < 6)).toBe(true);
+
+    // The last write sees the final state
+    expect(writes[writes.length - 1].items.every((item) => item.status === 'completed')).toBe(true);
+    expect(result.status).toBe('completed');
+  });
+
+  it('evaluates step conditions', async () => {
+    const conditional: Workflow = {
+      ...WORKFLOW,
+      steps: [
+        makeStep('a'),
+        { ...makeStep('b', ['a']), condition: { sourceStep: 'a', operator: 'contains', value: 'yes' } },
+      ],
+    };
+
+    const result = await runBatchExecution(
+      createBatchExecution(conditional, [{ topic: 'x' }]),
+      conditional,
+      async (step) => (step.id === 'a' ? 'no' : 'ran')
+    );
+
+    expect(result.items[0].status).toBe('completed');
+    expect(result.items[0].result?.stepStatuses.b).toBe('skipped');
+  });
+});
+
+describe('prepareBatchForResume', () => {
+  it('resets interrupted items and optionally failed ones', () => {
+    const batch = makeBatch(3);
+    batch.items[0].status = 'running';
+    batch.items[1].status = 'error';
+    batch.items[2].status = 'completed';
+
+    expect(prepareBatchForResume(batch).items.map((i) => i.status)).toEqual([
+      'pending',
+      'error',
+      'completed',
+    ]);
+    const retried = prepareBatchForResume(batch, { retryFailed: true });
+    expect(retried.items.map((i) => i.status)).toEqual(['pending', 'pending', 'completed']);
+    expect(retried.progress).toEqual({ total: 3, completed: 1, failed: 0 });
+  });
+});
+
+describe('streamBatchResultsCSV', () => {
+  it('yields the same rows as exportBatchResultsToCSV', async () => {
+    const result = await runBatchExecution(makeBatch(3), WORKFLOW, async () => 'has, comma');
+    const lines = [...streamBatchResultsCSV(result, WORKFLOW)];
+
+    expect(lines).toHaveLength(4);
+    expect(lines[0]).toContain('Output: d');
+    expect(lines[1]).toContain('"has, comma"');
+    expect(lines.join('\n')).toBe(exportBatchResultsToCSV(result, WORKFLOW));
+  });
+});
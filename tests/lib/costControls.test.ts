@@ -0,0 +1,207 @@
+/**
+ * Cost Controls Unit Tests
+ *
+ * Tests the cost ledger in lib/enhanced/costControls.ts: rollup summaries,
+ * date ranges, compaction to the archive and budget usage.
+ */
+
+import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
+import type { CostRecord } from '../../lib/enhanced/types';
+
+type CostControls = typeof import('../../lib/enhanced/costControls');
+
+let costs: CostControls;
+let archived: CostRecord[];
+
+function record(params: {
+  cost: number;
+  userId?: string;
+  teamId?: string;
+  skillId?: string;
+  provider?: string;
+  model?: string;
+  at?: string;
+}): CostRecord {
+  if (params.at) vi.setSystemTime(new Date(params.at));
+  return costs.recordCost({
+    executionId: `exec-${Math.random()}`,
+    userId: params.userId ?? 'user-1',
+    teamId: params.teamId,
+    skillId: params.skillId ?? 'resume-customizer',
+    inputTokens: 1000,
+    outputTokens: 500,
+    totalTokens: 1500,
+    cost: params.cost,
+    currency: 'USD',
+    provider: params.provider ?? 'claude',
+    model: params.model ?? 'claude-3-5-haiku',
+  });
+}
+
+beforeEach(async () => {
+  vi.useFakeTimers();
+  vi.setSystemTime(new Date('2024-02-14T12:00:00.000Z'));
+  vi.resetModules();
+  costs = await import('../../lib/enhanced/costControls');
+
+  archived = [];
+  costs.setCostRecordArchive({
+    save: async (records) => {
+      archived.push(...records);
+    },
+    getPage: async () => ({ items: [...archived].reverse(), nextCursor: null }),
+  });
+});
+
+afterEach(() => {
+  vi.useRealTimers();
+});
+
+describe('cost summary', () => {
+  it('totals costs by provider and model', () => {
+    record({ cost: 0.5 });
+    record({ cost: 0.25, provider: 'gemini', model: 'gemini-2.0-flash' });
+    record({ cost: 0.25, userId: 'user-2' });
+
+    const summary = costs.getCostSummary();
+    expect(summary.totalCost).toBeCloseTo(1);
+    expect(summary.totalTokens).toBe(4500);
+    expect(summary.executionCount).toBe(3);
+    expect(summary.avgCostPerExecution).toBeCloseTo(1 / 3);
+    expect(summary.byProvider.claude).toEqual({ cost: 0.75, tokens: 3000, count: 2 });
+    expect(summary.byModel['gemini-2.0-flash'].count).toBe(1);
+  });
+
+  it('filters by user, team, skill and provider', () => {
+    record({ cost: 1, userId: 'user-1', teamId: 'team-a', skillId: 'cover-letter' });
+    record({ cost: 2, userId: 'user-2', teamId: 'team-a', provider: 'gemini' });
+    record({ cost: 4, userId: 'user-2' });
+
+    expect(costs.getCostSummary({ userId: 'user-2' }).totalCost).toBe(6);
+    expect(costs.getCostSummary({ teamId: 'team-a' }).totalCost).toBe(3);
+    expect(costs.getCostSummary({ skillId: 'cover-letter' }).totalCost).toBe(1);
+    expect(costs.getCostSummary({ provider: 'gemini' }).totalCost).toBe(2);
+    expect(costs.getCostSummary({ userId: 'user-2', teamId: 'team-a' }).totalCost).toBe(2);
+    expect(costs.getCostSummary({ teamId: 'team-a', provider: 'claude' }).totalCost).toBe(1);
+  });
+
+  it('covers date ranges with hour, day and month rollups', () => {
+    record({ cost: 1, at: '2024-01-31T23:30:00.000Z' });
+    record({ cost: 2, at: '2024-02-01T00:10:00.000Z' });
+    record({ cost: 4, at: '2024-02-15T12:45:00.000Z' });
+    record({ cost: 8, at: '2024-02-29T23:59:00.000Z' });
+    record({ cost: 16, at: '2024-03-01T05:00:00.000Z' });
+
+    const total = (startDate?: string, endDate?: string) => costs.getCostSummary({ startDate, endDate }).totalCost;
+
+    expect(total('2024-02-01T00:00:00.000Z', '2024-02-29T23:59:59.999Z')).toBe(14);
+    expect(total('2024-01-31T23:00:00.000Z', '2024-02-15T12:50:00.000Z')).toBe(7);
+    expect(total('2024-02-15T13:00:00.000Z')).toBe(24);
+    expect(total(undefined, '2024-02-01T00:59:00.000Z')).toBe(3);
+    expect(total('2025-01-01T00:00:00.000Z')).toBe(0);
+  });
+});
+
+describe('cost records', () => {
+  it('lists the most recent records first', () => {
+    const first = record({ cost: 1 });
+    const second = record({ cost: 2, userId: 'user-2' });
+    const third = record({ cost: 3 });
+
+    expect(costs.getCostRecords()).toEqual([third, second, first]);
+    expect(costs.getCostRecords({ userId: 'user-1', limit: 1 })).toEqual([third]);
+  });
+
+  it('compacts the oldest records to the archive and keeps their totals', async () => {
+    const first = record({ cost: 0.001 });
+    for (let i = 1; i < 10001; i++) record({ cost: 0.001 });
+
+    expect(archived).toHaveLength(1000);
+    expect(archived[0]).toEqual(first);
+    expect(costs.getCostRecords({ limit: 20000 })).toHaveLength(9001);
+    expect(costs.getCostSummary().executionCount).toBe(10001);
+
+    const page = await costs.getArchivedCostRecords({ limit: 10 });
+    expect(page.items[page.items.length - 1]).toEqual(first);
+  });
+
+  it('keeps compacted records in filter pair summaries', () => {
+    record({ cost: 1, userId: 'user-2', teamId: 'team-a', at: '2024-02-01T00:00:00.000Z' });
+    vi.setSystemTime(new Date('2024-02-14T12:00:00.000Z'));
+    for (let i = 0; i < 10000; i++) record({ cost: 0.001 });
+
+    expect(archived[0].userId).toBe('user-2');
+    const pair = costs.getCostSummary({ userId: 'user-2', teamId: 'team-a' });
+    expect(pair.totalCost).toBe(1);
+    expect(pair.coveredFrom).toBeUndefined();
+  });
+
+  it('marks scanned summaries that miss compacted records', () => {
+    record({ cost: 1, userId: 'user-2', teamId: 'team-a', at: '2024-02-01T00:00:00.000Z' });
+    vi.setSystemTime(new Date('2024-02-14T12:00:00.000Z'));
+    for (let i = 0; i < 10000; i++) record({ cost: 0.001, userId: 'user-2', teamId: 'team-a' });
+
+    const filter = { userId: 'user-2', teamId: 'team-a', provider: 'claude' };
+    const scanned = costs.getCostSummary(filter);
+    expect(scanned.executionCount).toBe(9001);
+    expect(scanned.coveredFrom).toBe('2024-02-14T12:00:00.000Z');
+    // Complete when the range starts after the compacted records
+    expect(costs.getCostSummary({ ...filter, startDate: '2024-02-14T12:00:00.000Z' }).coveredFrom).toBeUndefined();
+  });
+});
+
+describe('budgets', () => {
+  beforeEach(() => {
+    costs.setBudget({
+      id: 'team-budget',
+      name: 'Team Budget',
+      dailyLimit: 5,
+      weeklyLimit: 10,
+      monthlyLimit: 20,
+      perRunLimit: 2,
+      scope: { teamId: 'team-a' },
+      onLimitReached: 'block',
+      notifyAt: [100],
+      currentDailyUsage: 0,
+      currentWeeklyUsage: 0,
+      currentMonthlyUsage: 0,
+      lastResetAt: new Date().toISOString(),
+    });
+  });
+
+  it('reads usage in the current day, week and month from the ledger', () => {
+    // Wednesday 2024-02-14; the week started on Monday the 12th
+    record({ cost: 3, teamId: 'team-a', at: '2024-02-11T10:00:00.000Z' });
+    record({ cost: 2, teamId: 'team-a', at: '2024-02-12T10:00:00.000Z' });
+    record({ cost: 4, teamId: 'team-a', at: '2024-02-14T09:00:00.000Z' });
+    record({ cost: 100, teamId: 'team-b', at: '2024-02-14T09:30:00.000Z' });
+
+    vi.setSystemTime(new Date('2024-02-14T12:00:00.000Z'));
+    expect(costs.checkBudget({ budgetId: 'team-budget', estimatedCost: 1 })).toMatchObject({
+      allowed: true,
+      remainingDaily: 1,
+      remainingWeekly: 4,
+      remainingMonthly: 11,
+    });
+    expect(costs.checkBudget({ budgetId: 'team-budget', estimatedCost: 1.5 })).toMatchObject({
+      allowed: false,
+      remainingDaily: 1,
+    });
+
+    // A new day starts with a fresh daily allowance
+    vi.setSystemTime(new Date('2024-02-15T00:30:00.000Z'));
+    expect(costs.checkBudget({ budgetId: 'team-budget', estimatedCost: 1.5 }).allowed).toBe(true);
+    expect(costs.getBudget('team-budget')?.currentDailyUsage).toBe(0);
+  });
+
+  it('counts from zero after a reset until the period ends', () => {
+    record({ cost: 4, teamId: 'team-a' });
+    costs.resetDailyBudgets();
+    record({ cost: 1, teamId: 'team-a' });
+
+    costs.checkBudget({ budgetId: 'team-budget', estimatedCost: 0 });
+    const budget = costs.getBudget('team-budget')!;
+    expect(budget.currentDailyUsage).toBe(1);
+    expect(budget.currentMonthlyUsage).toBe(5);
+  });
+});
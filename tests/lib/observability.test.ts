@@ -0,0 +1,206 @@
+/**
+ * Observability Unit Tests
+ *
+ * Tests lib/enhanced/observability.ts: latency sketches, the completed
+ * trace ring buffer, windowed latency budgets and metrics snapshots.
+ */
+
+import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
+import type { ExecutionTrace } from '../../lib/enhanced/types';
+
+type Observability = typeof import('../../lib/enhanced/observability');
+
+let obs: Observability;
+
+/**
+ * Run one traced execution that takes durationMs of (fake) time
+ */
+function run(entityId: string, durationMs: number, status: 'success' | 'error' = 'success'): ExecutionTrace {
+  const trace = obs.startTrace({
+    type: 'skill',
+    entityId,
+    entityName: entityId,
+    provider: 'gemini',
+    model: 'gemini-2.0-flash',
+  });
+  vi.advanceTimersByTime(durationMs);
+  return status === 'success'
+    ? obs.completeTrace(trace.id, { actualCost: 0.01 })!
+    : obs.failTrace(trace.id, { code: 'PROVIDER_ERROR', message: 'Provider unavailable' })!;
+}
+
+beforeEach(async () => {
+  vi.useFakeTimers();
+  vi.setSystemTime(new Date('2024-06-01T12:00:00.000Z'));
+  // Fresh module state for every test
+  vi.resetModules();
+  obs = await import('../../lib/enhanced/observability');
+});
+
+afterEach(() => {
+  vi.useRealTimers();
+});
+
+describe('LatencySketch', () => {
+  it('estimates percentiles within 1% of the exact values', () => {
+    const sketch = new obs.LatencySketch();
+    const values: number[] = [];
+    let seed = 42;
+    for (let i = 0; i < 20000; i++) {
+      seed = (seed * 16807) % 2147483647;
+      // Long-tailed latencies between 1 ms and ~2 minutes
+      const value = Math.exp((seed / 2147483647) * 11.7);
+      values.push(value);
+      sketch.add(value);
+    }
+    values.sort((a, b) => a - b);
+
+    for (const q of [0.5, 0.95, 0.99]) {
+      const exact = values[Math.floor(values.length * q)];
+      expect(Math.abs(sketch.quantile(q) - exact) / exact).toBeLessThanOrEqual(0.0101);
+    }
+    expect(sketch.count).toBe(20000);
+  });
+
+  it('merges and round-trips through snapshots', () => {
+    const a = new obs.LatencySketch();
+    const b = new obs.LatencySketch();
+    [120, 250, 900].forEach((v) => a.add(v));
+    [40, 5000].forEach((v) => b.add(v));
+    a.merge(b);
+
+    expect(a.count).toBe(5);
+    expect(a.min).toBe(40);
+    expect(a.max).toBe(5000);
+
+    const restored = obs.LatencySketch.fromSnapshot(JSON.parse(JSON.stringify(a.toSnapshot())));
+    expect(restored.count).toBe(5);
+    expect(restored.quantile(0.5)).toBe(a.quantile(0.5));
+    expect(restored.quantile(0.99)).toBe(a.quantile(0.99));
+  });
+
+  it('returns 0 when empty', () => {
+    expect(new obs.LatencySketch().quantile(0.95)).toBe(0);
+  });
+});
+
+describe('trace store', () => {
+  it('finds completed and failed traces by ID', () => {
+    const ok = run('resume-customizer', 100);
+    const failed = run('resume-customizer', 50, 'error');
+
+    expect(obs.getTrace(ok.id)?.status).toBe('success');
+    expect(obs.getTrace(failed.id)?.status).toBe('error');
+    expect(obs.getTrace('trace_missing')).toBeNull();
+  });
+
+  it('keeps the newest 1000 traces', () => {
+    const first = run('cover-letter', 10, 'error');
+    for (let i = 0; i < 1000; i++) run(i % 2 === 0 ? 'cover-letter' : 'interview-prep', 10);
+
+    expect(obs.getTrace(first.id)).toBeNull();
+    expect(obs.getRecentTraces({ limit: 5000 })).toHaveLength(1000);
+    expect(obs.getRecentTraces({ entityId: 'cover-letter', limit: 5000 })).toHaveLength(500);
+  });
+
+  it('lists recent traces newest first with filters', () => {
+    const older = run('cover-letter', 10);
+    run('interview-prep', 10);
+    const failed = run('cover-letter', 10, 'error');
+    const newer = run('cover-letter', 10);
+
+    expect(obs.getRecentTraces({ entityId: 'cover-letter' }).map((t) => t.id)).toEqual([
+      newer.id,
+      failed.id,
+      older.id,
+    ]);
+    expect(obs.getRecentTraces({ entityId: 'cover-letter', limit: 1 })).toEqual([newer]);
+    expect(obs.getRecentTraces({ status: 'error' })).toEqual([failed]);
+  });
+
+  it('lists running traces after completed ones', () => {
+    const done = run('cover-letter', 10);
+    const running = obs.startTrace({
+      type: 'workflow',
+      entityId: 'job-application',
+      entityName: 'Job Application',
+      provider: 'gemini',
+      model: 'gemini-2.0-flash',
+    });
+
+    expect(obs.getRecentTraces({}).map((t) => t.id)).toEqual([done.id, running.id]);
+    expect(obs.getTrace(running.id)).toBe(running);
+  });
+});
+
+describe('latency metrics', () => {
+  it('updates latency budgets from the budget window', () => {
+    obs.setLatencyBudget({
+      id: 'tight',
+      name: 'Tight',
+      targetP50Ms: 100,
+      targetP95Ms: 200,
+      targetP99Ms: 300,
+      maxMs: 1000,
+      windowMinutes: 60,
+      withinBudget: true,
+    });
+    const alerts: string[] = [];
+    obs.onAlert((event) => alerts.push(event.ruleId));
+
+    for (let i = 0; i < 9; i++) run('resume-customizer', 1000);
+    expect(obs.getLatencyBudget('tight')?.currentP95Ms).toBeUndefined();
+
+    run('resume-customizer', 1000);
+    const budget = obs.getLatencyBudget('tight')!;
+    expect(budget.withinBudget).toBe(false);
+    expect(budget.currentP95Ms).toBeCloseTo(1000, -1);
+    expect(alerts).toContain('latency_budget_tight');
+  });
+
+  it('drops latencies that left the window but keeps session totals', () => {
+    for (let i = 0; i < 10; i++) run('resume-customizer', 2000);
+    expect(obs.calculateLatencyPercentiles('resume-customizer')?.sampleCount).toBe(10);
+
+    vi.advanceTimersByTime(obs.LATENCY_WINDOW_MINUTES * 60 * 1000);
+    expect(obs.calculateLatencyPercentiles('resume-customizer')).toBeNull();
+
+    const summary = obs.getMetricsSummary('resume-customizer')!;
+    expect(summary.totalExecutions).toBe(10);
+    expect(summary.p95LatencyMs).toBeCloseTo(2000, -1);
+    expect(summary.totalCost).toBeCloseTo(0.1);
+  });
+
+  it('summarizes successes and failures', () => {
+    for (let i = 0; i < 3; i++) run('cover-letter', 100);
+    run('cover-letter', 100, 'error');
+    run('interview-prep', 300);
+
+    expect(obs.getMetricsSummary('cover-letter')).toMatchObject({
+      totalExecutions: 4,
+      successCount: 3,
+      errorCount: 1,
+      successRate: 0.75,
+      avgLatencyMs: 100,
+    });
+    expect(obs.getMetricsSummary('unknown')).toBeNull();
+    expect(obs.getGlobalMetricsSummary()).toMatchObject({ totalExecutions: 5, errorCount: 1 });
+  });
+
+  it('exports a snapshot with per-entity sketches', () => {
+    for (let i = 0; i < 12; i++) run('cover-letter', 100 + i * 10);
+    run('interview-prep', 300);
+
+    const snapshot: import('../../lib/enhanced/observability').MetricsSnapshot = JSON.parse(
+      obs.exportMetricsSnapshot()
+    );
+    expect(snapshot.global.totalExecutions).toBe(13);
+    expect(Object.keys(snapshot.entities).sort()).toEqual(['cover-letter', 'interview-prep']);
+    expect(snapshot.entities['cover-letter'].window?.sampleCount).toBe(12);
+    expect(snapshot.entities['interview-prep'].window).toBeNull();
+
+    const sketch = obs.LatencySketch.fromSnapshot(snapshot.entities['cover-letter'].latency);
+    expect(sketch.count).toBe(12);
+    expect(sketch.quantile(0.5)).toBe(snapshot.entities['cover-letter'].summary.p50LatencyMs);
+  });
+});
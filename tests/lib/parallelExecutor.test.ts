@@ -0,0 +1,224 @@
+/**
+ * Parallel Executor Unit Tests
+ *
+ * Tests lib/workflows/parallelExecutor.ts: dependency grouping, the
+ * ready-queue runner, per-provider limits and the critical-path report.
+ */
+
+import { describe, it, expect } from 'vitest';
+import {
+  buildExecutionGroups,
+  buildStepGraph,
+  executeStepGraph,
+  getCriticalPath,
+  visualizeExecutionPlan,
+  type StepTiming,
+} from '../../lib/workflows/parallelExecutor';
+import { AI_IMPLEMENTATION_WORKFLOW } from '../../lib/workflows';
+import type { WorkflowStep } from '../../lib/storage/types';
+
+function delay(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+function makeStep(id: string, dependsOn?: string[], skillId = 'test-skill'): WorkflowStep {
+  return {
+    id,
+    skillId,
+    name: id,
+    description: '',
+    inputMappings: {},
+    outputKey: `${id}Output`,
+    dependsOn,
+  };
+}
+
+// a → b (slow) → d
+//   → c (fast) → e
+const STEPS = [
+  makeStep('a'),
+  makeStep('b', ['a']),
+  makeStep('c', ['a']),
+  makeStep('d', ['b']),
+  makeStep('e', ['c']),
+];
+
+describe('buildExecutionGroups', () => {
+  it('groups steps by their longest dependency chain', () => {
+    expect(buildExecutionGroups(STEPS).map((g) => g.stepIds)).toEqual([['a'], ['b', 'c'], ['d', 'e']]);
+  });
+
+  it('defaults to depending on the previous step', () => {
+    const steps = [makeStep('a'), makeStep('b'), makeStep('c')];
+    expect(buildExecutionGroups(steps).map((g) => g.stepIds)).toEqual([['a'], ['b'], ['c']]);
+  });
+
+  it('runs steps in a cycle or with unknown dependencies one by one at the end', () => {
+    const steps = [
+      makeStep('a'),
+      makeStep('b', ['c']),
+      makeStep('c', ['b']),
+      makeStep('d', ['missing']),
+      makeStep('e', ['a']),
+    ];
+    const groups = buildExecutionGroups(steps).map((g) => g.stepIds);
+
+    expect(groups).toEqual([['a'], ['e'], ['b'], ['c'], ['d']]);
+    const { dependencies } = buildStepGraph(steps);
+    expect(dependencies.get('b')).toEqual(['a', 'e']);
+    expect(dependencies.get('d')).toEqual(['c']);
+  });
+
+  it('splits the AI implementation workflow into parallel branches', () => {
+    const groups = buildExecutionGroups(AI_IMPLEMENTATION_WORKFLOW.steps);
+    expect(groups.length).toBeLessThan(AI_IMPLEMENTATION_WORKFLOW.steps.length);
+    expect(groups.some((g) => g.stepIds.length > 1)).toBe(true);
+  });
+});
+
+describe('executeStepGraph', () => {
+  it('starts a step as soon as its own dependencies finish', async () => {
+    const started: string[] = [];
+    const result = await executeStepGraph(STEPS, async (step, outputs) => {
+      started.push(step.id);
+      for (const dep of step.dependsOn ?? []) {
+        expect(outputs[`${dep}Output`]).toBe(dep);
+      }
+      await delay(step.id === 'b' ? 30 : 2);
+      return step.id;
+    });
+
+    // e only waits for c, not for the slow b
+    expect(started.indexOf('e')).toBeLessThan(started.indexOf('d'));
+    expect(result.timings.e.completedAt).toBeLessThanOrEqual(result.timings.b.completedAt);
+    expect(result.hasError).toBe(false);
+    expect(Object.values(result.statuses).every((s) => s === 'completed')).toBe(true);
+  });
+
+  it('limits steps in flight overall and per provider', async () => {
+    const steps = [
+      makeStep('root'),
+      ...Array.from({ length: 6 }, (_, i) => makeStep(`g${i}`, ['root'], 'gemini')),
+      ...Array.from({ length: 6 }, (_, i) => makeStep(`c${i}`, ['root'], 'claude')),
+    ];
+    const inFlight = new Map<string, number>();
+    const maxInFlight = new Map<string, number>();
+    let total = 0;
+    let maxTotal = 0;
+
+    await executeStepGraph(
+      steps,
+      async (step) => {
+        const provider = step.skillId;
+        inFlight.set(provider, (inFlight.get(provider) ?? 0) + 1);
+        maxInFlight.set(provider, Math.max(maxInFlight.get(provider) ?? 0, inFlight.get(provider)!));
+        maxTotal = Math.max(maxTotal, ++total);
+        await delay(3);
+        inFlight.set(provider, inFlight.get(provider)! - 1);
+        total--;
+        return step.id;
+      },
+      {
+        concurrency: 4,
+        getProvider: (step) => step.skillId,
+        providerConcurrency: { gemini: 1, claude: 3 },
+      }
+    );
+
+    expect(maxInFlight.get('gemini')).toBe(1);
+    expect(maxInFlight.get('claude')).toBe(3);
+    expect(maxTotal).toBe(4);
+  });
+
+  it('treats skipped steps as finished for their dependents', async () => {
+    const skipped: string[] = [];
+    const result = await executeStepGraph(STEPS, async (step) => step.id, {
+      shouldSkip: (step) => (step.id === 'c' ? 'condition not met' : null),
+      onStepSkipped: (step) => skipped.push(step.id),
+    });
+
+    expect(skipped).toEqual(['c']);
+    expect(result.statuses.c).toBe('skipped');
+    expect(result.statuses.e).toBe('completed');
+  });
+
+  it('stops starting steps after an error', async () => {
+    const result = await executeStepGraph(STEPS, async (step) => {
+      if (step.id === 'c') throw new Error('Provider error');
+      await delay(step.id === 'b' ? 10 : 1);
+      return step.id;
+    });
+
+    expect(result.hasError).toBe(true);
+    expect(result.errors.c).toBe('Provider error');
+    // b was already running and finishes, but nothing new starts
+    expect(result.statuses.b).toBe('completed');
+    expect(result.statuses.d).toBe('pending');
+    expect(result.statuses.e).toBe('pending');
+  });
+
+  it('does not re-run steps that already completed', async () => {
+    const calls: string[] = [];
+    const result = await executeStepGraph(
+      STEPS,
+      async (step) => {
+        calls.push(step.id);
+        return step.id;
+      },
+      {
+        initialOutputs: { aOutput: 'cached', bOutput: 'cached' },
+        initialStatuses: { a: 'completed', b: 'completed' },
+      }
+    );
+
+    expect(calls.sort()).toEqual(['c', 'd', 'e']);
+    expect(result.outputs.aOutput).toBe('cached');
+  });
+
+  it('finishes a wide workflow in about the time of its critical path', async () => {
+    const latency = 15;
+    const result = await executeStepGraph(AI_IMPLEMENTATION_WORKFLOW.steps, async (step) => {
+      await delay(latency);
+      return step.id;
+    });
+
+    const depth = buildExecutionGroups(AI_IMPLEMENTATION_WORKFLOW.steps).length;
+    const elapsed = result.completedAt - result.startedAt;
+    expect(elapsed).toBeLessThan(AI_IMPLEMENTATION_WORKFLOW.steps.length * latency);
+    expect(getCriticalPath(AI_IMPLEMENTATION_WORKFLOW.steps, result.timings).stepIds).toHaveLength(depth);
+  });
+});
+
+describe('getCriticalPath', () => {
+  const timings: Record<string, StepTiming> = {
+    a: { readyAt: 0, startedAt: 0, completedAt: 1000 },
+    b: { readyAt: 1000, startedAt: 1000, completedAt: 5000 },
+    c: { readyAt: 1000, startedAt: 1500, completedAt: 2000 },
+    d: { readyAt: 5000, startedAt: 5000, completedAt: 6000 },
+    e: { readyAt: 2000, startedAt: 2000, completedAt: 3000 },
+  };
+
+  it('follows the dependency that finished last', () => {
+    expect(getCriticalPath(STEPS, timings)).toEqual({
+      stepIds: ['a', 'b', 'd'],
+      durationMs: 6000,
+      queuedMs: 0,
+      totalMs: 6000,
+    });
+  });
+
+  it('is empty without timings', () => {
+    expect(getCriticalPath(STEPS, {}).stepIds).toEqual([]);
+  });
+
+  it('is reported by visualizeExecutionPlan', () => {
+    const plan = visualizeExecutionPlan(STEPS, timings);
+
+    expect(plan).toContain('b (4.0s) *');
+    expect(plan).toContain('c (0.5s)');
+    expect(plan).not.toContain('c (0.5s) *');
+    expect(plan).toContain('Critical path (*): a → b → d');
+    expect(plan).toContain('Total: 6.0s (7.5s if run one step at a time)');
+    expect(visualizeExecutionPlan(STEPS)).not.toContain('Critical path');
+  });
+});
@@ -0,0 +1,307 @@
+/**
+ * Prompt Cache Unit Tests
+ *
+ * Tests lib/selfImprovement/promptCache.ts against an in-memory stand-in for
+ * the Supabase skill_registry table, going through the real registry
+ * queries in supabaseGrading.ts.
+ */
+
+import { describe, it, expect, beforeEach, vi } from 'vitest';
+
+const standIn = vi.hoisted(() => {
+  interface Row {
+    id: string;
+    current_system_instruction: string;
+    current_user_prompt_template: string;
+    current_version: number;
+  }
+
+  const rows = new Map<string, Row>();
+  /** Selected columns of every query that reached the stand-in */
+  const queries: string[] = [];
+  const state = { failing: false };
+
+  class Query {
+    private columns = '*';
+    private filters: ((row: Row) => boolean)[] = [];
+
+    select(columns: string) {
+      this.columns = columns;
+      return this;
+    }
+
+    eq(column: keyof Row, value: unknown) {
+      this.filters.push((row) => row[column] === value);
+      return this;
+    }
+
+    in(column: keyof Row, values: unknown[]) {
+      this.filters.push((row) => values.includes(row[column]));
+      return this;
+    }
+
+    single() {
+      const { data, error } = this.run();
+      if (error) return Promise.resolve({ data: null, error });
+      return Promise.resolve(
+        data.length === 1
+          ? { data: data[0], error: null }
+          : { data: null, error: { code: 'PGRST116', message: 'JSON object requested, multiple (or no) rows returned' } }
+      );
+    }
+
+    then<T>(resolve: (value: ReturnType<Query['run']>) => T, reject?: (reason: unknown) => T) {
+      return Promise.resolve(this.run()).then(resolve, reject);
+    }
+
+    private run() {
+      queries.push(this.columns);
+      if (state.failing) {
+        return { data: null as never, error: { message: 'connection refused' } };
+      }
+      const columns = this.columns.split(',').map((column) => column.trim());
+      const data = [...rows.values()]
+        .filter((row) => this.filters.every((filter) => filter(row)))
+        .map((row) =>
+          this.columns === '*'
+            ? { ...row }
+            : Object.fromEntries(columns.map((column) => [column, row[column as keyof Row]]))
+        );
+      return { data: data as Record<string, unknown>[], error: null };
+    }
+  }
+
+  return {
+    rows,
+    queries,
+    state,
+    client: { from: (_table: string) => new Query() },
+    setPrompt(id: string, version: number) {
+      rows.set(id, {
+        id,
+        current_system_instruction: `${id} system v${version}`,
+        current_user_prompt_template: `${id} user v${version}`,
+        current_version: version,
+      });
+    },
+  };
+});
+
+vi.mock('../../lib/supabase', () => ({
+  supabase: standIn.client,
+  isSupabaseConfigured: () => true,
+}));
+
+/** Prompts sent through the platform proxy by workflow steps */
+const proxyRequests = vi.hoisted(() => [] as { prompt: string; systemPrompt?: string }[]);
+
+vi.mock('../../lib/platformKeys', () => ({
+  async *streamAIProxy(request: { prompt: string; systemPrompt?: string }) {
+    proxyRequests.push(request);
+    yield 'ok';
+  },
+}));
+
+import { PromptCache, type PromptCacheEntry, type PromptCacheStorage } from '../../lib/selfImprovement/promptCache';
+import { prefetchPrompts } from '../../lib/selfImprovement/promptResolver';
+import { executeWorkflowStep } from '../../lib/workflows/stepExecutor';
+import { SKILLS } from '../../lib/skills/static';
+import type { WorkflowStep } from '../../lib/storage/types';
+
+function flush(): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, 0));
+}
+
+let now = 0;
+
+function makeCache(options: { maxEntries?: number; storage?: PromptCacheStorage | null } = {}) {
+  return new PromptCache({
+    ttlMs: 1000,
+    maxStaleMs: 5000,
+    storage: null,
+    now: () => now,
+    ...options,
+  });
+}
+
+beforeEach(() => {
+  now = 0;
+  standIn.rows.clear();
+  standIn.queries.length = 0;
+  standIn.state.failing = false;
+  standIn.setPrompt('resume-customizer', 2);
+  standIn.setPrompt('cover-letter', 1);
+});
+
+describe('PromptCache', () => {
+  it('queries the registry once per skill while fresh', async () => {
+    const cache = makeCache();
+
+    const first = await cache.get('resume-customizer');
+    const second = await cache.get('resume-customizer');
+
+    expect(first).toEqual({
+      systemInstruction: 'resume-customizer system v2',
+      userPromptTemplate: 'resume-customizer user v2',
+      version: 2,
+    });
+    expect(second).toEqual(first);
+    expect(standIn.queries).toHaveLength(1);
+    expect(cache.getStats()).toMatchObject({ hits: 1, misses: 1, size: 1 });
+  });
+
+  it('remembers skills that are not in the registry', async () => {
+    const cache = makeCache();
+
+    expect(await cache.get('unknown-skill')).toBeNull();
+    expect(await cache.get('unknown-skill')).toBeNull();
+    expect(standIn.queries).toHaveLength(1);
+  });
+
+  it('shares one request between concurrent lookups', async () => {
+    const cache = makeCache();
+
+    await Promise.all([cache.get('cover-letter'), cache.get('cover-letter'), cache.get('cover-letter')]);
+    expect(standIn.queries).toHaveLength(1);
+  });
+
+  it('serves stale prompts while checking the version in the background', async () => {
+    const cache = makeCache();
+    await cache.get('resume-customizer');
+    standIn.queries.length = 0;
+
+    now = 2000;
+    const stale = await cache.get('resume-customizer');
+    expect(stale?.version).toBe(2);
+    await flush();
+
+    // Unchanged version: only the version column was read
+    expect(standIn.queries).toEqual(['current_version']);
+    expect(cache.getStats()).toMatchObject({ staleHits: 1, revalidations: 1 });
+
+    await cache.get('resume-customizer');
+    expect(cache.getStats().hits).toBe(1);
+  });
+
+  it('downloads the prompt again when the registry version changed', async () => {
+    const cache = makeCache();
+    await cache.get('resume-customizer');
+    standIn.setPrompt('resume-customizer', 3);
+
+    now = 2000;
+    expect((await cache.get('resume-customizer'))?.version).toBe(2);
+    await flush();
+    expect((await cache.get('resume-customizer'))?.version).toBe(3);
+  });
+
+  it('waits for the registry once an entry is too old to serve', async () => {
+    const cache = makeCache();
+    await cache.get('resume-customizer');
+    standIn.setPrompt('resume-customizer', 3);
+
+    now = 10000;
+    expect((await cache.get('resume-customizer'))?.version).toBe(3);
+    expect(cache.getStats().misses).toBe(2);
+  });
+
+  it('keeps the cached prompt when the registry is unreachable', async () => {
+    const cache = makeCache();
+    await cache.get('resume-customizer');
+    standIn.state.failing = true;
+
+    now = 2000;
+    await cache.get('resume-customizer');
+    await flush();
+
+    expect((await cache.get('resume-customizer'))?.version).toBe(2);
+  });
+
+  it('prefetches many skills with one query', async () => {
+    const cache = makeCache();
+
+    const loaded = await cache.prefetch(['resume-customizer', 'cover-letter', 'unknown-skill']);
+    expect(loaded).toBe(2);
+    expect(standIn.queries).toHaveLength(1);
+
+    await cache.get('resume-customizer');
+    await cache.get('cover-letter');
+    expect(await cache.get('unknown-skill')).toBeNull();
+    expect(standIn.queries).toHaveLength(1);
+    expect(cache.getStats()).toMatchObject({ hits: 3, misses: 0 });
+  });
+
+  it('does not cache anything when a prefetch fails', async () => {
+    const cache = makeCache();
+    standIn.state.failing = true;
+
+    expect(await cache.prefetch(['resume-customizer'])).toBe(0);
+    standIn.state.failing = false;
+    expect((await cache.get('resume-customizer'))?.version).toBe(2);
+  });
+
+  it('evicts the least recently used skill', async () => {
+    standIn.setPrompt('interview-prep', 1);
+    const cache = makeCache({ maxEntries: 2 });
+
+    await cache.get('resume-customizer');
+    await cache.get('cover-letter');
+    await cache.get('resume-customizer');
+    await cache.get('interview-prep');
+    standIn.queries.length = 0;
+
+    await cache.get('resume-customizer');
+    expect(standIn.queries).toHaveLength(0);
+    await cache.get('cover-letter');
+    expect(standIn.queries).toHaveLength(1);
+  });
+
+  it('starts warm from persisted entries', async () => {
+    const persisted = new Map<string, PromptCacheEntry>();
+    const storage: PromptCacheStorage = {
+      load: async () => [...persisted.values()],
+      save: async (entries) => entries.forEach((entry) => persisted.set(entry.skillId, entry)),
+      remove: async (skillIds) => skillIds.forEach((skillId) => persisted.delete(skillId)),
+    };
+
+    await makeCache({ storage }).get('resume-customizer');
+    await flush();
+    standIn.queries.length = 0;
+
+    const reloaded = makeCache({ storage });
+    expect((await reloaded.get('resume-customizer'))?.version).toBe(2);
+    expect(standIn.queries).toHaveLength(0);
+
+    await reloaded.invalidate('resume-customizer');
+    expect(persisted.size).toBe(0);
+  });
+});
+
+describe('workflow step prompts', () => {
+  it('resolve from the registry cache warmed by prefetchPrompts', async () => {
+    const skillId = 'resume-customizer';
+    expect(SKILLS[skillId]).toBeDefined();
+    standIn.setPrompt(skillId, 3);
+    proxyRequests.length = 0;
+
+    await prefetchPrompts([skillId]);
+    const queriesAfterPrefetch = standIn.queries.length;
+
+    const step: WorkflowStep = {
+      id: 'step-1',
+      skillId,
+      name: 'Customize resume',
+      description: '',
+      inputMappings: {},
+      outputKey: 'resume',
+    };
+    await executeWorkflowStep(step, {
+      globalInputs: {},
+      outputs: {},
+      providerConfig: { provider: 'claude', model: 'sonnet', keyMode: 'platform', apiKey: '' },
+    });
+
+    expect(proxyRequests).toHaveLength(1);
+    expect(proxyRequests[0].systemPrompt).toBe(`${skillId} system v3`);
+    expect(standIn.queries).toHaveLength(queriesAfterPrefetch);
+  });
+});
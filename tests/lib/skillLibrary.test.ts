@@ -11,12 +11,17 @@ import {
   getSkillsByRole,
   getCollectionSkills,
   filterSkills,
+  searchLibrarySkills,
   sortSkills,
   getSkillCountByRole,
   getSkillCountByCategory,
+  getRoleTemplateSkills,
+  toLibrarySkillSummary,
   ROLE_DEFINITIONS,
   SKILL_COLLECTIONS,
 } from '../../lib/skillLibrary';
+import { getCatalogRoles, loadLibrarySkill, loadSkillsByRole } from '../../lib/skillLibrary/catalog';
+import { SkillSearchIndex, tokenize } from '../../lib/skillLibrary/search';
 import type { LibrarySkill, LibraryFilters } from '../../lib/skillLibrary/types';
 
 // ═══════════════════════════════════════════════════════════════════════════
@@ -153,6 +158,62 @@ describe('getSkillsByRole', () => {
   });
 });
 
+// ═══════════════════════════════════════════════════════════════════════════
+// LAZY CATALOG TESTS
+// ═══════════════════════════════════════════════════════════════════════════
+
+describe('getRoleTemplateSkills', () => {
+  it('returns only skills sourced from the given role', () => {
+    const roleId = ROLE_DEFINITIONS[0].id;
+    const skills = getRoleTemplateSkills(roleId);
+    expect(skills.length).toBeGreaterThan(0);
+    expect(skills.every((s) => s.sourceRoleId === roleId)).toBe(true);
+  });
+
+  it('returns the same instances as the full catalog', () => {
+    const roleId = ROLE_DEFINITIONS[0].id;
+    const [first] = getRoleTemplateSkills(roleId);
+    expect(getAllLibrarySkills().find((s) => s.id === first.id)).toBe(first);
+  });
+
+  it('returns an empty array for an unknown role', () => {
+    expect(getRoleTemplateSkills('non-existent-role')).toEqual([]);
+  });
+});
+
+describe('toLibrarySkillSummary', () => {
+  it('drops inputs, prompts and config', () => {
+    const summary = toLibrarySkillSummary(getAllLibrarySkills()[0]);
+    expect(summary).not.toHaveProperty('inputs');
+    expect(summary).not.toHaveProperty('prompts');
+    expect(summary).not.toHaveProperty('config');
+    expect(summary.id).toBeDefined();
+  });
+});
+
+describe('catalog loaders', () => {
+  it('loadLibrarySkill resolves full definitions', async () => {
+    const templateSkill = getAllLibrarySkills().find((s) => s.source === 'role-template')!;
+    const loaded = await loadLibrarySkill(templateSkill.id);
+    expect(loaded?.id).toBe(templateSkill.id);
+    expect(loaded?.prompts.systemInstruction).toBe(templateSkill.prompts.systemInstruction);
+  });
+
+  it('loadLibrarySkill returns undefined for unknown IDs', async () => {
+    expect(await loadLibrarySkill('non-existent-skill-id')).toBeUndefined();
+  });
+
+  it('loadSkillsByRole matches getSkillsByRole', async () => {
+    const roleId = ROLE_DEFINITIONS[0].id;
+    const loaded = await loadSkillsByRole(roleId);
+    expect(loaded.map((s) => s.id)).toEqual(getSkillsByRole(roleId).map((s) => s.id));
+  });
+
+  it('getCatalogRoles matches ROLE_DEFINITIONS', async () => {
+    expect(await getCatalogRoles()).toEqual(ROLE_DEFINITIONS);
+  });
+});
+
 // ═══════════════════════════════════════════════════════════════════════════
 // getCollectionSkills TESTS
 // ═══════════════════════════════════════════════════════════════════════════
@@ -596,6 +657,117 @@ describe('ROLE_DEFINITIONS', () => {
   });
 });
 
+// ═══════════════════════════════════════════════════════════════════════════
+// SEARCH INDEX TESTS
+// ═══════════════════════════════════════════════════════════════════════════
+
+describe('SkillSearchIndex', () => {
+  let allSkills: LibrarySkill[];
+
+  beforeEach(() => {
+    allSkills = getAllLibrarySkills();
+  });
+
+  it('tokenizes to lowercase alphanumeric words', () => {
+    expect(tokenize('Code-Review  Assistant (v2)')).toEqual(['code', 'review', 'assistant', 'v2']);
+  });
+
+  it('keeps non-ASCII letters in tokens', () => {
+    expect(tokenize('Résumé für Café-Ölfirmen')).toEqual(['résumé', 'für', 'café', 'ölfirmen']);
+  });
+
+  it('matches a query without tokens as a substring', () => {
+    const index = new SkillSearchIndex(allSkills);
+    expect(index.search({ search: '   ' })).toHaveLength(allSkills.length);
+    expect(index.search({ search: '%%%~~~' })).toEqual([]);
+
+    const ampersand = index.search({ search: '&' }).map((r) => r.skill.id);
+    expect(ampersand).toEqual(
+      allSkills
+        .filter((s) => [s.name, s.description, s.longDescription ?? ''].some((f) => f.includes('&')))
+        .map((s) => s.id)
+    );
+    expect(ampersand.length).toBeLessThan(allSkills.length);
+  });
+
+  it('filterSkills on the full catalog matches a linear scan', () => {
+    const filters = {
+      ...createEmptyFilters(),
+      search: 'review',
+      categories: ['analysis' as const],
+      roles: [ROLE_DEFINITIONS[0].id],
+    };
+    const indexed = filterSkills(allSkills, filters);
+    const linear = filterSkills([...allSkills], filters);
+    expect(indexed.map((s) => s.id)).toEqual(linear.map((s) => s.id));
+  });
+
+  it('indexes catalog summaries the same as full skills', () => {
+    const summaryIndex = new SkillSearchIndex(allSkills.map(toLibrarySkillSummary));
+    const filters = { ...createEmptyFilters(), search: 'resume', roles: [ROLE_DEFINITIONS[0].id] };
+    expect(summaryIndex.filter(filters).map((s) => s.id)).toEqual(
+      filterSkills([...allSkills], filters).map((s) => s.id)
+    );
+    expect(summaryIndex.search(filters).map((r) => r.skill.id)).toEqual(
+      searchLibrarySkills(filters).map((s) => s.id)
+    );
+  });
+
+  it('narrows incrementally as the query grows', () => {
+    const index = new SkillSearchIndex(allSkills);
+    const queries = ['r', 're', 'res', 'resu', 'resume'];
+    for (const search of queries) {
+      const filters = { ...createEmptyFilters(), search };
+      const expected = filterSkills([...allSkills], filters).map((s) => s.id);
+      expect(index.filter(filters).map((s) => s.id)).toEqual(expected);
+    }
+  });
+
+  it('looks up skills by ID', () => {
+    const index = new SkillSearchIndex(allSkills);
+    expect(index.get(allSkills[0].id)).toBe(allSkills[0]);
+    expect(index.get('non-existent-skill-id')).toBeUndefined();
+  });
+
+  it('counts facets', () => {
+    const index = new SkillSearchIndex(allSkills);
+    const roleId = ROLE_DEFINITIONS[0].id;
+    expect(index.countByRole(roleId)).toBe(getSkillsByRole(roleId).length);
+    expect(index.countByCategory('analysis')).toBe(
+      allSkills.filter((s) => s.tags.category === 'analysis').length
+    );
+  });
+});
+
+describe('searchLibrarySkills', () => {
+  it('ranks name matches above description-only matches', () => {
+    const results = searchLibrarySkills({ ...createEmptyFilters(), search: 'resume' });
+    expect(results.length).toBeGreaterThan(0);
+    expect(results[0].name.toLowerCase()).toContain('resume');
+  });
+
+  it('matches word prefixes', () => {
+    const full = searchLibrarySkills({ ...createEmptyFilters(), search: 'interview' });
+    const prefix = searchLibrarySkills({ ...createEmptyFilters(), search: 'interv' });
+    const prefixIds = new Set(prefix.map((s) => s.id));
+    expect(full.every((s) => prefixIds.has(s.id))).toBe(true);
+  });
+
+  it('requires every query token to match', () => {
+    const results = searchLibrarySkills({ ...createEmptyFilters(), search: 'resume xyz123nonexistentterm' });
+    expect(results).toEqual([]);
+  });
+
+  it('applies facet filters', () => {
+    const results = searchLibrarySkills({
+      ...createEmptyFilters(),
+      search: 'report',
+      sources: ['builtin'],
+    });
+    expect(results.every((s) => s.source === 'builtin')).toBe(true);
+  });
+});
+
 // ═══════════════════════════════════════════════════════════════════════════
 // SKILL_COLLECTIONS TESTS
 // ═══════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,158 @@
+/**
+ * Storage Query Helper Tests
+ *
+ * Tests lib/storage/query.ts: page cursor tokens and the search terms
+ * stored in the workflow execution full-text index. The paged, searched
+ * and bulk queries in lib/storage/indexeddb.ts run against fake-indexeddb.
+ */
+
+import 'fake-indexeddb/auto';
+import { IDBDatabase, IDBFactory } from 'fake-indexeddb';
+import { describe, it, expect, beforeEach, vi } from 'vitest';
+import {
+  decodePageCursor,
+  encodePageCursor,
+  getWorkflowExecutionSearchTerms,
+  tokenizeSearchText,
+} from '../../lib/storage/query';
+import type { SavedOutput, WorkflowExecution } from '../../lib/storage/types';
+
+type SkillEngineDB = typeof import('../../lib/storage/indexeddb').db;
+
+function makeExecution(id: string, overrides: Partial<WorkflowExecution> = {}): WorkflowExecution {
+  return {
+    id,
+    workflowId: 'job-application',
+    workflowName: 'Job Application',
+    status: 'completed',
+    currentStepIndex: 0,
+    globalInputs: {},
+    stepOutputs: {},
+    stepStatuses: {},
+    startedAt: '2024-05-01T10:00:00.000Z',
+    ...overrides,
+  };
+}
+
+function makeOutput(id: string): SavedOutput {
+  return {
+    id,
+    title: `Output ${id}`,
+    skillId: 'resume-customizer',
+    skillName: 'Resume Customizer',
+    skillSource: 'static',
+    output: 'text',
+    inputs: {},
+    model: 'claude',
+    createdAt: '2024-05-01T10:00:00.000Z',
+    updatedAt: '2024-05-01T10:00:00.000Z',
+    isFavorite: false,
+  };
+}
+
+describe('page cursors', () => {
+  it('round-trips string and compound index keys', () => {
+    const positions = [
+      { key: '2024-05-01T10:00:00.000Z', primaryKey: 'exec-1' },
+      { key: ['job-application', '2024-05-01T10:00:00.000Z'], primaryKey: 'exec-2' },
+    ];
+    for (const position of positions) {
+      expect(decodePageCursor(encodePageCursor(position))).toEqual(position);
+    }
+  });
+
+  it('rejects malformed tokens', () => {
+    expect(() => decodePageCursor('not json')).toThrow('Invalid page cursor');
+    expect(() => decodePageCursor('["only-one"]')).toThrow('Invalid page cursor');
+    expect(() => decodePageCursor('[null, "id"]')).toThrow('Invalid page cursor');
+  });
+});
+
+describe('search terms', () => {
+  it('splits text into lowercase words', () => {
+    expect(tokenizeSearchText('Q3 Sales-Report: Draft #2')).toEqual(['q3', 'sales', 'report', 'draft', '2']);
+    expect(tokenizeSearchText('Résumé Überblick')).toEqual(['résumé', 'überblick']);
+    expect(tokenizeSearchText('  --  ')).toEqual([]);
+  });
+
+  it('indexes title, workflow name and tags once each', () => {
+    const execution = {
+      id: 'exec-1',
+      workflowId: 'job-application',
+      workflowName: 'Job Application',
+      title: 'Application for Acme',
+      tags: ['acme', 'Priority'],
+    } as WorkflowExecution;
+
+    expect(getWorkflowExecutionSearchTerms(execution).sort()).toEqual([
+      'acme',
+      'application',
+      'for',
+      'job',
+      'priority',
+    ]);
+  });
+});
+
+describe('IndexedDB queries', () => {
+  let db: SkillEngineDB;
+
+  beforeEach(async () => {
+    // Fresh empty database and a fresh singleton for every test
+    globalThis.indexedDB = new IDBFactory();
+    vi.resetModules();
+    ({ db } = await import('../../lib/storage/indexeddb'));
+  });
+
+  it('pages past records that share an index key', async () => {
+    // Five executions with the same startedAt, so paging relies on the primary key
+    await db.saveWorkflowExecutions(['a', 'b', 'c', 'd', 'e'].map((id) => makeExecution(id)));
+    await db.saveWorkflowExecution(makeExecution('newest', { startedAt: '2024-05-02T10:00:00.000Z' }));
+
+    const seen: string[] = [];
+    let cursor: string | undefined;
+    let pages = 0;
+    do {
+      const page = await db.getWorkflowExecutionsPage({ limit: 2, cursor });
+      seen.push(...page.items.map((execution) => execution.id));
+      cursor = page.nextCursor ?? undefined;
+      pages++;
+    } while (cursor);
+
+    expect(seen).toEqual(['newest', 'e', 'd', 'c', 'b', 'a']);
+    expect(pages).toBe(3);
+  });
+
+  it('intersects search terms through the multiEntry index', async () => {
+    await db.saveWorkflowExecutions([
+      makeExecution('sales-report', { title: 'Sales Report for Acme' }),
+      makeExecution('sales-forecast', { title: 'Sales Forecast' }),
+      makeExecution('acme-report', { title: 'Quarterly Report', tags: ['acme'] }),
+    ]);
+
+    const bothTerms = await db.searchWorkflowExecutions('sales rep');
+    expect(bothTerms.map((execution) => execution.id)).toEqual(['sales-report']);
+
+    const acmeReports = await db.searchWorkflowExecutions('report acme');
+    expect(acmeReports.map((execution) => execution.id).sort()).toEqual(['acme-report', 'sales-report']);
+  });
+
+  it('writes a bulk save in one transaction', async () => {
+    await db.init();
+    const transaction = vi.spyOn(IDBDatabase.prototype, 'transaction');
+
+    await db.saveOutputs(['o1', 'o2', 'o3'].map(makeOutput));
+
+    expect(transaction).toHaveBeenCalledTimes(1);
+    expect(transaction).toHaveBeenCalledWith('savedOutputs', 'readwrite');
+    transaction.mockRestore();
+    expect((await db.getAllSavedOutputs()).map((output) => output.id).sort()).toEqual(['o1', 'o2', 'o3']);
+  });
+
+  it('writes nothing when any item of a bulk save fails', async () => {
+    const invalid = { ...makeOutput('bad'), id: undefined } as unknown as SavedOutput;
+
+    await expect(db.saveOutputs([makeOutput('o1'), invalid])).rejects.toBeDefined();
+    expect(await db.getAllSavedOutputs()).toEqual([]);
+  });
+});
@@ -0,0 +1,171 @@
+/**
+ * Test Scheduler Unit Tests
+ *
+ * Tests the worker pool, token bucket and 429 retry handling used by the
+ * eval test runner.
+ */
+
+import { describe, it, expect } from 'vitest';
+import {
+  RequestScheduler,
+  TokenBucket,
+  isRateLimitError,
+} from '../../lib/testing/scheduler';
+import { ApiCallError } from '../../lib/testing/apiHelper';
+
+const FAST = { requestsPerMinute: 600000, burst: 100 };
+
+function delay(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+describe('isRateLimitError', () => {
+  it('detects 429 ApiCallErrors', () => {
+    expect(isRateLimitError(new ApiCallError('Rate limit exceeded', 429))).toBe(true);
+    expect(isRateLimitError(new ApiCallError('Bad request', 400))).toBe(false);
+  });
+
+  it('detects rate limit messages on plain errors', () => {
+    expect(isRateLimitError(new Error('[429 Too Many Requests]'))).toBe(true);
+    expect(isRateLimitError(new Error('RESOURCE_EXHAUSTED'))).toBe(true);
+    expect(isRateLimitError(new Error('Network down'))).toBe(false);
+  });
+});
+
+describe('TokenBucket', () => {
+  it('allows a burst immediately', async () => {
+    const bucket = new TokenBucket({ requestsPerMinute: 60, burst: 3 });
+    const start = Date.now();
+    await bucket.take();
+    await bucket.take();
+    await bucket.take();
+    expect(Date.now() - start).toBeLessThan(50);
+  });
+
+  it('throttles once the burst is used', async () => {
+    // 1200 rpm = one token every 50ms
+    const bucket = new TokenBucket({ requestsPerMinute: 1200, burst: 1 });
+    await bucket.take();
+    const start = Date.now();
+    await bucket.take();
+    expect(Date.now() - start).toBeGreaterThanOrEqual(40);
+  });
+
+  it('waits out a pause', async () => {
+    const bucket = new TokenBucket(FAST);
+    bucket.pause(60);
+    const start = Date.now();
+    await bucket.take();
+    expect(Date.now() - start).toBeGreaterThanOrEqual(50);
+  });
+});
+
+describe('RequestScheduler', () => {
+  it('never exceeds the concurrency limit', async () => {
+    const scheduler = new RequestScheduler({ concurrency: 3, defaultRateLimit: FAST });
+    let inFlight = 0;
+    let maxInFlight = 0;
+
+    await Promise.all(
+      Array.from({ length: 12 }, () =>
+        scheduler.schedule('gemini', async () => {
+          inFlight++;
+          maxInFlight = Math.max(maxInFlight, inFlight);
+          await delay(5);
+          inFlight--;
+        })
+      )
+    );
+
+    expect(maxInFlight).toBe(3);
+    expect(scheduler.stats.completed).toBe(12);
+  });
+
+  it('runs high-priority tasks before queued normal ones', async () => {
+    const scheduler = new RequestScheduler({ concurrency: 1, defaultRateLimit: FAST });
+    const order: string[] = [];
+
+    const first = scheduler.schedule('gemini', async () => {
+      await delay(5);
+      order.push('first');
+    });
+    const normal = scheduler.schedule('gemini', async () => {
+      order.push('normal');
+    });
+    const high = scheduler.schedule(
+      'gemini',
+      async () => {
+        order.push('high');
+      },
+      { priority: 'high' }
+    );
+
+    await Promise.all([first, normal, high]);
+    expect(order).toEqual(['first', 'high', 'normal']);
+  });
+
+  it('retries 429 errors with backoff', async () => {
+    const scheduler = new RequestScheduler({
+      concurrency: 1,
+      defaultRateLimit: FAST,
+      retryBaseDelayMs: 5,
+    });
+    let attempts = 0;
+
+    const result = await scheduler.schedule('gemini', async () => {
+      attempts++;
+      if (attempts < 3) throw new ApiCallError('Rate limit exceeded', 429);
+      return 'ok';
+    });
+
+    expect(result).toBe('ok');
+    expect(attempts).toBe(3);
+    expect(scheduler.stats.retries).toBe(2);
+  });
+
+  it('gives up after maxRetries', async () => {
+    const scheduler = new RequestScheduler({
+      concurrency: 1,
+      defaultRateLimit: FAST,
+      maxRetries: 1,
+      retryBaseDelayMs: 5,
+    });
+
+    await expect(
+      scheduler.schedule('gemini', async () => {
+        throw new ApiCallError('Rate limit exceeded', 429);
+      })
+    ).rejects.toThrow('Rate limit exceeded');
+    expect(scheduler.stats.failed).toBe(1);
+  });
+
+  it('does not retry other errors', async () => {
+    const scheduler = new RequestScheduler({ concurrency: 1, defaultRateLimit: FAST });
+    let attempts = 0;
+
+    await expect(
+      scheduler.schedule('gemini', async () => {
+        attempts++;
+        throw new Error('Invalid input');
+      })
+    ).rejects.toThrow('Invalid input');
+    expect(attempts).toBe(1);
+  });
+
+  it('applies per-provider rate limits', async () => {
+    const scheduler = new RequestScheduler({
+      concurrency: 4,
+      defaultRateLimit: FAST,
+      rateLimits: { slow: { requestsPerMinute: 1200, burst: 1 } },
+    });
+
+    const start = Date.now();
+    await Promise.all([
+      scheduler.schedule('slow', async () => undefined),
+      scheduler.schedule('slow', async () => undefined),
+      scheduler.schedule('slow', async () => undefined),
+    ]);
+    // Two refills of 50ms each after the first token
+    expect(Date.now() - start).toBeGreaterThanOrEqual(80);
+  });
+});
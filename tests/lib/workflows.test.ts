@@ -293,4 +293,34 @@ describe('Cross-Workflow Validation', () => {
       expect(uniqueKeys.size).toBe(outputKeys.length);
     }
   });
+
+  it('steps with dependsOn wait for every step whose output they read', () => {
+    for (const workflow of WORKFLOW_LIST) {
+      const stepByOutput = new Map(workflow.steps.map(s => [s.outputKey, s.id]));
+      const stepById = new Map(workflow.steps.map(s => [s.id, s]));
+
+      // Transitive dependencies of a step
+      const ancestors = (stepId: string, seen = new Set<string>()): Set<string> => {
+        for (const dep of stepById.get(stepId)?.dependsOn ?? []) {
+          if (!seen.has(dep)) {
+            seen.add(dep);
+            ancestors(dep, seen);
+          }
+        }
+        return seen;
+      };
+
+      for (const step of workflow.steps) {
+        if (!step.dependsOn) continue;
+        for (const dep of step.dependsOn) {
+          expect(stepById.has(dep)).toBe(true);
+        }
+        const waitsFor = ancestors(step.id);
+        for (const mapping of Object.values(step.inputMappings)) {
+          if (mapping.type !== 'previous') continue;
+          expect(waitsFor.has(stepByOutput.get(mapping.outputKey)!)).toBe(true);
+        }
+      }
+    }
+  });
 });
@@ -5,4 +5,23 @@ import react from '@vitejs/plugin-react'
 // https://vitejs.dev/config/
 export default defineConfig({
   plugins: [react()],
+  build: {
+    rollupOptions: {
+      output: {
+        // Keep the large role template catalog out of the entry chunk so it
+        // is cached separately. The per-role files under
+        // lib/skillLibrary/generated/roles are dynamic imports and already get
+        // one chunk each.
+        manualChunks(id) {
+          if (id.includes('/lib/roleTemplates')) {
+            return 'role-templates'
+          }
+          if (id.includes('/lib/skillLibrary/generated/index.json')) {
+            return 'skill-index'
+          }
+          return undefined
+        },
+      },
+    },
+  },
 })